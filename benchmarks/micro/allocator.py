@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Microbenchmark for BlockSlotAllocator per-operation cost as the pool grows.
+
+For each pool size, times ``allocate_specific`` on random IDs (the path
+``L1ByteStore.store`` takes when the engine picks the slot), ``free``,
+``allocate``, and the bulk ``allocate_n`` / ``free_n`` calls, and reports
+nanoseconds per slot. With an O(1) allocator the figures stay flat from 1k
+to 1M slots.
+
+Usage:
+    python -m benchmarks.micro.allocator
+    python -m benchmarks.micro.allocator --sizes 1000,100000 --ops 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from data_plane.inference.sidecar.l1_cache.allocator import BlockSlotAllocator
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _ns_per_op(seconds: float, ops: int) -> float:
+    return seconds / max(ops, 1) * 1e9
+
+
+def run(num_blocks: int, ops: int) -> dict:
+    ops = min(ops, num_blocks)
+    alloc = BlockSlotAllocator(num_blocks)
+    ids = random.sample(range(num_blocks), ops)
+
+    start = time.perf_counter()
+    for block_id in ids:
+        alloc.allocate_specific(block_id)
+    specific_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for block_id in ids:
+        alloc.free(block_id)
+    free_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        alloc.allocate()
+    allocate_s = time.perf_counter() - start
+    alloc.free_n(range(num_blocks))
+
+    start = time.perf_counter()
+    bulk = alloc.allocate_n(ops)
+    allocate_n_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    alloc.free_n(bulk)
+    free_n_s = time.perf_counter() - start
+
+    return {
+        "num_blocks": num_blocks,
+        "ops": ops,
+        "allocate_specific_ns": _ns_per_op(specific_s, ops),
+        "free_ns": _ns_per_op(free_s, ops),
+        "allocate_ns": _ns_per_op(allocate_s, ops),
+        "allocate_n_ns_per_slot": _ns_per_op(allocate_n_s, ops),
+        "free_n_ns_per_slot": _ns_per_op(free_n_s, ops),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure BlockSlotAllocator per-op cost by pool size.")
+    parser.add_argument(
+        "--sizes", default="1000,10000,100000,1000000",
+        help="Comma-separated pool sizes in slots (default: %(default)s)",
+    )
+    parser.add_argument("--ops", type=int, default=100000, help="Operations timed per size (default: %(default)s)")
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = run(size, args.ops)
+        logger.info(
+            f"{size:>8} slots: allocate_specific {result['allocate_specific_ns']:.0f} ns, "
+            f"free {result['free_ns']:.0f} ns, allocate {result['allocate_ns']:.0f} ns, "
+            f"allocate_n {result['allocate_n_ns_per_slot']:.0f} ns/slot, "
+            f"free_n {result['free_n_ns_per_slot']:.0f} ns/slot"
+        )
+        results.append(result)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Offline replay of a block-access trace against the L1 eviction policies.
+
+Drives each policy through the same calls L1ByteStore makes (track_new on
+insert, record_access on hit, select_victim / admit / on_evict when full) and
+reports the hit rate per policy and cache size.
+
+A trace is a text file with one block hash per access, or JSON lines with a
+"block_hash" field. Without --trace a synthetic workload is generated: hot
+shared-prefix blocks requested with Zipf popularity, interleaved with long
+one-off prompts whose blocks are never seen again.
+
+Usage:
+    python -m benchmarks.micro.eviction_replay
+    python -m benchmarks.micro.eviction_replay --trace accesses.txt --capacities 256,1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+from typing import Iterable, List
+
+from data_plane.inference.sidecar.l1_cache.eviction_policy import (
+    EVICTION_POLICIES,
+    make_eviction_policy,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def load_trace(path: str) -> List[str]:
+    keys = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            keys.append(json.loads(line)["block_hash"] if line.startswith("{") else line)
+    return keys
+
+
+def synthetic_trace(
+    num_requests: int = 5000,
+    num_prefixes: int = 64,
+    prefix_blocks: int = 16,
+    scan_probability: float = 0.3,
+    scan_blocks: int = 200,
+    seed: int = 0,
+) -> List[str]:
+    """Shared-prefix requests with Zipf popularity mixed with one-off long prompts."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(num_prefixes)]
+    trace = []
+    for request in range(num_requests):
+        if rng.random() < scan_probability:
+            trace.extend(f"scan-{request}-{i}" for i in range(scan_blocks))
+        else:
+            prefix = rng.choices(range(num_prefixes), weights)[0]
+            trace.extend(f"prefix-{prefix}-{i}" for i in range(prefix_blocks))
+            trace.extend(f"suffix-{request}-{i}" for i in range(rng.randint(1, 4)))
+    return trace
+
+
+def replay(trace: Iterable[str], policy_name: str, capacity: int, tinylfu: bool = False) -> float:
+    """Hit rate of ``trace`` on a cache of ``capacity`` blocks."""
+    policy = make_eviction_policy(policy_name, capacity, tinylfu_admission=tinylfu)
+    resident = set()
+    hits = total = 0
+    for key in trace:
+        total += 1
+        if key in resident:
+            hits += 1
+            policy.record_access(key)
+            continue
+        if len(resident) >= capacity:
+            victim = policy.select_victim()
+            while victim is not None and victim not in resident:
+                policy.remove(victim)
+                victim = policy.select_victim()
+            if victim is None or not policy.admit(key, victim):
+                continue
+            policy.on_evict(victim)
+            resident.discard(victim)
+        resident.add(key)
+        policy.track_new(key, 1)
+    return hits / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare L1 eviction policies on a block-access trace.")
+    parser.add_argument("--trace", default=None, help="Trace file (default: synthetic workload)")
+    parser.add_argument("--capacities", default="256,1024", help="Comma-separated cache sizes in blocks (default: %(default)s)")
+    parser.add_argument("--policies", default=",".join(EVICTION_POLICIES), help="Comma-separated policies (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic trace seed (default: %(default)s)")
+    args = parser.parse_args()
+
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(seed=args.seed)
+    logger.info(f"Replaying {len(trace)} accesses over {len(set(trace))} distinct blocks")
+
+    results = []
+    for capacity in (int(c) for c in args.capacities.split(",")):
+        for name in args.policies.split(","):
+            for tinylfu in (False, True):
+                label = f"{name}+tinylfu" if tinylfu else name
+                hit_rate = replay(trace, name, capacity, tinylfu)
+                results.append({"capacity": capacity, "policy": label, "hit_rate": hit_rate})
+                logger.info(f"capacity {capacity:>6}  {label:<16} hit rate {hit_rate:.3f}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Microbenchmark for batched KV block RPCs as the job size varies.
+
+For each job size (blocks per transfer job), offloads and reloads the same
+blocks three ways: one unary StoreBlock/LoadBlock round trip per block (the
+pre-batching path), SidecarOffloadingHandler with a one-block message budget
+(a stream of single-block messages), and the handler with the default budget,
+where a job is one StoreBlocks/LoadBlocks call or a stream of budget-sized
+batches. Reports throughput and median per-job latency.
+
+Usage:
+    python -m benchmarks.micro.kv_batching
+    python -m benchmarks.micro.kv_batching --job-sizes 1,8,64,256 --jobs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks.micro.kv_transport import start_sidecar
+from data_plane.inference.engine.kv_offload.sidecar_backend import SidecarLoadStoreSpec
+from data_plane.inference.engine.kv_offload.sidecar_handler import (
+    SidecarOffloadingHandler,
+    _PER_BLOCK_OVERHEAD_BYTES,
+)
+from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
+from shared.proto import kv_cache_pb2
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _unary_job(handler: SidecarOffloadingHandler, op: str, payloads: list) -> bool:
+    for bid, data in enumerate(payloads):
+        if op == "store":
+            resp = handler.stub.StoreBlock(
+                kv_cache_pb2.StoreBlockRequest(block_id=bid, block_hash=f"b{bid}", data=data)
+            )
+        else:
+            resp = handler.stub.LoadBlock(kv_cache_pb2.LoadBlockRequest(block_id=bid))
+        if not resp.success:
+            return False
+    return True
+
+
+def _run(
+    handler: SidecarOffloadingHandler,
+    block_size: int,
+    blocks_per_job: int,
+    jobs: int,
+    unary: bool = False,
+) -> dict:
+    payloads = [os.urandom(block_size) for _ in range(blocks_per_job)]
+    spec = SidecarLoadStoreSpec(
+        block_ids=np.arange(blocks_per_job, dtype=np.int64),
+        block_hashes=[f"b{i}" for i in range(blocks_per_job)],
+    )
+    # Stand-in for the GPU->staging copy
+    handler._stage_store = lambda src_spec, block_ids: (list(payloads), None)
+    latencies = {"store": [], "load": []}
+    for job in range(jobs):
+        for op in ("store", "load"):
+            if unary:
+                start = time.perf_counter()
+                ok = _unary_job(handler, op, payloads)
+                latencies[op].append(time.perf_counter() - start)
+                if not ok:
+                    raise RuntimeError(f"unary {op} job {job} failed")
+                continue
+            start = time.perf_counter()
+            if op == "store":
+                handler.transfer_async(job_id=job, spec=(None, spec))
+            else:
+                handler.transfer_async(job_id=job, spec=(spec, None))
+            handler.wait_idle()
+            results = handler.get_finished()
+            latencies[op].append(time.perf_counter() - start)
+            if not all(ok for _, ok in results):
+                raise RuntimeError(f"{op} job {job} failed")
+
+    job_bytes = block_size * blocks_per_job
+    summary = {}
+    for op, samples in latencies.items():
+        summary[f"{op}_gb_per_s"] = job_bytes * len(samples) / sum(samples) / 1e9
+        summary[f"{op}_p50_ms"] = statistics.median(samples) * 1e3
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure batched KV RPC throughput vs job size.")
+    parser.add_argument("--block-size", type=int, default=131072, help="Bytes per block (default: %(default)s)")
+    parser.add_argument("--job-sizes", default="1,4,16,64,256", help="Comma-separated blocks per job (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=10, help="Jobs per measurement (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=50152, help="Sidecar gRPC port (default: %(default)s)")
+    args = parser.parse_args()
+
+    job_sizes = [int(n) for n in args.job_sizes.split(",")]
+    l1 = L1ByteStore(num_blocks=max(job_sizes), block_size_bytes=args.block_size)
+    stop = start_sidecar(l1, args.port)
+    url = f"localhost:{args.port}"
+    modes = {
+        "unary": SidecarOffloadingHandler(grpc_url=url, block_size_bytes=args.block_size),
+        "per_block": SidecarOffloadingHandler(
+            grpc_url=url,
+            block_size_bytes=args.block_size,
+            max_batch_bytes=args.block_size + _PER_BLOCK_OVERHEAD_BYTES,
+        ),
+        "batched": SidecarOffloadingHandler(grpc_url=url, block_size_bytes=args.block_size),
+    }
+    results = []
+    try:
+        for blocks_per_job in job_sizes:
+            for mode, handler in modes.items():
+                row = {"mode": mode, "blocks_per_job": blocks_per_job}
+                row.update(_run(handler, args.block_size, blocks_per_job, args.jobs, unary=mode == "unary"))
+                results.append(row)
+                logger.info(
+                    f"{blocks_per_job:>4} blocks/job {mode:>9}: "
+                    f"store {row['store_gb_per_s']:.2f} GB/s p50 {row['store_p50_ms']:.1f} ms, "
+                    f"load {row['load_gb_per_s']:.2f} GB/s p50 {row['load_p50_ms']:.1f} ms"
+                )
+    finally:
+        stop()
+        l1.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
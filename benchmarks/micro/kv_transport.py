@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Microbenchmark comparing KV block transports between engine and sidecar.
+
+Starts an in-process sidecar gRPC server whose L1 arena lives in shared
+memory, then pushes the same blocks through SidecarOffloadingHandler with the
+"grpc" transport (bytes in StoreBlock/LoadBlock) and the "shm" transport
+(copy into the mapped arena + CommitBlocks/ResolveBlocks) and reports GB/s.
+
+Usage:
+    python -m benchmarks.micro.kv_transport
+    python -m benchmarks.micro.kv_transport --blocks-per-job 64 --jobs 20 --shm-path /dev/shm/kv-bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from unittest.mock import AsyncMock
+
+import numpy as np
+
+from data_plane.inference.engine.kv_offload.sidecar_backend import SidecarLoadStoreSpec
+from data_plane.inference.engine.kv_offload.sidecar_handler import SidecarOffloadingHandler
+from data_plane.inference.sidecar.cache_manager import MultiTieredCacheManager
+from data_plane.inference.sidecar.grpc_server import create_grpc_server
+from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
+from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def start_sidecar(l1: L1ByteStore, port: int):
+    """Serve the KV cache gRPC API from a background event loop."""
+    loop = asyncio.new_event_loop()
+    manager = MultiTieredCacheManager(l1=l1, l2=AsyncMock(), registry=KVBlockRegistry())
+    server = loop.run_until_complete(create_grpc_server(manager, port=port))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(server.stop(grace=0), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return stop
+
+
+def _run_transport(transport: str, port: int, block_size: int, blocks_per_job: int, jobs: int) -> dict:
+    handler = SidecarOffloadingHandler(
+        grpc_url=f"localhost:{port}", block_size_bytes=block_size, transport=transport
+    )
+    payloads = [os.urandom(block_size) for _ in range(blocks_per_job)]
+    block_ids = np.arange(blocks_per_job, dtype=np.int64)
+    hashes = [f"{transport}-{i}" for i in range(blocks_per_job)]
+    # Stand-in for the GPU->staging copy
+    handler._stage_store = lambda src_spec, block_ids: (list(payloads), None)
+
+    def one_pass(store: bool) -> float:
+        start = time.perf_counter()
+        for job in range(jobs):
+            spec = SidecarLoadStoreSpec(block_ids=block_ids, block_hashes=hashes)
+            if store:
+                handler.transfer_async(job_id=job, spec=(None, spec))
+            else:
+                handler.transfer_async(job_id=job, spec=(spec, None))
+            handler.wait_idle()
+            results = handler.get_finished()
+            if not all(ok for _, ok in results):
+                raise RuntimeError(f"{transport} {'store' if store else 'load'} job {job} failed")
+        return time.perf_counter() - start
+
+    store_s = one_pass(store=True)
+    load_s = one_pass(store=False)
+    total = block_size * blocks_per_job * jobs
+    return {
+        "transport": "shm" if handler._arena is not None else "grpc",
+        "store_gb_per_s": total / store_s / 1e9,
+        "load_gb_per_s": total / load_s / 1e9,
+        "store_ms_per_job": store_s / jobs * 1e3,
+        "load_ms_per_job": load_s / jobs * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gRPC and shared-memory KV block transports.")
+    parser.add_argument("--block-size", type=int, default=131072, help="Bytes per block (default: %(default)s)")
+    parser.add_argument("--blocks-per-job", type=int, default=32, help="Blocks per transfer job (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=20, help="Jobs per direction (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=50151, help="Sidecar gRPC port (default: %(default)s)")
+    parser.add_argument("--shm-path", default="/dev/shm/kv-transport-bench", help="Shared arena file (default: %(default)s)")
+    args = parser.parse_args()
+
+    l1 = L1ByteStore(num_blocks=args.blocks_per_job, block_size_bytes=args.block_size, shm_path=args.shm_path)
+    stop = start_sidecar(l1, args.port)
+    try:
+        results = [
+            _run_transport(t, args.port, args.block_size, args.blocks_per_job, args.jobs)
+            for t in ("grpc", "shm")
+        ]
+    finally:
+        stop()
+        l1.close()
+
+    for r in results:
+        logger.info(
+            f"{r['transport']:>4}: store {r['store_gb_per_s']:.2f} GB/s ({r['store_ms_per_job']:.1f} ms/job), "
+            f"load {r['load_gb_per_s']:.2f} GB/s ({r['load_ms_per_job']:.1f} ms/job)"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
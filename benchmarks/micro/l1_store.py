@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Microbenchmark for L1ByteStore store/load throughput and resident memory.
+
+Fills the store with random blocks, then times repeated store and load passes
+over every slot and reports throughput alongside the process RSS growth. With
+``--compression`` a share of the blocks is made compressible (repeated runs
+plus zero blocks) and the achieved compression ratio is reported as well.
+
+Usage:
+    python -m benchmarks.micro.l1_store
+    python -m benchmarks.micro.l1_store --num-blocks 4096 --block-size 131072 --rounds 5
+    python -m benchmarks.micro.l1_store --compression auto --compressible 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import time
+
+import psutil
+
+from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
+from data_plane.inference.sidecar.l1_cache.compression import COMPRESSION_MODES
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _payload(block_size: int, compressible: bool, index: int) -> bytes:
+    if not compressible:
+        return os.urandom(block_size)
+    if index % 4 == 0:
+        return bytes(block_size)
+    # Low-entropy block: a short random pattern repeated
+    return (os.urandom(64) * (block_size // 64 + 1))[:block_size]
+
+
+def run(num_blocks: int, block_size: int, rounds: int, compression: str = "off", compressible: float = 0.0) -> dict:
+    proc = psutil.Process()
+    rss_before = proc.memory_info().rss
+
+    store = L1ByteStore(num_blocks=num_blocks, block_size_bytes=block_size, compression=compression)
+    n_payloads = min(num_blocks, 64)
+    payloads = [
+        _payload(block_size, i < n_payloads * compressible, i) for i in range(n_payloads)
+    ]
+    hashes = [f"h{i}" for i in range(num_blocks)]
+    ids = store.allocate_blocks(hashes)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i, (bid, h) in enumerate(zip(ids, hashes)):
+            store.store(bid, payloads[i % len(payloads)], h)
+    store_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    checksum = 0
+    for _ in range(rounds):
+        for bid in ids:
+            checksum += store.load(bid)[0]
+    load_s = time.perf_counter() - start
+
+    total = num_blocks * block_size * rounds
+    ops = num_blocks * rounds
+    return {
+        "num_blocks": num_blocks,
+        "block_size": block_size,
+        "rounds": rounds,
+        "store_ops_per_s": ops / store_s,
+        "store_gib_per_s": total / store_s / 2**30,
+        "load_ops_per_s": ops / load_s,
+        "load_gib_per_s": total / load_s / 2**30,
+        "compression": compression,
+        "compression_ratio": store.compression_ratio,
+        "arena_bytes": num_blocks * block_size,
+        "rss_growth_bytes": proc.memory_info().rss - rss_before,
+        "checksum": checksum,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure L1ByteStore store/load throughput.")
+    parser.add_argument("--num-blocks", type=int, default=1024, help="Slots in the store (default: %(default)s)")
+    parser.add_argument("--block-size", type=int, default=131072, help="Bytes per block (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=10, help="Passes over every slot (default: %(default)s)")
+    parser.add_argument(
+        "--compression", default="off", choices=COMPRESSION_MODES, help="L1 compression mode (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--compressible", type=float, default=0.0,
+        help="Fraction of blocks that are compressible (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    result = run(args.num_blocks, args.block_size, args.rounds, args.compression, args.compressible)
+    logger.info(
+        f"store {result['store_ops_per_s']:.0f} ops/s ({result['store_gib_per_s']:.2f} GiB/s), "
+        f"load {result['load_ops_per_s']:.0f} ops/s ({result['load_gib_per_s']:.2f} GiB/s), "
+        f"RSS +{result['rss_growth_bytes'] / 2**20:.1f} MiB for a {result['arena_bytes'] / 2**20:.1f} MiB arena, "
+        f"compression ratio {result['compression_ratio']:.2f}"
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Microbenchmark for metrics instrumentation cost on the L1 hot path.
+
+Two parts. First, the cost of a single update: ``prometheus_client``
+``labels(...).inc()`` / ``.observe()`` (the old per-block pattern), a
+pre-bound ``prometheus_client`` child, and a pre-bound hot-path child.
+Second, L1ByteStore store+load per block with its metrics as shipped and
+with every metric child swapped for a no-op, i.e. instrumentation off.
+
+Usage:
+    python -m benchmarks.micro.metrics_overhead
+    python -m benchmarks.micro.metrics_overhead --block-size 4096 --ops 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import time
+from unittest import mock
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from data_plane.inference.sidecar.l1_cache import api as l1_api
+from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
+from shared.monitoring.hot_path import HotCounter, HotHistogram
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+logger = logging.getLogger(__name__)
+
+
+class _NoOp:
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def observe(self, amount: float) -> None:
+        pass
+
+
+def _ns_per_call(fn, ops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ops):
+        fn()
+    return (time.perf_counter() - start) / ops * 1e9
+
+
+def per_update(ops: int) -> dict:
+    registry = CollectorRegistry()
+    counter = Counter("bench_ops_total", "", ["op", "status"], registry=registry)
+    hist = Histogram("bench_seconds", "", ["op"], registry=registry)
+    hot_counter = HotCounter("bench_hot_ops_total", "", ["op", "status"], registry=registry)
+    hot_hist = HotHistogram("bench_hot_seconds", "", ["op"], registry=registry)
+    bound_counter = counter.labels(op="store", status="hit")
+    bound_hist = hist.labels(op="store")
+    hot_bound_counter = hot_counter.labels(op="store", status="hit")
+    hot_bound_hist = hot_hist.labels(op="store")
+    return {
+        "counter_labels_inc_ns": _ns_per_call(lambda: counter.labels(op="store", status="hit").inc(), ops),
+        "counter_bound_inc_ns": _ns_per_call(bound_counter.inc, ops),
+        "hot_counter_inc_ns": _ns_per_call(hot_bound_counter.inc, ops),
+        "histogram_labels_observe_ns": _ns_per_call(lambda: hist.labels(op="store").observe(0.0003), ops),
+        "histogram_bound_observe_ns": _ns_per_call(lambda: bound_hist.observe(0.0003), ops),
+        "hot_histogram_observe_ns": _ns_per_call(lambda: hot_bound_hist.observe(0.0003), ops),
+    }
+
+
+def _store_load_ns(block_size: int, ops: int) -> float:
+    num_blocks = 1024
+    store = L1ByteStore(num_blocks=num_blocks, block_size_bytes=block_size)
+    payload = os.urandom(block_size)
+    start = time.perf_counter()
+    for i in range(ops):
+        block_id = i % num_blocks
+        store.store(block_id, payload, f"h{block_id}")
+        store.load(block_id)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / ops * 1e9
+
+
+def store_load(block_size: int, ops: int) -> dict:
+    instrumented = _store_load_ns(block_size, ops)
+    noop = _NoOp()
+    patches = [
+        mock.patch.dict(l1_api._OPS_TOTAL, {k: noop for k in l1_api._OPS_TOTAL}),
+        mock.patch.dict(l1_api._OP_DURATION, {k: noop for k in l1_api._OP_DURATION}),
+        mock.patch.object(l1_api, "_STORED_BYTES", noop),
+        mock.patch.object(l1_api, "_LOADED_BYTES", noop),
+    ]
+    for p in patches:
+        p.start()
+    try:
+        bare = _store_load_ns(block_size, ops)
+    finally:
+        for p in patches:
+            p.stop()
+    return {
+        "block_size": block_size,
+        "store_load_instrumented_ns": instrumented,
+        "store_load_uninstrumented_ns": bare,
+        "instrumentation_ns_per_store_load": instrumented - bare,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure metrics overhead on the L1 hot path.")
+    parser.add_argument("--block-size", type=int, default=131072, help="Bytes per block (default: %(default)s)")
+    parser.add_argument("--ops", type=int, default=100000, help="Operations per measurement (default: %(default)s)")
+    args = parser.parse_args()
+
+    updates = per_update(args.ops)
+    logger.info(
+        f"counter inc: labels() {updates['counter_labels_inc_ns']:.0f} ns, "
+        f"bound {updates['counter_bound_inc_ns']:.0f} ns, hot {updates['hot_counter_inc_ns']:.0f} ns"
+    )
+    logger.info(
+        f"histogram observe: labels() {updates['histogram_labels_observe_ns']:.0f} ns, "
+        f"bound {updates['histogram_bound_observe_ns']:.0f} ns, hot {updates['hot_histogram_observe_ns']:.0f} ns"
+    )
+    block = store_load(args.block_size, args.ops)
+    logger.info(
+        f"L1 store+load of {args.block_size} B: {block['store_load_instrumented_ns']:.0f} ns instrumented, "
+        f"{block['store_load_uninstrumented_ns']:.0f} ns without metrics"
+    )
+    print(json.dumps({"per_update": updates, "store_load": block}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Predictive LoRA adapter prefetching.
+
+Tracks an exponentially weighted moving average (EWMA) of the request rate of
+each adapter and, on every tick, warms the hottest adapters that are not yet on
+GPU. Loading goes through LoRAManager.prefetch_adapter, which only fills free
+GPU slots and otherwise just warms the sidecar's local copy, so a misprediction
+costs bandwidth but never displaces an adapter that is serving traffic.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from data_plane.inference.engine import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AdapterPrefetcher:
+    """Background task that prefetches adapters ranked by EWMA arrival rate."""
+
+    def __init__(
+        self,
+        lora_manager,
+        interval: float = 5.0,
+        alpha: float = 0.3,
+        top_k: int = 2,
+        min_rate: float = 0.05,
+    ):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self._lora_manager = lora_manager
+        self._interval = interval
+        self._alpha = alpha
+        self._top_k = top_k
+        self._min_rate = min_rate
+        self._task: asyncio.Task | None = None
+
+        # Requests/second per adapter, smoothed
+        self._rates: Dict[str, float] = {}
+        self._last_counts: Dict[str, int] = {}
+        self._last_sample: Optional[float] = None
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        return dict(self._rates)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Adapter prefetch tick failed: {e}")
+
+    def update_rates(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Fold the request counts since the last sample into the per-adapter EWMAs."""
+        now = time.monotonic() if now is None else now
+        counts = self._lora_manager.arrival_counts()
+
+        if self._last_sample is None:
+            # First sample only establishes the baseline
+            self._last_sample = now
+            self._last_counts = counts
+            return self.rates
+
+        elapsed = now - self._last_sample
+        if elapsed <= 0:
+            return self.rates
+
+        for adapter in set(counts) | set(self._rates):
+            delta = counts.get(adapter, 0) - self._last_counts.get(adapter, 0)
+            rate = delta / elapsed
+            previous = self._rates.get(adapter)
+            if previous is None:
+                smoothed = rate
+            else:
+                smoothed = self._alpha * rate + (1 - self._alpha) * previous
+            self._rates[adapter] = smoothed
+            metrics.engine_lora_arrival_rate.labels(adapter=adapter).set(smoothed)
+
+        self._last_sample = now
+        self._last_counts = counts
+        return self.rates
+
+    def candidates(self) -> List[str]:
+        """Adapters worth prefetching: top-k by rate above the floor, not already on GPU."""
+        ranked = sorted(self._rates.items(), key=lambda kv: kv[1], reverse=True)
+        picked = []
+        for adapter, rate in ranked[: self._top_k]:
+            if rate < self._min_rate:
+                break
+            if not self._lora_manager.is_loaded(adapter, self._lora_manager.last_version(adapter)):
+                picked.append(adapter)
+        return picked
+
+    async def tick(self, now: Optional[float] = None) -> List[str]:
+        """Update rates and issue prefetches. Returns the adapters prefetched."""
+        self.update_rates(now)
+        issued = []
+        for adapter in self.candidates():
+            version = self._lora_manager.last_version(adapter)
+            if await self._lora_manager.prefetch_adapter(adapter, version):
+                logger.info(f"Prefetched adapter {adapter} v{version} (rate={self._rates[adapter]:.3f}/s)")
+                issued.append(adapter)
+        return issued
@@ -24,6 +24,8 @@ import time
 
 from data_plane.inference.engine.config import EngineConfig
 from data_plane.inference.engine import metrics
+from data_plane.inference.engine.adapter_prefetcher import AdapterPrefetcher
+from data_plane.inference.engine.startup_timing import StartupTimer
 from shared.errors import ErrorCode, InferenceServerError
 from shared.logging_config import configure_logging
 from shared.middleware import RequestIDMiddleware, register_error_handlers
@@ -66,6 +68,8 @@ _config = None
 _collector: Optional[SessionCollector] = None
 _gpu_monitor: Optional[GPUMonitor] = None
 _flusher: Optional[BackgroundFlusher] = None
+_prefetcher: Optional[AdapterPrefetcher] = None
+_startup_timer: Optional[StartupTimer] = None
 _draining: bool = False
 
 # Track high-water mark of vLLM's internal num_requests_waiting gauge.
@@ -133,20 +137,37 @@ async def _wait_for_sidecar_model(config: EngineConfig) -> str:
 
 async def _init_engine(config: EngineConfig):
     """Background task: wait for sidecar, create engine, start batching loop."""
-    global _engine, _batching_loop
+    global _engine, _batching_loop, _prefetcher, _startup_timer
+    _startup_timer = StartupTimer()
     try:
         if config.enable_engine_mock:
             logger.info("Using MOCK engine (no GPU)")
             from data_plane.inference.engine.mock_engine import MockLLMEngine
-            _engine = MockLLMEngine(config, collector=_collector)
+            with _startup_timer.phase("engine_init"):
+                _engine = MockLLMEngine(config, collector=_collector)
         else:
             logger.info("Using REAL vLLM engine")
-            model_path = await _wait_for_sidecar_model(config)
+            with _startup_timer.phase("sidecar_wait"):
+                model_path = await _wait_for_sidecar_model(config)
             from data_plane.inference.engine.engine import Engine
-            _engine = await asyncio.to_thread(Engine, config, model_path=model_path, collector=_collector)
+            # Weight loading happens in here; its read_bytes shows whether the page cache was warm
+            with _startup_timer.phase("engine_init"):
+                _engine = await asyncio.to_thread(Engine, config, model_path=model_path, collector=_collector)
+        _startup_timer.finish()
 
         logger.info(f"_engine set to: {type(_engine)}, id={id(_engine)}")
         _batching_loop = asyncio.create_task(_engine.continuous_batching_loop())
+
+        if config.adapter_prefetch_enabled and getattr(_engine, "lora_manager", None):
+            _prefetcher = AdapterPrefetcher(
+                _engine.lora_manager,
+                interval=config.adapter_prefetch_interval,
+                alpha=config.adapter_prefetch_ewma_alpha,
+                top_k=config.adapter_prefetch_top_k,
+                min_rate=config.adapter_prefetch_min_rate,
+            )
+            _prefetcher.start()
+            logger.info("AdapterPrefetcher started")
         logger.info("Engine startup complete")
     except Exception as e:
         logger.error(f"Engine startup failed: {e}", exc_info=True)
@@ -259,6 +280,8 @@ async def lifespan(app: FastAPI):
         metrics.engine_draining.set(1)
         logger.info("Drain started, rejecting new requests")
 
+        if _prefetcher:
+            await _prefetcher.stop()
         if _flusher:
             await _flusher.stop()
         if _gpu_monitor:
@@ -506,6 +529,13 @@ async def apply_template(request: ChatTemplateRequest):
     return ChatTemplateResponse(prompt=prompt)
 
 
+@app.get("/adapters/in_use", tags=["adapters"])
+async def adapters_in_use():
+    """Adapter identifiers on GPU or being loaded; the sidecar never evicts these from disk."""
+    lora_manager = getattr(_engine, "lora_manager", None)
+    return {"adapters": lora_manager.in_use_identifiers if lora_manager else []}
+
+
 @app.get("/metrics", tags=["monitoring"])
 async def metrics_endpoint():
     """Prometheus metrics endpoint"""
@@ -549,6 +579,9 @@ async def metrics_summary():
     summary["queue"]["current_depth"] = int(vllm_waiting_now) if vllm_waiting_now is not None else summary["queue"]["current_depth"]
     summary["queue"]["max_depth"] = int(max_waiting)
 
+    if _startup_timer is not None:
+        summary["startup"] = _startup_timer.summary()
+
     # Read vLLM prefix-cache counter and our own input-token histogram
     # from the shared Prometheus registry to compute an approximate hit rate.
     # vLLM exposes "vllm:prefix_cache_hits_total" (cached token count);
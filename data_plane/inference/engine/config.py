@@ -4,7 +4,7 @@ Backward-compatible: ``EngineConfig()`` still works as before, but field
 definitions now come from the unified ``EngineSection`` model.
 """
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -40,12 +40,21 @@ class EngineConfig(BaseSettings):
     max_lora_rank: int = EngineSection.model_fields["max_lora_rank"].default
     adapter_poll_interval: float = EngineSection.model_fields["adapter_poll_interval"].default
     adapter_poll_timeout: float = EngineSection.model_fields["adapter_poll_timeout"].default
+    adapter_prefetch_enabled: bool = EngineSection.model_fields["adapter_prefetch_enabled"].default
+    adapter_prefetch_interval: float = EngineSection.model_fields["adapter_prefetch_interval"].default
+    adapter_prefetch_ewma_alpha: float = EngineSection.model_fields["adapter_prefetch_ewma_alpha"].default
+    adapter_prefetch_top_k: int = EngineSection.model_fields["adapter_prefetch_top_k"].default
+    adapter_prefetch_min_rate: float = EngineSection.model_fields["adapter_prefetch_min_rate"].default
     max_pending: int = EngineSection.model_fields["max_pending"].default
     temperature: float = EngineSection.model_fields["temperature"].default
     sidecar_grpc_url: str = EngineSection.model_fields["sidecar_grpc_url"].default
     enable_prefix_caching: bool = EngineSection.model_fields["enable_prefix_caching"].default
     enable_kv_offload: bool = EngineSection.model_fields["enable_kv_offload"].default
     kv_offload_num_blocks: int = EngineSection.model_fields["kv_offload_num_blocks"].default
+    kv_offload_transport: Literal["grpc", "shm"] = EngineSection.model_fields["kv_offload_transport"].default
+    kv_offload_max_inflight_transfers: int = EngineSection.model_fields["kv_offload_max_inflight_transfers"].default
+    kv_offload_restore_blocks: bool = EngineSection.model_fields["kv_offload_restore_blocks"].default
+    kv_offload_dedup_stores: bool = EngineSection.model_fields["kv_offload_dedup_stores"].default
     enable_engine_mock: bool = Field(
         default=False,
         alias="ENABLE_ENGINE_MOCK",
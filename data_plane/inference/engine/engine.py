@@ -55,6 +55,11 @@ class Engine:
                         "spec_module_path": "data_plane.inference.engine.kv_offload.sidecar_spec",
                         "sidecar_grpc_url": config.sidecar_grpc_url,
                         "num_blocks": config.kv_offload_num_blocks,
+                        "transport": config.kv_offload_transport,
+                        "max_inflight_transfers": config.kv_offload_max_inflight_transfers,
+                        "restore_blocks": config.kv_offload_restore_blocks,
+                        "dedup_stores": config.kv_offload_dedup_stores,
+                        "model_id": config.model_name,
                     },
                 }),
             ])
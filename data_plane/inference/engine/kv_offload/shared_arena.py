@@ -0,0 +1,84 @@
+"""Engine-side mapping of the sidecar's shared-memory L1 arena.
+
+When the sidecar runs with ``l1_shm_path``, its L1 arena is a file on a tmpfs
+that both containers mount. The engine maps the same file, copies staging
+buffers straight into slot ``block_id`` (offset ``block_id * block_size``)
+and reads loaded blocks from it, so block bytes never cross gRPC; only the
+small CommitBlocks / ResolveBlocks control messages do.
+"""
+
+import logging
+import mmap
+import os
+from typing import Optional
+
+from shared.proto import kv_cache_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class SharedArenaClient:
+    """Read/write access to the slots of a shared L1 arena."""
+
+    def __init__(self, path: str, num_blocks: int, block_size: int):
+        self.path = path
+        self.num_blocks = num_blocks
+        self.block_size = block_size
+        size = num_blocks * block_size
+        fd = os.open(path, os.O_RDWR)
+        try:
+            if os.fstat(fd).st_size < size:
+                raise ValueError(f"Shared arena {path} is smaller than {size} bytes")
+            self._arena = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._view = memoryview(self._arena)
+
+    @classmethod
+    def attach(cls, stub, block_size: int, timeout: float) -> Optional["SharedArenaClient"]:
+        """Map the sidecar's arena, or None if it is not shared or not reachable from here."""
+        try:
+            resp = stub.GetSharedArena(kv_cache_pb2.GetSharedArenaRequest(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f"GetSharedArena failed, using gRPC transport: {e}")
+            return None
+        if not resp.enabled:
+            logger.warning("Sidecar L1 arena is not shared (l1_shm_path unset), using gRPC transport")
+            return None
+        if resp.block_size_bytes != block_size:
+            logger.warning(
+                f"Sidecar block size {resp.block_size_bytes} != engine block size {block_size}, "
+                "using gRPC transport"
+            )
+            return None
+        try:
+            client = cls(resp.path, resp.num_blocks, resp.block_size_bytes)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot map shared arena {resp.path}, using gRPC transport: {e}")
+            return None
+        logger.info(f"Mapped shared L1 arena {resp.path} ({resp.num_blocks} x {resp.block_size_bytes} bytes)")
+        return client
+
+    def write(self, block_id: int, data) -> int:
+        """Copy ``data`` into the block's slot. Returns the number of bytes written."""
+        src = memoryview(data).cast("B")
+        size = src.nbytes
+        if not 0 <= block_id < self.num_blocks or size > self.block_size:
+            raise ValueError(f"Block {block_id} ({size} bytes) does not fit the shared arena")
+        offset = block_id * self.block_size
+        self._view[offset:offset + size] = src
+        return size
+
+    def view(self, block_id: int, length: int) -> memoryview:
+        """Zero-copy view of ``length`` bytes of the block's slot."""
+        if not 0 <= block_id < self.num_blocks or not 0 <= length <= self.block_size:
+            raise ValueError(f"Block {block_id} ({length} bytes) is outside the shared arena")
+        offset = block_id * self.block_size
+        return self._view[offset:offset + length]
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+            self._arena.close()
+        except BufferError:
+            logger.debug("Shared arena still referenced at close")
@@ -5,7 +5,7 @@ Pure arithmetic — no gRPC calls. The handler does the actual I/O.
 """
 
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
 import numpy as np
 
@@ -37,6 +37,16 @@ except ImportError:
             return ""
 
 
+def _hash_from_str(block_hash: str):
+    """Inverse of the handler's hash-to-string conversion: vLLM hashes are bytes sent as hex."""
+    if VLLM_OFFLOAD_AVAILABLE:
+        try:
+            return bytes.fromhex(block_hash)
+        except ValueError:
+            pass
+    return block_hash
+
+
 class SidecarLoadStoreSpec(BlockIDsLoadStoreSpec):
     """Describes a set of blocks to store/load to/from sidecar."""
 
@@ -107,6 +117,31 @@ class SidecarBackend(Backend):
         self._free_ids.append(block_id)
         return True
 
+    def restore(self, blocks: Iterable[tuple[str, int]]) -> list[tuple[object, BlockStatus]]:
+        """Adopt blocks the sidecar already holds, e.g. after an engine restart.
+
+        ``blocks`` are (block_hash, block_id) pairs as listed by the sidecar.
+        Each becomes a ready block under its existing ID; IDs out of range or
+        already in use, and hashes already tracked, are skipped. Returns the
+        adopted (block_hash, BlockStatus) pairs.
+        """
+        free = set(self._free_ids)
+        adopted = []
+        for hash_str, block_id in blocks:
+            bh = _hash_from_str(hash_str)
+            if block_id not in free or bh in self._hash_to_status:
+                continue
+            free.discard(block_id)
+            self._allocated[block_id] = bh
+            self._hash_to_id[bh] = block_id
+            status = BlockStatus()
+            status.ref_cnt = 0  # stored and ready to load
+            self._hash_to_status[bh] = status
+            self._status_to_id[id(status)] = block_id
+            adopted.append((bh, status))
+        self._free_ids = [block_id for block_id in self._free_ids if block_id in free]
+        return adopted
+
     def get_block_id(self, block: BlockStatus) -> Optional[int]:
         """Look up the integer block ID for a BlockStatus."""
         return self._status_to_id.get(id(block))
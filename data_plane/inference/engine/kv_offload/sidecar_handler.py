@@ -1,16 +1,38 @@
 """Sidecar offloading handler — performs GPU<->CPU<->gRPC transfers.
 
 Implements vLLM's OffloadingHandler interface. The transfer flow:
-  Store (GPU->Sidecar): GPU block -> pinned CPU staging -> bytes -> gRPC StoreBlock
-  Load (Sidecar->GPU):  gRPC LoadBlock -> bytes -> pinned CPU staging -> GPU block
-
-The handler uses synchronous gRPC since vLLM calls get_finished() from a
-worker thread without an event loop.
+  Store (GPU->Sidecar): GPU block -> pinned CPU staging -> bytes -> gRPC StoreBlocks
+  Load (Sidecar->GPU):  gRPC LoadBlocks -> bytes -> pinned CPU staging -> GPU block
+
+Each job's blocks go in as few messages as the gRPC message budget allows:
+one unary StoreBlocks/LoadBlocks call when they fit, otherwise a client- or
+server-streamed call of budget-sized batches.
+
+With the "shm" transport the sidecar's L1 arena is mapped into this process:
+staging buffers are copied straight into arena slots and a single
+CommitBlocks / ResolveBlocks RPC per job carries only block metadata.
+
+With ``dedup_stores`` a store job first asks the sidecar which of its blocks
+it already holds (one LookupBlocks RPC). Blocks already in their slot are
+skipped; over gRPC, blocks resident under another slot are sent as ``dedup``
+entries without data, which the sidecar links to its copy.
+
+Engines sharing a sidecar each get a range of its L1 block IDs (their model's
+namespace); the handler adds the range's ``block_base`` to every block ID.
+
+Transfers run on a pool of transfer worker threads as soon as
+transfer_async() queues them. A worker waits for the GPU copy and performs the
+RPCs (synchronous gRPC, no event loop needed), then posts the result to a
+completion queue. get_finished() only drains that queue, so a slow sidecar
+never stalls vLLM's scheduler.
 """
 
 import logging
+import queue
+import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -19,6 +41,7 @@ import grpc
 from data_plane.inference.engine import metrics as engine_metrics
 from shared.config_loader import get_config
 from shared.proto import kv_cache_pb2, kv_cache_pb2_grpc
+from data_plane.inference.engine.kv_offload.shared_arena import SharedArenaClient
 from data_plane.inference.engine.kv_offload.sidecar_backend import SidecarLoadStoreSpec
 
 logger = logging.getLogger(__name__)
@@ -26,10 +49,27 @@ logger = logging.getLogger(__name__)
 _grpc_cfg = get_config("grpc")
 _MAX_MESSAGE_SIZE = _grpc_cfg.get("max_message_size", 16 * 1024 * 1024)
 _RPC_TIMEOUT = _grpc_cfg.get("rpc_timeout", 5.0)
+# Smaller batches than the message limit keep a streamed job pipelined
+_BATCH_MAX_BYTES = _grpc_cfg.get("batch_max_bytes", 1024 * 1024)
+# Framing allowance per block in a batched message (field tags, ids, hash)
+_PER_BLOCK_OVERHEAD_BYTES = 256
 _GRPC_OPTIONS = [
     ("grpc.max_send_message_length", _MAX_MESSAGE_SIZE),
     ("grpc.max_receive_message_length", _MAX_MESSAGE_SIZE),
 ]
+# Blocks per ListBlocks page when rebuilding the block map at startup
+_LIST_PAGE_BLOCKS = 4096
+
+# Metric children bound once; per-job updates skip the labels() lookup
+_OPS_TOTAL = {
+    (op, status): engine_metrics.engine_kv_offload_operations_total.labels(op=op, status=status)
+    for op in ("store", "load")
+    for status in ("success", "error")
+}
+_BYTES = {d: engine_metrics.engine_kv_offload_bytes_total.labels(direction=d) for d in ("store", "load")}
+_DURATION = {op: engine_metrics.engine_kv_offload_duration_seconds.labels(op=op) for op in ("store", "load")}
+_DEDUP_SAVED_BYTES = engine_metrics.engine_kv_offload_dedup_saved_bytes_total.labels()
+_QUEUE_WAIT = {op: engine_metrics.engine_kv_offload_queue_wait_seconds.labels(op=op) for op in ("store", "load")}
 
 try:
     from vllm.v1.kv_offload.worker.worker import OffloadingHandler
@@ -51,6 +91,8 @@ class _StagingBufferPool:
     """Pool of pinned-memory CPU buffers for GPU<->CPU copies.
 
     Falls back to plain ``bytearray`` when torch is unavailable (tests).
+    Shared by vLLM's thread and the transfer workers; ``deque`` append and
+    popleft are atomic, so get/release need no lock.
     """
 
     def __init__(self, block_size_bytes: int, pool_size: int = 32):
@@ -68,9 +110,10 @@ class _StagingBufferPool:
 
     def get(self):
         """Acquire a staging buffer from the pool (or allocate a new one)."""
-        if self._pool:
+        try:
             return self._pool.popleft()
-        return self._alloc()
+        except IndexError:
+            return self._alloc()
 
     def release(self, buf):
         """Return a staging buffer to the pool."""
@@ -88,10 +131,12 @@ class _PendingStore:
     block_ids: list[int]
     block_hashes: list[bytes]
     model_id: str
-    # After CUDA event completes, staging tensors hold the data
-    staging_data: list = field(default_factory=list)  # list[bytes | torch.Tensor]
+    # After CUDA event completes, staging tensors hold the data; None if
+    # staging failed, and the job must fail rather than store anything
+    staging_data: Optional[list] = field(default_factory=list)  # list[bytes | torch.Tensor]
     cuda_event: object = None  # torch.cuda.Event
     gpu_copy_done: bool = False
+    queued_at: float = field(default_factory=time.monotonic)
 
 
 @dataclass
@@ -99,12 +144,51 @@ class _PendingLoad:
     """Tracks a pending Sidecar->GPU load operation."""
     job_id: int
     block_ids: list[int]
+    # Hash expected in each slot, so the sidecar can promote evicted blocks from L2
+    block_hashes: list[str] = field(default_factory=list)
     # After gRPC completes, staging tensors hold the data
     staging_data: list = field(default_factory=list)  # list[bytes | torch.Tensor]
     cuda_event: object = None  # torch.cuda.Event
     grpc_done: bool = False
     # Reference to the destination GPU spec for CPU->GPU copy
     dst_spec: object = None
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+def list_resident_blocks(grpc_url: str, model_id: str = "") -> list[tuple[str, int]]:
+    """(block_hash, block_id) of every block of ``model_id`` resident in the sidecar's L1 (all models if empty).
+
+    Raises grpc.RpcError if the sidecar cannot be reached.
+    """
+    channel = grpc.insecure_channel(grpc_url, options=_GRPC_OPTIONS)
+    try:
+        stub = kv_cache_pb2_grpc.KVCacheServiceStub(channel)
+        blocks: list[tuple[str, int]] = []
+        start = 0
+        while start >= 0:
+            resp = stub.ListBlocks(
+                kv_cache_pb2.ListBlocksRequest(model_id=model_id, start_block_id=start, max_blocks=_LIST_PAGE_BLOCKS),
+                timeout=_RPC_TIMEOUT,
+            )
+            blocks.extend(zip(resp.block_hashes, resp.block_ids))
+            start = resp.next_block_id
+        return blocks
+    finally:
+        channel.close()
+
+
+def resolve_namespace(grpc_url: str, model_id: str) -> tuple[int, int]:
+    """(base block_id, num_blocks) of the model's L1 namespace in the sidecar.
+
+    Raises grpc.RpcError if the sidecar cannot be reached.
+    """
+    channel = grpc.insecure_channel(grpc_url, options=_GRPC_OPTIONS)
+    try:
+        stub = kv_cache_pb2_grpc.KVCacheServiceStub(channel)
+        resp = stub.GetNamespace(kv_cache_pb2.GetNamespaceRequest(model_id=model_id), timeout=_RPC_TIMEOUT)
+        return resp.base_block_id, resp.num_blocks
+    finally:
+        channel.close()
 
 
 # ---------------------------------------------------------------------------
@@ -114,23 +198,48 @@ class _PendingLoad:
 class SidecarOffloadingHandler(OffloadingHandler):
     """Handles async GPU<->Sidecar transfers via pinned CPU staging + gRPC.
 
-    Uses synchronous gRPC because vLLM calls get_finished() from a worker
-    thread without an asyncio event loop.
+    At most ``max_inflight_transfers`` jobs run at once; later jobs wait in
+    the worker pool's queue.
     """
 
     def __init__(
         self,
         grpc_url: str = "sidecar:50051",
         block_size_bytes: int = 131072,
+        transport: str = "grpc",
+        max_batch_bytes: Optional[int] = None,
+        max_inflight_transfers: int = 4,
+        dedup_stores: bool = True,
+        model_id: str = "",
+        block_base: int = 0,
     ):
         self._grpc_url = grpc_url
+        self._dedup_stores = dedup_stores
+        self._model_id = model_id
+        # First sidecar block ID of this engine's namespace
+        self._block_base = block_base
         self._block_size = block_size_bytes
-        self._pending_stores: list[_PendingStore] = []
-        self._pending_loads: list[_PendingLoad] = []
+        # Byte budget per batched gRPC message
+        self._max_batch_bytes = min(max_batch_bytes or _BATCH_MAX_BYTES, _MAX_MESSAGE_SIZE)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_inflight_transfers),
+            thread_name_prefix="kv-transfer",
+        )
+        self._completed: queue.SimpleQueue = queue.SimpleQueue()
+        self._depth_lock = threading.Lock()
+        self._queue_depth = {"store": 0, "load": 0}
+        for op in self._queue_depth:
+            engine_metrics.engine_kv_offload_queue_depth.labels(op=op).set_function(
+                lambda op=op: self._queue_depth[op]
+            )
         self._channel = grpc.insecure_channel(grpc_url, options=_GRPC_OPTIONS)
         self._stub = kv_cache_pb2_grpc.KVCacheServiceStub(self._channel)
         self._staging_pool = _StagingBufferPool(block_size_bytes)
-        logger.info("SidecarOffloadingHandler initialized")
+        # Shared-memory L1 arena; None means block bytes travel over gRPC
+        self._arena: Optional[SharedArenaClient] = None
+        if transport == "shm":
+            self._arena = SharedArenaClient.attach(self._stub, block_size_bytes, _RPC_TIMEOUT)
+        logger.info(f"SidecarOffloadingHandler initialized (transport={'shm' if self._arena else 'grpc'})")
 
     # -- public interface (called by stub for tests) --------------------------
 
@@ -157,7 +266,9 @@ class SidecarOffloadingHandler(OffloadingHandler):
         If dst is SidecarLoadStoreSpec: Store path (GPU -> Sidecar).
         If src is SidecarLoadStoreSpec: Load path (Sidecar -> GPU).
 
-        Returns True to indicate the transfer was accepted.
+        The job is queued on a transfer worker immediately; its result shows
+        up in a later get_finished(). Returns True to indicate the transfer
+        was accepted.
         """
         src_spec, dst_spec = spec
 
@@ -166,46 +277,79 @@ class SidecarOffloadingHandler(OffloadingHandler):
             block_ids = dst_spec.block_ids.tolist() if hasattr(dst_spec.block_ids, 'tolist') else list(dst_spec.block_ids)
             pending = _PendingStore(
                 job_id=job_id,
-                block_ids=block_ids,
+                block_ids=self._sidecar_ids(block_ids),
                 block_hashes=dst_spec.block_hashes,
-                model_id="",
+                model_id=self._model_id,
             )
-
-            # Extract real tensor data from the GPU source spec if available
-            if VLLM_HANDLER_AVAILABLE and hasattr(src_spec, 'kv_caches'):
-                try:
-                    event = torch.cuda.Event()
-                    for idx, bid in enumerate(block_ids):
-                        staging_buf = self._staging_pool.get()
-                        # src_spec.kv_caches is a list of GPU tensors indexed by block_id
-                        gpu_tensor = src_spec.kv_caches[bid]
-                        flat = gpu_tensor.reshape(-1).to(torch.uint8)[:self._block_size]
-                        staging_buf[:flat.numel()].copy_(flat, non_blocking=True)
-                        pending.staging_data.append(staging_buf)
-                    event.record()
-                    pending.cuda_event = event
-                except Exception as e:
-                    logger.warning(f"GPU tensor extraction failed, using placeholder path: {e}")
-                    # Release any acquired staging buffers
-                    for buf in pending.staging_data:
-                        self._staging_pool.release(buf)
-                    pending.staging_data = []
-                    pending.cuda_event = None
-
-            self._pending_stores.append(pending)
+            pending.staging_data, pending.cuda_event = self._stage_store(src_spec, block_ids)
+            self._submit("store", self._run_store, pending)
 
         elif isinstance(src_spec, SidecarLoadStoreSpec):
             # Load: Sidecar -> GPU
             block_ids = src_spec.block_ids.tolist() if hasattr(src_spec.block_ids, 'tolist') else list(src_spec.block_ids)
             pending = _PendingLoad(
                 job_id=job_id,
-                block_ids=block_ids,
+                block_ids=self._sidecar_ids(block_ids),
+                block_hashes=[self._hash_to_str(bh) for bh in src_spec.block_hashes],
                 dst_spec=dst_spec if VLLM_HANDLER_AVAILABLE else None,
             )
-            self._pending_loads.append(pending)
+            self._submit("load", self._run_load, pending)
 
         return True
 
+    def _sidecar_ids(self, block_ids: list[int]) -> list[int]:
+        """Offset the backend's block IDs into this engine's namespace."""
+        if not self._block_base:
+            return block_ids
+        return [bid + self._block_base for bid in block_ids]
+
+    def _stage_store(self, src_spec, block_ids: list[int]) -> tuple[Optional[list], object]:
+        """Start GPU->pinned CPU copies of the blocks. Returns (staging buffers, CUDA event).
+
+        Staging buffers are None if the copies could not be started.
+
+        Runs on the caller's thread so the copies are ordered on vLLM's
+        stream; the transfer worker waits on the event.
+        """
+        staging: list = []
+        if not VLLM_HANDLER_AVAILABLE:
+            # No GPU side (tests): the worker sends placeholder blocks
+            return staging, None
+        if not hasattr(src_spec, 'kv_caches'):
+            logger.warning(f"Store source {type(src_spec).__name__} has no kv_caches, dropping the store")
+            return None, None
+        try:
+            event = torch.cuda.Event()
+            for bid in block_ids:
+                staging_buf = self._staging_pool.get()
+                staging.append(staging_buf)
+                # src_spec.kv_caches is a list of GPU tensors indexed by block_id
+                gpu_tensor = src_spec.kv_caches[bid]
+                flat = gpu_tensor.reshape(-1).to(torch.uint8)[:self._block_size]
+                staging_buf[:flat.numel()].copy_(flat, non_blocking=True)
+            event.record()
+            return staging, event
+        except Exception as e:
+            logger.warning(f"GPU tensor extraction failed, dropping the store: {e}")
+            # Release any acquired staging buffers
+            for buf in staging:
+                self._staging_pool.release(buf)
+            return None, None
+
+    def _submit(self, op: str, run, pending) -> None:
+        with self._depth_lock:
+            self._queue_depth[op] += 1
+
+        def _job():
+            _QUEUE_WAIT[op].observe(time.monotonic() - pending.queued_at)
+            try:
+                self._completed.put((pending.job_id, run(pending)))
+            finally:
+                with self._depth_lock:
+                    self._queue_depth[op] -= 1
+
+        self._executor.submit(_job)
+
     def _hash_to_str(self, bh) -> str:
         """Convert a BlockHash (bytes) to a hex string for gRPC."""
         if isinstance(bh, bytes):
@@ -215,127 +359,270 @@ class SidecarOffloadingHandler(OffloadingHandler):
     # -- get_finished ---------------------------------------------------------
 
     def get_finished(self) -> list[tuple[int, bool]]:
-        """Poll for completed transfers. Returns list of (job_id, success).
-
-        Uses synchronous gRPC -- safe to call from any thread.
-        """
+        """Drain completed transfers without blocking. Returns list of (job_id, success)."""
         results = []
-
-        # Process pending stores
-        for store in self._pending_stores:
-            t0 = time.monotonic()
+        while True:
             try:
-                # Wait for CUDA event if we have real GPU data
-                if store.cuda_event is not None:
-                    store.cuda_event.synchronize()
-
-                success = True
-                total_bytes = 0
-                for bid, bh in zip(store.block_ids, store.block_hashes):
-                    # Get real data from staging buffer, or fall back to placeholder
-                    if store.staging_data:
-                        raw = store.staging_data.pop(0)
-                        if VLLM_HANDLER_AVAILABLE and hasattr(raw, 'numpy'):
-                            data = raw.numpy().tobytes()
-                            self._staging_pool.release(raw)
-                        elif isinstance(raw, (bytes, bytearray)):
-                            data = bytes(raw)
-                        else:
-                            data = bytes(raw)
-                    else:
-                        data = b"\x00" * self._block_size
-
-                    total_bytes += len(data)
-                    resp = self._stub.StoreBlock(
-                        kv_cache_pb2.StoreBlockRequest(
-                            block_id=bid,
-                            block_hash=self._hash_to_str(bh),
-                            data=data,
-                            model_id=store.model_id,
-                        ),
-                        timeout=_RPC_TIMEOUT,
-                    )
-                    if not resp.success:
-                        success = False
-                        break
-                results.append((store.job_id, success))
-                status = "success" if success else "error"
-                engine_metrics.engine_kv_offload_operations_total.labels(
-                    op="store", status=status
-                ).inc()
-                engine_metrics.engine_kv_offload_bytes_total.labels(
-                    direction="store"
-                ).inc(total_bytes)
-            except Exception as e:
-                logger.error(f"Store job {store.job_id} failed: {e}")
-                results.append((store.job_id, False))
-                engine_metrics.engine_kv_offload_operations_total.labels(
-                    op="store", status="error"
-                ).inc()
-                # Release any remaining staging buffers
-                for buf in store.staging_data:
-                    if VLLM_HANDLER_AVAILABLE and hasattr(buf, 'numpy'):
-                        self._staging_pool.release(buf)
-            finally:
-                engine_metrics.engine_kv_offload_duration_seconds.labels(
-                    op="store"
-                ).observe(time.monotonic() - t0)
-        self._pending_stores = []
-
-        # Process pending loads
-        for load in self._pending_loads:
-            t0 = time.monotonic()
+                results.append(self._completed.get_nowait())
+            except queue.Empty:
+                return results
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no transfer is queued or running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._depth_lock:
+                if not any(self._queue_depth.values()):
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the transfer workers, optionally finishing queued jobs first."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # -- transfer workers -----------------------------------------------------
+
+    def _run_store(self, store: _PendingStore) -> bool:
+        t0 = time.monotonic()
+        staging = store.staging_data
+        store.staging_data = []
+        if staging is None:
+            # Never publish placeholder bytes under the blocks' real hashes
+            logger.error(f"Store job {store.job_id} failed: its blocks could not be staged")
+            _OPS_TOTAL["store", "error"].inc()
+            return False
+        try:
+            # Wait for CUDA event if we have real GPU data
+            if store.cuda_event is not None:
+                store.cuda_event.synchronize()
+
+            # Real data from staging buffers, or a placeholder block without vLLM
+            payloads = [
+                self._staging_view(staging[i]) if i < len(staging) else b"\x00" * self._block_size
+                for i in range(len(store.block_ids))
+            ]
+            if self._arena is not None:
+                success, total_bytes = self._store_shm(store, payloads)
+            else:
+                success, total_bytes = self._store_grpc(store, payloads)
+            status = "success" if success else "error"
+            _OPS_TOTAL["store", status].inc()
+            _BYTES["store"].inc(total_bytes)
+            return success
+        except Exception as e:
+            logger.error(f"Store job {store.job_id} failed: {e}")
+            _OPS_TOTAL["store", "error"].inc()
+            return False
+        finally:
+            # Return pinned staging buffers to the pool
+            for buf in staging:
+                if VLLM_HANDLER_AVAILABLE and hasattr(buf, 'numpy'):
+                    self._staging_pool.release(buf)
+            _DURATION["store"].observe(time.monotonic() - t0)
+
+    def _run_load(self, load: _PendingLoad) -> bool:
+        t0 = time.monotonic()
+        gpu_staging: list = []
+        try:
+            success = True
+            total_bytes = 0
+            fetch = self._load_shm if self._arena is not None else self._load_grpc
+            for bid, data in zip(load.block_ids, fetch(load.block_ids, load.block_hashes)):
+                if data is None:
+                    success = False
+                    break
+                total_bytes += len(data)
+                # GPU caches are indexed by the backend's own block IDs
+                self._deliver(load, bid - self._block_base, data, gpu_staging)
+
+            # The job is done once the CPU->GPU copies have landed
+            if load.cuda_event is not None:
+                load.cuda_event.synchronize()
+            status = "success" if success else "error"
+            _OPS_TOTAL["load", status].inc()
+            _BYTES["load"].inc(total_bytes)
+            return success
+        except Exception as e:
+            logger.error(f"Load job {load.job_id} failed: {e}")
+            _OPS_TOTAL["load", "error"].inc()
+            return False
+        finally:
+            for buf in gpu_staging:
+                self._staging_pool.release(buf)
+            _DURATION["load"].observe(time.monotonic() - t0)
+
+    def _deliver(self, load: _PendingLoad, bid: int, data, gpu_staging: list) -> None:
+        """Hand one loaded block to its destination."""
+        # If we have a GPU destination, copy through staging buffer
+        if VLLM_HANDLER_AVAILABLE and load.dst_spec is not None and hasattr(load.dst_spec, 'kv_caches'):
             try:
-                success = True
-                total_bytes = 0
-                for bid in load.block_ids:
-                    resp = self._stub.LoadBlock(
-                        kv_cache_pb2.LoadBlockRequest(block_id=bid),
-                        timeout=_RPC_TIMEOUT,
-                    )
-                    if not resp.success:
-                        success = False
-                        break
-                    total_bytes += len(resp.data)
-
-                    # If we have a GPU destination, copy through staging buffer
-                    if VLLM_HANDLER_AVAILABLE and load.dst_spec is not None and hasattr(load.dst_spec, 'kv_caches'):
-                        try:
-                            staging_buf = self._staging_pool.get()
-                            src_tensor = torch.frombuffer(resp.data, dtype=torch.uint8)
-                            staging_buf[:len(resp.data)].copy_(src_tensor)
-                            # Initiate CPU->GPU copy
-                            gpu_tensor = load.dst_spec.kv_caches[bid]
-                            flat_gpu = gpu_tensor.reshape(-1).to(torch.uint8)[:self._block_size]
-                            flat_gpu.copy_(staging_buf[:flat_gpu.numel()], non_blocking=True)
-                            event = torch.cuda.Event()
-                            event.record()
-                            load.cuda_event = event
-                            self._staging_pool.release(staging_buf)
-                        except Exception as e:
-                            logger.warning(f"GPU load copy failed, storing raw bytes: {e}")
-                            load.staging_data.append(resp.data)
-                    else:
-                        load.staging_data.append(resp.data)
-
-                results.append((load.job_id, success))
-                status = "success" if success else "error"
-                engine_metrics.engine_kv_offload_operations_total.labels(
-                    op="load", status=status
-                ).inc()
-                engine_metrics.engine_kv_offload_bytes_total.labels(
-                    direction="load"
-                ).inc(total_bytes)
+                staging_buf = self._staging_pool.get()
+                src_tensor = torch.frombuffer(data, dtype=torch.uint8)
+                staging_buf[:len(data)].copy_(src_tensor)
+                # Initiate CPU->GPU copy; the buffer is released once the event completes
+                gpu_tensor = load.dst_spec.kv_caches[bid]
+                flat_gpu = gpu_tensor.reshape(-1).to(torch.uint8)[:self._block_size]
+                flat_gpu.copy_(staging_buf[:flat_gpu.numel()], non_blocking=True)
+                gpu_staging.append(staging_buf)
+                event = torch.cuda.Event()
+                event.record()
+                load.cuda_event = event
+                return
             except Exception as e:
-                logger.error(f"Load job {load.job_id} failed: {e}")
-                results.append((load.job_id, False))
-                engine_metrics.engine_kv_offload_operations_total.labels(
-                    op="load", status="error"
-                ).inc()
-            finally:
-                engine_metrics.engine_kv_offload_duration_seconds.labels(
-                    op="load"
-                ).observe(time.monotonic() - t0)
-        self._pending_loads = []
+                logger.warning(f"GPU load copy failed, storing raw bytes: {e}")
+        load.staging_data.append(bytes(data))
+
+    # -- transports -----------------------------------------------------------
+
+    @staticmethod
+    def _staging_view(raw):
+        """Buffer over a staging entry's bytes without copying pinned tensors."""
+        if VLLM_HANDLER_AVAILABLE and hasattr(raw, 'numpy'):
+            return raw.numpy()
+        return raw
+
+    def _chain(self, store: _PendingStore) -> list[tuple[int, str, str]]:
+        """(block_id, hash, parent hash) for each block of a store job.
 
-        return results
+        A job's blocks are consecutive in their sequence; the first block's
+        parent was stored by an earlier job, so it is sent empty (unknown).
+        """
+        hashes = [self._hash_to_str(bh) for bh in store.block_hashes]
+        return [
+            (bid, bh, hashes[i - 1] if i else "")
+            for i, (bid, bh) in enumerate(zip(store.block_ids, hashes))
+        ]
+
+    def _resident_ids(self, chain: list[tuple[int, str, str]]) -> list[int]:
+        """Sidecar L1 slot already holding each block, -1 where it must be sent."""
+        missing = [-1] * len(chain)
+        if not self._dedup_stores:
+            return missing
+        try:
+            resp = self._stub.LookupBlocks(
+                kv_cache_pb2.LookupBlocksRequest(
+                    block_hashes=[bh for _, bh, _ in chain], model_id=self._model_id
+                ),
+                timeout=_RPC_TIMEOUT,
+            )
+        except grpc.RpcError as e:
+            logger.warning(f"LookupBlocks failed, sending every block: {e}")
+            return missing
+        found = list(resp.block_ids)
+        return found + missing[len(found):]
+
+    def _store_grpc(self, store: _PendingStore, payloads: list, dedup: bool = True) -> tuple[bool, int]:
+        chain = self._chain(store)
+        resident = self._resident_ids(chain) if dedup else [-1] * len(chain)
+        requests = []
+        saved = 0
+        for (bid, bh, parent), data, owner in zip(chain, payloads, resident):
+            if owner == bid:
+                # Already stored in this very slot
+                saved += len(data)
+                continue
+            linked = owner >= 0
+            if linked:
+                saved += len(data)
+            requests.append(kv_cache_pb2.StoreBlockRequest(
+                block_id=bid,
+                block_hash=bh,
+                data=b"" if linked else bytes(data),
+                model_id=store.model_id,
+                parent_hash=parent,
+                dedup=linked,
+            ))
+        if not requests:
+            _DEDUP_SAVED_BYTES.inc(saved)
+            return True, 0
+        batches = self._batch(requests, lambda r: len(r.data))
+        if len(batches) == 1:
+            resp = self._stub.StoreBlocks(
+                kv_cache_pb2.StoreBlocksRequest(blocks=batches[0]),
+                timeout=_RPC_TIMEOUT,
+            )
+        else:
+            resp = self._stub.StoreBlockStream(
+                (kv_cache_pb2.StoreBlocksRequest(blocks=b) for b in batches),
+                timeout=_RPC_TIMEOUT,
+            )
+        if not resp.success and saved:
+            # A block we linked against was evicted meanwhile: send it all
+            return self._store_grpc(store, payloads, dedup=False)
+        _DEDUP_SAVED_BYTES.inc(saved)
+        return resp.success, sum(len(r.data) for r in requests[:resp.num_stored])
+
+    def _batch(self, items: list, size_of) -> list[list]:
+        """Split items into consecutive batches that fit the message budget."""
+        batches: list[list] = [[]]
+        batch_bytes = 0
+        for item in items:
+            size = size_of(item) + _PER_BLOCK_OVERHEAD_BYTES
+            if batches[-1] and batch_bytes + size > self._max_batch_bytes:
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(item)
+            batch_bytes += size
+        return batches
+
+    def _store_shm(self, store: _PendingStore, payloads: list) -> tuple[bool, int]:
+        chain = self._chain(store)
+        commits = []
+        saved = 0
+        for (bid, bh, parent), data, owner in zip(chain, payloads, self._resident_ids(chain)):
+            if owner == bid:
+                # Already in this slot of the shared arena
+                saved += len(data)
+                continue
+            commits.append(kv_cache_pb2.BlockCommit(
+                block_id=bid,
+                block_hash=bh,
+                length=self._arena.write(bid, data),
+                model_id=store.model_id,
+                parent_hash=parent,
+            ))
+        _DEDUP_SAVED_BYTES.inc(saved)
+        if not commits:
+            return True, 0
+        resp = self._stub.CommitBlocks(
+            kv_cache_pb2.CommitBlocksRequest(blocks=commits),
+            timeout=_RPC_TIMEOUT,
+        )
+        return resp.success, sum(c.length for c in commits[:resp.num_committed])
+
+    def _load_grpc(self, block_ids: list[int], block_hashes: list[str]):
+        """Yield each block's bytes in order, or None at the first miss."""
+        request = kv_cache_pb2.LoadBlocksRequest(
+            block_ids=block_ids,
+            block_hashes=block_hashes,
+            max_batch_bytes=self._max_batch_bytes,
+            model_id=self._model_id,
+        )
+        if len(self._batch(block_ids, lambda _: self._block_size)) == 1:
+            responses = [self._stub.LoadBlocks(request, timeout=_RPC_TIMEOUT)]
+        else:
+            responses = self._stub.LoadBlockStream(request, timeout=_RPC_TIMEOUT)
+        for resp in responses:
+            yield from resp.data
+            if not resp.success:
+                yield None
+                return
+
+    def _load_shm(self, block_ids: list[int], block_hashes: list[str]):
+        """Yield a view of each block's arena slot in order, or None at the first miss."""
+        resp = self._stub.ResolveBlocks(
+            kv_cache_pb2.ResolveBlocksRequest(
+                block_ids=block_ids, block_hashes=block_hashes, model_id=self._model_id
+            ),
+            timeout=_RPC_TIMEOUT,
+        )
+        if not resp.success:
+            yield None
+            return
+        for bid, length in zip(block_ids, resp.lengths):
+            if length < 0:
+                yield None
+                return
+            yield self._arena.view(bid, length)
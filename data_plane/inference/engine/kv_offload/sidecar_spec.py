@@ -8,11 +8,18 @@ data movement.
 import logging
 from typing import Generator, Optional
 
+import grpc
+
 from data_plane.inference.engine.kv_offload.sidecar_backend import (
+    BlockStatus,
     SidecarBackend,
     SidecarLoadStoreSpec,
 )
-from data_plane.inference.engine.kv_offload.sidecar_handler import SidecarOffloadingHandler
+from data_plane.inference.engine.kv_offload.sidecar_handler import (
+    SidecarOffloadingHandler,
+    list_resident_blocks,
+    resolve_namespace,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,11 +43,32 @@ except ImportError:
         pass
 
 
+def _track_blocks(manager, blocks: list[tuple[object, BlockStatus]]) -> None:
+    """Make ``manager`` offer blocks the backend adopted from the sidecar.
+
+    The manager only offers blocks it tracks itself, and LRUOffloadingManager
+    has no public call to add ready blocks: this writes its ``blocks``
+    OrderedDict (block_hash -> BlockStatus), checked against vLLM 0.11.0.
+    """
+    tracked = getattr(manager, "blocks", None)
+    if tracked is None:
+        if blocks:
+            logger.warning(f"{type(manager).__name__} has no block map; {len(blocks)} restored blocks stay unused")
+        return
+    for block_hash, status in blocks:
+        tracked[block_hash] = status
+
+
 # Default configuration values
 _DEFAULTS = {
     "sidecar_grpc_url": "localhost:50051",
     "num_blocks": 1024,
     "block_size_bytes": 131072,
+    "transport": "grpc",
+    "max_inflight_transfers": 4,
+    "restore_blocks": True,
+    "dedup_stores": True,
+    "model_id": "",
 }
 
 
@@ -52,6 +80,16 @@ class SidecarOffloadingSpec(OffloadingSpec):
         - sidecar_grpc_url: gRPC address of the sidecar (default: localhost:50051)
         - num_blocks: number of block slots in the sidecar (default: 1024)
         - block_size_bytes: size of each block (default: 131072 = 128KB)
+        - transport: "grpc" or "shm" to map the sidecar's shared L1 arena (default: grpc)
+        - max_inflight_transfers: concurrent transfer jobs (default: 4)
+        - restore_blocks: adopt the blocks already in the sidecar's L1 when
+          the manager is created, so a restarted engine keeps its warm
+          prefix cache (default: true)
+        - dedup_stores: skip sending blocks the sidecar already holds
+          (default: true)
+        - model_id: the served model; when set, the engine uses the block-ID
+          range of the model's namespace in the sidecar, capping num_blocks
+          at its size (default: none, IDs from 0)
     """
 
     def __init__(self, vllm_config=None):
@@ -69,6 +107,14 @@ class SidecarOffloadingSpec(OffloadingSpec):
         self._grpc_url = extra.get("sidecar_grpc_url", _DEFAULTS["sidecar_grpc_url"])
         self._num_blocks = int(extra.get("num_blocks", _DEFAULTS["num_blocks"]))
         self._block_size = int(extra.get("block_size_bytes", _DEFAULTS["block_size_bytes"]))
+        self._transport = extra.get("transport", _DEFAULTS["transport"])
+        self._max_inflight = int(extra.get("max_inflight_transfers", _DEFAULTS["max_inflight_transfers"]))
+        self._restore_blocks = str(extra.get("restore_blocks", _DEFAULTS["restore_blocks"])).lower() == "true"
+        self._dedup_stores = str(extra.get("dedup_stores", _DEFAULTS["dedup_stores"])).lower() == "true"
+        self._model_id = extra.get("model_id", _DEFAULTS["model_id"])
+        self._block_base = 0
+        if self._model_id:
+            self._join_namespace()
 
         block_size = getattr(self, "offloaded_block_size", 16)
         self._backend = SidecarBackend(self._num_blocks, block_size=block_size)
@@ -78,17 +124,51 @@ class SidecarOffloadingSpec(OffloadingSpec):
             f"blocks={self._num_blocks}, block_size={self._block_size}"
         )
 
+    def _join_namespace(self) -> None:
+        """Take the block-ID range of the model's namespace in the sidecar."""
+        try:
+            base, num_blocks = resolve_namespace(self._grpc_url, self._model_id)
+        except grpc.RpcError as e:
+            logger.warning(f"Could not resolve the sidecar namespace of {self._model_id}, using IDs from 0: {e}")
+            return
+        self._block_base = base
+        if num_blocks < self._num_blocks:
+            logger.info(f"Sidecar namespace of {self._model_id} holds {num_blocks} blocks, not {self._num_blocks}")
+            self._num_blocks = num_blocks
+
     def get_manager(self):
         """Return an LRUOffloadingManager backed by SidecarBackend."""
         if not VLLM_SPEC_AVAILABLE:
             raise RuntimeError("vLLM offloading APIs not available")
-        return LRUOffloadingManager(self._backend)
+        manager = LRUOffloadingManager(self._backend)
+        if self._restore_blocks:
+            _track_blocks(manager, self.restore_from_sidecar())
+        return manager
+
+    def restore_from_sidecar(self) -> list[tuple[object, BlockStatus]]:
+        """Rebuild the backend's block map from the blocks resident in the sidecar."""
+        try:
+            resident = list_resident_blocks(self._grpc_url, self._model_id)
+        except grpc.RpcError as e:
+            logger.warning(f"Could not list sidecar blocks, starting with an empty offload cache: {e}")
+            return []
+        # Only this engine's namespace, in the backend's own IDs
+        end = self._block_base + self._num_blocks
+        resident = [(h, bid - self._block_base) for h, bid in resident if self._block_base <= bid < end]
+        adopted = self._backend.restore(resident)
+        logger.info(f"Restored {len(adopted)} of {len(resident)} blocks resident in the sidecar")
+        return adopted
 
     def get_handlers(self, kv_caches=None) -> Generator:
         """Yield (src_type, dst_type, handler) tuples for the scheduler."""
         handler = SidecarOffloadingHandler(
             grpc_url=self._grpc_url,
             block_size_bytes=self._block_size,
+            transport=self._transport,
+            max_inflight_transfers=self._max_inflight,
+            dedup_stores=self._dedup_stores,
+            model_id=self._model_id,
+            block_base=self._block_base,
         )
         yield (GPULoadStoreSpec, SidecarLoadStoreSpec, handler)
 
@@ -6,6 +6,7 @@ Handles:
 - Deduplicating concurrent downloads of the same adapter (leader-follower)
 - Polling sidecar registry until adapter is ready (fire-and-forget pattern)
 - Evicting LRU adapters when max_loras is reached
+- Warming adapters ahead of demand (prefetch) without evicting live ones
 - Recording LoRA metrics
 """
 
@@ -52,6 +53,10 @@ class LoRAManager:
     engine.add_lora/remove_lora are called via asyncio.to_thread.
     """
 
+    # How long a sidecar-only prefetch counts as done before it may be issued
+    # again (the sidecar can evict the download in the meantime)
+    _SIDECAR_PREFETCH_TTL_S = 600.0
+
     def __init__(self, engine, config, sidecar_url: str):
         self._engine = engine
         self._config = config
@@ -66,6 +71,16 @@ class LoRAManager:
         # Dedup: one Event per in-flight adapter download
         self._pending_downloads: Dict[str, asyncio.Event] = {}
 
+        # Prefetch bookkeeping: keys loaded by prefetch and not yet used by a request,
+        # and the most recently requested version per adapter identifier.
+        self._prefetched: set[str] = set()
+        self._prefetch_pending: set[str] = set()
+        # Keys whose download was prefetched to the sidecar only -> time issued
+        self._sidecar_prefetched: Dict[str, float] = {}
+        self._last_versions: Dict[str, str] = {}
+        # Cumulative request count per adapter identifier, sampled by AdapterPrefetcher
+        self._arrivals: Dict[str, int] = {}
+
         self._lock = asyncio.Lock()
         self._last_swap_duration: float = 0.0
 
@@ -89,24 +104,34 @@ class LoRAManager:
         Safe to call concurrently — only one download + GPU load per adapter.
         """
         version = adapter_version or "latest"
+        self._last_versions[adapter_identifier] = version
+        self._arrivals[adapter_identifier] = self._arrivals.get(adapter_identifier, 0) + 1
+        return await self._ensure_loaded(adapter_identifier, version)
+
+    async def _ensure_loaded(self, adapter_identifier: str, version: str):
         key = self._adapter_key(adapter_identifier, version)
 
         # Fast path: already loaded on GPU (0.0 swap duration = cache hit)
         async with self._lock:
             if key in self._loaded:
                 self._loaded.move_to_end(key)
+                self._consume_prefetch(key, adapter_identifier)
                 return self._make_lora_request(self._loaded[key]), 0.0
 
             # Check if another coroutine is already fetching this adapter
             if key in self._pending_downloads:
                 event = self._pending_downloads[key]
                 is_leader = False
+                joined_prefetch = key in self._prefetch_pending
             else:
                 event = asyncio.Event()
                 self._pending_downloads[key] = event
                 is_leader = True
 
         if is_leader:
+            metrics.engine_lora_prefetch_outcomes_total.labels(
+                adapter=adapter_identifier, result="miss"
+            ).inc()
             try:
                 await self._trigger_and_poll(adapter_identifier, version, key)
             except Exception:
@@ -117,7 +142,13 @@ class LoRAManager:
                 raise
             event.set()
         else:
+            if joined_prefetch:
+                # A request is now waiting on a prefetch — escalate it in the sidecar's queue
+                await self._escalate_download(adapter_identifier, version)
             await event.wait()
+            if joined_prefetch and key not in self._loaded:
+                # The prefetch gave up (no free slot or fetch failed) — load on demand
+                return await self._ensure_loaded(adapter_identifier, version)
 
         # Return the loaded adapter (or raise if it failed)
         async with self._lock:
@@ -127,10 +158,91 @@ class LoRAManager:
                     f"Adapter {adapter_identifier} v{version} failed to load"
                 )
             self._loaded.move_to_end(key)
+            if not is_leader:
+                # Joined an in-flight prefetch: the download was already under way
+                self._consume_prefetch(key, adapter_identifier)
             return self._make_lora_request(self._loaded[key]), self._last_swap_duration
 
-    async def _trigger_and_poll(self, identifier: str, version: str, key: str):
-        """Trigger sidecar download, poll until ready, evict if needed, load to GPU."""
+    async def prefetch_adapter(self, adapter_identifier: str, adapter_version: Optional[str] = None) -> bool:
+        """Warm an adapter ahead of demand. Returns True if a prefetch was issued.
+
+        Loads onto GPU only when a slot is free — prefetching never evicts an
+        adapter that is serving traffic. When all slots are taken, the sidecar
+        download is triggered so a later on-demand load skips the fetch.
+        """
+        version = adapter_version or "latest"
+        key = self._adapter_key(adapter_identifier, version)
+
+        async with self._lock:
+            if key in self._loaded or key in self._pending_downloads:
+                return False
+            gpu_slot_free = len(self._loaded) < self._max_loras
+            if gpu_slot_free:
+                event = asyncio.Event()
+                self._pending_downloads[key] = event
+                self._prefetch_pending.add(key)
+            else:
+                issued_at = self._sidecar_prefetched.get(key)
+                if issued_at is not None and time.monotonic() - issued_at < self._SIDECAR_PREFETCH_TTL_S:
+                    return False
+                # Claimed before the POST so concurrent ticks do not issue it twice
+                self._sidecar_prefetched[key] = time.monotonic()
+
+        if not gpu_slot_free:
+            try:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    r = await client.post(
+                        f"{self._sidecar_url}/adapter/load/{adapter_identifier}",
+                        params={"version": version, "priority": "prefetch"},
+                    )
+                    r.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.warning(f"Prefetch of {adapter_identifier} v{version} to sidecar failed: {e}")
+                async with self._lock:
+                    self._sidecar_prefetched.pop(key, None)
+                return False
+            metrics.engine_lora_prefetch_issued_total.labels(adapter=adapter_identifier, target="sidecar").inc()
+            return True
+
+        try:
+            loaded = await self._trigger_and_poll(adapter_identifier, version, key, allow_evict=False)
+            if loaded:
+                async with self._lock:
+                    self._prefetched.add(key)
+                metrics.engine_lora_prefetch_issued_total.labels(adapter=adapter_identifier, target="gpu").inc()
+            return loaded
+        except Exception as e:
+            logger.warning(f"Prefetch of {adapter_identifier} v{version} failed: {e}")
+            return False
+        finally:
+            async with self._lock:
+                self._pending_downloads.pop(key, None)
+                self._prefetch_pending.discard(key)
+            event.set()
+
+    async def _escalate_download(self, identifier: str, version: str) -> None:
+        """Best-effort bump of an in-flight sidecar download to blocking priority."""
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                await client.post(
+                    f"{self._sidecar_url}/adapter/load/{identifier}",
+                    params={"version": version, "priority": "blocking"},
+                )
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not escalate download of {identifier}: {e}")
+
+    def _consume_prefetch(self, key: str, identifier: str) -> None:
+        """Record a prefetch hit the first time a request uses a prefetched adapter."""
+        if key in self._prefetched:
+            self._prefetched.discard(key)
+            metrics.engine_lora_prefetch_outcomes_total.labels(adapter=identifier, result="hit").inc()
+
+    async def _trigger_and_poll(self, identifier: str, version: str, key: str, allow_evict: bool = True) -> bool:
+        """Trigger sidecar download, poll until ready, evict if needed, load to GPU.
+
+        With ``allow_evict=False`` (prefetch), the GPU load is skipped if every
+        slot filled up while the download was running. Returns True if loaded.
+        """
 
         async with httpx.AsyncClient(timeout=30.0) as client:
             # 1. Trigger download (fire-and-forget, returns 202 or 200 if cached).
@@ -138,7 +250,7 @@ class LoRAManager:
             async def _trigger_download():
                 r = await client.post(
                     f"{self._sidecar_url}/adapter/load/{identifier}",
-                    params={"version": version},
+                    params={"version": version, "priority": "blocking" if allow_evict else "prefetch"},
                 )
                 r.raise_for_status()
                 return r
@@ -158,11 +270,17 @@ class LoRAManager:
 
         # 3. Evict LRU if at capacity
         async with self._lock:
+            if not allow_evict and len(self._loaded) >= self._max_loras:
+                logger.info(f"No free GPU slot for prefetched adapter {key}, leaving it on the sidecar")
+                return False
             while len(self._loaded) >= self._max_loras:
                 evicted_key, evicted = self._loaded.popitem(last=False)
                 logger.info(f"Evicting LRU adapter: {evicted_key}")
                 await asyncio.to_thread(self._engine.remove_lora, evicted.lora_int_id)
                 metrics.engine_lora_active.dec()
+                if evicted_key in self._prefetched:
+                    self._prefetched.discard(evicted_key)
+                    metrics.engine_lora_prefetch_wasted_total.labels(adapter=evicted.adapter_identifier).inc()
 
         # 4. Load onto GPU
         int_id = self._adapter_int_id(identifier, version)
@@ -186,11 +304,13 @@ class LoRAManager:
         )
         async with self._lock:
             self._loaded[key] = loaded
+            self._sidecar_prefetched.pop(key, None)
 
         logger.info(
             f"Adapter {identifier} v{version} loaded to GPU in {duration:.2f}s "
             f"({len(self._loaded)}/{self._max_loras} slots used)"
         )
+        return True
 
     async def _poll_adapter_ready(
         self, client: httpx.AsyncClient, identifier: str, version: str
@@ -251,3 +371,21 @@ class LoRAManager:
     @property
     def loaded_keys(self) -> list:
         return list(self._loaded.keys())
+
+    @property
+    def in_use_identifiers(self) -> list:
+        """Identifiers of adapters on GPU or with a load in flight."""
+        ids = {a.adapter_identifier for a in self._loaded.values()}
+        ids.update(key.rsplit("@", 1)[0] for key in self._pending_downloads)
+        return sorted(ids)
+
+    def arrival_counts(self) -> Dict[str, int]:
+        """Snapshot of cumulative adapter request counts since startup."""
+        return dict(self._arrivals)
+
+    def last_version(self, identifier: str) -> str:
+        """Most recently requested version of an adapter (``latest`` if never seen)."""
+        return self._last_versions.get(identifier, "latest")
+
+    def is_loaded(self, identifier: str, version: Optional[str] = None) -> bool:
+        return self._adapter_key(identifier, version) in self._loaded
@@ -1,5 +1,7 @@
 from prometheus_client import Counter, Histogram, Gauge
 
+from shared.monitoring.hot_path import HotCounter, HotHistogram
+
 # Request counters
 engine_requests_total = Counter(
     "engine_requests_total",
@@ -126,6 +128,31 @@ engine_lora_requests_total = Counter(
     ["adapter"]
 )
 
+# LoRA prefetching
+engine_lora_arrival_rate = Gauge(
+    "engine_lora_arrival_rate",
+    "EWMA of request arrival rate per LoRA adapter (requests/sec)",
+    ["adapter"]
+)
+
+engine_lora_prefetch_issued_total = Counter(
+    "engine_lora_prefetch_issued_total",
+    "Total adapter prefetches issued",
+    ["adapter", "target"]
+)
+
+engine_lora_prefetch_outcomes_total = Counter(
+    "engine_lora_prefetch_outcomes_total",
+    "Adapter lookups by prefetch outcome (hit = warmed by prefetch, miss = loaded on demand)",
+    ["adapter", "result"]
+)
+
+engine_lora_prefetch_wasted_total = Counter(
+    "engine_lora_prefetch_wasted_total",
+    "Prefetched adapters evicted from GPU before serving any request",
+    ["adapter"]
+)
+
 # GPU gauges (Phase 2)
 engine_gpu_compute_utilization_percent = Gauge(
     "engine_gpu_compute_utilization_percent",
@@ -147,26 +174,58 @@ engine_gpu_power_watts = Gauge(
 
 # --- KV offload metrics ---
 
-engine_kv_offload_operations_total = Counter(
+# Per-job KV offload metrics are hot-path collectors: bind children once with labels()
+engine_kv_offload_operations_total = HotCounter(
     "engine_kv_offload_operations_total",
     "Total KV offload operations",
     ["op", "status"]
 )
 
-engine_kv_offload_duration_seconds = Histogram(
+engine_kv_offload_duration_seconds = HotHistogram(
     "engine_kv_offload_duration_seconds",
     "Duration of KV offload operations in seconds",
     ["op"]
 )
 
-engine_kv_offload_bytes_total = Counter(
+engine_kv_offload_bytes_total = HotCounter(
     "engine_kv_offload_bytes_total",
     "Total bytes transferred via KV offload",
     ["direction"]
 )
 
+engine_kv_offload_dedup_saved_bytes_total = HotCounter(
+    "engine_kv_offload_dedup_saved_bytes_total",
+    "Bytes of stored KV blocks not sent because the sidecar already held them"
+)
+
+engine_kv_offload_queue_depth = Gauge(
+    "engine_kv_offload_queue_depth",
+    "KV offload transfer jobs queued or running on the transfer workers",
+    ["op"]
+)
+
+engine_kv_offload_queue_wait_seconds = HotHistogram(
+    "engine_kv_offload_queue_wait_seconds",
+    "Time a KV offload job waits for a transfer worker",
+    ["op"],
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0]
+)
+
 # Drain state gauge (1 = draining, 0 = normal)
 engine_draining = Gauge(
     "engine_draining",
     "Whether the engine is draining (1) or accepting requests (0)"
 )
+
+# Startup breakdown
+engine_startup_phase_seconds = Gauge(
+    "engine_startup_phase_seconds",
+    "Wall time of each engine startup phase",
+    ["phase"]
+)
+
+engine_startup_read_bytes = Gauge(
+    "engine_startup_read_bytes",
+    "Block-device bytes read by the engine process tree during each startup phase",
+    ["phase"]
+)
@@ -341,7 +341,7 @@ class MockLLMEngine:
             return False
 
         # Allocate a slot, store data
-        ids = await self.cache_client.allocate_blocks([block_hash])
+        ids = await self.cache_client.allocate_blocks([block_hash], model_id)
         if ids is None:
             return False
         block_id = ids[0]
@@ -40,6 +40,7 @@ class SidecarCacheClient:
         data: bytes,
         model_id: str = "",
         layer_name: str = "",
+        parent_hash: str = "",
     ) -> bool:
         """Send block bytes to sidecar for storage."""
         try:
@@ -50,6 +51,7 @@ class SidecarCacheClient:
                     data=data,
                     model_id=model_id,
                     layer_name=layer_name,
+                    parent_hash=parent_hash,
                 ),
                 timeout=_RPC_TIMEOUT,
             )
@@ -58,13 +60,17 @@ class SidecarCacheClient:
             logger.error(f"StoreBlock RPC failed: {e}")
             return False
 
-    async def load_block(self, block_id: int, layer_name: str = "") -> Optional[bytes]:
+    async def load_block(
+        self, block_id: int, layer_name: str = "", block_hash: str = "", model_id: str = ""
+    ) -> Optional[bytes]:
         """Request block bytes from sidecar."""
         try:
             resp = await self._stub.LoadBlock(
                 kv_cache_pb2.LoadBlockRequest(
                     block_id=block_id,
                     layer_name=layer_name,
+                    block_hash=block_hash,
+                    model_id=model_id,
                 ),
                 timeout=_RPC_TIMEOUT,
             )
@@ -87,11 +93,11 @@ class SidecarCacheClient:
             logger.error(f"GetFreeBlocks RPC failed: {e}")
             return 0
 
-    async def allocate_blocks(self, block_hashes: list[str]) -> Optional[list[int]]:
-        """Reserve block slots by hash."""
+    async def allocate_blocks(self, block_hashes: list[str], model_id: str = "") -> Optional[list[int]]:
+        """Reserve block slots by hash in the model's L1 namespace."""
         try:
             resp = await self._stub.AllocateBlocks(
-                kv_cache_pb2.AllocateBlocksRequest(block_hashes=block_hashes),
+                kv_cache_pb2.AllocateBlocksRequest(block_hashes=block_hashes, model_id=model_id),
                 timeout=_RPC_TIMEOUT,
             )
             if resp.success:
@@ -113,6 +119,38 @@ class SidecarCacheClient:
             logger.error(f"FreeBlock RPC failed: {e}")
             return False
 
+    async def query_prefix(self, block_hashes: list[str], model_id: str = "") -> list[str]:
+        """Tiers of the leading cached blocks of a hash chain (empty if none are cached)."""
+        try:
+            resp = await self._stub.QueryPrefix(
+                kv_cache_pb2.QueryPrefixRequest(model_id=model_id, block_hashes=block_hashes),
+                timeout=_RPC_TIMEOUT,
+            )
+            return list(resp.locations)
+        except grpc.RpcError as e:
+            logger.error(f"QueryPrefix RPC failed: {e}")
+            return []
+
+    async def lookup_blocks(
+        self, block_hashes: list[str], include_data: bool = False, model_id: str = ""
+    ) -> list[tuple[int, str, Optional[bytes]]]:
+        """(L1 block_id or -1, tier or "", bytes if requested) for each hash; empty on error."""
+        try:
+            resp = await self._stub.LookupBlocks(
+                kv_cache_pb2.LookupBlocksRequest(
+                    block_hashes=block_hashes, include_data=include_data, model_id=model_id
+                ),
+                timeout=_RPC_TIMEOUT,
+            )
+            data = list(resp.data) if include_data else [b""] * len(resp.block_ids)
+            return [
+                (block_id, location, blob if location and include_data else None)
+                for block_id, location, blob in zip(resp.block_ids, resp.locations, data)
+            ]
+        except grpc.RpcError as e:
+            logger.error(f"LookupBlocks RPC failed: {e}")
+            return []
+
     async def close(self):
         """Close the gRPC channel."""
         await self._channel.close()
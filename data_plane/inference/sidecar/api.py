@@ -6,15 +6,16 @@ import socket
 import tempfile
 import time
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, Query, status
-from fastapi.responses import JSONResponse, Response
+from fastapi import FastAPI, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, JSONResponse, Response
 from prometheus_client import REGISTRY, generate_latest
 
 from data_plane.inference.sidecar import metrics
 from data_plane.inference.sidecar.artifact_manager import ArtifactManager
 from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.download_scheduler import DownloadPriority
 from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
 from shared.errors import ErrorCode, InferenceServerError
 from shared.preflight import PreflightCheck, run_preflight
@@ -113,11 +114,18 @@ async def lifespan(app: FastAPI):
     await run_preflight(preflight_checks, "sidecar")
 
     _manager = ArtifactManager(config=_config)
-    _kv_registry = KVBlockRegistry()
+    _kv_registry = KVBlockRegistry(
+        persist_path=_config.kv_registry_path,
+        flush_delay_s=_config.kv_registry_flush_delay_ms / 1000,
+    )
+    # L1 and the disk tier start empty; only L2 entries outlive the process
+    for location in ("L1", "DISK"):
+        _kv_registry.forget_location(location)
     _kv_registry._l1_capacity_bytes = _config.l1_num_blocks * _config.l1_block_size_bytes
 
     # Start gRPC KV cache server
     from data_plane.inference.sidecar.cache_manager import MultiTieredCacheManager
+    from data_plane.inference.sidecar.disk_tier import DiskTier
     from data_plane.inference.sidecar.grpc_server import create_grpc_server
     from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
     from data_plane.inference.sidecar.l2_cache.connector import L2Connector
@@ -125,11 +133,40 @@ async def lifespan(app: FastAPI):
     l1_store = L1ByteStore(
         num_blocks=_config.l1_num_blocks,
         block_size_bytes=_config.l1_block_size_bytes,
+        shm_path=_config.l1_shm_path,
+        eviction_policy=_config.l1_eviction_policy,
+        tinylfu_admission=_config.l1_tinylfu_admission,
+        compression=_config.l1_compression,
+        arena_bytes=_config.l1_arena_bytes,
+        compression_min_ratio=_config.l1_compression_min_ratio,
+        compression_cpu_budget_us=_config.l1_compression_cpu_budget_us,
+        namespace_weights=_config.l1_namespace_weights,
     )
+    disk_tier = None
+    if _config.disk_tier_path and _config.disk_tier_capacity_gb > 0:
+        disk_tier = DiskTier(
+            path=_config.disk_tier_path,
+            capacity_bytes=int(_config.disk_tier_capacity_gb * 1024**3),
+            block_size_bytes=_config.l1_block_size_bytes,
+            eviction_policy=_config.disk_tier_eviction_policy,
+        )
     l2 = L2Connector()
-    cache_manager = MultiTieredCacheManager(l1=l1_store, l2=l2, registry=_kv_registry)
+    if _config.l2_demotion_queue_blocks > 0:
+        await l2.initialize()
+    cache_manager = MultiTieredCacheManager(
+        l1=l1_store,
+        l2=l2,
+        registry=_kv_registry,
+        demotion_queue_blocks=_config.l2_demotion_queue_blocks,
+        demotion_concurrency=_config.l2_demotion_concurrency,
+        disk=disk_tier,
+        disk_demotion_queue_blocks=_config.disk_demotion_queue_blocks,
+    )
     _grpc_server = await create_grpc_server(cache_manager, port=_config.grpc_port)
 
+    # The engine always serves the initial model: never evict it
+    _manager.acquire("model", _config.initial_model)
+
     # Load initial model in background
     _manager.model_registry[_config.initial_model] = {
         "model_id": _config.initial_model,
@@ -139,9 +176,11 @@ async def lifespan(app: FastAPI):
 
     async def _initial_load():
         try:
+            # The engine cannot start until this lands
             path = await _manager.load_model(
                 model_identifier=_config.initial_model,
                 version=_config.initial_model_version,
+                priority=DownloadPriority.BLOCKING,
             )
             _manager.is_ready = True
             metrics.sidecar_resident_models.set(len(_manager.model_registry))
@@ -157,6 +196,15 @@ async def lifespan(app: FastAPI):
     if _grpc_server is not None:
         await _grpc_server.stop(grace=5)
         logger.info("gRPC server stopped")
+    await cache_manager.close()
+    await l2.close()
+    if disk_tier is not None:
+        disk_tier.close()
+    l1_store.close()
+    if _manager is not None:
+        _manager.close()
+    if _kv_registry is not None:
+        _kv_registry.close()
     logger.info("Sidecar shutdown complete")
 
 
@@ -195,11 +243,26 @@ async def startupz():
     return {"status": "started"}
 
 
+def _parse_priority(value: Optional[str], default: DownloadPriority) -> DownloadPriority:
+    if value is None:
+        return default
+    try:
+        return DownloadPriority.parse(value)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
 @app.post("/load/{model_identifier:path}", tags=["models"])
-async def load_model_route(model_identifier: str, version: str = "latest"):
-    """Accept a model load request and process it in the background."""
+async def load_model_route(model_identifier: str, version: str = "latest", priority: Optional[str] = None):
+    """Accept a model load request and process it in the background.
+
+    ``priority`` (blocking / prefetch / background, default background) orders
+    the download in the scheduler; repeating the call with a higher priority
+    escalates an in-flight download.
+    """
     if _manager is None:
         raise InferenceServerError(ErrorCode.SIDECAR_NOT_READY, "Sidecar not initialized")
+    download_priority = _parse_priority(priority, DownloadPriority.BACKGROUND)
 
     # Already loaded — return immediately
     existing = _manager.model_registry.get(model_identifier)
@@ -208,6 +271,8 @@ async def load_model_route(model_identifier: str, version: str = "latest"):
 
     # Already downloading — don't start a second task
     if existing and existing.get("status") == "downloading":
+        if priority is not None:
+            _manager.raise_download_priority(model_identifier, download_priority)
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
             content={"status": "downloading", "model_identifier": model_identifier},
@@ -223,7 +288,7 @@ async def load_model_route(model_identifier: str, version: str = "latest"):
     async def _background_load():
         try:
             start = time.time()
-            local_path = await _manager.load_model(model_identifier, version)
+            local_path = await _manager.load_model(model_identifier, version, priority=download_priority)
             duration = time.time() - start
             metrics.sidecar_model_load_duration_seconds.labels(model=model_identifier, source="huggingface").observe(
                 duration
@@ -292,6 +357,31 @@ async def get_model_status(model_identifier: str):
     return info
 
 
+@app.post("/warm/{model_identifier:path}", tags=["models"])
+async def warm_model_route(model_identifier: str):
+    """Pre-warm the OS page cache with a resident model's weights (e.g. ahead of an engine restart)."""
+    if _manager is None:
+        raise InferenceServerError(ErrorCode.SIDECAR_NOT_READY, "Sidecar not initialized")
+
+    entry = _manager.model_registry.get(model_identifier)
+    if entry is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model {model_identifier} not resident.",
+        )
+    if entry.get("status") != "loaded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Model {model_identifier} is {entry.get('status')}; warm it once loaded.",
+        )
+
+    _manager.schedule_warm(model_identifier)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={"status": "warming", "model_identifier": model_identifier},
+    )
+
+
 @app.post("/adapter/unload/{adapter_identifier:path}", tags=["adapters"])
 async def unload_adapter_route(adapter_identifier: str):
     """Remove an adapter from the registry."""
@@ -314,25 +404,37 @@ async def get_adapters():
     """Returns the current resident adapters."""
     if _manager is None:
         return {}
-    return _manager.adapter_registry
+    result = {}
+    for adapter_id, entry in _manager.adapter_registry.items():
+        info = dict(entry)
+        if info.get("status") == "downloading" and adapter_id in _manager.download_progress:
+            info["download_progress"] = _manager.download_progress[adapter_id]
+        result[adapter_id] = info
+    return result
 
 
 @app.post("/adapter/load/{adapter_identifier:path}", tags=["adapters"])
-async def load_adapter_route(adapter_identifier: str, version: str = "latest"):
+async def load_adapter_route(adapter_identifier: str, version: str = "latest", priority: Optional[str] = None):
     """Trigger a LoRA adapter download (fire-and-forget, returns 202).
 
     Poll GET /registry/adapters to check when status becomes "loaded".
+    ``priority`` defaults to blocking (requests are waiting on the adapter);
+    the engine's prefetcher sends ``prefetch``. Repeating the call with a
+    higher priority escalates an in-flight download.
     """
     if _manager is None:
         raise InferenceServerError(ErrorCode.SIDECAR_NOT_READY, "Sidecar not initialized")
+    download_priority = _parse_priority(priority, DownloadPriority.BLOCKING)
 
     # Already loaded — return immediately
     existing = _manager.adapter_registry.get(adapter_identifier)
     if existing and existing.get("version") == version and existing.get("status") == "loaded":
+        _manager.touch("adapter", adapter_identifier)
         return {"status": "loaded", "adapter_identifier": adapter_identifier, "local_path": existing["local_path"]}
 
     # Already downloading — don't start a second task
     if existing and existing.get("status") == "downloading":
+        _manager.raise_download_priority(adapter_identifier, download_priority)
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
             content={"status": "downloading", "adapter_identifier": adapter_identifier},
@@ -348,7 +450,7 @@ async def load_adapter_route(adapter_identifier: str, version: str = "latest"):
     async def _background_fetch():
         try:
             start = time.time()
-            local_path = await _manager.fetch_adapter(adapter_identifier, version)
+            local_path = await _manager.fetch_adapter(adapter_identifier, version, priority=download_priority)
             duration = time.time() - start
             metrics.sidecar_adapter_load_duration_seconds.labels(adapter=adapter_identifier).observe(duration)
             metrics.sidecar_resident_adapters.set(len(_manager.adapter_registry))
@@ -370,6 +472,44 @@ async def load_adapter_route(adapter_identifier: str, version: str = "latest"):
     )
 
 
+async def _require_peer(request: Request) -> None:
+    """Reject callers that are not peer sidecars (see ``peer_token_file``)."""
+    if _manager is None:
+        raise InferenceServerError(ErrorCode.SIDECAR_NOT_READY, "Sidecar not initialized")
+    client_host = request.client.host if request.client else None
+    if not await _manager.peer_authorized(client_host, request.headers.get("authorization")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Artifacts are only served to peer sidecars.",
+        )
+
+
+@app.get("/artifacts/manifest", tags=["peers"])
+async def artifact_manifest(request: Request, identifier: str, version: str = "latest"):
+    """File listing of an artifact this sidecar holds, for peer sidecars fetching it."""
+    await _require_peer(request)
+    files = await asyncio.to_thread(_manager.peer_manifest, identifier, version)
+    if files is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{identifier} v{version} not held by this sidecar.",
+        )
+    return {"identifier": identifier, "version": version, "files": files}
+
+
+@app.get("/artifacts/file", tags=["peers"])
+async def artifact_file(request: Request, identifier: str, path: str, version: str = "latest"):
+    """Serve one artifact file to a peer sidecar (supports HTTP Range requests)."""
+    await _require_peer(request)
+    full_path = _manager.peer_file(identifier, version, path)
+    if full_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{path} of {identifier} v{version} not held by this sidecar.",
+        )
+    return FileResponse(full_path, media_type="application/octet-stream")
+
+
 @app.get("/metrics", tags=["monitoring"])
 async def metrics_endpoint():
     """Prometheus metrics endpoint."""
@@ -383,17 +523,27 @@ async def metrics_endpoint():
 async def get_cache_blocks(
     prefix_hash: Optional[str] = Query(None),
     model_id: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
 ):
-    """List cached KV blocks, optionally filtered by prefix_hash and model_id."""
+    """List cached KV blocks, optionally filtered by prefix_hash, model_id and location."""
     if _kv_registry is None:
         return []
-    if prefix_hash:
-        entries = _kv_registry.query_by_prefix(prefix_hash, model_id or "")
-    else:
-        entries = _kv_registry.all_entries()
+    entries = _kv_registry.query(prefix_hash or "", model_id or "", location or "")
     return [e.to_dict() for e in entries]
 
 
+@app.get("/cache/prefix", tags=["cache"])
+async def get_cache_prefix(
+    block_hashes: List[str] = Query(default_factory=list),
+    model_id: Optional[str] = Query(None),
+):
+    """Longest leading run of ``block_hashes`` cached as one chain, with each block's tier."""
+    if _kv_registry is None:
+        return {"num_blocks": 0, "block_hashes": [], "locations": []}
+    match = _kv_registry.longest_prefix(block_hashes, model_id or "")
+    return {"num_blocks": match.num_blocks, "block_hashes": match.block_hashes, "locations": match.locations}
+
+
 @app.get("/cache/stats", tags=["cache"])
 async def get_cache_stats():
     """Summary statistics for cache state (used by routing and observability)."""
@@ -401,8 +551,10 @@ async def get_cache_stats():
         return {
             "total_blocks": 0,
             "l1_blocks": 0,
+            "disk_blocks": 0,
             "l2_blocks": 0,
             "l1_used_bytes": 0,
+            "disk_used_bytes": 0,
             "l2_used_bytes": 0,
             "hit_rate": 0.0,
             "eviction_count": 0,
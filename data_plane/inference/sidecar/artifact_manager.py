@@ -1,15 +1,40 @@
 import asyncio
+import hmac
+import json
 import logging
 import os
+import shutil
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import httpx
 from huggingface_hub import snapshot_download
 
+from data_plane.inference.sidecar import metrics
+from data_plane.inference.sidecar.blob_store import BlobStore
 from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.disk_space import (
+    EvictionCandidate,
+    InsufficientDiskSpace,
+    begin_evict,
+    finish_evict,
+    measure_footprints,
+    order_candidates,
+    plan_evictions,
+    sweep_evicting,
+)
+from data_plane.inference.sidecar.download_progress import ProgressTracker, progress_tqdm
+from data_plane.inference.sidecar.download_scheduler import DownloadPriority, DownloadScheduler
+from data_plane.inference.sidecar.downloader import ParallelDownloader, RemoteFile, hub_manifest
+from data_plane.inference.sidecar.page_cache import warm_model_dir
+from data_plane.inference.sidecar.peers import PeerDirectory, plan_peer_files
+from data_plane.inference.sidecar.registry_store import RegistryStore
 
 logger = logging.getLogger(__name__)
 
+# Per-version file listing served to peer sidecars
+_MANIFEST_FILE = ".manifest.json"
+
 
 class ArtifactManager:
     """
@@ -17,6 +42,13 @@ class ArtifactManager:
     into a shared volume and keep metadata about which models are resident.
     """
 
+    # Seconds between directory-size samples when the fetcher reports no bytes
+    _PROGRESS_FALLBACK_INTERVAL = 2.0
+
+    # Artifacts used within this window are not evicted, which covers the gap
+    # between the sidecar reporting "loaded" and the engine acquiring it
+    _EVICTION_GRACE_S = 60.0
+
     def __init__(self, config: Optional[SidecarConfig] = None):
         self.config = config or SidecarConfig()
 
@@ -32,9 +64,54 @@ class ArtifactManager:
         # Download progress tracking: {identifier: {"downloaded_bytes": int, "total_bytes": Optional[int], "started_at": float}}
         self.download_progress: Dict[str, dict] = {}
 
+        self.scheduler = DownloadScheduler(
+            max_concurrent=self.config.download_max_concurrent,
+            bandwidth_bytes_per_s=self.config.download_bandwidth_bytes_per_s,
+            progress=self.download_progress,
+        )
+
+        # In-use references by (artifact_type, identifier); referenced artifacts are never evicted
+        self._refs: Dict[Tuple[str, str], int] = {}
+        # Serializes space checks so two downloads don't both count the same free bytes
+        self._space_lock = asyncio.Lock()
+
+        # In-flight page-cache warm tasks, by model identifier
+        self._warm_tasks: Dict[str, asyncio.Task] = {}
+
+        # Shared secret between peer sidecars, if configured
+        self._peer_token: Optional[str] = None
+        if self.config.peer_token_file is not None:
+            with open(self.config.peer_token_file) as f:
+                self._peer_token = f.read().strip() or None
+
+        # Peer sidecars that may already hold an artifact (tried before the hub)
+        self._peers: Optional[PeerDirectory] = None
+        if self.config.peer_urls or self.config.peer_discovery_dns:
+            self._peers = PeerDirectory(
+                self.config.peer_urls,
+                discovery_dns=self.config.peer_discovery_dns,
+                port=self.config.port,
+                token=self._peer_token,
+            )
+
+        # Chunked downloader shared by all artifacts so the worker pool bounds total concurrency
+        self._downloader: Optional[ParallelDownloader] = None
+        if self.config.download_engine == "parallel" or self._peers is not None:
+            self._downloader = ParallelDownloader(
+                workers=self.config.download_workers,
+                chunk_bytes=self.config.download_chunk_bytes,
+                verify_checksums=self.config.verify_checksums,
+                max_retries=self.config.download_max_retries,
+            )
+
         # Ensure the shared volume path exists
         os.makedirs(self.config.shared_volume, exist_ok=True)
 
+        # Content-addressed file store shared by all versions on the volume
+        self._blobs: Optional[BlobStore] = None
+        if self.config.content_addressed_store:
+            self._blobs = BlobStore(self.config.shared_volume)
+
         # Validate hf_token_file if configured
         if self.config.hf_token_file is not None and not os.path.exists(self.config.hf_token_file):
             raise FileNotFoundError(
@@ -44,35 +121,244 @@ class ArtifactManager:
         logger.info(f"Artifact Manager initialized. Storage path: {self.config.shared_volume}")
 
         # Restore registry from disk if available
+        self._store = RegistryStore(self.config.registry_path, namespaces=("models", "adapters"))
         self._load_registry()
+        self._recover_evictions()
 
     def _load_registry(self):
-        """Restore registry state from JSON file on disk."""
-        import json
-
-        if os.path.exists(self.config.registry_path):
-            try:
-                with open(self.config.registry_path) as f:
-                    data = json.load(f)
-                self.model_registry = data.get("models", {})
-                self.adapter_registry = data.get("adapters", {})
-                logger.info(
-                    f"Registry restored: {len(self.model_registry)} models, {len(self.adapter_registry)} adapters"
-                )
-            except (json.JSONDecodeError, OSError) as e:
-                logger.warning(f"Could not restore registry: {e}")
+        """Restore registry state from the snapshot + write-ahead log on disk."""
+        state = self._store.load()
+        self.model_registry = state["models"]
+        self.adapter_registry = state["adapters"]
+        if self.model_registry or self.adapter_registry:
+            logger.info(
+                f"Registry restored: {len(self.model_registry)} models, {len(self.adapter_registry)} adapters"
+            )
 
     def _persist_registry(self):
-        """Persist registry state to JSON file on disk."""
-        import json
-
+        """Write a compacted registry snapshot (synchronous; truncates the log)."""
+        models = {identifier: self._persisted_model(entry) for identifier, entry in self.model_registry.items()}
         try:
-            os.makedirs(os.path.dirname(self.config.registry_path), exist_ok=True)
-            with open(self.config.registry_path, "w") as f:
-                json.dump({"models": self.model_registry, "adapters": self.adapter_registry}, f, indent=2)
+            self._store.checkpoint({"models": models, "adapters": self.adapter_registry})
         except OSError as e:
             logger.error(f"Could not persist registry: {e}")
 
+    @staticmethod
+    def _persisted_model(entry: Dict) -> Dict:
+        # Page-cache state does not survive a reboot, so it is never persisted
+        return {k: v for k, v in entry.items() if k != "page_cache"}
+
+    def _record_model(self, model_identifier: str):
+        """Append the model's current registry state to the log (off-loop)."""
+        entry = self.model_registry.get(model_identifier)
+        if entry is None:
+            self._store.delete("models", model_identifier)
+        else:
+            self._store.put("models", model_identifier, self._persisted_model(entry))
+
+    def _record_adapter(self, adapter_identifier: str):
+        """Append the adapter's current registry state to the log (off-loop)."""
+        entry = self.adapter_registry.get(adapter_identifier)
+        if entry is None:
+            self._store.delete("adapters", adapter_identifier)
+        else:
+            self._store.put("adapters", adapter_identifier, entry)
+
+    def _registry_for(self, artifact_type: str) -> Dict[str, Dict]:
+        return self.model_registry if artifact_type == "model" else self.adapter_registry
+
+    def _record(self, artifact_type: str, identifier: str):
+        if artifact_type == "model":
+            self._record_model(identifier)
+        else:
+            self._record_adapter(identifier)
+
+    def _recover_evictions(self):
+        """Finish evictions a crash interrupted and drop their registry entries."""
+        evicted = set(sweep_evicting(self.config.shared_volume))
+        if self._blobs is not None:
+            metrics.sidecar_blob_gc_freed_bytes_total.inc(self._blobs.gc())
+        if not evicted:
+            return
+        for artifact_type in ("model", "adapter"):
+            registry = self._registry_for(artifact_type)
+            for identifier in [i for i, e in registry.items() if e.get("local_path") in evicted]:
+                del registry[identifier]
+                self._record(artifact_type, identifier)
+
+    # ------------------------------------------------------------------
+    # References and eviction
+    # ------------------------------------------------------------------
+
+    def touch(self, artifact_type: str, identifier: str):
+        """Record a use of a resident artifact for LRU/LFU ordering."""
+        entry = self._registry_for(artifact_type).get(identifier)
+        if entry is not None:
+            entry["last_used"] = time.time()
+            entry["use_count"] = entry.get("use_count", 0) + 1
+            self._record(artifact_type, identifier)
+
+    def acquire(self, artifact_type: str, identifier: str):
+        """Mark an artifact as in use (e.g. loaded by the engine) so it is never evicted."""
+        key = (artifact_type, identifier)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        self.touch(artifact_type, identifier)
+
+    def release(self, artifact_type: str, identifier: str):
+        """Drop one reference taken with ``acquire``."""
+        key = (artifact_type, identifier)
+        remaining = self._refs.get(key, 0) - 1
+        if remaining > 0:
+            self._refs[key] = remaining
+        else:
+            self._refs.pop(key, None)
+
+    def in_use(self, artifact_type: str, identifier: str) -> bool:
+        return self._refs.get((artifact_type, identifier), 0) > 0
+
+    async def _footprints(self) -> Tuple[Dict[Tuple[str, str], int], Dict[str, int]]:
+        """Bytes evicting each resident artifact frees, and bytes on disk per type (see ``measure_footprints``)."""
+        paths = {
+            (artifact_type, identifier): entry["local_path"]
+            for artifact_type in ("model", "adapter")
+            for identifier, entry in self._registry_for(artifact_type).items()
+            if entry.get("status") == "loaded" and entry.get("local_path")
+        }
+        exclusive, usage = await asyncio.to_thread(measure_footprints, paths)
+        for artifact_type in ("model", "adapter"):
+            metrics.sidecar_artifact_bytes.labels(artifact_type=artifact_type).set(usage.get(artifact_type, 0))
+        return exclusive, usage
+
+    async def _engine_adapters_in_use(self) -> Optional[set]:
+        """Adapters the engine holds on GPU, or None if the engine can't be asked."""
+        try:
+            async with httpx.AsyncClient(timeout=2.0) as client:
+                resp = await client.get(f"{self.config.engine_url}/adapters/in_use")
+                resp.raise_for_status()
+                return set(resp.json().get("adapters", []))
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Could not query engine for adapters in use: {e}")
+            return None
+
+    async def _eviction_candidates(
+        self, exclude: Tuple[str, str], freed: Optional[Dict[Tuple[str, str], int]] = None
+    ) -> List[EvictionCandidate]:
+        """Unreferenced resident artifacts; ``freed`` overrides the recorded sizes with measured ones."""
+        now = time.time()
+        candidates = []
+        for artifact_type in ("model", "adapter"):
+            for identifier, entry in self._registry_for(artifact_type).items():
+                if (artifact_type, identifier) == exclude or self.in_use(artifact_type, identifier):
+                    continue
+                if entry.get("status") != "loaded" or not entry.get("local_path"):
+                    continue
+                if now - entry.get("last_used", 0.0) < self._EVICTION_GRACE_S:
+                    continue
+                candidates.append(EvictionCandidate(
+                    artifact_type=artifact_type,
+                    identifier=identifier,
+                    local_path=entry["local_path"],
+                    size_bytes=(freed or {}).get((artifact_type, identifier), entry.get("size_bytes", 0)),
+                    last_used=entry.get("last_used", 0.0),
+                    use_count=entry.get("use_count", 0),
+                ))
+
+        if any(c.artifact_type == "adapter" for c in candidates):
+            engine_held = await self._engine_adapters_in_use()
+            if engine_held is None:
+                # Engine unreachable: it may still hold any of these, so keep them all
+                candidates = [c for c in candidates if c.artifact_type != "adapter"]
+            else:
+                candidates = [c for c in candidates if c.artifact_type != "adapter" or c.identifier not in engine_held]
+        return candidates
+
+    async def make_room(self, artifact_type: str, identifier: str, need_bytes: int = 0):
+        """Evict unreferenced artifacts so a ``need_bytes`` download fits, before it starts.
+
+        Quotas and the free-space floor are targets: if honouring them would
+        require evicting referenced artifacts, the download still proceeds as
+        long as its bytes physically fit. Raises ``InsufficientDiskSpace`` otherwise.
+        """
+        async with self._space_lock:
+            freed, usage = await self._footprints()
+            free = (await asyncio.to_thread(shutil.disk_usage, self.config.shared_volume)).free
+            candidates = await self._eviction_candidates(exclude=(artifact_type, identifier), freed=freed)
+            quotas = {"model": self.config.model_quota_bytes, "adapter": self.config.adapter_quota_bytes}
+
+            victims = plan_evictions(
+                artifact_type, need_bytes, candidates, usage, quotas,
+                free, self.config.disk_min_free_bytes, self.config.eviction_policy,
+            )
+            if victims is None:
+                logger.warning(
+                    f"Cannot meet quota/free-space targets for {artifact_type} {identifier} "
+                    f"({need_bytes} bytes) without evicting in-use artifacts"
+                )
+                victims = plan_evictions(
+                    artifact_type, need_bytes, candidates, usage, {}, free, 0, self.config.eviction_policy,
+                )
+                if victims is None:
+                    raise InsufficientDiskSpace(
+                        f"{artifact_type} {identifier} needs {need_bytes} bytes; "
+                        f"{free} free on {self.config.shared_volume} and nothing left to evict"
+                    )
+            for victim in victims:
+                await self._evict(victim, reason="space")
+
+    async def _enforce_adapter_limit(self, incoming: str):
+        """Evict adapters so ``incoming`` fits within ``max_resident_adapters``."""
+        async with self._space_lock:
+            resident = [
+                i for i, e in self.adapter_registry.items() if e.get("status") == "loaded" and i != incoming
+            ]
+            excess = len(resident) + 1 - self.max_resident_adapters
+            if excess <= 0:
+                return
+            candidates = [c for c in await self._eviction_candidates(exclude=("adapter", incoming))
+                          if c.artifact_type == "adapter"]
+            victims = order_candidates(candidates, self.config.eviction_policy)[:excess]
+            if len(victims) < excess:
+                logger.warning(
+                    f"{len(resident)} adapters resident (max {self.max_resident_adapters}); "
+                    f"only {len(victims)} are evictable"
+                )
+            for victim in victims:
+                await self._evict(victim, reason="max_adapters")
+
+    async def _evict(self, victim: EvictionCandidate, reason: str):
+        """Crash-safe removal: rename aside, drop from registry (durably), then delete."""
+        doomed = await asyncio.to_thread(begin_evict, victim.local_path)
+        self._registry_for(victim.artifact_type).pop(victim.identifier, None)
+        self._record(victim.artifact_type, victim.identifier)
+        await asyncio.to_thread(self._store.flush)
+        if doomed is not None:
+            await asyncio.to_thread(finish_evict, doomed)
+        if self._blobs is not None:
+            metrics.sidecar_blob_gc_freed_bytes_total.inc(await asyncio.to_thread(self._blobs.gc))
+
+        metrics.sidecar_artifact_evictions_total.labels(artifact_type=victim.artifact_type, reason=reason).inc()
+        metrics.sidecar_artifact_evicted_bytes_total.labels(artifact_type=victim.artifact_type).inc(victim.size_bytes)
+        if victim.artifact_type == "model":
+            metrics.sidecar_resident_models.set(len(self.model_registry))
+        else:
+            metrics.sidecar_resident_adapters.set(len(self.adapter_registry))
+        logger.info(
+            f"Evicted {victim.artifact_type} {victim.identifier} ({victim.size_bytes} bytes, reason={reason})"
+        )
+
+    def raise_download_priority(self, identifier: str, priority: DownloadPriority) -> bool:
+        """Escalate an in-flight download, e.g. when requests start waiting on it."""
+        return self.scheduler.raise_priority(identifier, priority)
+
+    def close(self):
+        """Release the download worker pool and compact the registry log into a snapshot."""
+        for task in self._warm_tasks.values():
+            task.cancel()
+        if self._downloader is not None:
+            self._downloader.close()
+        self._persist_registry()
+        self._store.close()
+
     def _get_hf_token(self) -> Optional[str]:
         """Resolve HuggingFace token from file or environment variable."""
         if self.config.hf_token_file is not None:
@@ -92,18 +378,31 @@ class ArtifactManager:
                 total += os.path.getsize(os.path.join(dirpath, fname))
         return total
 
-    async def _monitor_download_progress(self, identifier: str, target_dir: str):
-        """Periodically update download_progress with current directory size."""
+    async def _monitor_download_progress(self, identifier: str, target_dir: str, tracker: ProgressTracker):
+        """Fallback progress for fetchers that report no byte counts.
+
+        Only scans the directory (in a worker thread, never on the loop) while
+        the tqdm hook has not reported any bytes — i.e. on huggingface_hub
+        releases that don't pass byte-level bars to ``tqdm_class``.
+        """
         while identifier in self.download_progress:
-            current_size = self._get_dir_size(target_dir)
-            if identifier in self.download_progress:
-                self.download_progress[identifier]["downloaded_bytes"] = current_size
-            await asyncio.sleep(2)
+            await asyncio.sleep(self._PROGRESS_FALLBACK_INTERVAL)
+            if tracker.bytes_seen == 0 or tracker.from_fallback:
+                tracker.from_fallback = True
+                tracker.set_downloaded(await asyncio.to_thread(self._get_dir_size, target_dir))
 
-    async def _fetch_from_external_storage(self, artifact_type: str, identifier: str, version: str) -> str:
+    async def _fetch_from_external_storage(
+        self,
+        artifact_type: str,
+        identifier: str,
+        version: str,
+        priority: DownloadPriority = DownloadPriority.BACKGROUND,
+    ) -> str:
         """
         Download model/adapter files from HuggingFace Hub.
 
+        Admission is ordered by ``priority`` through the download scheduler.
+
         Downloads directly to the target path. snapshot_download handles
         resumable/partial downloads, so no temp dir + move is needed.
         Avoids shutil.move which can corrupt directories on WSL2 bind mounts.
@@ -120,33 +419,234 @@ class ArtifactManager:
 
         os.makedirs(local_target_path, exist_ok=True)
 
-        # Track download progress
-        self.download_progress[identifier] = {
-            "downloaded_bytes": 0,
-            "total_bytes": None,
-            "started_at": time.time(),
-        }
-        monitor_task = asyncio.create_task(self._monitor_download_progress(identifier, local_target_path))
-
+        monitor_task = None
+        tracker: Optional[ProgressTracker] = None
         try:
-            await asyncio.to_thread(
-                snapshot_download,
-                repo_id=identifier,
-                revision=version if version != "latest" else None,
-                local_dir=local_target_path,
-                token=self._get_hf_token(),
-            )
+            # Wait for a scheduler slot; the scheduler publishes queue position meanwhile
+            async with self.scheduler.slot(identifier, priority):
+                # Track download progress
+                progress = self.download_progress.setdefault(identifier, {})
+                progress.update({
+                    "downloaded_bytes": 0,
+                    "total_bytes": None,
+                    "started_at": time.time(),
+                    "eta_s": None,
+                })
+                tracker = ProgressTracker(progress, artifact_type, identifier)
+
+                if self._peers is not None and await self._peer_download(
+                    artifact_type, identifier, version, local_target_path, tracker
+                ):
+                    with_manifest = True
+                elif self.config.download_engine == "parallel":
+                    await self._parallel_download(artifact_type, identifier, version, local_target_path, tracker)
+                    with_manifest = True
+                else:
+                    with_manifest = False
+                    # Size is unknown up front; assume it matches what this artifact used before
+                    await self.make_room(artifact_type, identifier, self._registry_for(artifact_type).get(
+                        identifier, {}).get("size_bytes", 0))
+                    monitor_task = asyncio.create_task(
+                        self._monitor_download_progress(identifier, local_target_path, tracker)
+                    )
+                    await asyncio.to_thread(
+                        snapshot_download,
+                        repo_id=identifier,
+                        revision=version if version != "latest" else None,
+                        local_dir=local_target_path,
+                        token=self._get_hf_token(),
+                        tqdm_class=progress_tqdm(tracker),
+                    )
         finally:
             self.download_progress.pop(identifier, None)
-            monitor_task.cancel()
-            try:
-                await monitor_task
-            except asyncio.CancelledError:
-                pass
+            if tracker is not None:
+                tracker.close()
+            if monitor_task is not None:
+                monitor_task.cancel()
+                try:
+                    await monitor_task
+                except asyncio.CancelledError:
+                    pass
+
+        if self._blobs is not None and not with_manifest:
+            # No manifest hashes up front: hash what arrived so later versions can share it
+            saved = await asyncio.to_thread(self._blobs.ingest_tree, local_target_path)
+            metrics.sidecar_blob_dedup_bytes_total.labels(source="ingest").inc(saved)
 
         logger.info(f"Download complete. {artifact_type} files ready at: {local_target_path}")
         return local_target_path
 
+    async def _parallel_download(
+        self, artifact_type: str, identifier: str, version: str, target_dir: str, tracker: ProgressTracker
+    ):
+        """Fetch an artifact from the hub with the chunked downloader, verifying hashes as bytes arrive."""
+        token = self._get_hf_token()
+        revision = version if version != "latest" else None
+        files = await asyncio.to_thread(hub_manifest, identifier, revision, token)
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        await self._download_files(artifact_type, identifier, version, files, target_dir, tracker, headers)
+
+    async def _peer_download(
+        self, artifact_type: str, identifier: str, version: str, target_dir: str, tracker: ProgressTracker
+    ) -> bool:
+        """Try to fetch an artifact from peer sidecars. Returns False to fall back to the hub.
+
+        Chunks are spread across every peer holding the artifact. Hashes come
+        from the hub manifest when the hub is reachable, so a peer can't serve
+        different bytes than the hub would; otherwise the peer manifest is used.
+        A partial peer download is resumed by the hub fallback from its ``.part`` files.
+        """
+        holders = await self._peers.find_holders(identifier, version)
+        if not holders:
+            metrics.sidecar_peer_fetch_total.labels(result="miss").inc()
+            return False
+
+        revision = version if version != "latest" else None
+        try:
+            authoritative = await asyncio.to_thread(hub_manifest, identifier, revision, self._get_hf_token())
+        except Exception as e:
+            logger.info(f"Hub manifest for {identifier} unavailable ({e}); trusting peer manifest")
+            authoritative = None
+
+        files = plan_peer_files(identifier, version, holders, authoritative)
+        if files is None:
+            metrics.sidecar_peer_fetch_total.labels(result="miss").inc()
+            return False
+
+        logger.info(f"Fetching {artifact_type} {identifier} v{version} from {len(holders)} peer(s)")
+        try:
+            # Only the peer token: the hub token is never sent to peers
+            await self._download_files(
+                artifact_type, identifier, version, files, target_dir, tracker, self._peers.headers or None
+            )
+        except InsufficientDiskSpace:
+            raise
+        except Exception as e:
+            logger.warning(f"Peer fetch of {identifier} v{version} failed ({e}); falling back to the hub")
+            metrics.sidecar_peer_fetch_total.labels(result="failed").inc()
+            return False
+        metrics.sidecar_peer_fetch_total.labels(result="hit").inc()
+        return True
+
+    async def _download_files(
+        self,
+        artifact_type: str,
+        identifier: str,
+        version: str,
+        files: List[RemoteFile],
+        target_dir: str,
+        tracker: ProgressTracker,
+        headers: Optional[Dict[str, str]],
+    ):
+        """Materialize a manifest into ``target_dir``: link stored blobs, download the rest."""
+        manifest = files
+
+        # Files whose hash is already in the blob store are linked instead of downloaded
+        stored = []
+        if self._blobs is not None:
+            files, stored = await asyncio.to_thread(self._blobs.partition, files)
+        total = sum(f.size for f in files)
+        tracker.set_total(total)
+        on_disk = await asyncio.to_thread(self._get_dir_size, target_dir)
+        await self.make_room(artifact_type, identifier, max(0, total - on_disk))
+
+        # config.json marks the directory complete, so it is linked only after everything else
+        marker = [f for f in stored if f.path == "config.json"]
+        if stored:
+            await asyncio.to_thread(self._blobs.materialize_files, [f for f in stored if f.path != "config.json"], target_dir)
+
+        fetched = 0
+        if files:
+            fetched = await asyncio.to_thread(
+                self._downloader.download,
+                files,
+                target_dir,
+                tracker.add,
+                headers,
+                self.scheduler.throttle_for(identifier),
+                self.scheduler.gate_for(identifier),
+            )
+            # Only verified content may be keyed by its hash
+            if self._blobs is not None and self.config.verify_checksums:
+                saved = await asyncio.to_thread(self._blobs.ingest_files, files, target_dir)
+                metrics.sidecar_blob_dedup_bytes_total.labels(source="ingest").inc(saved)
+        # Peers serve this listing to sidecars that fetch the artifact from us
+        await asyncio.to_thread(self._write_manifest, target_dir, manifest)
+        if marker:
+            await asyncio.to_thread(self._blobs.materialize_files, marker, target_dir)
+
+        reused = sum(f.size for f in stored)
+        metrics.sidecar_blob_dedup_bytes_total.labels(source="download").inc(reused)
+        logger.info(
+            f"Fetched {fetched} bytes for {identifier} v{version} ({len(files)} files); "
+            f"reused {reused} bytes from {len(stored)} stored blobs"
+        )
+
+    @staticmethod
+    def _write_manifest(target_dir: str, files: List[RemoteFile]):
+        tmp = os.path.join(target_dir, _MANIFEST_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump([
+                {"path": r.path, "size": r.size, "sha256": r.sha256, "git_sha1": r.git_sha1} for r in files
+            ], f)
+        os.replace(tmp, os.path.join(target_dir, _MANIFEST_FILE))
+
+    # ------------------------------------------------------------------
+    # Serving artifacts to peers
+    # ------------------------------------------------------------------
+
+    async def peer_authorized(self, client_host: Optional[str], authorization: Optional[str]) -> bool:
+        """Whether a caller may fetch artifacts.
+
+        It must send the peer token if one is configured, and otherwise call
+        from the address of a configured peer.
+        """
+        if self._peer_token is not None:
+            return hmac.compare_digest((authorization or "").encode(), f"Bearer {self._peer_token}".encode())
+        if self._peers is None or client_host is None:
+            return False
+        return client_host in await self._peers.addresses()
+
+    def _served_dir(self, identifier: str, version: str) -> Optional[str]:
+        """Local directory of a fully downloaded artifact version, if we hold it."""
+        for registry in (self.model_registry, self.adapter_registry):
+            entry = registry.get(identifier)
+            if entry and entry.get("status") == "loaded" and entry.get("version") == version:
+                return entry["local_path"]
+        return None
+
+    def peer_manifest(self, identifier: str, version: str) -> Optional[List[dict]]:
+        """File listing (with hashes when known) of an artifact this sidecar can serve."""
+        root = self._served_dir(identifier, version)
+        if root is None:
+            return None
+        try:
+            with open(os.path.join(root, _MANIFEST_FILE)) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+        # Fetched without a manifest (snapshot engine): list files, peers verify against the hub
+        listing = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for fname in filenames:
+                if fname.startswith("."):
+                    continue
+                full = os.path.join(dirpath, fname)
+                listing.append({"path": os.path.relpath(full, root), "size": os.path.getsize(full)})
+        return listing
+
+    def peer_file(self, identifier: str, version: str, path: str) -> Optional[str]:
+        """Absolute path of one served file, or None (also for paths escaping the artifact)."""
+        root = self._served_dir(identifier, version)
+        if root is None:
+            return None
+        root = os.path.realpath(root)
+        full = os.path.realpath(os.path.join(root, path))
+        if not full.startswith(root + os.sep) or not os.path.isfile(full):
+            return None
+        return full
+
     async def load_model(
         self,
         model_identifier: str,
@@ -154,20 +654,27 @@ class ArtifactManager:
         tags: Optional[List[str]] = None,
         warmup_prompts: Optional[List[str]] = None,
         preferred_device: Optional[str] = None,
+        priority: DownloadPriority = DownloadPriority.BACKGROUND,
     ) -> str:
         """Downloads the model if necessary and registers it as resident."""
 
         existing = self.model_registry.get(model_identifier)
         if existing and existing.get("version") == version and existing.get("status") == "loaded":
             logger.info(f"Model {model_identifier} v{version} already resident.")
+            self.touch("model", model_identifier)
+            if self.config.page_cache_warm_on_load and "page_cache" not in existing:
+                self.schedule_warm(model_identifier)
             return existing["local_path"]
 
-        local_path = await self._fetch_from_external_storage("model", model_identifier, version)
+        local_path = await self._fetch_from_external_storage("model", model_identifier, version, priority)
         entry: Dict = {
             "model_id": model_identifier,
             "version": version,
             "local_path": local_path,
             "status": "loaded",
+            "size_bytes": await asyncio.to_thread(self._get_dir_size, local_path),
+            "last_used": time.time(),
+            "use_count": 1,
         }
         if tags is not None:
             entry["tags"] = tags
@@ -176,21 +683,83 @@ class ArtifactManager:
         if preferred_device is not None:
             entry["preferred_device"] = preferred_device
         self.model_registry[model_identifier] = entry
-        self._persist_registry()
+        self._record_model(model_identifier)
+        if self.config.page_cache_warm_on_load:
+            self.schedule_warm(model_identifier)
         return local_path
 
+    def schedule_warm(self, model_identifier: str) -> asyncio.Task:
+        """Start warming a resident model's weights in the background (idempotent)."""
+        task = self._warm_tasks.get(model_identifier)
+        if task is None or task.done():
+            task = asyncio.create_task(self.warm_model(model_identifier))
+            self._warm_tasks[model_identifier] = task
+
+            def _forget(done: asyncio.Task) -> None:
+                if self._warm_tasks.get(model_identifier) is done:
+                    del self._warm_tasks[model_identifier]
+
+            task.add_done_callback(_forget)
+        return task
+
+    async def warm_model(self, model_identifier: str) -> dict:
+        """Read a resident model's weight shards into the OS page cache.
+
+        Progress is published per file under the registry entry's
+        ``page_cache`` key: ``{"status": ..., "files": {rel_path: record}}``.
+        """
+        entry = self.model_registry.get(model_identifier)
+        if entry is None or entry.get("status") != "loaded":
+            raise ValueError(f"Model {model_identifier} is not resident")
+
+        state: Dict = {"status": "warming", "files": {}, "started_at": time.time()}
+        entry["page_cache"] = state
+
+        def _on_file(rel_path: str, record: dict) -> None:
+            # Called from warm worker threads; each assignment is atomic under the GIL
+            state["files"][rel_path] = record
+            if record.get("bytes"):
+                metrics.sidecar_page_cache_warm_bytes_total.inc(record["bytes"])
+
+        start = time.monotonic()
+        try:
+            results = await asyncio.to_thread(
+                warm_model_dir,
+                entry["local_path"],
+                self.config.page_cache_warm_workers,
+                self.config.page_cache_max_memory_fraction,
+                _on_file,
+            )
+        except OSError as e:
+            state["status"] = "failed"
+            state["error"] = str(e)
+            logger.warning(f"Page-cache warm of {model_identifier} failed: {e}")
+            return state
+
+        elapsed = time.monotonic() - start
+        statuses = {r["status"] for r in results.values()}
+        state["status"] = "warm" if statuses <= {"warm"} else "partial"
+        state["seconds"] = round(elapsed, 3)
+        state["bytes"] = sum(r.get("bytes", 0) for r in results.values())
+        metrics.sidecar_page_cache_warm_duration_seconds.labels(model=model_identifier).observe(elapsed)
+        logger.info(
+            f"Warmed {state['bytes']} bytes of {model_identifier} into page cache in {elapsed:.2f}s "
+            f"({len(results)} shards, status={state['status']})"
+        )
+        return state
+
     def unload_model(self, model_identifier: str):
         """Removes the model from the registry."""
         if model_identifier in self.model_registry:
             del self.model_registry[model_identifier]
-            self._persist_registry()
+            self._record_model(model_identifier)
             logger.info(f"Model {model_identifier} unloaded from registry.")
 
     def unload_adapter(self, adapter_identifier: str):
         """Removes the adapter from the registry."""
         if adapter_identifier in self.adapter_registry:
             del self.adapter_registry[adapter_identifier]
-            self._persist_registry()
+            self._record_adapter(adapter_identifier)
             logger.info(f"Adapter {adapter_identifier} unloaded from registry.")
 
     async def fetch_adapter(
@@ -199,6 +768,7 @@ class ArtifactManager:
         version: str = "latest",
         tags: Optional[List[str]] = None,
         preferred_device: Optional[str] = None,
+        priority: DownloadPriority = DownloadPriority.BLOCKING,
     ) -> str:
         """Downloads the adapter if necessary and registers it as resident.
 
@@ -208,25 +778,30 @@ class ArtifactManager:
         existing = self.adapter_registry.get(adapter_identifier)
         if existing and existing.get("version") == version and existing.get("status") == "loaded":
             logger.info(f"Adapter {adapter_identifier} v{version} already resident.")
+            self.touch("adapter", adapter_identifier)
             return existing["local_path"]
 
         try:
-            local_path = await self._fetch_from_external_storage("adapter", adapter_identifier, version)
+            await self._enforce_adapter_limit(adapter_identifier)
+            local_path = await self._fetch_from_external_storage("adapter", adapter_identifier, version, priority)
             entry: Dict = {
                 "adapter_id": adapter_identifier,
                 "version": version,
                 "local_path": local_path,
                 "status": "loaded",
+                "size_bytes": await asyncio.to_thread(self._get_dir_size, local_path),
+                "last_used": time.time(),
+                "use_count": 1,
             }
             if tags is not None:
                 entry["tags"] = tags
             if preferred_device is not None:
                 entry["preferred_device"] = preferred_device
             self.adapter_registry[adapter_identifier] = entry
-            self._persist_registry()
+            self._record_adapter(adapter_identifier)
             return local_path
         except Exception:
             # Remove failed entry so it can be retried
             self.adapter_registry.pop(adapter_identifier, None)
-            self._persist_registry()
+            self._record_adapter(adapter_identifier)
             raise
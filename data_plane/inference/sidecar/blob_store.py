@@ -0,0 +1,169 @@
+"""Content-addressed blob store for artifact files on the shared volume.
+
+Blobs live at ``<shared_volume>/.blobs/<algo>/<hh>/<digest>`` keyed by the
+hash the Hub already publishes for each file (LFS ``sha256``, or the git blob
+``sha1`` for small files). Version directories keep their normal layout, but
+each file is a hardlink to its blob (a reflink/copy where hardlinks are not
+possible), so revisions that share a tokenizer or unchanged shards store those
+bytes once, and a new revision only downloads files whose hash is new.
+
+A blob is garbage once no version directory links to it (``st_nlink == 1``);
+``gc`` removes those after evictions and at startup.
+"""
+
+import errno
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+from typing import List, Optional, Tuple
+
+from data_plane.inference.sidecar.downloader import RemoteFile
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = ".blobs"
+
+# ioctl(FICLONE): copy-on-write clone on btrfs/XFS
+_FICLONE = 0x40049409
+_HASH_BUFFER_BYTES = 8 * 1024 * 1024
+
+
+def blob_key(remote: RemoteFile) -> Optional[str]:
+    """``"<algo>/<digest>"`` for a manifest entry, or None if it carries no hash."""
+    if remote.sha256:
+        return f"sha256/{remote.sha256}"
+    if remote.git_sha1:
+        return f"gitsha1/{remote.git_sha1}"
+    return None
+
+
+class BlobStore:
+    """Hash-keyed file store with hardlink materialization."""
+
+    def __init__(self, shared_volume: str):
+        self.root = os.path.join(shared_volume, BLOB_DIR)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        algo, digest = key.split("/", 1)
+        return os.path.join(self.root, algo, digest[:2], digest)
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self.path_for(key))
+
+    def partition(self, files: List[RemoteFile]) -> Tuple[List[RemoteFile], List[RemoteFile]]:
+        """Split a manifest into (files to download, files already stored as blobs)."""
+        to_fetch, stored = [], []
+        for f in files:
+            key = blob_key(f)
+            (stored if key and self.has(key) else to_fetch).append(f)
+        return to_fetch, stored
+
+    def materialize(self, key: str, dest: str) -> None:
+        """Make ``dest`` a link (or clone) of the blob, replacing any existing file atomically."""
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        tmp = dest + ".blobtmp"
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        _link_or_clone(self.path_for(key), tmp)
+        os.replace(tmp, dest)
+
+    def materialize_files(self, files: List[RemoteFile], target_dir: str) -> None:
+        for f in files:
+            self.materialize(blob_key(f), os.path.join(target_dir, f.path))
+
+    def ingest_files(self, files: List[RemoteFile], target_dir: str) -> int:
+        """Adopt freshly downloaded (and verified) manifest files. Returns bytes deduplicated."""
+        saved = 0
+        for f in files:
+            key = blob_key(f)
+            if key is not None:
+                saved += self.ingest(key, os.path.join(target_dir, f.path))
+        return saved
+
+    def ingest(self, key: str, path: str) -> int:
+        """Adopt a verified file into the store. Returns bytes deduplicated.
+
+        If the blob already exists, ``path`` is replaced by a link to it;
+        otherwise the blob becomes a second name for ``path``'s inode.
+        """
+        blob = self.path_for(key)
+        if os.path.exists(blob):
+            if os.path.samefile(blob, path):
+                return 0
+            size = os.path.getsize(path)
+            self.materialize(key, path)
+            return size
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            # Another download adopted the same content concurrently
+            return self.ingest(key, path)
+        except OSError as e:
+            logger.debug(f"Cannot hardlink {path} into blob store: {e}")
+            return 0
+        return 0
+
+    def ingest_tree(self, target_dir: str) -> int:
+        """Hash and adopt every file of a directory fetched without a manifest."""
+        saved = 0
+        for dirpath, dirnames, filenames in os.walk(target_dir):
+            # Skip huggingface_hub's local-dir metadata (.cache/huggingface)
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for fname in filenames:
+                path = os.path.join(dirpath, fname)
+                if os.path.islink(path):
+                    continue
+                try:
+                    saved += self.ingest(f"sha256/{_sha256_file(path)}", path)
+                except OSError as e:
+                    logger.warning(f"Could not add {path} to blob store: {e}")
+        return saved
+
+    def gc(self) -> int:
+        """Delete blobs no version directory links to. Returns bytes freed."""
+        freed = 0
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for fname in filenames:
+                path = os.path.join(dirpath, fname)
+                try:
+                    st = os.stat(path)
+                    if st.st_nlink == 1:
+                        os.unlink(path)
+                        freed += st.st_size
+                except FileNotFoundError:
+                    pass
+        if freed:
+            logger.info(f"Blob store GC freed {freed} bytes")
+        return freed
+
+
+def _link_or_clone(src: str, dest: str) -> None:
+    try:
+        os.link(src, dest)
+        return
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+    # No hardlinks here: try a copy-on-write clone, then a plain copy
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            pass
+        shutil.copyfileobj(fsrc, fdst, _HASH_BUFFER_BYTES)
+
+
+def _sha256_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_HASH_BUFFER_BYTES)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
@@ -1,41 +1,89 @@
-"""Multi-tiered cache manager orchestrating L1 byte store and L2.
+"""Multi-tiered cache manager orchestrating L1 byte store, disk tier and L2.
 
 Accepts raw bytes (not GPU addresses). The engine serializes tensors to bytes,
 sends them over gRPC, and this manager stores them in L1 (fast, local) with
-optional L2 fallback (slower, distributed Redis).
+an optional local disk tier and L2 fallback (slower, distributed Redis).
+
+Blocks evicted from L1 are written back to the next tier down (the disk
+tier if configured, else L2) by background workers, and blocks the disk
+tier evicts go on to L2. At most ``disk_demotion_queue_blocks`` wait to be
+written to the disk tier and ``demotion_queue_blocks`` to L2 (and are still
+served from memory); beyond that evicted blocks are dropped, and a limit of
+0 turns writes to that tier off. A load that misses L1 for a block that was demoted copies it back
+into the requested slot, so the engine keeps addressing it by the block ID
+it stored it under. Promoted blocks keep their disk copy, so evicting them
+again costs no write.
+
+Below the API every tier is keyed by ``block_key(model_id, block_hash)``, so
+a block is only ever served to the model that stored it.
 """
 
+import asyncio
 import logging
 import time
-from typing import Optional
+from typing import Dict, Optional
 
-from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
+from data_plane.inference.sidecar import metrics
+from data_plane.inference.sidecar.disk_tier import DiskTier
+from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry, block_key, split_block_key
 from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
 from data_plane.inference.sidecar.l2_cache.connector import L2Connector
+from data_plane.inference.sidecar.prefix_index import PrefixMatch
 from shared.types import KVBlockEntry
 
 logger = logging.getLogger(__name__)
 
+_TIER_LOOKUPS = {
+    (tier, result): metrics.sidecar_kv_tier_lookups_total.labels(tier=tier, result=result)
+    for tier in ("L1", "DISK", "L2")
+    for result in ("hit", "miss")
+}
+
 
 class MultiTieredCacheManager:
-    """Orchestrates L1 byte store + L2 with registry tracking."""
+    """Orchestrates L1 byte store + disk tier + L2 with registry tracking."""
 
     def __init__(
         self,
         l1: L1ByteStore,
         l2: L2Connector,
         registry: Optional[KVBlockRegistry] = None,
+        demotion_queue_blocks: int = 256,
+        demotion_concurrency: int = 4,
+        disk: Optional[DiskTier] = None,
+        disk_demotion_queue_blocks: int = 256,
     ):
         self.l1 = l1
         self.l2 = l2
+        self.disk = disk
         self.registry = registry or KVBlockRegistry()
+        # tier -> demotions that may wait for it, and how many do
+        self._demotion_limits = {
+            "DISK": disk_demotion_queue_blocks if disk is not None else 0,
+            "L2": demotion_queue_blocks,
+        }
+        self._queued = {"DISK": 0, "L2": 0}
+        self._demotion_concurrency = max(1, demotion_concurrency)
+        # block_key -> evicted bytes not yet written to the next tier
+        self._pending_demotions: Dict[str, bytes] = {}
+        self._demotion_queue: Optional[asyncio.Queue] = None
+        self._demotion_workers: list[asyncio.Task] = []
+        # block_id -> key of the block demoted out of that slot, until the slot is reused
+        self._demoted_slots: Dict[int, str] = {}
+        self.l1.eviction_listener = self._on_l1_eviction
+        if disk is not None:
+            disk.eviction_listener = self._on_disk_eviction
+        metrics.sidecar_kv_demotion_backlog.set_function(lambda: len(self._pending_demotions))
 
     def get_num_free_blocks(self) -> int:
         return self.l1.get_num_free_blocks()
 
-    def allocate_blocks(self, block_hashes: list[str]) -> Optional[list[int]]:
-        """Allocate block slots in L1. Returns block IDs or None if insufficient space."""
-        return self.l1.allocate_blocks(block_hashes)
+    def allocate_blocks(self, block_hashes: list[str], model_id: str = "") -> Optional[list[int]]:
+        """Allocate block slots in the model's L1 namespace. Returns block IDs or None if insufficient space."""
+        ids = self.l1.allocate_blocks([block_key(model_id, h) for h in block_hashes], model_id)
+        for block_id in ids or ():
+            self._demoted_slots.pop(block_id, None)
+        return ids
 
     async def store_block(
         self,
@@ -44,37 +92,272 @@ class MultiTieredCacheManager:
         data: bytes,
         model_id: str = "",
         layer_name: str = "",
+        parent_hash: str = "",
     ) -> bool:
         """Store block bytes in L1, register in metadata."""
-        ok = self.l1.store(block_id, data, block_hash)
+        self._demoted_slots.pop(block_id, None)
+        ok = self.l1.store(block_id, data, block_key(model_id, block_hash))
+        if ok:
+            self._register(block_hash, len(data), model_id, parent_hash)
+        return ok
+
+    def commit_block(
+        self,
+        block_id: int,
+        block_hash: str,
+        size: int,
+        model_id: str = "",
+        parent_hash: str = "",
+    ) -> bool:
+        """Register a block the engine wrote directly into the shared L1 arena."""
+        self._demoted_slots.pop(block_id, None)
+        ok = self.l1.commit(block_id, size, block_key(model_id, block_hash))
         if ok:
-            self.registry.register(KVBlockEntry(
-                key=block_hash,
-                location="L1",
-                size_bytes=len(data),
-                model_id=model_id,
-                prefix_hash=block_hash,
-                created_at=time.time(),
-                last_accessed=time.time(),
-            ))
+            self._register(block_hash, size, model_id, parent_hash)
         return ok
 
-    async def load_block(self, block_id: int) -> Optional[bytes]:
-        """Load block bytes from L1. Returns None on miss."""
-        data = self.l1.load(block_id)
+    def link_block(self, block_id: int, block_hash: str, model_id: str = "") -> bool:
+        """Point ``block_id`` at the L1-resident copy of ``block_hash`` instead of storing it again.
+
+        False if the model's block is not in L1; the caller then stores its bytes.
+        """
+        self._demoted_slots.pop(block_id, None)
+        if not self.l1.link(block_id, block_key(model_id, block_hash)):
+            return False
+        self.registry.record_access(block_hash, model_id)
+        return True
+
+    def longest_prefix(self, block_hashes: list[str], model_id: str = "") -> PrefixMatch:
+        """Leading blocks of a hash chain that are cached, with their tiers."""
+        return self.registry.longest_prefix(block_hashes, model_id)
+
+    def _register(self, block_hash: str, size: int, model_id: str, parent_hash: str = "") -> None:
+        self.registry.register(KVBlockEntry(
+            key=block_hash,
+            location="L1",
+            size_bytes=size,
+            model_id=model_id,
+            prefix_hash=block_hash,
+            parent_hash=parent_hash,
+            created_at=time.time(),
+            last_accessed=time.time(),
+        ))
+
+    async def load_block(self, block_id: int, block_hash: str = "", model_id: str = "") -> Optional[memoryview]:
+        """Load a zero-copy view of block bytes, promoting the block from a lower tier on an L1 miss.
+
+        ``block_hash`` is the block the caller expects in the slot; without it
+        only a block demoted from this very slot can be promoted. Either way
+        only blocks ``model_id`` stored are promoted. Returns None on miss.
+        """
+        data = None
+        key = block_key(model_id, block_hash) if block_hash else ""
+        if not key or self.l1._id_to_hash.get(block_id) == key:
+            data = self.l1.load(block_id)
+        if data is not None:
+            _TIER_LOOKUPS["L1", "hit"].inc()
+            key = self.l1._id_to_hash.get(block_id)
+        else:
+            _TIER_LOOKUPS["L1", "miss"].inc()
+            key = key or self._demoted_slots.get(block_id, "")
+            if key:
+                data = await self._promote(block_id, key, model_id)
         if data is not None:
             self.registry._hits += 1
-            block_hash = self.l1._id_to_hash.get(block_id)
-            if block_hash:
-                self.registry.record_access(block_hash)
+            if key:
+                owner, block_hash = split_block_key(key)
+                self.registry.record_access(block_hash, owner)
         else:
             self.registry._misses += 1
         return data
 
+    async def _promote(self, block_id: int, key: str, model_id: str) -> Optional[memoryview]:
+        """Copy a demoted block of ``model_id`` back into L1 at ``block_id``."""
+        owner, block_hash = split_block_key(key)
+        if owner != model_id:
+            return None  # another model's block, demoted out of a shared slot
+        namespace = self.l1.namespace_of(block_id)
+        if self.l1.slot_of(key, namespace) not in (None, block_id):
+            return None  # cached in L1 under another slot
+        tier = self.registry.location(block_hash, model_id)
+        if tier not in ("DISK", "L2"):
+            return None
+        occupant = self.l1._id_to_hash.get(block_id)
+        data, source = await self._read_lower_tier(key, tier)
+        if data is None:
+            _TIER_LOOKUPS[tier, "miss"].inc()
+            return None
+        _TIER_LOOKUPS[tier, "hit"].inc()
+        # The slot or the block may have moved while L2 answered
+        if (
+            self.l1._id_to_hash.get(block_id) != occupant
+            or self.l1.slot_of(key, namespace) not in (None, block_id)
+        ):
+            return None
+        if occupant is not None and occupant != key:
+            # The slot was reused: the current block is demoted in turn
+            self.l1._evict(block_id)
+        self._demoted_slots.pop(block_id, None)
+        if not self.l1.store(block_id, data, key):
+            return None
+        if not self.registry.update_location(block_hash, "L1", model_id):
+            self._register(block_hash, len(data), model_id)
+        metrics.sidecar_kv_promotions_total.labels(source=source).inc()
+        return self.l1._peek(block_id)
+
+    async def _read_lower_tier(self, key: str, tier: str) -> tuple[Optional[object], str]:
+        """A demoted block's bytes and where they came from; None if the tier lost it."""
+        data = self._pending_demotions.get(key)
+        if data is not None:
+            return data, "pending"
+        if tier == "DISK":
+            return (self.disk.get(key) if self.disk is not None else None), "DISK"
+        result = await self.l2.get(key)
+        return (result.data if result.success else None), "L2"
+
+    async def lookup_blocks(
+        self, block_hashes: list[str], include_data: bool = False, model_id: str = ""
+    ) -> list[tuple[int, str, Optional[bytes]]]:
+        """(L1 block_id or -1, tier or "", bytes if requested and cached) for each hash.
+
+        L1 slots are looked up in the model's namespace. Blocks in lower
+        tiers are read where they are, not promoted.
+        """
+        results = []
+        for block_hash in block_hashes:
+            key = block_key(model_id, block_hash)
+            block_id = self.l1.resident_id(key, model_id)
+            location = "L1" if block_id is not None else self.registry.location(block_hash, model_id) or ""
+            data = None
+            if include_data and block_id is not None:
+                data = bytes(self.l1._peek(block_id))
+            elif include_data and location:
+                lower, _ = await self._read_lower_tier(key, location)
+                data = bytes(lower) if lower is not None else None
+            results.append((-1 if block_id is None else block_id, location, data))
+        return results
+
+    def list_blocks(
+        self, model_id: str = "", start_block_id: int = 0, max_blocks: int = 4096
+    ) -> tuple[list[tuple[str, int]], int]:
+        """One page of (block_hash, block_id) for blocks resident in L1, in block_id order.
+
+        Returns the page and the start_block_id of the next one (-1 after the last).
+        """
+        page = []
+        for block_id, key in sorted(self.l1.resident_blocks()):
+            if block_id < start_block_id:
+                continue
+            if len(page) == max_blocks:
+                return page, block_id
+            owner, block_hash = split_block_key(key)
+            if model_id and owner != model_id:
+                continue
+            page.append((block_hash, block_id))
+        return page, -1
+
+    def _on_l1_eviction(self, block_id: int, key: str, data: Optional[memoryview]) -> None:
+        model_id, block_hash = split_block_key(key)
+        tier = "DISK" if self.disk is not None else "L2"
+        if data is None or not self._start_demotion(tier):
+            self.registry.unregister(block_hash, model_id)
+            return
+        if tier == "DISK" and key in self.disk:
+            # Promoted from the disk tier earlier and still there
+            self.registry.update_location(block_hash, "DISK", model_id)
+        elif not self._queue_demotion(key, data, tier):
+            return
+        self._demoted_slots[block_id] = key
+
+    def _on_disk_eviction(self, key: str, data: memoryview) -> None:
+        # Blocks back in L1 (or already gone) only lose their disk copy
+        model_id, block_hash = split_block_key(key)
+        if self.registry.location(block_hash, model_id) != "DISK":
+            return
+        if not self._start_demotion("L2"):
+            self.registry.unregister(block_hash, model_id)
+            return
+        self._queue_demotion(key, data, "L2")
+
+    def _queue_demotion(self, key: str, data, tier: str) -> bool:
+        model_id, block_hash = split_block_key(key)
+        if self._queued[tier] >= self._demotion_limits[tier]:
+            metrics.sidecar_kv_demotions_total.labels(tier=tier, status="dropped").inc()
+            self.registry.unregister(block_hash, model_id)
+            return False
+        self._queued[tier] += 1
+        self._pending_demotions[key] = bytes(data)
+        self.registry.update_location(block_hash, tier, model_id)
+        self._demotion_queue.put_nowait((key, tier))
+        return True
+
+    def _start_demotion(self, tier: str) -> bool:
+        """Start the demotion writers on first use. False if demotion to ``tier`` is off or there is no event loop."""
+        if self._demotion_limits[tier] <= 0:
+            return False
+        if self._demotion_queue is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return False
+            self._demotion_queue = asyncio.Queue()
+            self._demotion_workers = [
+                asyncio.create_task(self._demotion_worker()) for _ in range(self._demotion_concurrency)
+            ]
+        return True
+
+    async def _demotion_worker(self) -> None:
+        while True:
+            key, tier = await self._demotion_queue.get()
+            try:
+                data = self._pending_demotions.get(key)
+                if data is None:
+                    continue
+                if tier == "DISK":
+                    # A page-cache copy; the kernel writes it back to the SSD
+                    ok, message = self.disk.put(key, data), "disk tier full"
+                else:
+                    try:
+                        result = await self.l2.put(key, data)
+                        ok, message = result.success, result.message
+                    except Exception as e:
+                        ok, message = False, str(e)
+                if self._pending_demotions.get(key) is data:
+                    del self._pending_demotions[key]
+                if ok:
+                    metrics.sidecar_kv_demotions_total.labels(tier=tier, status="ok").inc()
+                    continue
+                logger.warning(f"Demoting block {key} to {tier} failed: {message}")
+                metrics.sidecar_kv_demotions_total.labels(tier=tier, status="failed").inc()
+                model_id, block_hash = split_block_key(key)
+                if self.registry.location(block_hash, model_id) == tier:
+                    self.registry.unregister(block_hash, model_id)
+            finally:
+                self._queued[tier] -= 1
+                self._demotion_queue.task_done()
+
+    async def drain_demotions(self) -> None:
+        """Wait until every queued demotion has been written (or has failed)."""
+        if self._demotion_queue is not None:
+            await self._demotion_queue.join()
+
+    async def close(self) -> None:
+        """Stop the demotion writers; blocks still queued are dropped."""
+        for task in self._demotion_workers:
+            task.cancel()
+        await asyncio.gather(*self._demotion_workers, return_exceptions=True)
+        self._demotion_workers = []
+        self._demotion_queue = None
+        self._pending_demotions.clear()
+        self._queued = {"DISK": 0, "L2": 0}
+
     def free_block(self, block_id: int) -> bool:
         """Free a block slot and unregister from metadata."""
-        block_hash = self.l1._id_to_hash.get(block_id)
+        self._demoted_slots.pop(block_id, None)
+        key = self.l1._id_to_hash.get(block_id)
         result = self.l1.free(block_id)
-        if result and block_hash:
-            self.registry.unregister(block_hash)
+        # Freeing a link leaves the block resident under its owning slot
+        if result and key and self.l1.resident_id(key, self.l1.namespace_of(block_id)) is None:
+            model_id, block_hash = split_block_key(key)
+            self.registry.unregister(block_hash, model_id)
         return result
@@ -4,11 +4,12 @@ Backward-compatible: ``SidecarConfig()`` still works as before, but field
 definitions now come from the unified ``SidecarSection`` model.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
-from shared.config import SidecarSection, _get_section, _env_overlay
+from shared.config import SidecarSection, _get_section, _env_overlay, _parse_list
 from shared.config_loader import get_config
 
 
@@ -42,13 +43,48 @@ class SidecarConfig(BaseSettings):
     registry_path: str = SidecarSection.model_fields["registry_path"].default
     l1_num_blocks: int = SidecarSection.model_fields["l1_num_blocks"].default
     l1_block_size_bytes: int = SidecarSection.model_fields["l1_block_size_bytes"].default
+    l1_shm_path: Optional[str] = SidecarSection.model_fields["l1_shm_path"].default
+    l1_eviction_policy: str = SidecarSection.model_fields["l1_eviction_policy"].default
+    l1_tinylfu_admission: bool = SidecarSection.model_fields["l1_tinylfu_admission"].default
+    l1_compression: str = SidecarSection.model_fields["l1_compression"].default
+    l1_arena_bytes: int = SidecarSection.model_fields["l1_arena_bytes"].default
+    l1_compression_min_ratio: float = SidecarSection.model_fields["l1_compression_min_ratio"].default
+    l1_compression_cpu_budget_us: float = SidecarSection.model_fields["l1_compression_cpu_budget_us"].default
+    l1_namespace_weights: Dict[str, float] = SidecarSection.model_fields["l1_namespace_weights"].default_factory()  # type: ignore[misc]
+    l2_demotion_queue_blocks: int = SidecarSection.model_fields["l2_demotion_queue_blocks"].default
+    l2_demotion_concurrency: int = SidecarSection.model_fields["l2_demotion_concurrency"].default
+    disk_tier_path: Optional[str] = SidecarSection.model_fields["disk_tier_path"].default
+    disk_tier_capacity_gb: float = SidecarSection.model_fields["disk_tier_capacity_gb"].default
+    disk_tier_eviction_policy: str = SidecarSection.model_fields["disk_tier_eviction_policy"].default
+    disk_demotion_queue_blocks: int = SidecarSection.model_fields["disk_demotion_queue_blocks"].default
+    kv_registry_path: Optional[str] = SidecarSection.model_fields["kv_registry_path"].default
+    kv_registry_flush_delay_ms: float = SidecarSection.model_fields["kv_registry_flush_delay_ms"].default
     # New fields
     hf_token_file: Optional[str] = SidecarSection.model_fields["hf_token_file"].default
     verify_checksums: bool = SidecarSection.model_fields["verify_checksums"].default
     log_json: bool = SidecarSection.model_fields["log_json"].default
     log_level: str = SidecarSection.model_fields["log_level"].default
+    download_engine: str = SidecarSection.model_fields["download_engine"].default
+    download_workers: int = SidecarSection.model_fields["download_workers"].default
+    download_chunk_bytes: int = SidecarSection.model_fields["download_chunk_bytes"].default
+    download_max_retries: int = SidecarSection.model_fields["download_max_retries"].default
+    download_max_concurrent: int = SidecarSection.model_fields["download_max_concurrent"].default
+    download_bandwidth_bytes_per_s: int = SidecarSection.model_fields["download_bandwidth_bytes_per_s"].default
+    page_cache_warm_on_load: bool = SidecarSection.model_fields["page_cache_warm_on_load"].default
+    page_cache_warm_workers: int = SidecarSection.model_fields["page_cache_warm_workers"].default
+    page_cache_max_memory_fraction: float = SidecarSection.model_fields["page_cache_max_memory_fraction"].default
+    model_quota_bytes: int = SidecarSection.model_fields["model_quota_bytes"].default
+    adapter_quota_bytes: int = SidecarSection.model_fields["adapter_quota_bytes"].default
+    disk_min_free_bytes: int = SidecarSection.model_fields["disk_min_free_bytes"].default
+    eviction_policy: str = SidecarSection.model_fields["eviction_policy"].default
+    content_addressed_store: bool = SidecarSection.model_fields["content_addressed_store"].default
+    peer_urls: List[str] = SidecarSection.model_fields["peer_urls"].default_factory()  # type: ignore[misc]
+    peer_discovery_dns: Optional[str] = SidecarSection.model_fields["peer_discovery_dns"].default
+    peer_token_file: Optional[str] = SidecarSection.model_fields["peer_token_file"].default
     otlp_endpoint: Optional[str] = None
 
+    _split_peer_urls = field_validator("peer_urls", mode="before")(_parse_list)
+
     @classmethod
     def settings_customise_sources(cls, settings_cls, **kwargs):
         return (
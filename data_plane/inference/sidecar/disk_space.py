@@ -0,0 +1,168 @@
+"""Shared-volume space accounting and eviction planning for artifacts.
+
+Pure policy plus the crash-safe delete primitive; ``ArtifactManager`` owns the
+registry and decides which artifacts are referenced.
+
+Eviction is a two-step delete: the version directory is first renamed to
+``<dir>.evicting`` (atomic, so a crash never leaves a half-deleted directory
+under a live name), then removed. On startup, ``sweep_evicting`` finishes any
+deletes interrupted by a crash and reports which artifact paths they belonged
+to so stale registry entries can be dropped.
+"""
+
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVICTING_SUFFIX = ".evicting"
+
+
+class InsufficientDiskSpace(OSError):
+    """Raised before a download that cannot fit even after evicting everything evictable."""
+
+
+@dataclass
+class EvictionCandidate:
+    artifact_type: str  # "model" | "adapter"
+    identifier: str
+    local_path: str
+    size_bytes: int  # bytes evicting it frees, see measure_footprints
+    last_used: float
+    use_count: int
+
+
+def measure_footprints(paths: Dict[Hashable, str]) -> Tuple[Dict[Hashable, int], Dict[str, int]]:
+    """Bytes each artifact would free, and bytes on disk per artifact type.
+
+    ``paths`` maps ``(artifact_type, identifier)`` to the artifact's directory.
+    Versions share content-addressed blobs through hardlinks, so every inode is
+    counted once: towards each type that links it, and towards the freeable
+    bytes of an artifact only if no other listed artifact links it (its blob
+    store link is garbage-collected with the artifact).
+    """
+    # (st_dev, st_ino) -> (size, artifacts linking it)
+    inodes: Dict[Tuple[int, int], Tuple[int, set]] = {}
+    for key, path in paths.items():
+        for dirpath, _dirnames, filenames in os.walk(path):
+            for fname in filenames:
+                try:
+                    st = os.stat(os.path.join(dirpath, fname))
+                except OSError:
+                    continue
+                inodes.setdefault((st.st_dev, st.st_ino), (st.st_size, set()))[1].add(key)
+    exclusive = {key: 0 for key in paths}
+    usage: Dict[str, int] = {}
+    for size, owners in inodes.values():
+        if len(owners) == 1:
+            exclusive[next(iter(owners))] += size
+        for artifact_type in {artifact_type for artifact_type, _ in owners}:
+            usage[artifact_type] = usage.get(artifact_type, 0) + size
+    return exclusive, usage
+
+
+def order_candidates(candidates: Iterable[EvictionCandidate], policy: str) -> List[EvictionCandidate]:
+    """Eviction order, first victim first: ``lru`` by recency, ``lfu`` by use count then recency."""
+    if policy == "lfu":
+        return sorted(candidates, key=lambda c: (c.use_count, c.last_used))
+    return sorted(candidates, key=lambda c: c.last_used)
+
+
+def plan_evictions(
+    artifact_type: str,
+    need_bytes: int,
+    candidates: List[EvictionCandidate],
+    used_bytes: Dict[str, int],
+    quotas: Dict[str, int],
+    free_bytes: int,
+    min_free_bytes: int,
+    policy: str = "lru",
+) -> Optional[List[EvictionCandidate]]:
+    """Pick victims so a ``need_bytes`` download of ``artifact_type`` fits.
+
+    Two constraints: the artifact type's byte quota (0 = unlimited), which only
+    same-type artifacts can be evicted for, and the volume's free-space floor,
+    which any artifact can be evicted for. Candidates are credited with
+    ``size_bytes`` only, so content shared by several victims is not counted
+    and the plan may evict more than strictly needed, never less. Returns None
+    if the candidates cannot free enough space.
+    """
+    victims: List[EvictionCandidate] = []
+    chosen = set()
+
+    quota = quotas.get(artifact_type, 0)
+    over_quota = used_bytes.get(artifact_type, 0) + need_bytes - quota if quota else 0
+    for c in order_candidates((c for c in candidates if c.artifact_type == artifact_type), policy):
+        if over_quota <= 0:
+            break
+        victims.append(c)
+        chosen.add(id(c))
+        over_quota -= c.size_bytes
+        free_bytes += c.size_bytes
+    if over_quota > 0:
+        return None
+
+    short = min_free_bytes + need_bytes - free_bytes
+    for c in order_candidates((c for c in candidates if id(c) not in chosen), policy):
+        if short <= 0:
+            break
+        victims.append(c)
+        short -= c.size_bytes
+    if short > 0:
+        return None
+    return victims
+
+
+def begin_evict(path: str) -> Optional[str]:
+    """Atomically retire ``path`` by renaming it aside. Returns the new path."""
+    if not os.path.exists(path):
+        return None
+    doomed = path.rstrip(os.sep) + EVICTING_SUFFIX
+    if os.path.exists(doomed):
+        shutil.rmtree(doomed, ignore_errors=True)
+    os.rename(path, doomed)
+    _fsync_dir(os.path.dirname(doomed))
+    return doomed
+
+
+def finish_evict(doomed: str) -> None:
+    """Delete a renamed-aside directory, then its artifact parent if now empty."""
+    shutil.rmtree(doomed, ignore_errors=True)
+    parent = os.path.dirname(doomed)
+    try:
+        os.rmdir(parent)
+    except OSError:
+        pass
+
+
+def sweep_evicting(root: str) -> List[str]:
+    """Finish interrupted evictions under ``root``; returns the original artifact paths."""
+    recovered = []
+    if not os.path.isdir(root):
+        return recovered
+    for dirpath, dirnames, _filenames in os.walk(root):
+        for name in list(dirnames):
+            if name.endswith(EVICTING_SUFFIX):
+                dirnames.remove(name)
+                doomed = os.path.join(dirpath, name)
+                recovered.append(doomed[: -len(EVICTING_SUFFIX)])
+                finish_evict(doomed)
+    if recovered:
+        logger.info(f"Completed {len(recovered)} interrupted evictions under {root}")
+    return recovered
+
+
+def _fsync_dir(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
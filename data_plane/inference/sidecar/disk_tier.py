@@ -0,0 +1,163 @@
+"""Disk tier — file-backed KV block store between L1 and L2.
+
+Blocks live in one preallocated slab file on a local SSD, mapped with mmap:
+``capacity_bytes // block_size_bytes`` fixed slots, slot ``i`` at offset
+``i * block_size_bytes``, so finding a block is a dict lookup plus an
+offset. A write is a memory copy into the page cache and the kernel writes
+the dirty pages back to the SSD in the background (write-behind); reads are
+served from the page cache, or at SSD latency once the pages were dropped.
+
+The tier has its own eviction policy. Blocks it evicts are passed to
+``eviction_listener`` so the cache manager can hand them on to L2.
+
+The slab is a cache, not storage: its contents are not indexed across
+restarts, so the tier always starts empty.
+"""
+
+import logging
+import mmap
+import os
+from array import array
+from typing import Callable, Optional
+
+from data_plane.inference.sidecar import metrics
+from data_plane.inference.sidecar.l1_cache.allocator import BlockSlotAllocator
+from data_plane.inference.sidecar.l1_cache.eviction_policy import make_eviction_policy
+
+logger = logging.getLogger(__name__)
+
+
+class DiskTier:
+    """Fixed-slot block store in a memory-mapped slab file, keyed by block hash."""
+
+    _EMPTY = -1
+
+    def __init__(
+        self,
+        path: str,
+        capacity_bytes: int,
+        block_size_bytes: int = 131072,
+        eviction_policy: str = "lru",
+    ):
+        num_slots = capacity_bytes // block_size_bytes
+        if num_slots <= 0:
+            raise ValueError(f"Disk tier of {capacity_bytes} bytes cannot hold a {block_size_bytes}-byte block")
+        self._path = path
+        self._block_size = block_size_bytes
+        self.allocator = BlockSlotAllocator(num_slots)
+        self.eviction_policy = make_eviction_policy(eviction_policy, num_slots)
+
+        slab_bytes = num_slots * block_size_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size != slab_bytes:
+                os.ftruncate(fd, slab_bytes)
+            # Reserve the extents up front so write-back never hits ENOSPC
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, slab_bytes)
+            self._slab = mmap.mmap(fd, slab_bytes)
+        finally:
+            os.close(fd)
+        self._view = memoryview(self._slab)
+
+        # slot -> stored length in bytes, _EMPTY if the slot holds no block
+        self._lengths = array("q", [self._EMPTY]) * num_slots
+        self._slot_to_hash: dict[int, str] = {}
+        self._hash_to_slot: dict[str, int] = {}
+        self._used_bytes = 0
+        # Called as (block_hash, data) for every block evicted for capacity;
+        # data is a view of the slab, valid only during the call
+        self.eviction_listener: Optional[Callable[[str, memoryview], object]] = None
+
+        metrics.sidecar_kv_disk_capacity_bytes.set(slab_bytes)
+        metrics.sidecar_kv_disk_used_bytes.set_function(lambda: self._used_bytes)
+        logger.info(f"Disk tier at {path}: {num_slots} slots of {block_size_bytes} bytes")
+
+    @property
+    def num_blocks(self) -> int:
+        return self.allocator.num_blocks
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used_bytes
+
+    def __len__(self) -> int:
+        return len(self._hash_to_slot)
+
+    def __contains__(self, block_hash: str) -> bool:
+        return block_hash in self._hash_to_slot
+
+    def put(self, block_hash: str, data) -> bool:
+        """Copy a block into its slot, evicting others for room. False if it cannot be stored."""
+        size = len(data)
+        if size > self._block_size:
+            logger.warning(f"Block {block_hash} is {size} bytes, larger than the {self._block_size}-byte slot")
+            return False
+        slot = self._hash_to_slot.get(block_hash)
+        if slot is None:
+            slot = self._allocate()
+            if slot is None:
+                return False
+            self._slot_to_hash[slot] = block_hash
+            self._hash_to_slot[block_hash] = slot
+            self.eviction_policy.track_new(block_hash, size)
+        else:
+            self._used_bytes -= self._lengths[slot]
+            self.eviction_policy.record_access(block_hash)
+        offset = slot * self._block_size
+        self._view[offset:offset + size] = data
+        self._lengths[slot] = size
+        self._used_bytes += size
+        return True
+
+    def get(self, block_hash: str) -> Optional[memoryview]:
+        """View of the block's bytes in the slab, valid until it is evicted. None on miss."""
+        slot = self._hash_to_slot.get(block_hash)
+        if slot is None:
+            return None
+        self.eviction_policy.record_access(block_hash)
+        offset = slot * self._block_size
+        return self._view[offset:offset + self._lengths[slot]]
+
+    def remove(self, block_hash: str) -> bool:
+        slot = self._hash_to_slot.pop(block_hash, None)
+        if slot is None:
+            return False
+        self.eviction_policy.remove(block_hash)
+        self._release(slot)
+        return True
+
+    def _allocate(self) -> Optional[int]:
+        slot = self.allocator.allocate()
+        while slot is None:
+            victim = self.eviction_policy.select_victim()
+            if victim is None:
+                return None
+            victim_slot = self._hash_to_slot.pop(victim, None)
+            if victim_slot is None:
+                self.eviction_policy.remove(victim)
+                continue
+            self.eviction_policy.on_evict(victim)
+            if self.eviction_listener is not None:
+                offset = victim_slot * self._block_size
+                self.eviction_listener(victim, self._view[offset:offset + self._lengths[victim_slot]])
+            self._release(victim_slot)
+            metrics.sidecar_kv_disk_evictions_total.inc()
+            slot = self.allocator.allocate()
+        return slot
+
+    def _release(self, slot: int) -> None:
+        self._slot_to_hash.pop(slot, None)
+        self._used_bytes -= self._lengths[slot]
+        self._lengths[slot] = self._EMPTY
+        self.allocator.free(slot)
+
+    def close(self) -> None:
+        """Unmap the slab. The file stays for the next start to reuse."""
+        try:
+            self._view.release()
+            self._slab.close()
+        except BufferError:
+            # A caller still holds a block view; the mapping goes with the process
+            logger.debug("Disk tier slab still referenced at close")
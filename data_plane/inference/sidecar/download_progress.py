@@ -0,0 +1,99 @@
+"""Byte-counter download progress, fed by the fetchers themselves.
+
+``ProgressTracker`` receives byte increments from downloader worker threads
+(or from a tqdm hook installed into ``snapshot_download``) and keeps the
+shared ``download_progress`` entry, the ETA and the throughput gauge current.
+Nothing here touches the filesystem, so progress reporting never blocks the
+sidecar event loop that also serves gRPC KV traffic and health probes.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from tqdm.auto import tqdm
+
+from data_plane.inference.sidecar import metrics
+from data_plane.inference.sidecar.download_scheduler import estimate_eta
+
+# Minimum window for the instantaneous throughput sample
+_THROUGHPUT_WINDOW_S = 1.0
+
+
+class ProgressTracker:
+    """Thread-safe byte counter for one in-flight download."""
+
+    def __init__(self, progress: dict, artifact_type: str, identifier: str):
+        self._progress = progress
+        self._artifact_type = artifact_type
+        self._identifier = identifier
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self.bytes_seen = 0
+        # Set once the directory-scan fallback has taken over byte counting
+        self.from_fallback = False
+
+    def set_total(self, total: Optional[int]) -> None:
+        with self._lock:
+            self._progress["total_bytes"] = total
+
+    def add(self, n: int) -> None:
+        if n <= 0:
+            return
+        metrics.sidecar_download_bytes_total.labels(artifact_type=self._artifact_type).inc(n)
+        with self._lock:
+            self.bytes_seen += n
+            self._progress["downloaded_bytes"] = self._progress.get("downloaded_bytes", 0) + n
+            self._progress["eta_s"] = estimate_eta(self._progress)
+
+            self._window_bytes += n
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed >= _THROUGHPUT_WINDOW_S:
+                rate = self._window_bytes / elapsed
+                self._progress["throughput_bytes_per_s"] = rate
+                metrics.sidecar_download_throughput_bytes_per_second.labels(
+                    artifact_type=self._artifact_type, identifier=self._identifier
+                ).set(rate)
+                self._window_start = now
+                self._window_bytes = 0
+
+    def set_downloaded(self, total_on_disk: int) -> None:
+        """Absolute update, used only by the directory-size fallback."""
+        with self._lock:
+            delta = total_on_disk - self._progress.get("downloaded_bytes", 0)
+        self.add(delta)
+
+    def close(self) -> None:
+        try:
+            metrics.sidecar_download_throughput_bytes_per_second.remove(self._artifact_type, self._identifier)
+        except KeyError:
+            pass
+
+
+def progress_tqdm(tracker: ProgressTracker) -> type:
+    """Build a silent tqdm class that forwards byte updates to ``tracker``.
+
+    Passed as ``snapshot_download(tqdm_class=...)``. Only byte-unit bars are
+    counted, and the network "Downloading bytes" bar is skipped because it
+    duplicates the on-disk byte bar. Older huggingface_hub releases only hand
+    this class the file-count bar, so no bytes arrive; callers fall back to
+    an off-loop directory scan in that case.
+    """
+
+    class _ProgressTqdm(tqdm):
+        def __init__(self, *args, **kwargs):
+            kwargs.pop("name", None)
+            kwargs["disable"] = True
+            self._counts_bytes = kwargs.get("unit") == "B" and not str(kwargs.get("desc", "")).startswith(
+                "Downloading bytes"
+            )
+            super().__init__(*args, **kwargs)
+
+        def update(self, n=1):
+            if self._counts_bytes and n:
+                tracker.add(int(n))
+            return super().update(n)
+
+    return _ProgressTqdm
@@ -0,0 +1,239 @@
+"""Priority-aware admission and bandwidth control for artifact downloads.
+
+Downloads wait for a slot in priority order (request-blocking adapters, then
+prefetches, then background models). Request-blocking downloads have their own
+concurrency budget, so they never queue behind a large model. While a
+higher-priority download is running, lower-priority ones stop handing chunks to
+the downloader's worker pool (priority gating), so the urgent download's chunks
+get every worker as soon as the ones already running finish. All chunked
+downloads draw from one shared token bucket when a bandwidth cap is configured.
+
+Queue state is published into ``ArtifactManager.download_progress`` so the
+existing ``/status`` and ``/registry`` views show ``queue_position``,
+``priority`` and ``eta_s``.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional
+
+from data_plane.inference.sidecar import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadPriority(IntEnum):
+    """Lower value = more urgent."""
+
+    BLOCKING = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+    @classmethod
+    def parse(cls, value: str) -> "DownloadPriority":
+        try:
+            return cls[value.upper()]
+        except KeyError:
+            choices = ", ".join(p.name.lower() for p in cls)
+            raise ValueError(f"Unknown download priority '{value}' (expected one of: {choices})") from None
+
+
+def estimate_eta(progress: dict) -> Optional[float]:
+    """Seconds remaining for an active download, from its average throughput so far."""
+    total = progress.get("total_bytes")
+    done = progress.get("downloaded_bytes", 0)
+    started = progress.get("started_at")
+    if not total or not started or done <= 0:
+        return None
+    elapsed = time.time() - started
+    if elapsed <= 0:
+        return None
+    return max(0.0, (total - done) / (done / elapsed))
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "identifier", "granted")
+
+    def __init__(self, priority: DownloadPriority, seq: int, identifier: str, granted: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.identifier = identifier
+        self.granted = granted
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class DownloadScheduler:
+    """Admits downloads by priority and meters their bandwidth.
+
+    Admission state lives on the event loop; ``wait_turn`` is called from the
+    threads submitting chunks and ``throttle`` from downloader worker threads,
+    so the priorities of active downloads and the token bucket are guarded by
+    a ``threading.Condition``.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        bandwidth_bytes_per_s: int = 0,
+        progress: Optional[Dict[str, dict]] = None,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        self._max_concurrent = max_concurrent
+        self._bandwidth = bandwidth_bytes_per_s
+        self._progress = progress if progress is not None else {}
+
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._active: Dict[str, DownloadPriority] = {}
+        self._cond = threading.Condition()
+
+        # Token bucket (bytes); may go negative, in which case callers sleep off the debt
+        self._tokens = float(bandwidth_bytes_per_s)
+        self._last_refill = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Admission (event loop)
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, identifier: str, priority: DownloadPriority = DownloadPriority.BACKGROUND):
+        """Hold a download slot for ``identifier`` for the duration of the block."""
+        ticket = _Ticket(priority, next(self._seq), identifier, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, ticket)
+        self._dispatch()
+        try:
+            await ticket.granted
+        except asyncio.CancelledError:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._publish_queue()
+            elif ticket.granted.done():
+                # Cancelled after being granted but before resuming — hand the slot back
+                with self._cond:
+                    self._active.pop(identifier, None)
+                    self._cond.notify_all()
+                self._dispatch()
+            raise
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active.pop(identifier, None)
+                self._cond.notify_all()
+            self._dispatch()
+
+    def raise_priority(self, identifier: str, priority: DownloadPriority) -> bool:
+        """Escalate a queued or running download. Returns True if anything changed."""
+        for ticket in self._queue:
+            if ticket.identifier == identifier and priority < ticket.priority:
+                ticket.priority = priority
+                heapq.heapify(self._queue)
+                logger.info(f"Raised queued download {identifier} to {priority.name.lower()}")
+                self._dispatch()
+                return True
+        with self._cond:
+            current = self._active.get(identifier)
+            if current is not None and priority < current:
+                self._active[identifier] = priority
+                self._cond.notify_all()
+                if identifier in self._progress:
+                    self._progress[identifier]["priority"] = priority.name.lower()
+                logger.info(f"Raised running download {identifier} to {priority.name.lower()}")
+                return True
+        return False
+
+    def _can_start(self, priority: DownloadPriority) -> bool:
+        if priority == DownloadPriority.BLOCKING:
+            blocking = sum(1 for p in self._active.values() if p == DownloadPriority.BLOCKING)
+            return blocking < self._max_concurrent
+        return len(self._active) < self._max_concurrent
+
+    def _dispatch(self) -> None:
+        while self._queue and self._can_start(self._queue[0].priority):
+            ticket = heapq.heappop(self._queue)
+            if ticket.granted.done():
+                continue
+            with self._cond:
+                self._active[ticket.identifier] = ticket.priority
+            entry = self._progress.setdefault(ticket.identifier, {})
+            entry.update({"status": "downloading", "queue_position": 0, "priority": ticket.priority.name.lower()})
+            ticket.granted.set_result(None)
+        self._publish_queue()
+
+    def _publish_queue(self) -> None:
+        for position, ticket in enumerate(sorted(self._queue), start=1):
+            entry = self._progress.setdefault(ticket.identifier, {"downloaded_bytes": 0, "total_bytes": None})
+            entry.update({
+                "status": "queued",
+                "queue_position": position,
+                "priority": ticket.priority.name.lower(),
+                "eta_s": None,
+            })
+        for priority in DownloadPriority:
+            metrics.sidecar_download_queue_depth.labels(priority=priority.name.lower()).set(
+                sum(1 for t in self._queue if t.priority == priority)
+            )
+
+    @property
+    def queued(self) -> List[str]:
+        return [t.identifier for t in sorted(self._queue)]
+
+    @property
+    def active(self) -> Dict[str, DownloadPriority]:
+        return dict(self._active)
+
+    # ------------------------------------------------------------------
+    # Priority gating (submitting threads)
+    # ------------------------------------------------------------------
+
+    def gate_for(self, identifier: str) -> Callable[[], None]:
+        """Return a per-download hook the chunked downloader calls before submitting each chunk."""
+        return lambda: self.wait_turn(identifier)
+
+    def wait_turn(self, identifier: str) -> None:
+        """Block while a more urgent download is active.
+
+        Must not run on a downloader worker: a paused download would hold the
+        workers the urgent one needs.
+        """
+        with self._cond:
+            while self._outranked(identifier):
+                self._cond.wait(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # Bandwidth (worker threads)
+    # ------------------------------------------------------------------
+
+    def throttle_for(self, identifier: str) -> Callable[[int], None]:
+        """Return a per-download hook the chunked downloader calls before each chunk request."""
+        return lambda nbytes: self.throttle(identifier, nbytes)
+
+    def throttle(self, identifier: str, nbytes: int) -> None:
+        """Charge ``nbytes`` to the shared token bucket and sleep off any deficit."""
+        if self._bandwidth <= 0:
+            return
+        with self._cond:
+            now = time.monotonic()
+            self._tokens = min(float(self._bandwidth), self._tokens + (now - self._last_refill) * self._bandwidth)
+            self._last_refill = now
+            self._tokens -= nbytes
+            delay = -self._tokens / self._bandwidth if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+
+    def _outranked(self, identifier: str) -> bool:
+        mine = self._active.get(identifier)
+        if mine is None:
+            return False
+        return any(p < mine for other, p in self._active.items() if other != identifier)
@@ -0,0 +1,371 @@
+"""Parallel, resumable, checksum-verified artifact downloader.
+
+Files are split into fixed-size chunks fetched with HTTP Range requests on a
+bounded thread pool shared by every download in the sidecar. Each file is
+written to ``<name>.part`` at chunk offsets; completed chunk indices are
+recorded in ``<name>.part.state`` (every ``_STATE_SAVE_INTERVAL_S`` and when
+the download stops) so an interrupted download resumes where it stopped; a
+hard crash re-fetches at most the chunks of the last interval. Hashing runs alongside the download: whenever the contiguous prefix
+of completed chunks grows, the new bytes are fed to the hasher, so the digest
+is ready the moment the last chunk lands. The final path only ever appears via
+``os.replace`` after verification, so an existing final file is trusted.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int], None]
+
+# How often a file's resume state is rewritten while its chunks land
+_STATE_SAVE_INTERVAL_S = 2.0
+
+
+class ChecksumMismatch(Exception):
+    """Raised when a downloaded file does not match its expected digest."""
+
+    def __init__(self, path: str, expected: str, actual: str):
+        self.path = path
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"Checksum mismatch for {path}: expected {expected}, got {actual}")
+
+
+@dataclass
+class RemoteFile:
+    """One file of a remote artifact.
+
+    ``sha256`` is the LFS content hash; ``git_sha1`` is the git blob id used
+    for small non-LFS files. Either may be None if the source provides neither.
+    ``mirrors`` are alternative URLs serving identical bytes (e.g. peer
+    sidecars); chunks are spread across ``url`` and every mirror.
+    """
+
+    path: str
+    size: int
+    url: str
+    sha256: Optional[str] = None
+    git_sha1: Optional[str] = None
+    mirrors: List[str] = field(default_factory=list)
+
+    @property
+    def urls(self) -> List[str]:
+        return [self.url, *self.mirrors]
+
+
+def hub_manifest(
+    repo_id: str,
+    revision: Optional[str] = None,
+    token: Optional[str] = None,
+    endpoint: Optional[str] = None,
+) -> List[RemoteFile]:
+    """List the files of a HuggingFace Hub repo with sizes and hashes."""
+    from huggingface_hub import HfApi, hf_hub_url
+
+    info = HfApi(endpoint=endpoint, token=token).model_info(repo_id, revision=revision, files_metadata=True)
+    files = []
+    for sibling in info.siblings or []:
+        lfs = sibling.lfs
+        files.append(RemoteFile(
+            path=sibling.rfilename,
+            size=lfs.size if lfs else (sibling.size or 0),
+            url=hf_hub_url(repo_id, sibling.rfilename, revision=info.sha, endpoint=endpoint),
+            sha256=lfs.sha256 if lfs else None,
+            git_sha1=None if lfs else sibling.blob_id,
+        ))
+    return files
+
+
+class _StreamingVerifier:
+    """Feeds a file to its hasher in order as chunks complete out of order."""
+
+    def __init__(self, remote: RemoteFile, part_path: str, chunk_bytes: int, enabled: bool):
+        self._remote = remote
+        self._part_path = part_path
+        self._chunk_bytes = chunk_bytes
+        self._done: set[int] = set()
+        self._next = 0
+        self._lock = threading.Lock()
+        self._hasher = None
+        if enabled and remote.sha256:
+            self._hasher = hashlib.sha256()
+            self._expected = remote.sha256
+        elif enabled and remote.git_sha1:
+            self._hasher = hashlib.sha1()
+            self._hasher.update(f"blob {remote.size}\0".encode())
+            self._expected = remote.git_sha1
+
+    def chunk_done(self, index: int, data: Optional[bytes] = None) -> None:
+        if self._hasher is None:
+            return
+        with self._lock:
+            self._done.add(index)
+            while self._next in self._done:
+                if self._next == index and data is not None:
+                    self._hasher.update(data)
+                else:
+                    # Chunk finished earlier (or in a previous run) — read it back from the page cache
+                    offset = self._next * self._chunk_bytes
+                    length = min(self._chunk_bytes, self._remote.size - offset)
+                    with open(self._part_path, "rb") as f:
+                        self._hasher.update(os.pread(f.fileno(), length, offset))
+                self._done.discard(self._next)
+                self._next += 1
+
+    def verify(self) -> None:
+        if self._hasher is None:
+            return
+        actual = self._hasher.hexdigest()
+        if actual != self._expected:
+            raise ChecksumMismatch(self._remote.path, self._expected, actual)
+
+
+class ParallelDownloader:
+    """Downloads file sets in parallel byte ranges on a bounded worker pool."""
+
+    def __init__(
+        self,
+        workers: int = 8,
+        chunk_bytes: int = 16 * 1024 * 1024,
+        verify_checksums: bool = True,
+        max_retries: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 60.0,
+    ):
+        if chunk_bytes <= 0:
+            raise ValueError("chunk_bytes must be positive")
+        self._chunk_bytes = chunk_bytes
+        self._verify = verify_checksums
+        self._max_retries = max_retries
+        self._workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="download")
+        self._client = httpx.Client(headers=headers or {}, timeout=timeout, follow_redirects=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._client.close()
+
+    def download(
+        self,
+        files: List[RemoteFile],
+        target_dir: str,
+        on_progress: Optional[ProgressCallback] = None,
+        headers: Optional[Dict[str, str]] = None,
+        throttle: Optional[Callable[[int], None]] = None,
+        gate: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """Download ``files`` into ``target_dir``. Blocks until done; returns bytes fetched.
+
+        Chunks are handed to the shared pool from the calling thread, interleaved
+        across files so small files don't serialize behind large ones, with at
+        most ``workers`` of this download queued or running at once. ``gate()``
+        is called on the calling thread before each chunk is submitted and may
+        block (priority gating): a paused download then holds no pool workers
+        beyond the chunks already running. ``throttle(nbytes)`` is called on the
+        worker before each chunk request (bandwidth limit). Once a chunk fails no
+        more are submitted and queued ones are cancelled; raises that chunk's
+        error after the running ones settle.
+        """
+        fetched = 0
+        fetched_lock = threading.Lock()
+
+        def _progress(n: int) -> None:
+            nonlocal fetched
+            with fetched_lock:
+                fetched += n
+            if on_progress:
+                on_progress(n)
+
+        jobs = [job for job in (self._plan(f, target_dir) for f in files) if job is not None]
+        chunks = itertools.chain.from_iterable(
+            itertools.zip_longest(*[[(job, index) for index in job.pending] for job in jobs])
+        )
+        in_flight = threading.Semaphore(self._workers)
+        failed = threading.Event()
+
+        def _settled(fut) -> None:
+            if not fut.cancelled() and fut.exception() is not None:
+                failed.set()
+            in_flight.release()
+
+        futures = {}
+        submitted_all = False
+        try:
+            for chunk in chunks:
+                if chunk is None:
+                    continue
+                job, index = chunk
+                in_flight.acquire()
+                if gate is not None:
+                    gate()
+                if failed.is_set():
+                    break
+                fut = self._executor.submit(self._fetch_chunk, job, index, _progress, headers, throttle)
+                fut.add_done_callback(_settled)
+                futures[fut] = job
+            else:
+                submitted_all = True
+        finally:
+            if not submitted_all:
+                for fut in futures:
+                    fut.cancel()
+            wait(futures)
+            for job in jobs:
+                job.save_state()
+
+        errors = [fut.exception() for fut in futures if not fut.cancelled() and fut.exception() is not None]
+        if errors:
+            raise errors[0]
+
+        # config.json doubles as the "download complete" marker — publish it last
+        for job in sorted(jobs, key=lambda j: os.path.basename(j.final_path) == "config.json"):
+            job.finish()
+        return fetched
+
+    def _plan(self, remote: RemoteFile, target_dir: str) -> Optional["_FileJob"]:
+        final_path = os.path.join(target_dir, remote.path)
+        if os.path.exists(final_path) and os.path.getsize(final_path) == remote.size:
+            return None
+        os.makedirs(os.path.dirname(final_path) or target_dir, exist_ok=True)
+        return _FileJob(remote, final_path, self._chunk_bytes, self._verify)
+
+    def _fetch_chunk(
+        self,
+        job: "_FileJob",
+        index: int,
+        on_progress: ProgressCallback,
+        headers: Optional[Dict[str, str]],
+        throttle: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        start = index * self._chunk_bytes
+        end = min(start + self._chunk_bytes, job.remote.size) - 1
+        if throttle is not None:
+            throttle(end - start + 1)
+        request_headers = dict(headers or {})
+        if job.num_chunks > 1:
+            request_headers["Range"] = f"bytes={start}-{end}"
+
+        urls = job.remote.urls
+        delay = 0.5
+        for attempt in range(self._max_retries + 1):
+            # Spread chunks across mirrors; a retry moves on to the next one
+            url = urls[(index + attempt) % len(urls)]
+            try:
+                resp = self._client.get(url, headers=request_headers)
+                resp.raise_for_status()
+                if job.num_chunks > 1 and resp.status_code != 206:
+                    raise RuntimeError(f"Server ignored Range request for {job.remote.path}")
+                data = resp.content
+                break
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500 and len(urls) == 1:
+                    raise
+                if attempt == self._max_retries:
+                    raise
+                logger.warning(f"Chunk {index} of {job.remote.path} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                delay *= 2
+
+        expected_len = end - start + 1
+        if len(data) != expected_len:
+            raise RuntimeError(
+                f"Short read for {job.remote.path} chunk {index}: got {len(data)} of {expected_len} bytes"
+            )
+        job.write_chunk(index, start, data)
+        on_progress(len(data))
+
+
+class _FileJob:
+    """Per-file state: the ``.part`` file, its resume state and the verifier."""
+
+    def __init__(self, remote: RemoteFile, final_path: str, chunk_bytes: int, verify: bool):
+        self.remote = remote
+        self.final_path = final_path
+        self.part_path = final_path + ".part"
+        self.state_path = self.part_path + ".state"
+        self.num_chunks = max(1, -(-remote.size // chunk_bytes))
+        self._chunk_bytes = chunk_bytes
+        self._state_lock = threading.Lock()
+        # Chunks completed since the state file was last written, and when that was
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+        completed = self._load_state()
+        if not os.path.exists(self.part_path) or os.path.getsize(self.part_path) != remote.size:
+            completed = set()
+            with open(self.part_path, "wb") as f:
+                f.truncate(remote.size)
+        self._completed = completed
+        self.pending = [i for i in range(self.num_chunks) if i not in completed]
+
+        self._verifier = _StreamingVerifier(remote, self.part_path, chunk_bytes, verify)
+        for index in sorted(completed):
+            self._verifier.chunk_done(index)
+        if completed:
+            logger.info(f"Resuming {remote.path}: {len(completed)}/{self.num_chunks} chunks already on disk")
+
+    def _load_state(self) -> set[int]:
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return set()
+        if state.get("size") != self.remote.size or state.get("chunk_bytes") != self._chunk_bytes:
+            return set()
+        return set(state.get("completed", []))
+
+    def write_chunk(self, index: int, offset: int, data: bytes) -> None:
+        fd = os.open(self.part_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, data, offset)
+        finally:
+            os.close(fd)
+        self._verifier.chunk_done(index, data)
+        with self._state_lock:
+            self._completed.add(index)
+            self._unsaved += 1
+            if time.monotonic() - self._saved_at >= _STATE_SAVE_INTERVAL_S:
+                self._write_state()
+
+    def save_state(self) -> None:
+        """Record chunks completed since the last write, if any."""
+        with self._state_lock:
+            if self._unsaved:
+                self._write_state()
+
+    def _write_state(self) -> None:
+        """Caller holds ``_state_lock``."""
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "size": self.remote.size,
+                "chunk_bytes": self._chunk_bytes,
+                "completed": sorted(self._completed),
+            }, f)
+        os.replace(tmp, self.state_path)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    def finish(self) -> None:
+        try:
+            self._verifier.verify()
+        except ChecksumMismatch:
+            # Corrupt bytes can't be resumed from — start over next time
+            for p in (self.part_path, self.state_path):
+                if os.path.exists(p):
+                    os.remove(p)
+            raise
+        os.replace(self.part_path, self.final_path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
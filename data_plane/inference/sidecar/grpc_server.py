@@ -26,7 +26,7 @@ async def create_grpc_server(
 ) -> grpc.aio.Server:
     """Create, configure, and start the gRPC server."""
     server = grpc.aio.server(options=_GRPC_OPTIONS)
-    servicer = KVCacheServicer(cache_manager)
+    servicer = KVCacheServicer(cache_manager, max_message_bytes=_MAX_MESSAGE_SIZE)
     kv_cache_pb2_grpc.add_KVCacheServiceServicer_to_server(servicer, server)
     listen_addr = f"[::]:{port}"
     server.add_insecure_port(listen_addr)
@@ -1,25 +1,72 @@
 """KV Block Registry — unified metadata store for cached KV blocks.
 
-Tracks where each block lives (L1 or L2) and exposes queries used by
-cache-aware routing (Phase J) and the MultiTieredCacheManager.
+Tracks where each block lives (L1, DISK or L2) and exposes queries used by
+cache-aware routing (Phase J) and the MultiTieredCacheManager. Blocks are
+also indexed by their hash chain (see ``PrefixIndex``) for longest cached
+prefix lookups.
+
+Secondary indexes by prefix_hash, model_id and location, plus per-tier block
+and byte totals, are kept up to date on every mutation, so ``stats()`` costs
+O(1) and filtered queries O(matching entries), however large the registry.
+Entries are only indexed through the registry's methods: change an entry's
+location, size, model or prefix with ``update_location``, not in place.
+
+Block hashes are only unique within a model, so entries are keyed by
+``block_key(model_id, block_hash)``: the same hash stored by two models is
+two blocks, and looking one up needs the model it was stored under.
 """
 
-import json
 import logging
 import time
 from typing import Dict, List, Optional
 
+from data_plane.inference.sidecar.prefix_index import PrefixIndex, PrefixMatch
+from data_plane.inference.sidecar.registry_store import RegistryStore
 from shared.types import KVBlockEntry
 
 logger = logging.getLogger(__name__)
 
 
+def block_key(model_id: str, block_hash: str) -> str:
+    """Key of a model's block, in the registry and in every cache tier."""
+    return f"{model_id}#{block_hash}" if model_id else block_hash
+
+
+def split_block_key(key: str) -> tuple[str, str]:
+    """(model_id, block_hash) of a block key; model IDs never contain '#'."""
+    model_id, sep, block_hash = key.rpartition("#")
+    return (model_id, block_hash) if sep else ("", key)
+
+
 class KVBlockRegistry:
-    """In-memory registry of KV cache block locations with optional JSON persistence."""
+    """In-memory registry of KV cache block locations with optional persistence.
+
+    When ``persist_path`` is set, changes are appended to a write-ahead log by a
+    background writer (see ``RegistryStore``) instead of rewriting the file.
+    Each change logs a snapshot of the entry taken on the caller's thread, so
+    the writer never reads an entry the event loop is still updating; it is
+    written at most ``flush_delay_s`` after the change.
+    """
 
-    def __init__(self, persist_path: Optional[str] = None):
+    _NAMESPACE = "blocks"
+
+    def __init__(self, persist_path: Optional[str] = None, flush_delay_s: float = 0.0):
         self._blocks: Dict[str, KVBlockEntry] = {}
+        # block_key -> entry; prefix_hash / model_id / location -> block_key -> entry
+        self._by_prefix: Dict[str, Dict[str, KVBlockEntry]] = {}
+        self._by_model: Dict[str, Dict[str, KVBlockEntry]] = {}
+        self._by_location: Dict[str, Dict[str, KVBlockEntry]] = {}
+        self._location_bytes: Dict[str, int] = {}
+        self._prefix_index = PrefixIndex()
         self._persist_path = persist_path
+        self._store: Optional[RegistryStore] = None
+        if persist_path:
+            self._store = RegistryStore(
+                persist_path,
+                namespaces=(self._NAMESPACE,),
+                migrate=self._migrate_legacy,
+                flush_delay_s=flush_delay_s,
+            )
         self._hits = 0
         self._misses = 0
         self._evictions = 0
@@ -30,94 +77,192 @@ class KVBlockRegistry:
     def register(self, entry: KVBlockEntry) -> None:
         entry.created_at = entry.created_at or time.time()
         entry.last_accessed = entry.last_accessed or entry.created_at
-        self._blocks[entry.key] = entry
-        self._persist_to_disk()
+        bkey = block_key(entry.model_id, entry.key)
+        previous = self._blocks.get(bkey)
+        if previous is not None:
+            self._unindex(previous)
+        self._blocks[bkey] = entry
+        self._index(entry)
+        self._prefix_index.insert(entry.model_id, entry.key, entry.parent_hash, entry.location)
+        self._persist_entry(bkey)
 
-    def unregister(self, key: str) -> Optional[KVBlockEntry]:
-        entry = self._blocks.pop(key, None)
+    def unregister(self, key: str, model_id: str = "") -> Optional[KVBlockEntry]:
+        bkey = block_key(model_id, key)
+        entry = self._blocks.pop(bkey, None)
         if entry:
+            self._unindex(entry)
+            self._prefix_index.remove(entry.model_id, key)
             self._evictions += 1
-            self._persist_to_disk()
+            self._persist_entry(bkey)
         return entry
 
-    def lookup(self, key: str) -> Optional[KVBlockEntry]:
-        entry = self._blocks.get(key)
+    def lookup(self, key: str, model_id: str = "") -> Optional[KVBlockEntry]:
+        entry = self._blocks.get(block_key(model_id, key))
         if entry:
             self._hits += 1
         else:
             self._misses += 1
         return entry
 
-    def update_location(self, key: str, new_location: str, **kwargs) -> bool:
-        entry = self._blocks.get(key)
+    def entry(self, key: str, model_id: str = "") -> Optional[KVBlockEntry]:
+        """The block's entry, without counting a lookup."""
+        return self._blocks.get(block_key(model_id, key))
+
+    def location(self, key: str, model_id: str = "") -> Optional[str]:
+        """Where a block lives, without counting a lookup."""
+        entry = self._blocks.get(block_key(model_id, key))
+        return entry.location if entry else None
+
+    def update_location(self, key: str, new_location: str, model_id: str = "", **kwargs) -> bool:
+        """Move a block to another tier; ``kwargs`` update other fields, but not its model."""
+        bkey = block_key(model_id, key)
+        entry = self._blocks.get(bkey)
         if not entry:
             return False
+        self._unindex(entry)
         entry.location = new_location
+        self._prefix_index.update_location(entry.model_id, key, new_location)
         for attr, val in kwargs.items():
-            if hasattr(entry, attr):
+            if hasattr(entry, attr) and attr not in ("key", "model_id"):
                 setattr(entry, attr, val)
-        self._persist_to_disk()
+        self._index(entry)
+        self._persist_entry(bkey)
         return True
 
-    def record_access(self, key: str) -> None:
-        entry = self._blocks.get(key)
+    def record_access(self, key: str, model_id: str = "") -> None:
+        entry = self._blocks.get(block_key(model_id, key))
         if entry:
             entry.last_accessed = time.time()
             entry.access_count += 1
 
     def query_by_prefix(self, prefix_hash: str, model_id: str = "") -> List[KVBlockEntry]:
-        results = []
-        for entry in self._blocks.values():
-            if entry.prefix_hash == prefix_hash:
-                if not model_id or entry.model_id == model_id:
-                    results.append(entry)
-        return results
+        return self.query(prefix_hash=prefix_hash, model_id=model_id)
+
+    def query(self, prefix_hash: str = "", model_id: str = "", location: str = "") -> List[KVBlockEntry]:
+        """Entries matching every given filter; with none, all entries.
+
+        Scans only the smallest matching index bucket.
+        """
+        filters = [
+            (index, value, attr)
+            for index, value, attr in (
+                (self._by_prefix, prefix_hash, "prefix_hash"),
+                (self._by_model, model_id, "model_id"),
+                (self._by_location, location, "location"),
+            )
+            if value
+        ]
+        if not filters:
+            return list(self._blocks.values())
+        buckets = [index.get(value, {}) for index, value, _ in filters]
+        smallest = min(buckets, key=len)
+        return [
+            entry for entry in smallest.values()
+            if all(getattr(entry, attr) == value for _, value, attr in filters)
+        ]
+
+    def longest_prefix(self, block_hashes: List[str], model_id: str = "") -> PrefixMatch:
+        """How many leading blocks of a hash chain are cached, and where."""
+        return self._prefix_index.longest_prefix(model_id, block_hashes)
+
+    def forget_location(self, location: str) -> int:
+        """Drop every entry in ``location`` without counting evictions.
+
+        For tiers that do not survive a restart, whose restored entries
+        would otherwise point at blocks that are gone. Returns the count.
+        """
+        keys = list(self._by_location.get(location, ()))
+        for key in keys:
+            entry = self._blocks.pop(key)
+            self._unindex(entry)
+            self._prefix_index.remove(entry.model_id, entry.key)
+            self._persist_entry(key)
+        return len(keys)
 
     def all_entries(self) -> List[KVBlockEntry]:
         return list(self._blocks.values())
 
     def stats(self) -> dict:
-        l1_blocks = [e for e in self._blocks.values() if e.location == "L1"]
-        l2_blocks = [e for e in self._blocks.values() if e.location == "L2"]
         total_lookups = self._hits + self._misses
-        l1_used = sum(e.size_bytes for e in l1_blocks)
+        l1_used = self._location_bytes.get("L1", 0)
         elapsed = time.time() - self._eviction_window_start
         eviction_rate = self._evictions / elapsed if elapsed > 0 else 0.0
         l1_util = l1_used / self._l1_capacity_bytes if self._l1_capacity_bytes > 0 else 0.0
         return {
             "total_blocks": len(self._blocks),
-            "l1_blocks": len(l1_blocks),
-            "l2_blocks": len(l2_blocks),
+            "l1_blocks": len(self._by_location.get("L1", ())),
+            "disk_blocks": len(self._by_location.get("DISK", ())),
+            "l2_blocks": len(self._by_location.get("L2", ())),
             "l1_used_bytes": l1_used,
             "l1_capacity_bytes": self._l1_capacity_bytes,
             "l1_utilization_ratio": round(l1_util, 4),
-            "l2_used_bytes": sum(e.size_bytes for e in l2_blocks),
+            "disk_used_bytes": self._location_bytes.get("DISK", 0),
+            "l2_used_bytes": self._location_bytes.get("L2", 0),
             "hit_rate": self._hits / total_lookups if total_lookups > 0 else 0.0,
             "eviction_count": self._evictions,
             "eviction_rate": round(eviction_rate, 4),
         }
 
-    def _persist_to_disk(self) -> None:
-        if not self._persist_path:
+    def flush(self) -> None:
+        """Block until all logged changes are durable."""
+        if self._store is not None:
+            self._store.flush()
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+
+    def _index(self, entry: KVBlockEntry) -> None:
+        for index, value in (
+            (self._by_prefix, entry.prefix_hash),
+            (self._by_model, entry.model_id),
+            (self._by_location, entry.location),
+        ):
+            index.setdefault(value, {})[block_key(entry.model_id, entry.key)] = entry
+        self._location_bytes[entry.location] = self._location_bytes.get(entry.location, 0) + entry.size_bytes
+
+    def _unindex(self, entry: KVBlockEntry) -> None:
+        for index, value in (
+            (self._by_prefix, entry.prefix_hash),
+            (self._by_model, entry.model_id),
+            (self._by_location, entry.location),
+        ):
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(block_key(entry.model_id, entry.key), None)
+                if not bucket:
+                    del index[value]
+        self._location_bytes[entry.location] -= entry.size_bytes
+
+    def _persist_entry(self, key: str) -> None:
+        if self._store is None:
             return
-        try:
-            data = [e.to_dict() for e in self._blocks.values()]
-            with open(self._persist_path, "w") as f:
-                json.dump(data, f)
-        except Exception as exc:
-            logger.warning(f"Failed to persist KV block registry: {exc}")
+        entry = self._blocks.get(key)
+        if entry is None:
+            self._store.delete(self._NAMESPACE, key)
+        else:
+            self._store.put(self._NAMESPACE, key, entry.to_dict())
+
+    @classmethod
+    def _migrate_legacy(cls, data) -> dict:
+        """Older registries were persisted as a flat JSON list of entries."""
+        return {cls._NAMESPACE: {item["key"]: item for item in data}}
 
     def _load_from_disk(self) -> None:
-        if not self._persist_path:
+        if self._store is None:
             return
         try:
-            with open(self._persist_path) as f:
-                data = json.load(f)
-            for item in data:
+            for stored_key, item in self._store.load()[self._NAMESPACE].items():
                 entry = KVBlockEntry.from_dict(item)
-                self._blocks[entry.key] = entry
-            logger.info(f"Restored {len(self._blocks)} KV block entries from disk")
-        except FileNotFoundError:
-            pass
+                bkey = block_key(entry.model_id, entry.key)
+                self._blocks[bkey] = entry
+                self._index(entry)
+                self._prefix_index.insert(entry.model_id, entry.key, entry.parent_hash, entry.location)
+                if stored_key != bkey:
+                    # Persisted before entries were keyed by model
+                    self._store.delete(self._NAMESPACE, stored_key)
+                    self._persist_entry(bkey)
+            if self._blocks:
+                logger.info(f"Restored {len(self._blocks)} KV block entries from disk")
         except Exception as exc:
             logger.warning(f"Failed to load KV block registry: {exc}")
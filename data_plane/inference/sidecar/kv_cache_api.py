@@ -13,12 +13,36 @@ from shared.proto import kv_cache_pb2, kv_cache_pb2_grpc
 
 logger = logging.getLogger(__name__)
 
+# Framing allowance per block in a batched message (field tags, ids, hash)
+_PER_BLOCK_OVERHEAD_BYTES = 256
+
+# Default ListBlocks page: hashes and ids only, well under one message
+_LIST_PAGE_BLOCKS = 4096
+
+
+def _fail(context, rpc: str, error: Exception) -> None:
+    """Log an RPC's error and report it as INTERNAL, for responses without a success field."""
+    logger.error(f"{rpc} error: {error}")
+    context.set_code(grpc.StatusCode.INTERNAL)
+    context.set_details(str(error))
+
+
+def _expected_blocks(request) -> list[tuple[int, str]]:
+    """(block_id, expected hash or "") pairs of a batched load request."""
+    hashes = list(request.block_hashes)
+    return [(bid, hashes[i] if i < len(hashes) else "") for i, bid in enumerate(request.block_ids)]
+
 
 class KVCacheServicer(kv_cache_pb2_grpc.KVCacheServiceServicer):
     """gRPC servicer exposing cache store/load/allocate/free operations."""
 
-    def __init__(self, cache_manager: MultiTieredCacheManager):
+    def __init__(
+        self,
+        cache_manager: MultiTieredCacheManager,
+        max_message_bytes: int = 16 * 1024 * 1024,
+    ):
         self._manager = cache_manager
+        self._max_message_bytes = max_message_bytes
         logger.info("KVCacheServicer initialized")
 
     async def StoreBlock(self, request, context):
@@ -29,6 +53,7 @@ class KVCacheServicer(kv_cache_pb2_grpc.KVCacheServiceServicer):
                 data=request.data,
                 model_id=request.model_id,
                 layer_name=request.layer_name,
+                parent_hash=request.parent_hash,
             )
             return kv_cache_pb2.StoreBlockResponse(
                 success=ok,
@@ -40,10 +65,11 @@ class KVCacheServicer(kv_cache_pb2_grpc.KVCacheServiceServicer):
 
     async def LoadBlock(self, request, context):
         try:
-            data = await self._manager.load_block(request.block_id)
+            data = await self._manager.load_block(request.block_id, request.block_hash, request.model_id)
             if data is not None:
+                # protobuf bytes fields need an owned copy of the L1 slot view
                 return kv_cache_pb2.LoadBlockResponse(
-                    success=True, data=data, message="loaded"
+                    success=True, data=bytes(data), message="loaded"
                 )
             return kv_cache_pb2.LoadBlockResponse(
                 success=False, data=b"", message="block not found"
@@ -54,13 +80,101 @@ class KVCacheServicer(kv_cache_pb2_grpc.KVCacheServiceServicer):
                 success=False, data=b"", message=str(e)
             )
 
+    async def _store_many(self, blocks) -> tuple[int, str]:
+        """Store blocks in order. Returns (number stored, error message or "")."""
+        stored = 0
+        for block in blocks:
+            if block.dedup:
+                if not self._manager.link_block(block.block_id, block.block_hash, block.model_id):
+                    return stored, f"dedup of block {block.block_id} failed: {block.block_hash} is not in L1"
+                stored += 1
+                continue
+            ok = await self._manager.store_block(
+                block_id=block.block_id,
+                block_hash=block.block_hash,
+                data=block.data,
+                model_id=block.model_id,
+                layer_name=block.layer_name,
+                parent_hash=block.parent_hash,
+            )
+            if not ok:
+                return stored, f"store of block {block.block_id} failed"
+            stored += 1
+        return stored, ""
+
+    async def StoreBlocks(self, request, context):
+        try:
+            stored, error = await self._store_many(request.blocks)
+            return kv_cache_pb2.StoreBlocksResponse(
+                success=not error, num_stored=stored, message=error or "stored"
+            )
+        except Exception as e:
+            logger.error(f"StoreBlocks error: {e}")
+            return kv_cache_pb2.StoreBlocksResponse(success=False, message=str(e))
+
+    async def StoreBlockStream(self, request_iterator, context):
+        stored = 0
+        try:
+            async for batch in request_iterator:
+                n, error = await self._store_many(batch.blocks)
+                stored += n
+                if error:
+                    return kv_cache_pb2.StoreBlocksResponse(
+                        success=False, num_stored=stored, message=error
+                    )
+            return kv_cache_pb2.StoreBlocksResponse(
+                success=True, num_stored=stored, message="stored"
+            )
+        except Exception as e:
+            logger.error(f"StoreBlockStream error: {e}")
+            return kv_cache_pb2.StoreBlocksResponse(
+                success=False, num_stored=stored, message=str(e)
+            )
+
+    async def LoadBlocks(self, request, context):
+        data = []
+        try:
+            for block_id, block_hash in _expected_blocks(request):
+                block = await self._manager.load_block(block_id, block_hash, request.model_id)
+                if block is None:
+                    return kv_cache_pb2.LoadBlocksResponse(
+                        success=False, data=data, message=f"block {block_id} not found"
+                    )
+                data.append(bytes(block))
+            return kv_cache_pb2.LoadBlocksResponse(success=True, data=data, message="loaded")
+        except Exception as e:
+            logger.error(f"LoadBlocks error: {e}")
+            return kv_cache_pb2.LoadBlocksResponse(success=False, data=data, message=str(e))
+
+    async def LoadBlockStream(self, request, context):
+        budget = request.max_batch_bytes or self._max_message_bytes
+        batch, batch_bytes = [], 0
+        try:
+            for block_id, block_hash in _expected_blocks(request):
+                block = await self._manager.load_block(block_id, block_hash, request.model_id)
+                if block is None:
+                    yield kv_cache_pb2.LoadBlocksResponse(
+                        success=False, data=batch, message=f"block {block_id} not found"
+                    )
+                    return
+                size = len(block) + _PER_BLOCK_OVERHEAD_BYTES
+                if batch and batch_bytes + size > budget:
+                    yield kv_cache_pb2.LoadBlocksResponse(success=True, data=batch, message="loaded")
+                    batch, batch_bytes = [], 0
+                batch.append(bytes(block))
+                batch_bytes += size
+            yield kv_cache_pb2.LoadBlocksResponse(success=True, data=batch, message="loaded")
+        except Exception as e:
+            logger.error(f"LoadBlockStream error: {e}")
+            yield kv_cache_pb2.LoadBlocksResponse(success=False, data=batch, message=str(e))
+
     async def GetFreeBlocks(self, request, context):
         num_free = self._manager.get_num_free_blocks()
         return kv_cache_pb2.GetFreeBlocksResponse(num_free_blocks=num_free)
 
     async def AllocateBlocks(self, request, context):
         try:
-            ids = self._manager.allocate_blocks(list(request.block_hashes))
+            ids = self._manager.allocate_blocks(list(request.block_hashes), request.model_id)
             if ids is not None:
                 return kv_cache_pb2.AllocateBlocksResponse(
                     success=True, block_ids=ids, message="allocated"
@@ -84,3 +198,102 @@ class KVCacheServicer(kv_cache_pb2_grpc.KVCacheServiceServicer):
         except Exception as e:
             logger.error(f"FreeBlock error: {e}")
             return kv_cache_pb2.FreeBlockResponse(success=False, message=str(e))
+
+    async def GetSharedArena(self, request, context):
+        l1 = self._manager.l1
+        if not l1.shm_path:
+            return kv_cache_pb2.GetSharedArenaResponse(enabled=False)
+        return kv_cache_pb2.GetSharedArenaResponse(
+            enabled=True,
+            path=l1.shm_path,
+            num_blocks=l1.num_blocks,
+            block_size_bytes=l1.block_size,
+        )
+
+    async def CommitBlocks(self, request, context):
+        committed = 0
+        try:
+            for block in request.blocks:
+                ok = self._manager.commit_block(
+                    block_id=block.block_id,
+                    block_hash=block.block_hash,
+                    size=block.length,
+                    model_id=block.model_id,
+                    parent_hash=block.parent_hash,
+                )
+                if not ok:
+                    return kv_cache_pb2.CommitBlocksResponse(
+                        success=False,
+                        num_committed=committed,
+                        message=f"commit of block {block.block_id} failed",
+                    )
+                committed += 1
+            return kv_cache_pb2.CommitBlocksResponse(
+                success=True, num_committed=committed, message="committed"
+            )
+        except Exception as e:
+            logger.error(f"CommitBlocks error: {e}")
+            return kv_cache_pb2.CommitBlocksResponse(
+                success=False, num_committed=committed, message=str(e)
+            )
+
+    async def ResolveBlocks(self, request, context):
+        try:
+            lengths = []
+            for block_id, block_hash in _expected_blocks(request):
+                data = await self._manager.load_block(block_id, block_hash, request.model_id)
+                lengths.append(-1 if data is None else len(data))
+            return kv_cache_pb2.ResolveBlocksResponse(
+                success=True, lengths=lengths, message="resolved"
+            )
+        except Exception as e:
+            logger.error(f"ResolveBlocks error: {e}")
+            return kv_cache_pb2.ResolveBlocksResponse(success=False, message=str(e))
+
+    async def LookupBlocks(self, request, context):
+        try:
+            found = await self._manager.lookup_blocks(
+                list(request.block_hashes), request.include_data, request.model_id
+            )
+            return kv_cache_pb2.LookupBlocksResponse(
+                block_ids=[block_id for block_id, _, _ in found],
+                locations=[location for _, location, _ in found],
+                data=[data or b"" for _, _, data in found] if request.include_data else [],
+            )
+        except Exception as e:
+            _fail(context, "LookupBlocks", e)
+            return kv_cache_pb2.LookupBlocksResponse()
+
+    async def ListBlocks(self, request, context):
+        try:
+            page, next_block_id = self._manager.list_blocks(
+                request.model_id, request.start_block_id, request.max_blocks or _LIST_PAGE_BLOCKS
+            )
+            return kv_cache_pb2.ListBlocksResponse(
+                block_hashes=[block_hash for block_hash, _ in page],
+                block_ids=[block_id for _, block_id in page],
+                next_block_id=next_block_id,
+            )
+        except Exception as e:
+            _fail(context, "ListBlocks", e)
+            return kv_cache_pb2.ListBlocksResponse()
+
+    async def GetNamespace(self, request, context):
+        try:
+            ns = self._manager.l1.namespace(request.model_id)
+            return kv_cache_pb2.GetNamespaceResponse(
+                name=ns.name, base_block_id=ns.base, num_blocks=ns.num_blocks
+            )
+        except Exception as e:
+            _fail(context, "GetNamespace", e)
+            return kv_cache_pb2.GetNamespaceResponse()
+
+    async def QueryPrefix(self, request, context):
+        try:
+            match = self._manager.longest_prefix(list(request.block_hashes), request.model_id)
+            return kv_cache_pb2.QueryPrefixResponse(
+                num_blocks=match.num_blocks, locations=match.locations
+            )
+        except Exception as e:
+            _fail(context, "QueryPrefix", e)
+            return kv_cache_pb2.QueryPrefixResponse()
@@ -2,21 +2,30 @@
 
 Manages a fixed number of block slots identified by integer IDs.
 No memory addresses, no coalescing — just a free-list of block IDs.
+
+The free-list is a packed array of free IDs plus a position index
+(``block_id -> index in the free array``, ``-1`` when allocated), so
+allocating, freeing and claiming a specific ID are all O(1): a specific ID
+is taken out by swapping it with the last free entry.
 """
 
 import logging
-from typing import Optional
+from array import array
+from typing import Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
 
 class BlockSlotAllocator:
-    """Fixed-capacity allocator tracking block IDs with a free-list."""
+    """Fixed-capacity allocator tracking block IDs with an indexed free-list."""
+
+    _ALLOCATED = -1
 
     def __init__(self, num_blocks: int):
         self._num_blocks = num_blocks
-        self._free_ids: list[int] = list(range(num_blocks))
-        self._allocated: set[int] = set()
+        self._free_ids = array("q", range(num_blocks))
+        # block_id -> index into _free_ids, _ALLOCATED if in use
+        self._free_pos = array("q", range(num_blocks))
         logger.debug(f"BlockSlotAllocator initialized: {num_blocks} slots")
 
     @property
@@ -29,45 +38,64 @@ class BlockSlotAllocator:
 
     @property
     def num_allocated(self) -> int:
-        return len(self._allocated)
+        return self._num_blocks - len(self._free_ids)
 
     def allocate(self) -> Optional[int]:
         """Allocate a single block slot. Returns block_id or None if full."""
         if not self._free_ids:
             return None
         block_id = self._free_ids.pop()
-        self._allocated.add(block_id)
+        self._free_pos[block_id] = self._ALLOCATED
         return block_id
 
     def allocate_n(self, n: int) -> Optional[list[int]]:
         """Allocate n block slots. Returns list of IDs or None if not enough free."""
         if len(self._free_ids) < n:
             return None
-        ids = [self._free_ids.pop() for _ in range(n)]
-        self._allocated.update(ids)
+        if n <= 0:
+            return []
+        ids = self._free_ids[-n:].tolist()
+        ids.reverse()
+        del self._free_ids[-n:]
+        for block_id in ids:
+            self._free_pos[block_id] = self._ALLOCATED
         return ids
 
     def free(self, block_id: int) -> bool:
         """Return a block slot to the free-list."""
-        if block_id not in self._allocated:
+        if not self.is_allocated(block_id):
             logger.warning(f"Double-free or invalid block_id: {block_id}")
             return False
-        self._allocated.discard(block_id)
+        self._free_pos[block_id] = len(self._free_ids)
         self._free_ids.append(block_id)
         return True
 
+    def free_n(self, block_ids: Iterable[int]) -> int:
+        """Return several block slots to the free-list. Returns how many were freed."""
+        return sum(1 for block_id in block_ids if self.free(block_id))
+
     def allocate_specific(self, block_id: int) -> bool:
-        """Allocate a specific block ID. Returns False if already allocated or out of range."""
-        if block_id in self._allocated:
-            return True  # already allocated
+        """Allocate a specific block ID. Returns False if out of range."""
         if block_id < 0 or block_id >= self._num_blocks:
             return False
-        try:
-            self._free_ids.remove(block_id)
-        except ValueError:
+        pos = self._free_pos[block_id]
+        if pos == self._ALLOCATED:
+            return True  # already allocated
+        last = self._free_ids.pop()
+        if last != block_id:
+            self._free_ids[pos] = last
+            self._free_pos[last] = pos
+        self._free_pos[block_id] = self._ALLOCATED
+        return True
+
+    def allocate_specific_n(self, block_ids: Iterable[int]) -> bool:
+        """Allocate several specific IDs. Returns False (allocating none) if any is out of range."""
+        block_ids = list(block_ids)
+        if any(block_id < 0 or block_id >= self._num_blocks for block_id in block_ids):
             return False
-        self._allocated.add(block_id)
+        for block_id in block_ids:
+            self.allocate_specific(block_id)
         return True
 
     def is_allocated(self, block_id: int) -> bool:
-        return block_id in self._allocated
+        return 0 <= block_id < self._num_blocks and self._free_pos[block_id] == self._ALLOCATED
@@ -2,128 +2,562 @@
 
 The sidecar cannot access GPU memory (separate container). It stores raw bytes
 keyed by block_id, with LRU eviction and Prometheus metrics.
+
+Blocks live in one preallocated arena (an anonymous mmap) of ``num_blocks``
+fixed ``block_size_bytes`` slots, slot ``i`` at offset ``i * block_size_bytes``.
+Stores copy into the slot and loads return a zero-copy ``memoryview`` of it, so
+resident memory is bounded by the arena size rather than by per-block heap
+objects. A loaded view aliases the slot: it is valid until the block is freed
+or evicted, and callers that keep data longer must copy it.
+
+With ``shm_path`` the arena is a file on a tmpfs (``/dev/shm``) instead, so a
+co-located engine can map it and write or read slots directly; ``commit``
+then records a block whose bytes are already in its slot.
+
+With ``compression`` enabled the arena is instead split into ``_PAGE_BYTES``
+pages and each block takes as many pages as its encoded payload needs (none
+for an all-zero block), so the same DRAM holds more blocks than it has
+fixed slots: ``num_blocks`` is then the number of block IDs and
+``arena_bytes`` the memory behind them. Capacity pressure evicts by pages
+as well as by IDs. A block kept raw in consecutive pages still loads as a
+zero-copy view; compressed blocks load as a fresh decompressed buffer.
+Compression needs the store to own the layout, so it is not available with
+``shm_path``.
+
+With ``namespace_weights`` the block IDs are split into per-model ranges,
+each with its own allocator and eviction policy (see ``namespaces``).
+
+``link`` makes a block ID share the slot of a resident block with the same
+hash instead of holding a second copy: loads of the linked ID read the
+owner's bytes, and freeing or evicting the owner frees its links as well.
 """
 
 import logging
+import mmap
+import os
 import time
-from typing import Optional
+from array import array
+from typing import Callable, Optional
 
 from data_plane.inference.sidecar.l1_cache import metrics as l1_metrics
-from data_plane.inference.sidecar.l1_cache.allocator import BlockSlotAllocator
-from data_plane.inference.sidecar.l1_cache.eviction_policy import LRUPolicy
+from data_plane.inference.sidecar.l1_cache.compression import CODEC_NONE, CODEC_ZERO, BlockCompressor
+from data_plane.inference.sidecar.l1_cache.eviction_policy import EvictionPolicy
+from data_plane.inference.sidecar.l1_cache.namespaces import Namespace, split_namespaces
 
 logger = logging.getLogger(__name__)
 
+_PAGE_BYTES = 4096
+
+# Metric children bound once; per-block updates skip the labels() lookup
+_OPS_TOTAL = {
+    (op, status): l1_metrics.l1_cache_operations_total.labels(op=op, status=status)
+    for op, status in [
+        ("store", "hit"), ("store", "error"),
+        ("commit", "hit"), ("commit", "error"),
+        ("load", "hit"), ("load", "miss"),
+        ("link", "hit"), ("link", "miss"),
+    ]
+}
+_OP_DURATION = {
+    op: l1_metrics.l1_cache_operation_duration_seconds.labels(op=op)
+    for op in ("store", "commit", "load", "link")
+}
+_STORED_BYTES = l1_metrics.l1_cache_transfer_bytes_total.labels(direction="store")
+_LOADED_BYTES = l1_metrics.l1_cache_transfer_bytes_total.labels(direction="load")
+_CAPACITY_EVICTIONS = l1_metrics.l1_cache_evictions_total.labels(reason="capacity")
+_ADMISSION_REJECTIONS = l1_metrics.l1_cache_admission_rejections_total.labels()
+_DEDUP_SAVED_BYTES = l1_metrics.l1_cache_dedup_saved_bytes_total.labels()
+
 
 class L1ByteStore:
     """In-memory byte store with block-slot allocation and LRU eviction."""
 
-    def __init__(self, num_blocks: int = 1024, block_size_bytes: int = 131072):
-        self.allocator = BlockSlotAllocator(num_blocks)
-        self.eviction_policy = LRUPolicy()
+    _EMPTY = -1
+
+    def __init__(
+        self,
+        num_blocks: int = 1024,
+        block_size_bytes: int = 131072,
+        shm_path: Optional[str] = None,
+        eviction_policy: str = "lru",
+        tinylfu_admission: bool = False,
+        compression: str = "off",
+        arena_bytes: int = 0,
+        compression_min_ratio: float = 1.25,
+        compression_cpu_budget_us: float = 1000.0,
+        namespace_weights: Optional[dict[str, float]] = None,
+    ):
+        self._num_blocks = num_blocks
+        self._namespaces = [
+            Namespace(name, base, size, eviction_policy, tinylfu_admission)
+            for name, base, size in split_namespaces(num_blocks, namespace_weights or {})
+        ]
+        self._default = self._namespaces[0]
+        self._by_name = {ns.name: ns for ns in self._namespaces}
+        # block_id -> index of its namespace in _namespaces
+        self._ns_index = array("H")
+        for i, ns in enumerate(self._namespaces):
+            self._ns_index.extend(array("H", [i]) * ns.num_blocks)
         self._block_size = block_size_bytes
-        # block_id -> bytes
-        self._data: dict[int, bytes] = {}
-        # block_id -> block_hash (for registry/eviction tracking)
+        self._shm_path = shm_path
+        if compression != "off" and shm_path:
+            logger.warning("L1 compression is not supported with a shared-memory arena; disabling it")
+            compression = "off"
+        self._compressor: Optional[BlockCompressor] = None
+        if compression != "off":
+            self._compressor = BlockCompressor(
+                compression, min_ratio=compression_min_ratio, cpu_budget_us=compression_cpu_budget_us
+            )
+            arena_bytes = arena_bytes or num_blocks * block_size_bytes
+            self._init_pages(num_blocks, arena_bytes)
+        else:
+            arena_bytes = num_blocks * block_size_bytes
+        self._capacity_bytes = arena_bytes
+        arena_bytes = max(arena_bytes, 1)
+        if shm_path:
+            fd = os.open(shm_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o660)
+            try:
+                os.ftruncate(fd, arena_bytes)
+                self._arena = mmap.mmap(fd, arena_bytes)
+            finally:
+                os.close(fd)
+            logger.info(f"L1 arena shared at {shm_path} ({arena_bytes} bytes)")
+        else:
+            self._arena = mmap.mmap(-1, arena_bytes)
+        self._view = memoryview(self._arena)
+        # block_id -> stored length in bytes, _EMPTY if the slot holds no data
+        self._lengths = array("q", [self._EMPTY]) * num_blocks
+        self._num_stored = 0
+        self._logical_bytes = 0
+        # block_id -> block_hash (for registry/eviction tracking); the reverse
+        # map is per namespace
         self._id_to_hash: dict[int, str] = {}
-        # block_hash -> block_id (reverse lookup)
-        self._hash_to_id: dict[str, int] = {}
+        # Block IDs linked to another slot holding the same block: alias -> owner,
+        # and owner -> its aliases. An alias has no bytes of its own.
+        self._alias_of: dict[int, int] = {}
+        self._aliases: dict[int, set[int]] = {}
+        # Called as (block_id, block_hash, data) for every block that leaves L1
+        # other than by free(); data is a view of the evicted bytes, valid only
+        # during the call, or None when the slot was already overwritten
+        self.eviction_listener: Optional[Callable[[int, str, Optional[memoryview]], object]] = None
+
+        self._publish_gauges()
+
+    def _init_pages(self, num_blocks: int, arena_bytes: int) -> None:
+        self._page_size = min(_PAGE_BYTES, self._block_size) or 1
+        self._pages_per_block = -(-self._block_size // self._page_size)
+        num_pages = arena_bytes // self._page_size
+        # Free pages as a stack; popping yields ascending, mostly contiguous runs
+        self._free_pages = array("i", range(num_pages - 1, -1, -1))
+        self._num_pages = num_pages
+        # block_id -> its pages, at block_id * _pages_per_block
+        self._page_table = array("i", [-1]) * (num_blocks * self._pages_per_block)
+        self._page_counts = array("i", [0]) * num_blocks
+        self._payload_lengths = array("q", [0]) * num_blocks
+        self._codecs = array("b", [CODEC_NONE]) * num_blocks
+        self._zero_block = bytes(self._block_size)
+
+    def _used_bytes(self) -> int:
+        if self._compressor is None:
+            return self._num_stored * self._block_size
+        return (self._num_pages - len(self._free_pages)) * self._page_size
+
+    def _publish_gauges(self) -> None:
+        """Point the L1 gauges at this store; they are computed when scraped."""
+        cap = self._capacity_bytes
+        l1_metrics.l1_cache_capacity_bytes.set(cap)
+        l1_metrics.l1_cache_used_bytes.set_function(self._used_bytes)
+        l1_metrics.l1_cache_utilization_ratio.set_function(
+            lambda: self._used_bytes() / cap if cap > 0 else 0
+        )
+        l1_metrics.l1_cache_blocks_stored.set_function(lambda: self._num_stored)
+        l1_metrics.l1_cache_compression_ratio.set_function(lambda: self.compression_ratio)
+        l1_metrics.l1_cache_effective_capacity_bytes.set_function(
+            lambda: min(cap * self.compression_ratio, self._num_blocks * self._block_size)
+        )
 
-        l1_metrics.l1_cache_capacity_bytes.set(num_blocks * block_size_bytes)
-        l1_metrics.l1_cache_used_bytes.set(0)
-        l1_metrics.l1_cache_blocks_stored.set(0)
+    @property
+    def num_blocks(self) -> int:
+        return self._num_blocks
 
-    def _update_metrics(self) -> None:
-        used = len(self._data) * self._block_size
-        cap = self.allocator.num_blocks * self._block_size
-        l1_metrics.l1_cache_used_bytes.set(used)
-        l1_metrics.l1_cache_utilization_ratio.set(used / cap if cap > 0 else 0)
-        l1_metrics.l1_cache_blocks_stored.set(len(self._data))
+    @property
+    def eviction_policy(self) -> EvictionPolicy:
+        """The default namespace's policy (the only one without namespaces)."""
+        return self._default.eviction_policy
+
+    def namespace(self, name: str = "") -> Namespace:
+        """The namespace of a model ID; models without their own share the default."""
+        return self._by_name.get(name, self._default)
+
+    def namespace_of(self, block_id: int) -> str:
+        """Name of the namespace a block ID belongs to."""
+        return self._ns(block_id).name if 0 <= block_id < self._num_blocks else self._default.name
+
+    def _ns(self, block_id: int) -> Namespace:
+        return self._namespaces[self._ns_index[block_id]]
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size
+
+    @property
+    def shm_path(self) -> Optional[str]:
+        """Path of the shared-memory arena, or None if the arena is private."""
+        return self._shm_path
+
+    @property
+    def compression_ratio(self) -> float:
+        """Logical bytes stored per arena byte they occupy (1.0 when empty or uncompressed)."""
+        used = self._used_bytes()
+        if self._compressor is None or self._logical_bytes == 0:
+            return 1.0
+        # Only all-zero blocks stored: they take no pages at all
+        return self._logical_bytes / used if used else float(self._logical_bytes)
 
     def get_num_free_blocks(self) -> int:
-        return self.allocator.num_free
+        return sum(ns.allocator.num_free for ns in self._namespaces)
 
-    def allocate_blocks(self, block_hashes: list[str]) -> Optional[list[int]]:
-        """Reserve block slots for the given hashes. Returns block IDs or None."""
-        # Evict if needed to make room
-        needed = len(block_hashes) - self.allocator.num_free
+    def allocate_blocks(self, block_hashes: list[str], namespace: str = "") -> Optional[list[int]]:
+        """Reserve block slots for the given hashes in a namespace. Returns block IDs or None."""
+        ns = self.namespace(namespace)
+        # Evict if needed to make room; only the namespace's own blocks
+        needed = len(block_hashes) - ns.allocator.num_free
         while needed > 0:
-            victim_hash = self.eviction_policy.select_victim()
+            victim_hash = ns.eviction_policy.select_victim()
             if not victim_hash:
                 break
-            victim_id = self._hash_to_id.get(victim_hash)
-            if victim_id is not None:
-                self._evict(victim_id)
-                l1_metrics.l1_cache_evictions_total.labels(reason="capacity").inc()
+            victim_id = ns.hash_to_id.get(victim_hash)
+            if victim_id is None:
+                # Stale policy entry: drop it and pick again
+                ns.eviction_policy.remove(victim_hash)
+                continue
+            candidate = block_hashes[len(block_hashes) - needed]
+            if not ns.eviction_policy.admit(candidate, victim_hash):
+                _ADMISSION_REJECTIONS.inc()
+                return None
+            self._evict(victim_id)
+            _CAPACITY_EVICTIONS.inc()
             needed -= 1
 
-        ids = self.allocator.allocate_n(len(block_hashes))
-        if ids is None:
+        local_ids = ns.allocator.allocate_n(len(block_hashes))
+        if local_ids is None:
             return None
 
+        ids = [ns.base + local_id for local_id in local_ids]
         for block_id, block_hash in zip(ids, block_hashes):
             self._id_to_hash[block_id] = block_hash
-            self._hash_to_id[block_hash] = block_id
+            ns.hash_to_id[block_hash] = block_id
 
         return ids
 
     def store(self, block_id: int, data: bytes, block_hash: str) -> bool:
-        """Store block bytes. Auto-allocates the slot if not already allocated."""
+        """Copy block bytes into the block's slot. Auto-allocates the slot if not already allocated."""
         start = time.monotonic()
-        if not self.allocator.is_allocated(block_id):
-            # Auto-allocate: the engine-side backend tracks its own IDs
-            # and may store without a prior AllocateBlocks RPC.
-            if not self.allocator.allocate_specific(block_id):
-                l1_metrics.l1_cache_operations_total.labels(op="store", status="error").inc()
+        size = len(data)
+        if not self._reserve(block_id, size, op="store"):
+            return False
+        self._detach(block_id, block_hash)
+        if self._compressor is not None:
+            if not self._store_pages(block_id, data, block_hash):
+                _OPS_TOTAL["store", "error"].inc()
                 return False
+        else:
+            offset = block_id * self._block_size
+            self._view[offset:offset + size] = data
+        self._record(block_id, size, block_hash, op="store", start=start)
+        return True
 
-        self._data[block_id] = data
-        self._id_to_hash[block_id] = block_hash
-        self._hash_to_id[block_hash] = block_id
-        self.eviction_policy.track_new(block_hash, len(data))
-        l1_metrics.l1_cache_operations_total.labels(op="store", status="hit").inc()
-        l1_metrics.l1_cache_transfer_bytes_total.labels(direction="store").inc(len(data))
-        self._update_metrics()
-        l1_metrics.l1_cache_operation_duration_seconds.labels(op="store").observe(
-            time.monotonic() - start
-        )
+    def _store_pages(self, block_id: int, data, block_hash: str) -> bool:
+        """Encode a block and copy the payload into free pages, evicting others for room."""
+        codec, payload = self._compressor.compress(data)
+        self._release_pages(block_id)
+        npages = -(-payload.nbytes // self._page_size)
+        ns = self._ns(block_id)
+        # The block is re-tracked by _record; it must not be its own victim
+        ns.eviction_policy.remove(block_hash)
+        while len(self._free_pages) < npages:
+            victim_id = self._page_victim()
+            if victim_id is None:
+                logger.warning(f"Block {block_id} needs {npages} pages, only {len(self._free_pages)} free")
+                self._clear_slot(block_id)
+                return False
+            self._evict(victim_id)
+            _CAPACITY_EVICTIONS.inc()
+
+        base = block_id * self._pages_per_block
+        page_size = self._page_size
+        for i in range(npages):
+            page = self._free_pages.pop()
+            self._page_table[base + i] = page
+            chunk = payload[i * page_size:(i + 1) * page_size]
+            self._view[page * page_size:page * page_size + chunk.nbytes] = chunk
+        self._page_counts[block_id] = npages
+        ns.pages += npages
+        self._payload_lengths[block_id] = payload.nbytes
+        self._codecs[block_id] = codec
+        return True
+
+    def _page_victim(self) -> Optional[int]:
+        """Block to evict for pages, taken from the namespace using the most pages for its quota."""
+        for ns in sorted(self._namespaces, key=lambda ns: ns.pages / max(ns.num_blocks, 1), reverse=True):
+            while True:
+                victim_hash = ns.eviction_policy.select_victim()
+                if not victim_hash:
+                    break
+                victim_id = ns.hash_to_id.get(victim_hash)
+                if victim_id is not None:
+                    return victim_id
+                ns.eviction_policy.remove(victim_hash)
+        return None
+
+    def _release_pages(self, block_id: int) -> None:
+        npages = self._page_counts[block_id]
+        self._ns(block_id).pages -= npages
+        base = block_id * self._pages_per_block
+        # Push in reverse so the next store pops the same run in order
+        for i in range(npages - 1, -1, -1):
+            self._free_pages.append(self._page_table[base + i])
+            self._page_table[base + i] = -1
+        self._page_counts[block_id] = 0
+
+    def _load_pages(self, block_id: int, size: int) -> memoryview:
+        codec = self._codecs[block_id]
+        if codec == CODEC_ZERO:
+            return memoryview(self._zero_block)[:size]
+        npages = self._page_counts[block_id]
+        length = self._payload_lengths[block_id]
+        base = block_id * self._pages_per_block
+        first = self._page_table[base]
+        page_size = self._page_size
+        if all(self._page_table[base + i] == first + i for i in range(1, npages)):
+            payload = self._view[first * page_size:first * page_size + length]
+        else:
+            payload = memoryview(b"".join(
+                self._view[p * page_size:(p + 1) * page_size]
+                for p in self._page_table[base:base + npages]
+            ))[:length]
+        if codec == CODEC_NONE:
+            return payload
+        return memoryview(self._compressor.decompress(codec, payload, size))
+
+    def commit(self, block_id: int, size: int, block_hash: str) -> bool:
+        """Record a block whose ``size`` bytes were written straight into its shared slot."""
+        start = time.monotonic()
+        if not self._reserve(block_id, size, op="commit"):
+            return False
+        self._detach(block_id, block_hash)
+        self._record(block_id, size, block_hash, op="commit", start=start)
         return True
 
-    def load(self, block_id: int) -> Optional[bytes]:
-        """Retrieve block bytes. Returns None on miss."""
+    def _reserve(self, block_id: int, size: int, op: str) -> bool:
+        if size < 0 or size > self._block_size:
+            logger.warning(f"Block {block_id} is {size} bytes, larger than the {self._block_size}-byte slot")
+            _OPS_TOTAL[op, "error"].inc()
+            return False
+        if not 0 <= block_id < self._num_blocks:
+            _OPS_TOTAL[op, "error"].inc()
+            return False
+        # Auto-allocate: the engine-side backend tracks its own IDs
+        # and may store without a prior AllocateBlocks RPC.
+        ns = self._ns(block_id)
+        ns.allocator.allocate_specific(block_id - ns.base)
+        return True
+
+    def link(self, block_id: int, block_hash: str) -> bool:
+        """Make ``block_id`` share the bytes of the resident copy of ``block_hash``.
+
+        Stores nothing: loads of ``block_id`` read the owning slot. False if
+        the block is not resident (the caller must store it). Not available
+        with ``shm_path``, where the engine reads slots directly.
+        """
         start = time.monotonic()
-        data = self._data.get(block_id)
-        if data is None:
-            l1_metrics.l1_cache_operations_total.labels(op="load", status="miss").inc()
+        if self._shm_path or not 0 <= block_id < self._num_blocks:
+            _OPS_TOTAL["link", "miss"].inc()
+            return False
+        ns = self._ns(block_id)
+        # Only within the namespace: equal hashes of different models are not the same block
+        owner = self.resident_id(block_hash, ns.name)
+        if owner is None:
+            _OPS_TOTAL["link", "miss"].inc()
+            return False
+        if owner != block_id:
+            ns.allocator.allocate_specific(block_id - ns.base)
+            self._detach(block_id, block_hash)
+            previous = self._id_to_hash.get(block_id)
+            if previous is not None and ns.hash_to_id.get(previous) == block_id:
+                # The slot's own block is replaced by the link
+                ns.hash_to_id.pop(previous, None)
+                ns.eviction_policy.remove(previous)
+                if self.eviction_listener is not None:
+                    self.eviction_listener(block_id, previous, None)
+            self._clear_slot(block_id)
+            self._alias_of[block_id] = owner
+            self._aliases.setdefault(owner, set()).add(block_id)
+            self._id_to_hash[block_id] = block_hash
+        ns.eviction_policy.record_access(block_hash)
+        _OPS_TOTAL["link", "hit"].inc()
+        _DEDUP_SAVED_BYTES.inc(self._lengths[owner])
+        _OP_DURATION["link"].observe(time.monotonic() - start)
+        return True
+
+    def owner_of(self, block_id: int) -> int:
+        """The slot whose bytes ``block_id`` reads: itself unless it is a link."""
+        return self._alias_of.get(block_id, block_id)
+
+    def _detach(self, block_id: int, block_hash: str) -> None:
+        """Undo links before ``block_id`` takes its own bytes for ``block_hash``."""
+        owner = self._alias_of.pop(block_id, None)
+        if owner is not None:
+            self._unlink(owner, block_id)
+            self._id_to_hash.pop(block_id, None)
+        elif self._id_to_hash.get(block_id) != block_hash:
+            # Links to the slot's old block must not see the new bytes
+            self._drop_aliases(block_id)
+
+    def _unlink(self, owner: int, alias: int) -> None:
+        aliases = self._aliases.get(owner)
+        if aliases is not None:
+            aliases.discard(alias)
+            if not aliases:
+                del self._aliases[owner]
+
+    def _drop_aliases(self, owner: int) -> None:
+        """Free the IDs linked to ``owner``; their blocks must be stored again."""
+        aliases = self._aliases.pop(owner, ())
+        if not aliases:
+            return
+        ns = self._ns(owner)
+        for alias in aliases:
+            del self._alias_of[alias]
+            self._id_to_hash.pop(alias, None)
+            ns.allocator.free(alias - ns.base)
+
+    def _record(self, block_id: int, size: int, block_hash: str, op: str, start: float) -> None:
+        ns = self._ns(block_id)
+        if self._lengths[block_id] == self._EMPTY:
+            self._num_stored += 1
+            ns.num_stored += 1
+        else:
+            self._logical_bytes -= self._lengths[block_id]
+        self._logical_bytes += size
+        previous = self._id_to_hash.get(block_id)
+        if previous is not None and previous != block_hash:
+            # The engine reused the slot for another block
+            ns.hash_to_id.pop(previous, None)
+            ns.eviction_policy.remove(previous)
+            if self.eviction_listener is not None:
+                self.eviction_listener(block_id, previous, None)
+        self._lengths[block_id] = size
+        self._id_to_hash[block_id] = block_hash
+        ns.hash_to_id[block_hash] = block_id
+        ns.eviction_policy.track_new(block_hash, size)
+        _OPS_TOTAL[op, "hit"].inc()
+        _STORED_BYTES.inc(size)
+        _OP_DURATION[op].observe(time.monotonic() - start)
+
+    def load(self, block_id: int) -> Optional[memoryview]:
+        """Zero-copy view of the block's bytes. Returns None on miss."""
+        start = time.monotonic()
+        block_id = self._alias_of.get(block_id, block_id)
+        if not 0 <= block_id < self._num_blocks:
+            _OPS_TOTAL["load", "miss"].inc()
+            return None
+        ns = self._ns(block_id)
+        size = self._lengths[block_id]
+        if size == self._EMPTY:
+            _OPS_TOTAL["load", "miss"].inc()
+            ns.misses.inc()
             return None
+        data = self._peek(block_id)
 
         block_hash = self._id_to_hash.get(block_id)
         if block_hash:
-            self.eviction_policy.record_access(block_hash)
-        l1_metrics.l1_cache_operations_total.labels(op="load", status="hit").inc()
-        l1_metrics.l1_cache_transfer_bytes_total.labels(direction="load").inc(len(data))
-        l1_metrics.l1_cache_operation_duration_seconds.labels(op="load").observe(
-            time.monotonic() - start
-        )
+            ns.eviction_policy.record_access(block_hash)
+        _OPS_TOTAL["load", "hit"].inc()
+        ns.hits.inc()
+        _LOADED_BYTES.inc(size)
+        _OP_DURATION["load"].observe(time.monotonic() - start)
         return data
 
+    def resident_id(self, block_hash: str, namespace: str = "") -> Optional[int]:
+        """Slot holding the block's bytes in a namespace, or None if it is not stored in L1."""
+        block_id = self.namespace(namespace).hash_to_id.get(block_hash)
+        if block_id is None or self._lengths[block_id] == self._EMPTY:
+            return None
+        return block_id
+
+    def slot_of(self, block_hash: str, namespace: str = "") -> Optional[int]:
+        """Slot reserved for or holding the block in a namespace, stored or not."""
+        return self.namespace(namespace).hash_to_id.get(block_hash)
+
+    def resident_blocks(self) -> list[tuple[int, str]]:
+        """(block_id, block_hash) of every block whose bytes are stored."""
+        return [(bid, h) for bid, h in self._id_to_hash.items() if self._lengths[bid] != self._EMPTY]
+
+    def _peek(self, block_id: int) -> Optional[memoryview]:
+        """The block's bytes without touching metrics or eviction state."""
+        block_id = self._alias_of.get(block_id, block_id)
+        size = self._lengths[block_id]
+        if size == self._EMPTY:
+            return None
+        if self._compressor is not None:
+            return self._load_pages(block_id, size)
+        offset = block_id * self._block_size
+        return self._view[offset:offset + size]
+
     def free(self, block_id: int) -> bool:
         """Release a block slot and its data."""
+        if not 0 <= block_id < self._num_blocks:
+            logger.warning(f"Free of invalid block_id: {block_id}")
+            return False
+        ns = self._ns(block_id)
+        owner = self._alias_of.pop(block_id, None)
+        if owner is not None:
+            # A link: the block stays resident in its owner's slot
+            self._unlink(owner, block_id)
+            self._id_to_hash.pop(block_id, None)
+            return ns.allocator.free(block_id - ns.base)
+        self._drop_aliases(block_id)
         block_hash = self._id_to_hash.pop(block_id, None)
         if block_hash:
-            self._hash_to_id.pop(block_hash, None)
-            self.eviction_policy.remove(block_hash)
-        self._data.pop(block_id, None)
-        result = self.allocator.free(block_id)
-        self._update_metrics()
+            ns.hash_to_id.pop(block_hash, None)
+            ns.eviction_policy.remove(block_hash)
+        self._clear_slot(block_id)
+        result = ns.allocator.free(block_id - ns.base)
         return result
 
     def _evict(self, block_id: int) -> None:
         """Evict a specific block by ID."""
+        self._drop_aliases(block_id)
+        ns = self._ns(block_id)
         block_hash = self._id_to_hash.pop(block_id, None)
         if block_hash:
-            self._hash_to_id.pop(block_hash, None)
-            self.eviction_policy.remove(block_hash)
-        self._data.pop(block_id, None)
-        self.allocator.free(block_id)
-        self._update_metrics()
+            ns.hash_to_id.pop(block_hash, None)
+            ns.eviction_policy.on_evict(block_hash)
+            if self.eviction_listener is not None:
+                self.eviction_listener(block_id, block_hash, self._peek(block_id))
+        self._clear_slot(block_id)
+        ns.allocator.free(block_id - ns.base)
+
+    def _clear_slot(self, block_id: int) -> None:
+        if 0 <= block_id < len(self._lengths) and self._lengths[block_id] != self._EMPTY:
+            self._logical_bytes -= self._lengths[block_id]
+            self._lengths[block_id] = self._EMPTY
+            self._num_stored -= 1
+            self._ns(block_id).num_stored -= 1
+            if self._compressor is not None:
+                self._release_pages(block_id)
+
+    def close(self) -> None:
+        """Unmap the arena and remove its shared-memory file."""
+        try:
+            self._view.release()
+            self._arena.close()
+        except BufferError:
+            # A caller still holds a loaded view; the mapping goes with the process
+            logger.debug("L1 arena still referenced at close")
+        if self._shm_path:
+            try:
+                os.unlink(self._shm_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,198 @@
+"""Per-block compression for the L1 byte store.
+
+``BlockCompressor`` turns a block into ``(codec, payload)``. All-zero blocks
+(the handler's placeholders, zero padding) become ``CODEC_ZERO`` with an empty
+payload. Other blocks are compressed with zlib, or lz4 / zstd when those
+packages are installed, and kept raw (``CODEC_NONE``) unless the payload is at
+least ``min_ratio`` times smaller.
+
+The codec is chosen from measurements: every ``probe_interval`` blocks the
+candidates are run on the incoming block, and per-codec moving averages of
+ratio and compress time pick the best ratio within ``cpu_budget_us`` per
+block; if no codec fits the budget, blocks are kept raw until the next probe.
+Every block is first checked by compressing a few small samples of it, so an
+incompressible block costs a fraction of a full compression and never skews
+the measurements.
+"""
+
+import logging
+import time
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from data_plane.inference.sidecar.l1_cache import metrics as l1_metrics
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lz4.block as _lz4
+except ImportError:
+    _lz4 = None
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+CODEC_NONE = 0
+CODEC_ZERO = 1
+CODEC_ZLIB = 2
+CODEC_LZ4 = 3
+CODEC_ZSTD = 4
+
+CODEC_NAMES = {
+    CODEC_NONE: "none",
+    CODEC_ZERO: "zero",
+    CODEC_ZLIB: "zlib",
+    CODEC_LZ4: "lz4",
+    CODEC_ZSTD: "zstd",
+}
+
+COMPRESSION_MODES = ("off", "zlib", "lz4", "zstd", "auto")
+
+_BLOCKS_BY_CODEC = {
+    codec: l1_metrics.l1_cache_compressed_blocks_total.labels(codec=name) for codec, name in CODEC_NAMES.items()
+}
+_DURATION = {
+    (op, codec): l1_metrics.l1_cache_compression_duration_seconds.labels(op=op, codec=name)
+    for op in ("compress", "decompress")
+    for codec, name in CODEC_NAMES.items()
+}
+
+# Weight of the newest sample in the per-codec moving averages
+_EWMA_ALPHA = 0.2
+# Pre-check: compress this many evenly spaced pieces of the block first
+_SAMPLE_PIECES = 4
+_SAMPLE_PIECE_BYTES = 1024
+
+Compress = Callable[[memoryview], bytes]
+Decompress = Callable[[memoryview, int], bytes]
+
+
+def _available_codecs() -> Dict[int, Tuple[Compress, Decompress]]:
+    codecs: Dict[int, Tuple[Compress, Decompress]] = {
+        CODEC_ZLIB: (
+            lambda data: zlib.compress(data, 1),
+            lambda payload, size: zlib.decompress(payload, bufsize=size),
+        ),
+    }
+    if _lz4 is not None:
+        codecs[CODEC_LZ4] = (
+            lambda data: _lz4.compress(data, store_size=False),
+            lambda payload, size: _lz4.decompress(payload, uncompressed_size=size),
+        )
+    if _zstd is not None:
+        compressor = _zstd.ZstdCompressor(level=1)
+        decompressor = _zstd.ZstdDecompressor()
+        codecs[CODEC_ZSTD] = (
+            compressor.compress,
+            lambda payload, size: decompressor.decompress(payload, max_output_size=size),
+        )
+    return codecs
+
+
+class BlockCompressor:
+    """Adaptive codec selection for L1 blocks."""
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        min_ratio: float = 1.25,
+        cpu_budget_us: float = 1000.0,
+        probe_interval: int = 64,
+    ):
+        if mode not in COMPRESSION_MODES or mode == "off":
+            raise ValueError(f"Unknown compression mode {mode!r}; expected one of {COMPRESSION_MODES[1:]}")
+        available = _available_codecs()
+        if mode == "auto":
+            self._codecs = available
+        else:
+            codec = {"zlib": CODEC_ZLIB, "lz4": CODEC_LZ4, "zstd": CODEC_ZSTD}[mode]
+            if codec not in available:
+                logger.warning(f"Compression codec {mode} is not installed, using zlib")
+                codec = CODEC_ZLIB
+            self._codecs = {codec: available[codec]}
+        self.mode = mode
+        self.min_ratio = min_ratio
+        self.cpu_budget_us = cpu_budget_us
+        self.probe_interval = max(1, probe_interval)
+        # codec -> [ratio, compress microseconds] moving averages
+        self._stats: Dict[int, list] = {}
+        # None while no codec fits the CPU budget
+        self._current: Optional[int] = min(self._codecs)
+        self._seen = 0
+        # Set every probe_interval blocks; the next block passing the sample check is probed
+        self._probe_pending = True
+        self._zeros = b""
+
+    @property
+    def current_codec(self) -> str:
+        return CODEC_NAMES[self._current if self._current is not None else CODEC_NONE]
+
+    def compress(self, data) -> Tuple[int, memoryview]:
+        """Encode one block. Returns ``(codec, payload)``; the payload aliases ``data`` when raw."""
+        view = memoryview(data).cast("B")
+        size = view.nbytes
+        if len(self._zeros) < size:
+            self._zeros = bytes(size)
+        if view == self._zeros[:size]:
+            _BLOCKS_BY_CODEC[CODEC_ZERO].inc()
+            return CODEC_ZERO, memoryview(b"")
+
+        self._seen += 1
+        if self._seen % self.probe_interval == 0:
+            self._probe_pending = True
+        candidate = self._current
+        if candidate is None and self._probe_pending:
+            candidate = min(self._codecs)
+        if candidate is None or not self._sample_compresses(candidate, view):
+            codec, payload = CODEC_NONE, None
+        else:
+            if self._probe_pending:
+                self._probe_pending = False
+                codec, payload = self._probe(view)
+            else:
+                codec, payload = candidate, self._run(candidate, view)
+
+        if payload is None or len(payload) * self.min_ratio > size:
+            _BLOCKS_BY_CODEC[CODEC_NONE].inc()
+            return CODEC_NONE, view
+        _BLOCKS_BY_CODEC[codec].inc()
+        return codec, memoryview(payload)
+
+    def decompress(self, codec: int, payload, size: int) -> bytes:
+        """Decode a payload produced by ``compress`` back to ``size`` bytes."""
+        if codec == CODEC_ZERO:
+            return bytes(size)
+        start = time.perf_counter()
+        data = self._codecs[codec][1](payload, size)
+        _DURATION["decompress", codec].observe(time.perf_counter() - start)
+        return data
+
+    def _run(self, codec: int, view: memoryview) -> bytes:
+        start = time.perf_counter()
+        payload = self._codecs[codec][0](view)
+        elapsed = time.perf_counter() - start
+        _DURATION["compress", codec].observe(elapsed)
+        stats = self._stats.setdefault(codec, [view.nbytes / max(len(payload), 1), elapsed * 1e6])
+        stats[0] += _EWMA_ALPHA * (view.nbytes / max(len(payload), 1) - stats[0])
+        stats[1] += _EWMA_ALPHA * (elapsed * 1e6 - stats[1])
+        return payload
+
+    def _sample_compresses(self, codec: int, view: memoryview) -> bool:
+        size = view.nbytes
+        if size < 4 * _SAMPLE_PIECES * _SAMPLE_PIECE_BYTES:
+            return True
+        step = size // _SAMPLE_PIECES
+        sample = b"".join(view[i * step:i * step + _SAMPLE_PIECE_BYTES] for i in range(_SAMPLE_PIECES))
+        return len(self._codecs[codec][0](sample)) * self.min_ratio <= len(sample)
+
+    def _probe(self, view: memoryview) -> Tuple[int, Optional[bytes]]:
+        """Try every codec on this block, then re-pick the one to use until the next probe."""
+        outputs = {codec: self._run(codec, view) for codec in self._codecs}
+        within_budget = [c for c in self._codecs if self._stats[c][1] <= self.cpu_budget_us]
+        if not within_budget:
+            self._current = None
+            return CODEC_NONE, None
+        self._current = max(within_budget, key=lambda c: self._stats[c][0])
+        return self._current, outputs[self._current]
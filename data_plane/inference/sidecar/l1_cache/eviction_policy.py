@@ -19,6 +19,18 @@ class EvictionPolicy:
         """Removes a key from tracking (e.g. after manual deletion)."""
         raise NotImplementedError
 
+    def on_evict(self, key: str):
+        """Called when the cache evicts the key returned by select_victim().
+
+        Policies that keep history of evicted keys (ghost lists) override this;
+        by default it is the same as remove().
+        """
+        self.remove(key)
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        """Whether a new key may displace ``victim``. Admission filters override this."""
+        return True
+
 class LRUPolicy(EvictionPolicy):
     """
     Least Recently Used (LRU) implementation using an OrderedDict.
@@ -43,4 +55,278 @@ class LRUPolicy(EvictionPolicy):
 
     def remove(self, key: str):
         if key in self._cache_map:
-            del self._cache_map[key]
\ No newline at end of file
+            del self._cache_map[key]
+
+class TwoQueuePolicy(EvictionPolicy):
+    """
+    2Q (Johnson & Shasha). New keys enter a FIFO probation queue (A1in); keys
+    evicted from it are remembered in a ghost queue (A1out), and only a key
+    seen again while in A1out is promoted to the LRU main queue (Am). A scan
+    of one-off keys therefore only churns A1in.
+    """
+    def __init__(self, capacity: int, in_fraction: float = 0.25, out_fraction: float = 0.5):
+        self._kin = max(1, int(capacity * in_fraction))
+        self._kout = max(1, int(capacity * out_fraction))
+        self._a1in: OrderedDict[str, int] = OrderedDict()
+        self._a1out: OrderedDict[str, None] = OrderedDict()
+        self._am: OrderedDict[str, int] = OrderedDict()
+
+    def record_access(self, key: str):
+        # Hits in A1in do not reorder: it is a FIFO
+        if key in self._am:
+            self._am.move_to_end(key)
+
+    def track_new(self, key: str, size: int):
+        if key in self._am:
+            self._am[key] = size
+            self._am.move_to_end(key)
+        elif key in self._a1in:
+            self._a1in[key] = size
+        elif key in self._a1out:
+            del self._a1out[key]
+            self._am[key] = size
+        else:
+            self._a1in[key] = size
+
+    def select_victim(self) -> Optional[str]:
+        if self._a1in and (len(self._a1in) > self._kin or not self._am):
+            return next(iter(self._a1in))
+        if self._am:
+            return next(iter(self._am))
+        return None
+
+    def on_evict(self, key: str):
+        if key in self._a1in:
+            del self._a1in[key]
+            self._a1out[key] = None
+            while len(self._a1out) > self._kout:
+                self._a1out.popitem(last=False)
+        else:
+            self._am.pop(key, None)
+
+    def remove(self, key: str):
+        self._a1in.pop(key, None)
+        self._am.pop(key, None)
+
+
+class ARCPolicy(EvictionPolicy):
+    """
+    Adaptive Replacement Cache (Megiddo & Modha). T1 holds keys seen once
+    recently, T2 keys seen at least twice; ghost lists B1/B2 remember keys
+    evicted from each, and a hit in a ghost list shifts the target size ``p``
+    of T1 toward whichever side would have kept it.
+    """
+    def __init__(self, capacity: int):
+        self._c = max(1, capacity)
+        self._p = 0.0
+        self._t1: OrderedDict[str, int] = OrderedDict()
+        self._t2: OrderedDict[str, int] = OrderedDict()
+        self._b1: OrderedDict[str, None] = OrderedDict()
+        self._b2: OrderedDict[str, None] = OrderedDict()
+
+    def record_access(self, key: str):
+        if key in self._t1:
+            self._t2[key] = self._t1.pop(key)
+        elif key in self._t2:
+            self._t2.move_to_end(key)
+
+    def track_new(self, key: str, size: int):
+        if key in self._t1 or key in self._t2:
+            self.record_access(key)
+            self._t2[key] = size
+        elif key in self._b1:
+            self._p = min(self._c, self._p + max(len(self._b2) / len(self._b1), 1))
+            del self._b1[key]
+            self._t2[key] = size
+        elif key in self._b2:
+            self._p = max(0.0, self._p - max(len(self._b1) / len(self._b2), 1))
+            del self._b2[key]
+            self._t2[key] = size
+        else:
+            self._t1[key] = size
+        self._trim_ghosts()
+
+    def select_victim(self) -> Optional[str]:
+        if self._t1 and (len(self._t1) > self._p or not self._t2):
+            return next(iter(self._t1))
+        if self._t2:
+            return next(iter(self._t2))
+        return None
+
+    def on_evict(self, key: str):
+        if key in self._t1:
+            del self._t1[key]
+            self._b1[key] = None
+        elif key in self._t2:
+            del self._t2[key]
+            self._b2[key] = None
+        self._trim_ghosts()
+
+    def remove(self, key: str):
+        self._t1.pop(key, None)
+        self._t2.pop(key, None)
+
+    def _trim_ghosts(self):
+        while self._b1 and len(self._t1) + len(self._b1) > self._c:
+            self._b1.popitem(last=False)
+        while self._b2 and len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) > 2 * self._c:
+            self._b2.popitem(last=False)
+
+
+class S3FIFOPolicy(EvictionPolicy):
+    """
+    S3-FIFO (Yang et al.). New keys enter a small FIFO (~10% of capacity);
+    those re-accessed while there move to the main FIFO, the rest are evicted
+    early and remembered in a ghost FIFO so a quick return goes straight to
+    main. Main is a FIFO with lazy promotion: a key with a non-zero access
+    count is reinserted (count decremented) instead of evicted.
+    """
+    _MAX_FREQ = 3
+
+    def __init__(self, capacity: int, small_fraction: float = 0.1):
+        capacity = max(1, capacity)
+        self._small_target = max(1, int(capacity * small_fraction))
+        self._ghost_size = max(1, capacity - self._small_target)
+        self._small: OrderedDict[str, int] = OrderedDict()
+        self._main: OrderedDict[str, int] = OrderedDict()
+        self._ghost: OrderedDict[str, None] = OrderedDict()
+        self._freq: Dict[str, int] = {}
+
+    def record_access(self, key: str):
+        if key in self._freq:
+            self._freq[key] = min(self._freq[key] + 1, self._MAX_FREQ)
+
+    def track_new(self, key: str, size: int):
+        if key in self._freq:
+            self.record_access(key)
+            return
+        self._freq[key] = 0
+        if key in self._ghost:
+            del self._ghost[key]
+            self._main[key] = size
+        else:
+            self._small[key] = size
+
+    def select_victim(self) -> Optional[str]:
+        if len(self._small) >= self._small_target or not self._main:
+            # Promote re-accessed keys out of the small queue
+            while self._small:
+                key = next(iter(self._small))
+                if self._freq[key] == 0:
+                    return key
+                self._main[key] = self._small.pop(key)
+                self._freq[key] = 0
+        # Lazy promotion in main: spend one access to survive another pass
+        while self._main:
+            key = next(iter(self._main))
+            if self._freq[key] == 0:
+                return key
+            self._freq[key] -= 1
+            self._main.move_to_end(key)
+        return None
+
+    def on_evict(self, key: str):
+        if key in self._small:
+            del self._small[key]
+            self._ghost[key] = None
+            while len(self._ghost) > self._ghost_size:
+                self._ghost.popitem(last=False)
+        else:
+            self._main.pop(key, None)
+        self._freq.pop(key, None)
+
+    def remove(self, key: str):
+        self._small.pop(key, None)
+        self._main.pop(key, None)
+        self._freq.pop(key, None)
+
+
+class TinyLFUAdmission(EvictionPolicy):
+    """
+    TinyLFU admission filter (Einziger et al.) in front of another policy.
+    Access frequencies are estimated with a count-min sketch of 4-bit
+    counters that are halved every ``sample_factor * capacity`` increments, so
+    old popularity fades. A new key only displaces the victim the wrapped
+    policy picked if it has been requested more often recently.
+    """
+    _DEPTH = 4
+    _MAX_COUNT = 15
+
+    def __init__(self, policy: EvictionPolicy, capacity: int, sample_factor: int = 10):
+        self.policy = policy
+        width = 1
+        while width < max(16, capacity * 4):
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(self._DEPTH)]
+        self._sample_size = max(1, capacity) * sample_factor
+        self._additions = 0
+        # Candidates already counted by admit() whose track_new is still to come
+        self._counted: set = set()
+
+    def _indexes(self, key: str):
+        h = hash(key)
+        for i in range(self._DEPTH):
+            yield (h ^ (h >> (16 + i * 7)) ^ (0x9E3779B9 * (i + 1))) & self._mask
+            h = (h * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+
+    def increment(self, key: str):
+        for row, idx in zip(self._rows, self._indexes(key)):
+            if row[idx] < self._MAX_COUNT:
+                row[idx] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            # Aging: halve every counter
+            for row in self._rows:
+                row[:] = bytes(c >> 1 for c in row)
+            self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        return min(row[idx] for row, idx in zip(self._rows, self._indexes(key)))
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        self.increment(candidate)
+        if self.estimate(candidate) > self.estimate(victim):
+            self._counted.add(candidate)
+            return True
+        return False
+
+    def record_access(self, key: str):
+        self.increment(key)
+        self.policy.record_access(key)
+
+    def track_new(self, key: str, size: int):
+        if key in self._counted:
+            self._counted.discard(key)
+        else:
+            self.increment(key)
+        self.policy.track_new(key, size)
+
+    def select_victim(self) -> Optional[str]:
+        return self.policy.select_victim()
+
+    def on_evict(self, key: str):
+        self.policy.on_evict(key)
+
+    def remove(self, key: str):
+        self.policy.remove(key)
+
+
+EVICTION_POLICIES = ("lru", "2q", "arc", "s3fifo")
+
+
+def make_eviction_policy(name: str, capacity: int, tinylfu_admission: bool = False) -> EvictionPolicy:
+    """Build the policy named in config for a cache of ``capacity`` blocks."""
+    if name == "lru":
+        policy: EvictionPolicy = LRUPolicy()
+    elif name == "2q":
+        policy = TwoQueuePolicy(capacity)
+    elif name == "arc":
+        policy = ARCPolicy(capacity)
+    elif name == "s3fifo":
+        policy = S3FIFOPolicy(capacity)
+    else:
+        raise ValueError(f"Unknown eviction policy {name!r}; expected one of {EVICTION_POLICIES}")
+    if tinylfu_admission:
+        policy = TinyLFUAdmission(policy, capacity)
+    return policy
@@ -1,6 +1,12 @@
-"""Prometheus metrics for L1 KV cache operations."""
+"""Prometheus metrics for L1 KV cache operations.
 
-from prometheus_client import Counter, Gauge, Histogram
+Per-block counters and histograms are hot-path collectors (bind children once
+with ``labels()``); gauges are computed from the store when scraped.
+"""
+
+from prometheus_client import Gauge, Histogram
+
+from shared.monitoring.hot_path import HotCounter, HotHistogram
 
 l1_cache_capacity_bytes = Gauge(
     "l1_cache_capacity_bytes",
@@ -17,13 +23,13 @@ l1_cache_utilization_ratio = Gauge(
     "L1 cache used / capacity ratio",
 )
 
-l1_cache_operations_total = Counter(
+l1_cache_operations_total = HotCounter(
     "l1_cache_operations_total",
     "Total L1 cache operations",
     ["op", "status"],
 )
 
-l1_cache_operation_duration_seconds = Histogram(
+l1_cache_operation_duration_seconds = HotHistogram(
     "l1_cache_operation_duration_seconds",
     "End-to-end L1 cache operation latency (includes transfer)",
     ["op"],
@@ -37,19 +43,72 @@ l1_cache_transfer_duration_seconds = Histogram(
     buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
 )
 
-l1_cache_transfer_bytes_total = Counter(
+l1_cache_transfer_bytes_total = HotCounter(
     "l1_cache_transfer_bytes_total",
     "Total bytes transferred",
     ["direction"],
 )
 
-l1_cache_evictions_total = Counter(
+l1_cache_evictions_total = HotCounter(
     "l1_cache_evictions_total",
     "Total L1 cache evictions",
     ["reason"],
 )
 
+l1_cache_admission_rejections_total = HotCounter(
+    "l1_cache_admission_rejections_total",
+    "Allocations refused because the admission filter kept the eviction victim",
+)
+
+l1_cache_dedup_saved_bytes_total = HotCounter(
+    "l1_cache_dedup_saved_bytes_total",
+    "Bytes not stored because a block was linked to a resident copy of the same block",
+)
+
 l1_cache_blocks_stored = Gauge(
     "l1_cache_blocks_stored",
     "Current number of blocks stored in L1",
 )
+
+l1_cache_compressed_blocks_total = HotCounter(
+    "l1_cache_compressed_blocks_total",
+    "Blocks stored per codec (\"none\" = kept raw, \"zero\" = all-zero block)",
+    ["codec"],
+)
+
+l1_cache_compression_duration_seconds = HotHistogram(
+    "l1_cache_compression_duration_seconds",
+    "CPU time spent compressing or decompressing one block",
+    ["op", "codec"],
+    buckets=[0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05],
+)
+
+l1_cache_compression_ratio = Gauge(
+    "l1_cache_compression_ratio",
+    "Logical block bytes held in L1 / arena bytes they occupy",
+)
+
+l1_cache_effective_capacity_bytes = Gauge(
+    "l1_cache_effective_capacity_bytes",
+    "Logical bytes L1 can hold at the current compression ratio",
+)
+
+# --- Per-namespace (per-model) partitions ---
+
+l1_cache_namespace_capacity_blocks = Gauge(
+    "l1_cache_namespace_capacity_blocks",
+    "Block IDs reserved for each L1 namespace (its quota)",
+    ["namespace"],
+)
+
+l1_cache_namespace_blocks_stored = Gauge(
+    "l1_cache_namespace_blocks_stored",
+    "Blocks currently stored in each L1 namespace",
+    ["namespace"],
+)
+
+l1_cache_namespace_loads_total = HotCounter(
+    "l1_cache_namespace_loads_total",
+    "L1 loads per namespace by result (hit rate = hit / (hit + miss))",
+    ["namespace", "result"],
+)
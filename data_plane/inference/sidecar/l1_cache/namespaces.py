@@ -0,0 +1,77 @@
+"""L1 namespaces — per-model partitions of the block-ID space.
+
+Several engines can share one sidecar, and each picks its own block IDs. Left
+alone, two engines would write each other's slots, and one busy model would
+evict every other model's blocks. With namespace weights configured, L1's
+``num_blocks`` IDs are split into contiguous ranges sized by weight, one per
+namespace. An engine asks for its range (GetNamespace RPC) and offsets its
+IDs into it.
+
+A range is its namespace's quota. Each namespace has its own allocator and
+eviction policy, so allocating in one only evicts that namespace's blocks.
+Hash lookups (dedup links, promotion) also stay within a namespace. Models
+without a namespace of their own share ``default``, which starts at ID 0.
+"""
+
+from typing import Dict, List, Tuple
+
+from data_plane.inference.sidecar.l1_cache import metrics as l1_metrics
+from data_plane.inference.sidecar.l1_cache.allocator import BlockSlotAllocator
+from data_plane.inference.sidecar.l1_cache.eviction_policy import make_eviction_policy
+
+DEFAULT_NAMESPACE = "default"
+
+
+def split_namespaces(num_blocks: int, weights: Dict[str, float]) -> List[Tuple[str, int, int]]:
+    """(name, base block_id, num_blocks) of each namespace, ``default`` first.
+
+    ``default`` weighs 1.0 unless listed; IDs left over by rounding go to it.
+    """
+    if any(w < 0 for w in weights.values()):
+        raise ValueError("Namespace weights must be non-negative")
+    names = [DEFAULT_NAMESPACE] + sorted(n for n in weights if n != DEFAULT_NAMESPACE)
+    shares = [weights.get(DEFAULT_NAMESPACE, 1.0)] + [weights[n] for n in names[1:]]
+    total = sum(shares)
+    if total <= 0:
+        raise ValueError("Namespace weights must not all be zero")
+    sizes = [int(num_blocks * share / total) for share in shares]
+    sizes[0] += num_blocks - sum(sizes)
+    ranges = []
+    base = 0
+    for name, size in zip(names, sizes):
+        ranges.append((name, base, size))
+        base += size
+    return ranges
+
+
+class Namespace:
+    """One namespace's ID range, allocator, eviction policy and hash index.
+
+    The allocator and the policy work on the namespace's own IDs, i.e. block
+    IDs minus ``base``; ``hash_to_id`` maps to global block IDs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base: int,
+        num_blocks: int,
+        eviction_policy: str = "lru",
+        tinylfu_admission: bool = False,
+    ):
+        self.name = name
+        self.base = base
+        self.num_blocks = num_blocks
+        self.allocator = BlockSlotAllocator(num_blocks)
+        self.eviction_policy = make_eviction_policy(eviction_policy, max(num_blocks, 1), tinylfu_admission)
+        # block_hash -> block_id of the slot reserved for or holding it
+        self.hash_to_id: dict[str, int] = {}
+        self.num_stored = 0
+        # Arena pages held by the namespace's blocks (compressed L1 only)
+        self.pages = 0
+        self.hits = l1_metrics.l1_cache_namespace_loads_total.labels(namespace=name, result="hit")
+        self.misses = l1_metrics.l1_cache_namespace_loads_total.labels(namespace=name, result="miss")
+        l1_metrics.l1_cache_namespace_capacity_blocks.labels(namespace=name).set(num_blocks)
+        l1_metrics.l1_cache_namespace_blocks_stored.labels(namespace=name).set_function(
+            lambda: self.num_stored
+        )
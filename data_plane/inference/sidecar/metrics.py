@@ -1,5 +1,7 @@
 from prometheus_client import Counter, Gauge, Histogram
 
+from shared.monitoring.hot_path import HotCounter
+
 # Model loading
 sidecar_model_load_duration_seconds = Histogram(
     "sidecar_model_load_duration_seconds",
@@ -31,3 +33,104 @@ sidecar_download_bytes_total = Counter(
     "Total bytes downloaded",
     ["artifact_type"],
 )
+
+sidecar_download_throughput_bytes_per_second = Gauge(
+    "sidecar_download_throughput_bytes_per_second",
+    "Current throughput of an in-flight artifact download",
+    ["artifact_type", "identifier"],
+)
+
+sidecar_download_queue_depth = Gauge(
+    "sidecar_download_queue_depth",
+    "Downloads waiting for a scheduler slot",
+    ["priority"],
+)
+
+# Page-cache warming
+sidecar_page_cache_warm_duration_seconds = Histogram(
+    "sidecar_page_cache_warm_duration_seconds",
+    "Time to pull a model's weight shards into the OS page cache",
+    ["model"],
+)
+
+sidecar_page_cache_warm_bytes_total = Counter(
+    "sidecar_page_cache_warm_bytes_total",
+    "Weight bytes read into the OS page cache",
+)
+
+# Shared-volume eviction
+sidecar_artifact_evictions_total = Counter(
+    "sidecar_artifact_evictions_total",
+    "Artifacts evicted from the shared volume",
+    ["artifact_type", "reason"],
+)
+
+sidecar_artifact_evicted_bytes_total = Counter(
+    "sidecar_artifact_evicted_bytes_total",
+    "Bytes freed on the shared volume by artifact eviction",
+    ["artifact_type"],
+)
+
+sidecar_artifact_bytes = Gauge(
+    "sidecar_artifact_bytes",
+    "Bytes of resident artifacts on the shared volume",
+    ["artifact_type"],
+)
+
+# Content-addressed blob store
+sidecar_blob_dedup_bytes_total = Counter(
+    "sidecar_blob_dedup_bytes_total",
+    "Bytes not downloaded (source=download) or not stored twice (source=ingest) thanks to existing blobs",
+    ["source"],
+)
+
+sidecar_blob_gc_freed_bytes_total = Counter(
+    "sidecar_blob_gc_freed_bytes_total",
+    "Bytes freed by deleting blobs no version directory links to",
+)
+
+# Peer-to-peer artifact distribution
+sidecar_peer_fetch_total = Counter(
+    "sidecar_peer_fetch_total",
+    "Artifact fetches attempted from peer sidecars",
+    ["result"],
+)
+
+# KV cache tiering (L1 <-> L2)
+sidecar_kv_tier_lookups_total = HotCounter(
+    "sidecar_kv_tier_lookups_total",
+    "KV block loads by the tier that answered them (L2 is only asked on an L1 miss)",
+    ["tier", "result"],
+)
+
+sidecar_kv_demotions_total = Counter(
+    "sidecar_kv_demotions_total",
+    "Evicted blocks written back to the next tier down (DISK or L2)",
+    ["tier", "status"],
+)
+
+sidecar_kv_promotions_total = Counter(
+    "sidecar_kv_promotions_total",
+    "Blocks copied back into L1 on an L1 miss",
+    ["source"],
+)
+
+sidecar_kv_demotion_backlog = Gauge(
+    "sidecar_kv_demotion_backlog",
+    "Evicted blocks waiting to be written to L2",
+)
+
+sidecar_kv_disk_capacity_bytes = Gauge(
+    "sidecar_kv_disk_capacity_bytes",
+    "Size of the disk tier's slab file",
+)
+
+sidecar_kv_disk_used_bytes = Gauge(
+    "sidecar_kv_disk_used_bytes",
+    "Bytes of KV blocks held in the disk tier",
+)
+
+sidecar_kv_disk_evictions_total = Counter(
+    "sidecar_kv_disk_evictions_total",
+    "Blocks evicted from the disk tier for capacity",
+)
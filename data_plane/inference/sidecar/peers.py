@@ -0,0 +1,173 @@
+"""Peer sidecar discovery and artifact lookup.
+
+Peers come from a static ``peer_urls`` list and/or a DNS name (a Kubernetes
+headless service resolves to every sidecar pod IP). Each peer exposes
+``GET /artifacts/manifest`` for artifacts it holds and serves file bytes with
+Range support from ``GET /artifacts/file``, so the chunked downloader can pull
+an artifact from several peers at once instead of from the hub.
+
+Those endpoints hand out weights that may have been fetched with the hub
+token, so they only answer peers: callers presenting the shared peer token
+when one is configured, otherwise callers at a known peer address.
+"""
+
+import asyncio
+import logging
+import socket
+import time
+import urllib.parse
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from data_plane.inference.sidecar.downloader import RemoteFile
+
+logger = logging.getLogger(__name__)
+
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "0.0.0.0", "::1"}
+
+# How long resolved peer addresses are trusted before resolving again
+_ADDRESS_TTL_S = 30.0
+
+
+class PeerDirectory:
+    """Finds peer sidecars that already hold an artifact."""
+
+    def __init__(
+        self,
+        peer_urls: List[str],
+        discovery_dns: Optional[str] = None,
+        port: int = 8001,
+        timeout: float = 2.0,
+        token: Optional[str] = None,
+    ):
+        self._static = [u.rstrip("/") for u in peer_urls]
+        self._dns = discovery_dns
+        self._port = port
+        self._timeout = timeout
+        self._token = token
+        self._addresses: set = set()
+        self._addresses_at = float("-inf")
+        self._own_hosts = set(_LOCAL_HOSTS)
+        try:
+            self._own_hosts.add(socket.gethostbyname(socket.gethostname()))
+        except OSError:
+            pass
+
+    def _is_self(self, url: str) -> bool:
+        parsed = urllib.parse.urlparse(url)
+        return parsed.hostname in self._own_hosts and (parsed.port or 80) == self._port
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Headers authenticating this sidecar to its peers."""
+        return {"Authorization": f"Bearer {self._token}"} if self._token else {}
+
+    async def addresses(self) -> set:
+        """IP addresses of every configured peer, re-resolved every ``_ADDRESS_TTL_S``."""
+        if time.monotonic() - self._addresses_at < _ADDRESS_TTL_S:
+            return self._addresses
+        hosts = [urllib.parse.urlparse(u).hostname for u in self._static]
+        if self._dns:
+            hosts.append(self._dns)
+        loop = asyncio.get_running_loop()
+        addresses = set()
+        for host in filter(None, hosts):
+            try:
+                infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                addresses.update(info[4][0] for info in infos)
+            except OSError as e:
+                logger.debug(f"Peer address lookup of {host} failed: {e}")
+        self._addresses, self._addresses_at = addresses, time.monotonic()
+        return addresses
+
+    async def discover(self) -> List[str]:
+        """Base URLs of every known peer, excluding this sidecar."""
+        urls = list(self._static)
+        if self._dns:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(
+                    self._dns, self._port, type=socket.SOCK_STREAM
+                )
+                urls.extend(f"http://{info[4][0]}:{self._port}" for info in infos)
+            except OSError as e:
+                logger.debug(f"Peer DNS lookup of {self._dns} failed: {e}")
+        seen = set()
+        peers = []
+        for url in urls:
+            if url not in seen and not self._is_self(url):
+                seen.add(url)
+                peers.append(url)
+        return peers
+
+    async def find_holders(self, identifier: str, version: str) -> List[Tuple[str, List[dict]]]:
+        """Peers holding ``identifier@version``, each with its file manifest."""
+        peers = await self.discover()
+        if not peers:
+            return []
+        params = {"identifier": identifier, "version": version}
+
+        async def _ask(client: httpx.AsyncClient, peer: str) -> Optional[Tuple[str, List[dict]]]:
+            try:
+                resp = await client.get(f"{peer}/artifacts/manifest", params=params)
+                if resp.status_code != 200:
+                    return None
+                return peer, resp.json()["files"]
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                logger.debug(f"Peer {peer} manifest query failed: {e}")
+                return None
+
+        async with httpx.AsyncClient(timeout=self._timeout, headers=self.headers) as client:
+            answers = await asyncio.gather(*[_ask(client, p) for p in peers])
+        return [a for a in answers if a is not None]
+
+
+def peer_file_url(peer: str, identifier: str, version: str, path: str) -> str:
+    query = urllib.parse.urlencode({"identifier": identifier, "version": version, "path": path})
+    return f"{peer}/artifacts/file?{query}"
+
+
+def plan_peer_files(
+    identifier: str,
+    version: str,
+    holders: List[Tuple[str, List[dict]]],
+    authoritative: Optional[List[RemoteFile]],
+) -> Optional[List[RemoteFile]]:
+    """Build a download list that pulls every file from the peers holding it.
+
+    ``authoritative`` is the hub manifest when reachable: its hashes are what
+    gets verified, and peers whose listing disagrees on paths or sizes are
+    ignored. Without it the first holder's manifest is trusted. Returns None
+    if no peer has every file.
+    """
+    if authoritative is not None:
+        expected: Dict[str, RemoteFile] = {f.path: f for f in authoritative}
+    else:
+        expected = {
+            f["path"]: RemoteFile(f["path"], f["size"], "", f.get("sha256"), f.get("git_sha1"))
+            for f in holders[0][1]
+        }
+
+    sources: Dict[str, List[str]] = {path: [] for path in expected}
+    for peer, files in holders:
+        listing = {f["path"]: f for f in files}
+        if any(path not in listing or listing[path]["size"] != f.size for path, f in expected.items()):
+            continue
+        for path in expected:
+            sources[path].append(peer)
+
+    if not expected or any(not urls for urls in sources.values()):
+        return None
+
+    planned = []
+    for path, remote in expected.items():
+        urls = [peer_file_url(peer, identifier, version, path) for peer in sources[path]]
+        planned.append(RemoteFile(
+            path=path,
+            size=remote.size,
+            url=urls[0],
+            sha256=remote.sha256,
+            git_sha1=remote.git_sha1,
+            mirrors=urls[1:],
+        ))
+    return planned
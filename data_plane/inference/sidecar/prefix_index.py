@@ -0,0 +1,122 @@
+"""Prefix index over chained KV block hashes.
+
+Block hashes are chained: each block's hash covers its parent's, so the
+hashes of a sequence's blocks spell out its token prefix block by block.
+``PrefixIndex`` keeps one trie of those hashes per model (parent/children
+links plus a hash -> node map), so ``longest_prefix`` — how many leading
+blocks of a sequence are cached, and in which tier — costs one dict lookup
+per matched block however many blocks are indexed.
+
+A block stored without its parent (the engine does not know the parent of
+the first block of a transfer job) is indexed unlinked. It still matches at
+any position, because a chained hash already pins down its prefix, and it is
+linked once a later store names its parent. A removed block whose children
+are still cached stays as an uncached placeholder, so a lookup stops there.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+class _Node:
+    __slots__ = ("block_hash", "parent", "children", "location")
+
+    def __init__(self, block_hash: str):
+        self.block_hash = block_hash
+        self.parent: Optional["_Node"] = None
+        self.children: Dict[str, "_Node"] = {}
+        # None for a placeholder: a parent we know of that is not cached
+        self.location: Optional[str] = None
+
+
+@dataclass
+class PrefixMatch:
+    """Leading cached blocks of a queried sequence."""
+    num_blocks: int = 0
+    block_hashes: List[str] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+
+
+class PrefixIndex:
+    """Per-model trie of cached block hashes."""
+
+    def __init__(self):
+        # model_id -> block_hash -> node
+        self._models: Dict[str, Dict[str, _Node]] = {}
+        self._num_cached = 0
+
+    def __len__(self) -> int:
+        return self._num_cached
+
+    def insert(self, model_id: str, block_hash: str, parent_hash: str = "", location: str = "L1") -> None:
+        nodes = self._models.setdefault(model_id, {})
+        node = nodes.get(block_hash)
+        if node is None:
+            node = nodes[block_hash] = _Node(block_hash)
+        if node.location is None:
+            self._num_cached += 1
+        node.location = location
+        if parent_hash and (node.parent is None or node.parent.block_hash != parent_hash):
+            parent = nodes.get(parent_hash)
+            if parent is None:
+                parent = nodes[parent_hash] = _Node(parent_hash)
+            self._detach(nodes, node)
+            node.parent = parent
+            parent.children[block_hash] = node
+
+    def update_location(self, model_id: str, block_hash: str, location: str) -> bool:
+        node = self._models.get(model_id, {}).get(block_hash)
+        if node is None or node.location is None:
+            return False
+        node.location = location
+        return True
+
+    def remove(self, model_id: str, block_hash: str) -> bool:
+        nodes = self._models.get(model_id)
+        node = nodes.get(block_hash) if nodes else None
+        if node is None or node.location is None:
+            return False
+        node.location = None
+        self._num_cached -= 1
+        self._prune(nodes, node)
+        if not nodes:
+            del self._models[model_id]
+        return True
+
+    def longest_prefix(self, model_id: str, block_hashes: List[str]) -> PrefixMatch:
+        """Count the leading ``block_hashes`` that are cached as one unbroken chain."""
+        match = PrefixMatch()
+        nodes = self._models.get(model_id)
+        if not nodes:
+            return match
+        prev: Optional[_Node] = None
+        for block_hash in block_hashes:
+            node = nodes.get(block_hash)
+            if node is None or node.location is None:
+                break
+            # A known parent must be the previous block (or none at the start)
+            if node.parent is not None and node.parent is not prev:
+                break
+            match.num_blocks += 1
+            match.block_hashes.append(block_hash)
+            match.locations.append(node.location)
+            prev = node
+        return match
+
+    def _detach(self, nodes: Dict[str, _Node], node: _Node) -> None:
+        parent = node.parent
+        if parent is None:
+            return
+        parent.children.pop(node.block_hash, None)
+        node.parent = None
+        self._prune(nodes, parent)
+
+    def _prune(self, nodes: Dict[str, _Node], node: Optional[_Node]) -> None:
+        """Drop uncached nodes that no longer lead to a cached descendant."""
+        while node is not None and node.location is None and not node.children:
+            nodes.pop(node.block_hash, None)
+            parent = node.parent
+            if parent is not None:
+                parent.children.pop(node.block_hash, None)
+            node.parent = None
+            node = parent
@@ -0,0 +1,283 @@
+"""Durable registry storage: compacted JSON snapshot + append-only write-ahead log.
+
+State is a set of namespaces (e.g. ``models`` / ``adapters``), each a mapping
+of key -> JSON-serializable dict. State transitions are appended to
+``<path>.wal`` as JSON lines by a background writer thread, which fsyncs once
+per batch (group commit), so callers on the event loop only pay for a dict
+update. Writes to a key that is still waiting for the writer replace the
+waiting one, so a burst of changes to the same blocks costs one record per
+key. With ``flush_delay_s`` the writer lets a burst build up for at most that
+long before writing it, which bounds how stale the log can be. When the log
+outgrows ``compact_threshold_bytes`` the writer folds it into a new snapshot
+at ``<path>`` (write temp file, fsync, atomic rename) and truncates the log.
+
+Recovery loads the snapshot and replays the log. Records are idempotent
+put/delete operations, so a crash between snapshot rename and log truncation
+just replays operations already reflected in the snapshot. A torn trailing
+log line from a crash mid-append is ignored and cut off the log, so records
+appended after the restart start on a line of their own.
+
+The snapshot has the shape ``{"<namespace>": {key: value}}``, which is the
+same format the artifact registry always wrote, so existing files load as-is.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+State = Dict[str, Dict[str, dict]]
+
+# Stores currently open in this process, by real path (see RegistryStore.__init__)
+_open_stores: "weakref.WeakValueDictionary[str, RegistryStore]" = weakref.WeakValueDictionary()
+_open_stores_lock = threading.Lock()
+
+
+class RegistryStore:
+    """Namespaced key/value registry persisted as snapshot + WAL."""
+
+    def __init__(
+        self,
+        path: str,
+        namespaces: Iterable[str],
+        compact_threshold_bytes: int = 4 * 1024 * 1024,
+        migrate: Optional[Callable[[object], State]] = None,
+        flush_delay_s: float = 0.0,
+    ):
+        self.path = path
+        self.wal_path = path + ".wal"
+        self._namespaces = tuple(namespaces)
+        self._compact_threshold = compact_threshold_bytes
+        self._migrate = migrate
+        self._flush_delay = flush_delay_s
+
+        # Latest operation per (namespace, key) not yet taken by the writer;
+        # None for a delete
+        self._pending: Dict[Tuple[str, str], Optional[dict]] = {}
+        self._cond = threading.Condition()
+        # Operations queued / written so far, for flush()
+        self._queued_seq = 0
+        self._written_seq = 0
+        self._flush_waiters = 0
+        self._stopping = False
+        self._io_lock = threading.Lock()
+        self._state: State = {ns: {} for ns in self._namespaces}
+        self._wal_bytes = 0
+        self._closed = False
+
+        # A second handle on the same files in one process would interleave log
+        # writes; make sure the earlier handle's queued records are on disk first.
+        real = os.path.realpath(path)
+        with _open_stores_lock:
+            previous = _open_stores.get(real)
+            _open_stores[real] = self
+        if previous is not None:
+            previous.flush()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="registry-wal", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def load(self) -> State:
+        """Return the recovered state (snapshot + replayed log)."""
+        state: State = {ns: {} for ns in self._namespaces}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    raw = json.load(f)
+                if not isinstance(raw, dict) and self._migrate is not None:
+                    raw = self._migrate(raw)
+                for ns in self._namespaces:
+                    state[ns].update(raw.get(ns, {}))
+            except (json.JSONDecodeError, OSError, AttributeError) as e:
+                logger.warning(f"Could not read registry snapshot {self.path}: {e}")
+
+        replayed = 0
+        if os.path.exists(self.wal_path):
+            # Offset just past the last complete record
+            good = 0
+            with open(self.wal_path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("no line end")
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Ignoring torn record at end of {self.wal_path}")
+                        break
+                    self._apply(state, record)
+                    replayed += 1
+                    good += len(line)
+            if good < os.path.getsize(self.wal_path):
+                self._truncate_wal(good)
+            self._wal_bytes = good
+
+        with self._io_lock:
+            self._state = copy.deepcopy(state)
+        if replayed:
+            logger.info(f"Replayed {replayed} registry log records from {self.wal_path}")
+        if self._wal_bytes > self._compact_threshold:
+            self.checkpoint(state)
+        return state
+
+    @staticmethod
+    def _apply(state: State, record: dict) -> None:
+        ns = state.setdefault(record["ns"], {})
+        if record["op"] == "put":
+            ns[record["key"]] = record["value"]
+        elif record["op"] == "del":
+            ns.pop(record["key"], None)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, namespace: str, key: str, value: dict) -> None:
+        """Log that ``key`` now maps to ``value``. Returns immediately.
+
+        ``value`` is copied now, so later changes to it are not logged.
+        """
+        self._enqueue(namespace, key, copy.deepcopy(value))
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Log that ``key`` was removed. Returns immediately."""
+        self._enqueue(namespace, key, None)
+
+    def _enqueue(self, namespace: str, key: str, value: Optional[dict]) -> None:
+        with self._cond:
+            self._pending[namespace, key] = value
+            self._queued_seq += 1
+            if len(self._pending) == 1:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every record queued so far is fsynced."""
+        if self._closed:
+            return
+        with self._cond:
+            target = self._queued_seq
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(lambda: self._written_seq >= target, timeout)
+            finally:
+                self._flush_waiters -= 1
+
+    def checkpoint(self, state: Optional[State] = None) -> None:
+        """Write a compacted snapshot synchronously and truncate the log.
+
+        ``state`` is the caller's authoritative view; when omitted the store's
+        own mirror of the logged records is used.
+        """
+        self.flush()
+        with self._io_lock:
+            if state is not None:
+                self._state = copy.deepcopy({ns: dict(state.get(ns, {})) for ns in self._namespaces})
+            self._write_snapshot()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._writer.join(timeout=10.0)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._flush_waiters or self._stopping)
+                if self._flush_delay and self._pending:
+                    # Let the burst build up, unless someone is waiting for it
+                    self._cond.wait_for(lambda: self._flush_waiters or self._stopping, self._flush_delay)
+                # Group commit: everything queued so far, one record per key
+                batch, self._pending = self._pending, {}
+                seq = self._queued_seq
+                stopping = self._stopping
+
+            records = []
+            for (ns, key), value in batch.items():
+                if value is None:
+                    records.append({"op": "del", "ns": ns, "key": key})
+                else:
+                    records.append({"op": "put", "ns": ns, "key": key, "value": value})
+            if records:
+                try:
+                    self._append(records)
+                except OSError as e:
+                    logger.error(f"Registry log write failed: {e}")
+
+            with self._cond:
+                self._written_seq = seq
+                self._cond.notify_all()
+            if stopping:
+                return
+
+    def _append(self, records: list) -> None:
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+        with self._io_lock:
+            for record in records:
+                self._apply(self._state, record)
+            os.makedirs(os.path.dirname(self.wal_path) or ".", exist_ok=True)
+            fd = os.open(self.wal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._wal_bytes += len(data)
+            if self._wal_bytes > self._compact_threshold:
+                self._write_snapshot()
+
+    def _truncate_wal(self, size: int) -> None:
+        """Cut the log back to ``size`` bytes, durably."""
+        fd = os.open(self.wal_path, os.O_WRONLY)
+        try:
+            os.ftruncate(fd, size)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _write_snapshot(self) -> None:
+        """Atomically replace the snapshot with the current mirror, then reset the log.
+
+        Caller holds ``_io_lock``.
+        """
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        _fsync_dir(directory)
+        if os.path.exists(self.wal_path):
+            os.truncate(self.wal_path, 0)
+        self._wal_bytes = 0
+
+
+def _fsync_dir(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
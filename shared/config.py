@@ -15,14 +15,15 @@ Loading priority (highest → lowest):
 
 from __future__ import annotations
 
+import json
 import logging
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 import yaml
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,15 @@ def _env_overlay(prefix: str, data: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
+def _parse_list(value: Any) -> Any:
+    """Accept a JSON list or ``"a,b"`` string (env vars) as well as a YAML list."""
+    if isinstance(value, str):
+        if value.lstrip().startswith("["):
+            return json.loads(value)
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+
 # ---------------------------------------------------------------------------
 # Section models
 # ---------------------------------------------------------------------------
@@ -104,12 +114,27 @@ class EngineSection(BaseModel):
     max_lora_rank: int = 16
     adapter_poll_interval: float = 1.0
     adapter_poll_timeout: float = 600.0
+    # Predictive adapter prefetching (EWMA over per-adapter request rates)
+    adapter_prefetch_enabled: bool = False
+    adapter_prefetch_interval: float = 5.0
+    adapter_prefetch_ewma_alpha: float = 0.3
+    adapter_prefetch_top_k: int = 2
+    adapter_prefetch_min_rate: float = 0.05
     max_pending: int = 200
     temperature: float = 0.0
     sidecar_grpc_url: str = "localhost:50051"
     enable_prefix_caching: bool = False
     enable_kv_offload: bool = False
     kv_offload_num_blocks: int = 1024
+    # KV block transport to the sidecar: "grpc" (bytes in RPCs) or "shm" (shared
+    # L1 arena, needs the sidecar's l1_shm_path on a tmpfs both containers mount)
+    kv_offload_transport: Literal["grpc", "shm"] = "grpc"
+    # KV transfer jobs run concurrently on background workers (the rest queue)
+    kv_offload_max_inflight_transfers: int = 4
+    # Adopt the blocks already in the sidecar at startup (warm cache across engine restarts)
+    kv_offload_restore_blocks: bool = True
+    # Ask the sidecar which blocks it already holds and send only the missing ones
+    kv_offload_dedup_stores: bool = True
     enable_engine_mock: bool = Field(
         default=False,
         description="Set to true to use mock engine (no GPU needed)",
@@ -148,11 +173,76 @@ class SidecarSection(BaseModel):
     registry_path: str = "/mnt/models/registry.json"
     l1_num_blocks: int = 1024
     l1_block_size_bytes: int = 131072  # 128 KB
+    # Put the L1 arena in a shared-memory file (e.g. /dev/shm/kv-l1-arena) that a
+    # co-located engine can map; None keeps it private to the sidecar
+    l1_shm_path: Optional[str] = None
+    # L1 block replacement: "lru", or scan-resistant "2q" / "arc" / "s3fifo";
+    # optionally gated by a TinyLFU admission filter
+    l1_eviction_policy: Literal["lru", "2q", "arc", "s3fifo"] = "lru"
+    l1_tinylfu_admission: bool = False
+    # Per-block L1 compression ("auto" measures zlib/lz4/zstd and picks one);
+    # l1_arena_bytes is then the DRAM behind the l1_num_blocks IDs (0 = num_blocks x block size)
+    l1_compression: Literal["off", "zlib", "lz4", "zstd", "auto"] = "off"
+    l1_arena_bytes: int = 0
+    l1_compression_min_ratio: float = 1.25
+    l1_compression_cpu_budget_us: float = 1000.0
+    # Split L1's block IDs into per-model namespaces sized by weight (model_id ->
+    # weight; "default", for unlisted models, weighs 1 unless listed). Each is a
+    # quota: a model only evicts its own blocks. Empty = one shared namespace
+    l1_namespace_weights: Dict[str, float] = Field(default_factory=dict)
+    # Blocks evicted from L1 can be written back to L2 in the background; at most
+    # this many wait for L2. Off (0, evicted blocks are dropped) unless an L2
+    # backend is deployed, since a non-zero value connects to it at startup
+    l2_demotion_queue_blocks: int = 0
+    l2_demotion_concurrency: int = 4
+    # Optional disk tier between L1 and L2: a preallocated slab file on a local
+    # SSD (e.g. /mnt/nvme/kv-disk-tier); off unless both are set
+    disk_tier_path: Optional[str] = None
+    disk_tier_capacity_gb: float = 0.0
+    disk_tier_eviction_policy: Literal["lru", "2q", "arc", "s3fifo"] = "lru"
+    # With a disk tier, at most this many L1 evictions wait to be written to it
+    # (beyond that they are dropped); independent of l2_demotion_queue_blocks,
+    # which only governs writes to L2
+    disk_demotion_queue_blocks: int = 256
+    # Persist the KV block registry to a snapshot + change log at this path (None =
+    # in memory only); changes reach the log at most flush_delay_ms after they happen
+    kv_registry_path: Optional[str] = None
+    kv_registry_flush_delay_ms: float = 50.0
     # New fields
     hf_token_file: Optional[str] = None
     verify_checksums: bool = True
     log_json: bool = True
     log_level: str = "INFO"
+    # Artifact downloads: "snapshot" (huggingface_hub) or "parallel" (chunked Range requests)
+    download_engine: Literal["snapshot", "parallel"] = "snapshot"
+    download_workers: int = 8
+    download_chunk_bytes: int = 16777216  # 16 MB
+    download_max_retries: int = 3
+    # Download scheduling: concurrent downloads per priority budget, shared bandwidth cap (0 = unlimited)
+    download_max_concurrent: int = 2
+    download_bandwidth_bytes_per_s: int = 0
+    # Page-cache warming of weight shards once a model is on disk
+    page_cache_warm_on_load: bool = True
+    page_cache_warm_workers: int = 4
+    page_cache_max_memory_fraction: float = 0.8
+    # Shared-volume space management: per-type byte quotas (0 = unlimited), free-space floor
+    model_quota_bytes: int = 0
+    adapter_quota_bytes: int = 0
+    disk_min_free_bytes: int = 1073741824  # 1 GB
+    eviction_policy: Literal["lru", "lfu"] = "lru"
+    # Store artifact files once by content hash; version dirs hold hardlinks
+    content_addressed_store: bool = True
+    # Peer sidecars to fetch artifacts from before the hub: static URLs and/or a
+    # DNS name resolving to every sidecar (e.g. a headless Service)
+    peer_urls: List[str] = Field(default_factory=list)
+    peer_discovery_dns: Optional[str] = None
+    # /artifacts/manifest and /artifacts/file hand out downloaded weights, gated
+    # or private ones included. With a shared secret in this file they only
+    # answer callers sending it (peers send it too); without one, only the
+    # addresses of peer_urls / peer_discovery_dns, and nobody if neither is set
+    peer_token_file: Optional[str] = None
+
+    _split_peer_urls = field_validator("peer_urls", mode="before")(_parse_list)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,166 @@
+"""Low-overhead Prometheus counters and histograms for per-block hot paths.
+
+``prometheus_client`` takes a lock for every ``inc`` / ``observe`` and another
+for each ``.labels(...)`` lookup, which costs about as much as copying a KV
+block. ``HotCounter`` and ``HotHistogram`` expose the same series (name, help,
+labels, buckets) but are collectors: children are bound once with
+``labels()``, each thread adds into its own plain-number cell without locking,
+and the cells are summed when the registry is scraped.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, Sequence, Tuple
+
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.metrics_core import CounterMetricFamily, HistogramMetricFamily
+from prometheus_client.registry import Collector
+from prometheus_client.utils import floatToGoString
+
+
+class _ThreadCells:
+    """One accumulator list per thread; only the owning thread writes to it."""
+
+    __slots__ = ("_local", "_cells", "_lock", "_width")
+
+    def __init__(self, width: int):
+        self._local = threading.local()
+        self._cells: list = []
+        self._lock = threading.Lock()
+        self._width = width
+
+    def _new_cell(self) -> list:
+        cell = self._local.cell = [0] * self._width
+        with self._lock:
+            self._cells.append(cell)
+        return cell
+
+    def totals(self) -> list:
+        with self._lock:
+            cells = list(self._cells)
+        return [sum(cell[i] for cell in cells) for i in range(self._width)]
+
+
+class HotCounterChild(_ThreadCells):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1) -> None:
+        try:
+            self._local.cell[0] += amount
+        except AttributeError:
+            self._new_cell()[0] += amount
+
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class HotHistogramChild(_ThreadCells):
+    # Cell layout: one count per bucket (the last is +Inf), then the sum
+    __slots__ = ("_bounds",)
+
+    def __init__(self, bounds: Sequence[float]):
+        super().__init__(len(bounds) + 2)
+        self._bounds = bounds
+
+    def observe(self, amount: float) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell[bisect_left(self._bounds, amount)] += 1
+        cell[-1] += amount
+
+
+class _HotMetric(Collector):
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str], registry):
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *labelvalues, **labelkwargs):
+        """The child for these label values; bind it once, outside the hot path."""
+        if labelkwargs:
+            labelvalues = tuple(str(labelkwargs[name]) for name in self._labelnames)
+        else:
+            labelvalues = tuple(str(v) for v in labelvalues)
+        if len(labelvalues) != len(self._labelnames):
+            raise ValueError(f"{self._name} expects labels {self._labelnames}")
+        child = self._children.get(labelvalues)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labelvalues, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def describe(self):
+        return [self._family()]
+
+    def _family(self):
+        raise NotImplementedError
+
+
+class HotCounter(_HotMetric):
+    """Counter with per-thread, lock-free increments."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> HotCounterChild:
+        return HotCounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _family(self) -> CounterMetricFamily:
+        return CounterMetricFamily(self._name, self._documentation, labels=self._labelnames)
+
+    def collect(self):
+        family = self._family()
+        for labelvalues, child in list(self._children.items()):
+            family.add_metric(list(labelvalues), child.value())
+        yield family
+
+
+class HotHistogram(_HotMetric):
+    """Histogram with per-thread, lock-free observations."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS,
+        registry=REGISTRY,
+    ):
+        self._bounds = tuple(sorted(float(b) for b in buckets if b != float("inf")))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> HotHistogramChild:
+        return HotHistogramChild(self._bounds)
+
+    def observe(self, amount: float) -> None:
+        self.labels().observe(amount)
+
+    def _family(self) -> HistogramMetricFamily:
+        return HistogramMetricFamily(self._name, self._documentation, labels=self._labelnames)
+
+    def collect(self):
+        family = self._family()
+        for labelvalues, child in list(self._children.items()):
+            totals = child.totals()
+            buckets = []
+            cumulative = 0
+            for bound, count in zip(self._bounds + (float("inf"),), totals[:-1]):
+                cumulative += count
+                buckets.append((floatToGoString(bound), cumulative))
+            family.add_metric(list(labelvalues), buckets, totals[-1])
+        yield family
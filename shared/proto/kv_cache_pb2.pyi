@@ -1,24 +1,28 @@
 from google.protobuf.internal import containers as _containers
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from collections.abc import Iterable as _Iterable
-from typing import ClassVar as _ClassVar, Optional as _Optional
+from collections.abc import Iterable as _Iterable, Mapping as _Mapping
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class StoreBlockRequest(_message.Message):
-    __slots__ = ("block_id", "block_hash", "data", "model_id", "layer_name")
+    __slots__ = ("block_id", "block_hash", "data", "model_id", "layer_name", "parent_hash", "dedup")
     BLOCK_ID_FIELD_NUMBER: _ClassVar[int]
     BLOCK_HASH_FIELD_NUMBER: _ClassVar[int]
     DATA_FIELD_NUMBER: _ClassVar[int]
     MODEL_ID_FIELD_NUMBER: _ClassVar[int]
     LAYER_NAME_FIELD_NUMBER: _ClassVar[int]
+    PARENT_HASH_FIELD_NUMBER: _ClassVar[int]
+    DEDUP_FIELD_NUMBER: _ClassVar[int]
     block_id: int
     block_hash: str
     data: bytes
     model_id: str
     layer_name: str
-    def __init__(self, block_id: _Optional[int] = ..., block_hash: _Optional[str] = ..., data: _Optional[bytes] = ..., model_id: _Optional[str] = ..., layer_name: _Optional[str] = ...) -> None: ...
+    parent_hash: str
+    dedup: bool
+    def __init__(self, block_id: _Optional[int] = ..., block_hash: _Optional[str] = ..., data: _Optional[bytes] = ..., model_id: _Optional[str] = ..., layer_name: _Optional[str] = ..., parent_hash: _Optional[str] = ..., dedup: bool = ...) -> None: ...
 
 class StoreBlockResponse(_message.Message):
     __slots__ = ("success", "message")
@@ -29,12 +33,16 @@ class StoreBlockResponse(_message.Message):
     def __init__(self, success: bool = ..., message: _Optional[str] = ...) -> None: ...
 
 class LoadBlockRequest(_message.Message):
-    __slots__ = ("block_id", "layer_name")
+    __slots__ = ("block_id", "layer_name", "block_hash", "model_id")
     BLOCK_ID_FIELD_NUMBER: _ClassVar[int]
     LAYER_NAME_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HASH_FIELD_NUMBER: _ClassVar[int]
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
     block_id: int
     layer_name: str
-    def __init__(self, block_id: _Optional[int] = ..., layer_name: _Optional[str] = ...) -> None: ...
+    block_hash: str
+    model_id: str
+    def __init__(self, block_id: _Optional[int] = ..., layer_name: _Optional[str] = ..., block_hash: _Optional[str] = ..., model_id: _Optional[str] = ...) -> None: ...
 
 class LoadBlockResponse(_message.Message):
     __slots__ = ("success", "data", "message")
@@ -46,6 +54,44 @@ class LoadBlockResponse(_message.Message):
     message: str
     def __init__(self, success: bool = ..., data: _Optional[bytes] = ..., message: _Optional[str] = ...) -> None: ...
 
+class StoreBlocksRequest(_message.Message):
+    __slots__ = ("blocks",)
+    BLOCKS_FIELD_NUMBER: _ClassVar[int]
+    blocks: _containers.RepeatedCompositeFieldContainer[StoreBlockRequest]
+    def __init__(self, blocks: _Optional[_Iterable[_Union[StoreBlockRequest, _Mapping]]] = ...) -> None: ...
+
+class StoreBlocksResponse(_message.Message):
+    __slots__ = ("success", "num_stored", "message")
+    SUCCESS_FIELD_NUMBER: _ClassVar[int]
+    NUM_STORED_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    success: bool
+    num_stored: int
+    message: str
+    def __init__(self, success: bool = ..., num_stored: _Optional[int] = ..., message: _Optional[str] = ...) -> None: ...
+
+class LoadBlocksRequest(_message.Message):
+    __slots__ = ("block_ids", "max_batch_bytes", "block_hashes", "model_id")
+    BLOCK_IDS_FIELD_NUMBER: _ClassVar[int]
+    MAX_BATCH_BYTES_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HASHES_FIELD_NUMBER: _ClassVar[int]
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    block_ids: _containers.RepeatedScalarFieldContainer[int]
+    max_batch_bytes: int
+    block_hashes: _containers.RepeatedScalarFieldContainer[str]
+    model_id: str
+    def __init__(self, block_ids: _Optional[_Iterable[int]] = ..., max_batch_bytes: _Optional[int] = ..., block_hashes: _Optional[_Iterable[str]] = ..., model_id: _Optional[str] = ...) -> None: ...
+
+class LoadBlocksResponse(_message.Message):
+    __slots__ = ("success", "data", "message")
+    SUCCESS_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    success: bool
+    data: _containers.RepeatedScalarFieldContainer[bytes]
+    message: str
+    def __init__(self, success: bool = ..., data: _Optional[_Iterable[bytes]] = ..., message: _Optional[str] = ...) -> None: ...
+
 class GetFreeBlocksRequest(_message.Message):
     __slots__ = ()
     def __init__(self) -> None: ...
@@ -57,10 +103,12 @@ class GetFreeBlocksResponse(_message.Message):
     def __init__(self, num_free_blocks: _Optional[int] = ...) -> None: ...
 
 class AllocateBlocksRequest(_message.Message):
-    __slots__ = ("block_hashes",)
+    __slots__ = ("block_hashes", "model_id")
     BLOCK_HASHES_FIELD_NUMBER: _ClassVar[int]
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
     block_hashes: _containers.RepeatedScalarFieldContainer[str]
-    def __init__(self, block_hashes: _Optional[_Iterable[str]] = ...) -> None: ...
+    model_id: str
+    def __init__(self, block_hashes: _Optional[_Iterable[str]] = ..., model_id: _Optional[str] = ...) -> None: ...
 
 class AllocateBlocksResponse(_message.Message):
     __slots__ = ("success", "block_ids", "message")
@@ -85,3 +133,141 @@ class FreeBlockResponse(_message.Message):
     success: bool
     message: str
     def __init__(self, success: bool = ..., message: _Optional[str] = ...) -> None: ...
+
+class GetSharedArenaRequest(_message.Message):
+    __slots__ = ()
+    def __init__(self) -> None: ...
+
+class GetSharedArenaResponse(_message.Message):
+    __slots__ = ("enabled", "path", "num_blocks", "block_size_bytes")
+    ENABLED_FIELD_NUMBER: _ClassVar[int]
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    NUM_BLOCKS_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_SIZE_BYTES_FIELD_NUMBER: _ClassVar[int]
+    enabled: bool
+    path: str
+    num_blocks: int
+    block_size_bytes: int
+    def __init__(self, enabled: bool = ..., path: _Optional[str] = ..., num_blocks: _Optional[int] = ..., block_size_bytes: _Optional[int] = ...) -> None: ...
+
+class BlockCommit(_message.Message):
+    __slots__ = ("block_id", "block_hash", "length", "model_id", "parent_hash")
+    BLOCK_ID_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HASH_FIELD_NUMBER: _ClassVar[int]
+    LENGTH_FIELD_NUMBER: _ClassVar[int]
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    PARENT_HASH_FIELD_NUMBER: _ClassVar[int]
+    block_id: int
+    block_hash: str
+    length: int
+    model_id: str
+    parent_hash: str
+    def __init__(self, block_id: _Optional[int] = ..., block_hash: _Optional[str] = ..., length: _Optional[int] = ..., model_id: _Optional[str] = ..., parent_hash: _Optional[str] = ...) -> None: ...
+
+class CommitBlocksRequest(_message.Message):
+    __slots__ = ("blocks",)
+    BLOCKS_FIELD_NUMBER: _ClassVar[int]
+    blocks: _containers.RepeatedCompositeFieldContainer[BlockCommit]
+    def __init__(self, blocks: _Optional[_Iterable[_Union[BlockCommit, _Mapping]]] = ...) -> None: ...
+
+class CommitBlocksResponse(_message.Message):
+    __slots__ = ("success", "num_committed", "message")
+    SUCCESS_FIELD_NUMBER: _ClassVar[int]
+    NUM_COMMITTED_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    success: bool
+    num_committed: int
+    message: str
+    def __init__(self, success: bool = ..., num_committed: _Optional[int] = ..., message: _Optional[str] = ...) -> None: ...
+
+class ResolveBlocksRequest(_message.Message):
+    __slots__ = ("block_ids", "block_hashes", "model_id")
+    BLOCK_IDS_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HASHES_FIELD_NUMBER: _ClassVar[int]
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    block_ids: _containers.RepeatedScalarFieldContainer[int]
+    block_hashes: _containers.RepeatedScalarFieldContainer[str]
+    model_id: str
+    def __init__(self, block_ids: _Optional[_Iterable[int]] = ..., block_hashes: _Optional[_Iterable[str]] = ..., model_id: _Optional[str] = ...) -> None: ...
+
+class ResolveBlocksResponse(_message.Message):
+    __slots__ = ("success", "lengths", "message")
+    SUCCESS_FIELD_NUMBER: _ClassVar[int]
+    LENGTHS_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    success: bool
+    lengths: _containers.RepeatedScalarFieldContainer[int]
+    message: str
+    def __init__(self, success: bool = ..., lengths: _Optional[_Iterable[int]] = ..., message: _Optional[str] = ...) -> None: ...
+
+class QueryPrefixRequest(_message.Message):
+    __slots__ = ("model_id", "block_hashes")
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_HASHES_FIELD_NUMBER: _ClassVar[int]
+    model_id: str
+    block_hashes: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, model_id: _Optional[str] = ..., block_hashes: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class QueryPrefixResponse(_message.Message):
+    __slots__ = ("num_blocks", "locations")
+    NUM_BLOCKS_FIELD_NUMBER: _ClassVar[int]
+    LOCATIONS_FIELD_NUMBER: _ClassVar[int]
+    num_blocks: int
+    locations: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, num_blocks: _Optional[int] = ..., locations: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class LookupBlocksRequest(_message.Message):
+    __slots__ = ("block_hashes", "include_data", "model_id")
+    BLOCK_HASHES_FIELD_NUMBER: _ClassVar[int]
+    INCLUDE_DATA_FIELD_NUMBER: _ClassVar[int]
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    block_hashes: _containers.RepeatedScalarFieldContainer[str]
+    include_data: bool
+    model_id: str
+    def __init__(self, block_hashes: _Optional[_Iterable[str]] = ..., include_data: bool = ..., model_id: _Optional[str] = ...) -> None: ...
+
+class LookupBlocksResponse(_message.Message):
+    __slots__ = ("block_ids", "locations", "data")
+    BLOCK_IDS_FIELD_NUMBER: _ClassVar[int]
+    LOCATIONS_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    block_ids: _containers.RepeatedScalarFieldContainer[int]
+    locations: _containers.RepeatedScalarFieldContainer[str]
+    data: _containers.RepeatedScalarFieldContainer[bytes]
+    def __init__(self, block_ids: _Optional[_Iterable[int]] = ..., locations: _Optional[_Iterable[str]] = ..., data: _Optional[_Iterable[bytes]] = ...) -> None: ...
+
+class ListBlocksRequest(_message.Message):
+    __slots__ = ("model_id", "start_block_id", "max_blocks")
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    START_BLOCK_ID_FIELD_NUMBER: _ClassVar[int]
+    MAX_BLOCKS_FIELD_NUMBER: _ClassVar[int]
+    model_id: str
+    start_block_id: int
+    max_blocks: int
+    def __init__(self, model_id: _Optional[str] = ..., start_block_id: _Optional[int] = ..., max_blocks: _Optional[int] = ...) -> None: ...
+
+class ListBlocksResponse(_message.Message):
+    __slots__ = ("block_hashes", "block_ids", "next_block_id")
+    BLOCK_HASHES_FIELD_NUMBER: _ClassVar[int]
+    BLOCK_IDS_FIELD_NUMBER: _ClassVar[int]
+    NEXT_BLOCK_ID_FIELD_NUMBER: _ClassVar[int]
+    block_hashes: _containers.RepeatedScalarFieldContainer[str]
+    block_ids: _containers.RepeatedScalarFieldContainer[int]
+    next_block_id: int
+    def __init__(self, block_hashes: _Optional[_Iterable[str]] = ..., block_ids: _Optional[_Iterable[int]] = ..., next_block_id: _Optional[int] = ...) -> None: ...
+
+class GetNamespaceRequest(_message.Message):
+    __slots__ = ("model_id",)
+    MODEL_ID_FIELD_NUMBER: _ClassVar[int]
+    model_id: str
+    def __init__(self, model_id: _Optional[str] = ...) -> None: ...
+
+class GetNamespaceResponse(_message.Message):
+    __slots__ = ("name", "base_block_id", "num_blocks")
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    BASE_BLOCK_ID_FIELD_NUMBER: _ClassVar[int]
+    NUM_BLOCKS_FIELD_NUMBER: _ClassVar[int]
+    name: str
+    base_block_id: int
+    num_blocks: int
+    def __init__(self, name: _Optional[str] = ..., base_block_id: _Optional[int] = ..., num_blocks: _Optional[int] = ...) -> None: ...
@@ -40,12 +40,14 @@ class AllocationPointer(NamedTuple):
 class KVBlockEntry:
     """Metadata for a cached KV block tracked by the KVBlockRegistry."""
     key: str
-    location: Literal["L1", "L2"]
+    location: Literal["L1", "DISK", "L2"]
     size_bytes: int
     l1_address: Optional[int] = None
     l2_node_id: Optional[str] = None
     model_id: str = ""
     prefix_hash: str = ""
+    # Hash of the preceding block in its sequence, "" if first or unknown
+    parent_hash: str = ""
     created_at: float = 0.0
     last_accessed: float = 0.0
     access_count: int = 0
@@ -59,6 +61,7 @@ class KVBlockEntry:
             "l2_node_id": self.l2_node_id,
             "model_id": self.model_id,
             "prefix_hash": self.prefix_hash,
+            "parent_hash": self.parent_hash,
             "created_at": self.created_at,
             "last_accessed": self.last_accessed,
             "access_count": self.access_count,
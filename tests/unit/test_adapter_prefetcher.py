@@ -0,0 +1,189 @@
+"""
+Unit tests for AdapterPrefetcher and LoRAManager.prefetch_adapter:
+EWMA rate tracking, top-k selection, and the never-evict guarantee.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from data_plane.inference.engine.adapter_prefetcher import AdapterPrefetcher
+from data_plane.inference.engine.config import EngineConfig
+from data_plane.inference.engine.lora_manager import LoRAManager
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def mock_engine():
+    engine = MagicMock()
+    engine._loaded = {}
+    engine.add_lora = MagicMock(side_effect=lambda req: engine._loaded.__setitem__(req.lora_int_id, req))
+    engine.remove_lora = MagicMock(side_effect=lambda int_id: engine._loaded.pop(int_id, None))
+    return engine
+
+
+@pytest.fixture
+def manager(mock_engine):
+    config = EngineConfig(
+        enable_lora=True,
+        max_loras=2,
+        adapter_poll_interval=0.01,
+        adapter_poll_timeout=5.0,
+    )
+    return LoRAManager(engine=mock_engine, config=config, sidecar_url="http://mock-sidecar:8001")
+
+
+@pytest.fixture
+def mock_sidecar():
+    """Patch httpx.AsyncClient so every adapter trigger returns 200 (already on disk)."""
+    async def _post(url, **kwargs):
+        identifier = url.rsplit("/adapter/load/", 1)[1]
+        return httpx.Response(
+            200,
+            json={"status": "loaded", "local_path": f"/mnt/models/{identifier}"},
+            request=httpx.Request("POST", url),
+        )
+
+    with patch("data_plane.inference.engine.lora_manager.httpx.AsyncClient") as cls:
+        client = AsyncMock()
+        client.post = AsyncMock(side_effect=_post)
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=False)
+        cls.return_value = client
+        yield client
+
+
+class _FakeManager:
+    """Just enough of LoRAManager for rate/selection tests."""
+
+    def __init__(self):
+        self.counts = {}
+        self.loaded = set()
+        self.prefetch_adapter = AsyncMock(return_value=True)
+
+    def arrival_counts(self):
+        return dict(self.counts)
+
+    def last_version(self, identifier):
+        return "latest"
+
+    def is_loaded(self, identifier, version=None):
+        return identifier in self.loaded
+
+
+# ---------------------------------------------------------------------------
+# Rate tracking and selection
+# ---------------------------------------------------------------------------
+
+class TestRates:
+
+    def test_first_sample_is_baseline(self):
+        fake = _FakeManager()
+        fake.counts = {"a": 10}
+        p = AdapterPrefetcher(fake, alpha=0.5)
+        assert p.update_rates(now=0.0) == {}
+
+    def test_ewma_smooths_rate(self):
+        fake = _FakeManager()
+        p = AdapterPrefetcher(fake, alpha=0.5)
+        p.update_rates(now=0.0)
+
+        fake.counts = {"a": 10}
+        assert p.update_rates(now=10.0)["a"] == pytest.approx(1.0)
+
+        # No new requests: rate halves with alpha=0.5
+        assert p.update_rates(now=20.0)["a"] == pytest.approx(0.5)
+
+    def test_invalid_alpha_rejected(self):
+        with pytest.raises(ValueError):
+            AdapterPrefetcher(_FakeManager(), alpha=0.0)
+
+
+class TestSelection:
+
+    @pytest.mark.asyncio
+    async def test_top_k_above_floor_not_loaded(self):
+        fake = _FakeManager()
+        p = AdapterPrefetcher(fake, alpha=1.0, top_k=2, min_rate=0.5)
+        p.update_rates(now=0.0)
+        fake.counts = {"hot": 30, "warm": 20, "cold": 2, "loaded": 40}
+        fake.loaded = {"loaded"}
+
+        issued = await p.tick(now=10.0)
+
+        # top-2 by rate is loaded(4/s), hot(3/s); loaded is skipped, warm is outside top-k
+        assert issued == ["hot"]
+        fake.prefetch_adapter.assert_awaited_once_with("hot", "latest")
+
+    @pytest.mark.asyncio
+    async def test_below_min_rate_not_prefetched(self):
+        fake = _FakeManager()
+        p = AdapterPrefetcher(fake, alpha=1.0, min_rate=1.0)
+        p.update_rates(now=0.0)
+        fake.counts = {"rare": 1}
+
+        assert await p.tick(now=10.0) == []
+        fake.prefetch_adapter.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# LoRAManager.prefetch_adapter
+# ---------------------------------------------------------------------------
+
+class TestPrefetchAdapter:
+
+    @pytest.mark.asyncio
+    async def test_prefetch_loads_into_free_slot_then_hits(self, manager, mock_engine, mock_sidecar):
+        assert await manager.prefetch_adapter("org/a") is True
+        assert manager.is_loaded("org/a")
+        assert mock_engine.add_lora.call_count == 1
+
+        _, swap = await manager.ensure_adapter_loaded("org/a")
+        assert swap == 0.0
+        assert mock_engine.add_lora.call_count == 1
+        assert manager._prefetched == set()
+
+    @pytest.mark.asyncio
+    async def test_prefetch_never_evicts(self, manager, mock_engine, mock_sidecar):
+        await manager.ensure_adapter_loaded("org/a")
+        await manager.ensure_adapter_loaded("org/b")
+        mock_engine.add_lora.reset_mock()
+
+        # All GPU slots in use: only the sidecar is warmed
+        assert await manager.prefetch_adapter("org/c") is True
+        mock_engine.remove_lora.assert_not_called()
+        mock_engine.add_lora.assert_not_called()
+        assert manager.loaded_keys == ["org/a@latest", "org/b@latest"]
+        assert mock_sidecar.post.call_args.args[0].endswith("/adapter/load/org/c")
+
+    @pytest.mark.asyncio
+    async def test_sidecar_prefetch_issued_once(self, manager, mock_sidecar):
+        await manager.ensure_adapter_loaded("org/a")
+        await manager.ensure_adapter_loaded("org/b")
+        mock_sidecar.post.reset_mock()
+
+        assert await manager.prefetch_adapter("org/c") is True
+        assert await manager.prefetch_adapter("org/c") is False
+        assert mock_sidecar.post.call_count == 1
+
+        # Once the TTL has passed the sidecar may have dropped it: warm it again
+        manager._sidecar_prefetched["org/c@latest"] -= manager._SIDECAR_PREFETCH_TTL_S
+        assert await manager.prefetch_adapter("org/c") is True
+        assert mock_sidecar.post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_prefetch_skips_loaded(self, manager, mock_sidecar):
+        await manager.ensure_adapter_loaded("org/a")
+        assert await manager.prefetch_adapter("org/a") is False
+
+    @pytest.mark.asyncio
+    async def test_arrivals_and_versions_tracked(self, manager, mock_sidecar):
+        await manager.ensure_adapter_loaded("org/a", "v2")
+        await manager.ensure_adapter_loaded("org/a", "v2")
+        assert manager.arrival_counts() == {"org/a": 2}
+        assert manager.last_version("org/a") == "v2"
+        assert manager.last_version("org/unknown") == "latest"
@@ -0,0 +1,94 @@
+"""
+Unit tests for the content-addressed blob store and cross-version
+deduplication in ArtifactManager's parallel download path.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+from data_plane.inference.sidecar.blob_store import BlobStore
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.downloader import RemoteFile
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+class TestBlobStore:
+
+    def test_ingest_then_materialize_shares_inode(self, tmp_path):
+        store = BlobStore(str(tmp_path))
+        v1 = _write(tmp_path / "m" / "v1" / "shard.bin", b"w" * 100)
+        store.ingest("sha256/aa11", v1)
+
+        v2 = str(tmp_path / "m" / "v2" / "shard.bin")
+        store.materialize("sha256/aa11", v2)
+
+        assert os.path.samefile(v1, v2)
+
+    def test_duplicate_ingest_replaced_by_link(self, tmp_path):
+        store = BlobStore(str(tmp_path))
+        first = _write(tmp_path / "a" / "tok.json", b"t" * 50)
+        second = _write(tmp_path / "b" / "tok.json", b"t" * 50)
+
+        assert store.ingest("sha256/bb22", first) == 0
+        assert store.ingest("sha256/bb22", second) == 50
+        assert os.path.samefile(first, second)
+
+    def test_gc_removes_only_unlinked_blobs(self, tmp_path):
+        store = BlobStore(str(tmp_path))
+        kept = _write(tmp_path / "a" / "x", b"x")
+        gone = _write(tmp_path / "b" / "y", b"yy")
+        store.ingest("sha256/cc33", kept)
+        store.ingest("sha256/dd44", gone)
+        os.unlink(gone)
+
+        assert store.gc() == 2
+        assert store.has("sha256/cc33") and not store.has("sha256/dd44")
+
+
+class TestArtifactManagerDedup:
+
+    @pytest.mark.asyncio
+    async def test_new_revision_fetches_only_changed_files(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("HF_TOKEN", raising=False)
+        contents = {"shard.bin": b"w" * 4000, "config.json": b"{}"}
+        mgr = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path / "models"),
+            registry_path=str(tmp_path / "registry.json"),
+            download_engine="parallel",
+            disk_min_free_bytes=0,
+        ))
+        fetched_paths = []
+
+        def _fake_download(files, target_dir, *args):
+            for f in files:
+                fetched_paths.append(f.path)
+                _write(os.path.join(target_dir, f.path), contents[f.path])
+            return sum(f.size for f in files)
+
+        def _manifest(config_sha):
+            return [
+                RemoteFile("shard.bin", 4000, "http://hub/shard.bin", sha256="ee55"),
+                RemoteFile("config.json", 2, "http://hub/config.json", git_sha1=config_sha),
+            ]
+
+        try:
+            with patch.object(mgr._downloader, "download", side_effect=_fake_download):
+                with patch("data_plane.inference.sidecar.artifact_manager.hub_manifest", return_value=_manifest("c1")):
+                    v1 = await mgr._fetch_from_external_storage("model", "org/model", "v1")
+                fetched_paths.clear()
+                with patch("data_plane.inference.sidecar.artifact_manager.hub_manifest", return_value=_manifest("c2")):
+                    v2 = await mgr._fetch_from_external_storage("model", "org/model", "v2")
+        finally:
+            mgr.close()
+
+        assert fetched_paths == ["config.json"]
+        assert os.path.samefile(os.path.join(v1, "shard.bin"), os.path.join(v2, "shard.bin"))
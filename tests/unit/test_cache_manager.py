@@ -1,5 +1,6 @@
 """Unit tests for byte-oriented MultiTieredCacheManager and REST cache endpoints."""
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -45,7 +46,7 @@ class TestMultiTieredCacheManager:
         ok = await manager.store_block(block_id, "hash-1", data, model_id="m1")
         assert ok is True
 
-        entry = registry.lookup("hash-1")
+        entry = registry.lookup("hash-1", "m1")
         assert entry is not None
         assert entry.location == "L1"
         assert entry.model_id == "m1"
@@ -89,6 +90,104 @@ class TestMultiTieredCacheManager:
         assert len(set(ids)) == 3  # all unique
 
 
+class TestTiering:
+    @pytest.fixture
+    def small(self, mock_l2, registry):
+        l1 = L1ByteStore(num_blocks=2, block_size_bytes=64)
+        return MultiTieredCacheManager(l1=l1, l2=mock_l2, registry=registry)
+
+    @staticmethod
+    async def _fill(manager, hashes, model_id=""):
+        for h in hashes:
+            [bid] = manager.allocate_blocks([h], model_id)
+            await manager.store_block(bid, h, h.encode().ljust(64, b"."), model_id=model_id)
+
+    @pytest.mark.asyncio
+    async def test_eviction_demotes_to_l2(self, small, mock_l2, registry):
+        await self._fill(small, ["a", "b", "c"])  # evicts a
+        await small.drain_demotions()
+
+        mock_l2.put.assert_awaited_once_with("a", b"a".ljust(64, b"."))
+        assert registry.location("a") == "L2"
+        assert registry.location("c") == "L1"
+        await small.close()
+
+    @pytest.mark.asyncio
+    async def test_miss_promotes_from_l2_into_requested_slot(self, small, mock_l2, registry):
+        await self._fill(small, ["a", "b"])
+        slot_a = small.l1.slot_of("a")
+        await self._fill(small, ["c"])  # evicts a; c reuses its slot
+        await small.drain_demotions()
+        mock_l2.get = AsyncMock(return_value=TransferResult(True, "L2 OK", b"a".ljust(64, b".")))
+
+        data = await small.load_block(slot_a, "a")
+
+        assert data == b"a".ljust(64, b".")
+        mock_l2.get.assert_awaited_once_with("a")
+        assert registry.location("a") == "L1"
+        assert small.l1._id_to_hash[slot_a] == "a"
+        # c was in the way and is demoted in turn
+        assert registry.location("c") == "L2"
+        await small.close()
+
+    @pytest.mark.asyncio
+    async def test_pending_demotion_served_without_l2(self, small, mock_l2, registry):
+        release = asyncio.Event()
+
+        async def _slow_put(key, data):
+            await release.wait()
+            return TransferResult(True, "L2 OK")
+
+        mock_l2.put = AsyncMock(side_effect=_slow_put)
+        await self._fill(small, ["a", "b"])
+        slot_a = small.l1.slot_of("a")
+        small.l1.free(slot_a)
+        small.l1._evict(small.l1.slot_of("b"))  # b is queued for L2, not written yet
+
+        data = await small.load_block(slot_a, "b")  # any free slot can take it back
+        assert data == b"b".ljust(64, b".")
+        mock_l2.get.assert_not_awaited()
+        release.set()
+        await small.drain_demotions()
+        assert registry.location("b") == "L1"
+        await small.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_demotion_unregisters(self, small, mock_l2, registry):
+        mock_l2.put = AsyncMock(return_value=TransferResult(False, "No storage nodes available."))
+        await self._fill(small, ["a", "b", "c"])
+        await small.drain_demotions()
+        assert registry.location("a") is None
+        await small.close()
+
+    @pytest.mark.asyncio
+    async def test_demoted_block_never_served_to_another_model(self, small, mock_l2, registry):
+        await self._fill(small, ["h", "b"], model_id="A")
+        slot_h = small.l1.slot_of("A#h")
+        await self._fill(small, ["c"], model_id="B")  # evicts A's h; c reuses its slot
+        await small.drain_demotions()
+        mock_l2.put.assert_awaited_once_with("A#h", b"h".ljust(64, b"."))
+        mock_l2.get = AsyncMock(return_value=TransferResult(True, "L2 OK", b"h".ljust(64, b".")))
+
+        assert await small.load_block(slot_h, "h", model_id="B") is None
+        assert await small.lookup_blocks(["h"], include_data=True, model_id="B") == [(-1, "", None)]
+        mock_l2.get.assert_not_awaited()
+        assert registry.location("h", "B") is None
+        # The model that stored it still gets it back
+        assert await small.load_block(slot_h, "h", model_id="A") == b"h".ljust(64, b".")
+        await small.close()
+
+    @pytest.mark.asyncio
+    async def test_full_backlog_drops_evicted_blocks(self, mock_l2, registry):
+        l1 = L1ByteStore(num_blocks=1, block_size_bytes=64)
+        manager = MultiTieredCacheManager(l1=l1, l2=mock_l2, registry=registry, demotion_queue_blocks=1)
+        await self._fill(manager, ["a", "b", "c"])  # a queued, b dropped before the writer runs
+        assert registry.location("b") is None
+        await manager.drain_demotions()
+        assert registry.location("a") == "L2"
+        await manager.close()
+
+
 # --- REST endpoint tests ---
 
 
@@ -115,3 +214,14 @@ class TestCacheRESTEndpoints:
             assert "total_blocks" in body
             assert "hit_rate" in body
             assert "l1_blocks" in body
+
+    @pytest.mark.asyncio
+    async def test_cache_prefix_structure(self):
+        from data_plane.inference.sidecar.api import app
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            r = await client.get("/cache/prefix", params={"block_hashes": ["h0", "h1"]})
+            assert r.status_code == 200
+            body = r.json()
+            assert body["num_blocks"] == len(body["locations"])
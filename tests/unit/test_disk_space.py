@@ -0,0 +1,195 @@
+"""
+Unit tests for shared-volume space management: eviction planning, crash-safe
+deletes, and ArtifactManager quota / max_resident_adapters enforcement.
+"""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.disk_space import (
+    EvictionCandidate,
+    InsufficientDiskSpace,
+    begin_evict,
+    measure_footprints,
+    plan_evictions,
+    sweep_evicting,
+)
+
+
+def _candidate(identifier, size, last_used, use_count=0, artifact_type="model"):
+    return EvictionCandidate(artifact_type, identifier, f"/vol/{identifier}", size, last_used, use_count)
+
+
+class TestPlanEvictions:
+
+    def test_quota_evicts_least_recently_used_same_type(self):
+        candidates = [
+            _candidate("new", 100, last_used=30),
+            _candidate("old", 100, last_used=10),
+            _candidate("adapter", 100, last_used=0, artifact_type="adapter"),
+        ]
+        victims = plan_evictions(
+            "model", 50, candidates, used_bytes={"model": 200}, quotas={"model": 200},
+            free_bytes=10_000, min_free_bytes=0,
+        )
+        assert [v.identifier for v in victims] == ["old"]
+
+    def test_lfu_prefers_rarely_used(self):
+        candidates = [_candidate("hot", 100, last_used=10, use_count=9), _candidate("cold", 100, last_used=30, use_count=1)]
+        victims = plan_evictions(
+            "model", 100, candidates, used_bytes={}, quotas={}, free_bytes=150, min_free_bytes=100, policy="lfu",
+        )
+        assert [v.identifier for v in victims] == ["cold"]
+
+    def test_free_space_floor_evicts_any_type(self):
+        candidates = [_candidate("a", 500, last_used=1, artifact_type="adapter")]
+        victims = plan_evictions(
+            "model", 400, candidates, used_bytes={}, quotas={}, free_bytes=600, min_free_bytes=300,
+        )
+        assert [v.identifier for v in victims] == ["a"]
+
+    def test_returns_none_when_candidates_insufficient(self):
+        assert plan_evictions(
+            "model", 1000, [_candidate("a", 10, 1)], used_bytes={}, quotas={}, free_bytes=0, min_free_bytes=0,
+        ) is None
+
+
+def _shared_versions(root, size):
+    """Two model versions hardlinking one blob, as the content-addressed store lays them out."""
+    blob = root / ".blobs" / "sha256" / "ab" / "ab12"
+    blob.parent.mkdir(parents=True)
+    blob.write_bytes(b"x" * size)
+    paths = []
+    for version in ("v1", "v2"):
+        path = root / "org--m" / version
+        path.mkdir(parents=True)
+        os.link(blob, path / "weights.bin")
+        paths.append(str(path))
+    return paths
+
+
+class TestFootprints:
+
+    def test_shared_blob_counted_once_and_freed_by_neither(self, tmp_path):
+        v1, v2 = _shared_versions(tmp_path, 100)
+        (tmp_path / "org--m" / "v2" / "extra.bin").write_bytes(b"y" * 10)
+
+        freed, usage = measure_footprints({("model", "v1"): v1, ("model", "v2"): v2})
+
+        assert freed == {("model", "v1"): 0, ("model", "v2"): 10}
+        assert usage == {"model": 110}
+
+    def test_blob_freed_once_its_last_version_is_listed_alone(self, tmp_path):
+        v1, _ = _shared_versions(tmp_path, 100)
+        assert measure_footprints({("model", "v1"): v1}) == ({("model", "v1"): 100}, {"model": 100})
+
+
+class TestCrashSafeEvict:
+
+    def test_interrupted_eviction_swept(self, tmp_path):
+        artifact = tmp_path / "org--m" / "main"
+        artifact.mkdir(parents=True)
+        (artifact / "w.bin").write_bytes(b"x")
+
+        begin_evict(str(artifact))  # crash before the delete
+        assert not artifact.exists()
+
+        assert sweep_evicting(str(tmp_path)) == [str(artifact)]
+        assert not (tmp_path / "org--m").exists()
+
+
+def _artifact(root, identifier, size):
+    path = root / identifier.replace("/", "--") / "main"
+    path.mkdir(parents=True)
+    (path / "weights.bin").write_bytes(b"x" * size)
+    return str(path)
+
+
+class TestArtifactManagerEviction:
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        am = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path),
+            registry_path=str(tmp_path / "registry.json"),
+            download_engine="snapshot",
+            model_quota_bytes=250,
+            disk_min_free_bytes=0,
+            max_adapters=1,
+        ))
+        yield am
+        am.close()
+
+    def _resident(self, am, kind, identifier, path, last_used):
+        key = "model_id" if kind == "model" else "adapter_id"
+        am._registry_for(kind)[identifier] = {
+            key: identifier, "version": "main", "local_path": path,
+            "status": "loaded", "size_bytes": 100, "last_used": last_used,
+        }
+
+    @pytest.mark.asyncio
+    async def test_quota_evicts_unreferenced_lru_model(self, manager, tmp_path):
+        self._resident(manager, "model", "pinned", _artifact(tmp_path, "pinned", 100), last_used=1)
+        self._resident(manager, "model", "stale", _artifact(tmp_path, "stale", 100), last_used=2)
+        manager.acquire("model", "pinned")
+
+        await manager.make_room("model", "incoming", 100)
+
+        assert "stale" not in manager.model_registry
+        assert not os.path.exists(tmp_path / "stale")
+        assert "pinned" in manager.model_registry
+
+    @pytest.mark.asyncio
+    async def test_raises_when_nothing_can_fit(self, manager, tmp_path):
+        with pytest.raises(InsufficientDiskSpace):
+            await manager.make_room("model", "huge", 1 << 60)
+
+    @pytest.mark.asyncio
+    async def test_max_resident_adapters_skips_engine_held(self, manager, tmp_path):
+        self._resident(manager, "adapter", "on-gpu", _artifact(tmp_path, "on-gpu", 10), last_used=1)
+        with patch.object(manager, "_engine_adapters_in_use", AsyncMock(return_value={"on-gpu"})):
+            await manager._enforce_adapter_limit("next")
+        assert "on-gpu" in manager.adapter_registry
+
+        with patch.object(manager, "_engine_adapters_in_use", AsyncMock(return_value=set())):
+            await manager._enforce_adapter_limit("next")
+        assert "on-gpu" not in manager.adapter_registry
+
+    def test_registry_entry_dropped_after_interrupted_eviction(self, tmp_path):
+        config = SidecarConfig(
+            shared_volume=str(tmp_path), registry_path=str(tmp_path / "registry.json"), download_engine="snapshot",
+        )
+        am = ArtifactManager(config)
+        path = _artifact(tmp_path, "org/m", 10)
+        self._resident(am, "model", "org/m", path, last_used=1)
+        am._record_model("org/m")
+        begin_evict(path)
+        am.close()
+
+        restored = ArtifactManager(config)
+        assert "org/m" not in restored.model_registry
+        restored.close()
+
+    @pytest.mark.asyncio
+    async def test_victim_sharing_blobs_not_credited_with_them(self, tmp_path):
+        am = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path), registry_path=str(tmp_path / "registry.json"),
+            download_engine="snapshot", disk_min_free_bytes=0,
+        ))
+        v1, v2 = _shared_versions(tmp_path, 150)
+        self._resident(am, "model", "m@v1", v1, last_used=1)
+        self._resident(am, "model", "m@v2", v2, last_used=3)
+        self._resident(am, "model", "own", _artifact(tmp_path, "own", 100), last_used=2)
+
+        # 50 bytes short: evicting v1 alone frees nothing, since v2 still links the blob
+        disk = SimpleNamespace(total=1000, used=950, free=50)
+        with patch("data_plane.inference.sidecar.artifact_manager.shutil.disk_usage", return_value=disk):
+            await am.make_room("model", "incoming", 100)
+
+        assert set(am.model_registry) == {"m@v2"}
+        am.close()
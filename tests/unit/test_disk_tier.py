@@ -0,0 +1,137 @@
+"""Unit tests for the file-backed disk tier of the KV cache."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from data_plane.inference.sidecar.cache_manager import MultiTieredCacheManager
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.disk_tier import DiskTier
+from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
+from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
+from shared.types import TransferResult
+
+
+def _block(h: str) -> bytes:
+    return h.encode().ljust(64, b".")
+
+
+@pytest.fixture
+def disk(tmp_path):
+    tier = DiskTier(str(tmp_path / "slab"), capacity_bytes=2 * 64, block_size_bytes=64)
+    yield tier
+    tier.close()
+
+
+class TestDiskTier:
+    def test_slab_preallocated(self, disk, tmp_path):
+        assert (tmp_path / "slab").stat().st_size == 128
+        assert disk.num_blocks == 2
+
+    def test_put_get_roundtrip(self, disk):
+        assert disk.put("a", _block("a"))
+        assert "a" in disk
+        assert bytes(disk.get("a")) == _block("a")
+        assert disk.used_bytes == 64
+
+    def test_evicts_lru_and_notifies(self, disk):
+        evicted = []
+        disk.eviction_listener = lambda h, data: evicted.append((h, bytes(data)))
+        disk.put("a", _block("a"))
+        disk.put("b", _block("b"))
+        disk.get("a")
+        disk.put("c", _block("c"))
+
+        assert evicted == [("b", _block("b"))]
+        assert "b" not in disk
+        assert len(disk) == 2
+
+    def test_oversized_block_rejected(self, disk):
+        assert not disk.put("big", b"x" * 65)
+
+    def test_remove_frees_slot(self, disk):
+        disk.put("a", _block("a"))
+        assert disk.remove("a")
+        assert disk.get("a") is None
+        assert disk.used_bytes == 0
+
+    def test_too_small_capacity_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            DiskTier(str(tmp_path / "slab"), capacity_bytes=10, block_size_bytes=64)
+
+
+class TestDiskTiering:
+    @pytest.fixture
+    def l2(self):
+        l2 = AsyncMock()
+        l2.put = AsyncMock(return_value=TransferResult(True, "L2 OK"))
+        l2.get = AsyncMock(return_value=TransferResult(False, "L2 miss"))
+        return l2
+
+    @pytest.fixture
+    def manager(self, disk, l2):
+        l1 = L1ByteStore(num_blocks=1, block_size_bytes=64)
+        return MultiTieredCacheManager(l1=l1, l2=l2, registry=KVBlockRegistry(), disk=disk)
+
+    @staticmethod
+    async def _store(manager, h):
+        [bid] = manager.allocate_blocks([h])
+        await manager.store_block(bid, h, _block(h))
+        return bid
+
+    @pytest.mark.asyncio
+    async def test_l1_eviction_lands_on_disk(self, manager, disk, l2):
+        await self._store(manager, "a")
+        await self._store(manager, "b")  # evicts a
+        await manager.drain_demotions()
+
+        assert "a" in disk
+        assert manager.registry.location("a") == "DISK"
+        l2.put.assert_not_awaited()
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_default_settings_demote_to_disk_without_l2(self, disk, l2):
+        config = SidecarConfig()
+        manager = MultiTieredCacheManager(
+            l1=L1ByteStore(num_blocks=1, block_size_bytes=64),
+            l2=l2,
+            registry=KVBlockRegistry(),
+            demotion_queue_blocks=config.l2_demotion_queue_blocks,
+            disk=disk,
+            disk_demotion_queue_blocks=config.disk_demotion_queue_blocks,
+        )
+        for h in ("a", "b", "c", "d"):  # L1 holds d, the disk b and c; a is dropped
+            await self._store(manager, h)
+            await manager.drain_demotions()
+
+        assert len(disk) == 2
+        assert manager.registry.location("b") == "DISK"
+        assert manager.registry.location("a") is None
+        l2.put.assert_not_awaited()
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_disk_eviction_cascades_to_l2(self, manager, l2):
+        for h in ("a", "b", "c", "d"):  # L1 holds d, the disk b and c
+            await self._store(manager, h)
+            await manager.drain_demotions()
+
+        l2.put.assert_awaited_once_with("a", _block("a"))
+        assert manager.registry.location("a") == "L2"
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_miss_promotes_from_disk(self, manager, disk, l2):
+        slot = await self._store(manager, "a")
+        await self._store(manager, "b")
+        await manager.drain_demotions()
+
+        data = await manager.load_block(slot, "a")
+
+        assert data == _block("a")
+        l2.get.assert_not_awaited()
+        assert manager.registry.location("a") == "L1"
+        # The disk copy stays, so demoting a again needs no write
+        assert "a" in disk
+        await manager.close()
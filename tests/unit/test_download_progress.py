@@ -0,0 +1,124 @@
+"""
+Unit tests for byte-counter download progress: ProgressTracker, the
+snapshot_download tqdm hook, and the off-loop directory-scan fallback.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.download_progress import ProgressTracker, progress_tqdm
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ArtifactManager(SidecarConfig(
+        shared_volume=str(tmp_path / "models"),
+        registry_path=str(tmp_path / "registry.json"),
+        download_engine="snapshot",
+    ))
+
+
+class TestProgressTracker:
+
+    def test_add_updates_bytes_eta_and_throughput(self):
+        progress = {"downloaded_bytes": 0, "total_bytes": 1000, "started_at": time.time() - 1.0}
+        tracker = ProgressTracker(progress, "model", "org/m")
+        tracker._window_start -= 2.0  # make the first update close a throughput window
+
+        tracker.add(250)
+
+        assert progress["downloaded_bytes"] == 250
+        assert progress["eta_s"] == pytest.approx(3.0, rel=0.1)
+        assert progress["throughput_bytes_per_s"] > 0
+        tracker.close()
+
+    def test_set_downloaded_is_absolute(self):
+        progress = {"downloaded_bytes": 0}
+        tracker = ProgressTracker(progress, "model", "org/m")
+        tracker.set_downloaded(500)
+        tracker.set_downloaded(800)
+        assert progress["downloaded_bytes"] == 800
+
+
+class TestTqdmHook:
+
+    def test_counts_only_on_disk_byte_bars(self):
+        progress = {"downloaded_bytes": 0}
+        cls = progress_tqdm(ProgressTracker(progress, "model", "org/m"))
+
+        files_bar = cls(total=3, desc="Fetching 3 files")
+        files_bar.update(1)
+        network_bar = cls(total=0, unit="B", desc="Downloading bytes", name="hf.transfer")
+        network_bar.update(400)
+        disk_bar = cls(total=0, unit="B", desc="Reconstructing", name="hf.snapshot")
+        disk_bar.update(400)
+
+        assert progress["downloaded_bytes"] == 400
+
+    @pytest.mark.asyncio
+    async def test_snapshot_download_reports_through_hook(self, manager):
+        seen = {}
+
+        def fake_snapshot_download(**kwargs):
+            bar = kwargs["tqdm_class"](total=2048, unit="B", desc="model.bin")
+            bar.update(1024)
+            seen.update(manager.download_progress["org/model"])
+            bar.update(1024)
+
+        with patch("data_plane.inference.sidecar.artifact_manager.snapshot_download",
+                   side_effect=fake_snapshot_download):
+            await manager._fetch_from_external_storage("model", "org/model", "main")
+
+        assert seen["downloaded_bytes"] == 1024
+        assert "org/model" not in manager.download_progress
+
+
+class TestFallbackScan:
+
+    @pytest.mark.asyncio
+    async def test_dir_scan_runs_off_loop_when_no_bytes_reported(self, manager, tmp_path):
+        manager._PROGRESS_FALLBACK_INTERVAL = 0.01
+        scan_threads = []
+        original = ArtifactManager._get_dir_size
+
+        def _spy(path):
+            scan_threads.append(threading.current_thread())
+            return original(path)
+
+        target = tmp_path / "target"
+        target.mkdir()
+        (target / "shard").write_bytes(b"x" * 300)
+        progress = {"downloaded_bytes": 0}
+        manager.download_progress["org/model"] = progress
+        tracker = ProgressTracker(progress, "model", "org/model")
+
+        with patch.object(ArtifactManager, "_get_dir_size", side_effect=_spy):
+            task = asyncio.create_task(manager._monitor_download_progress("org/model", str(target), tracker))
+            await asyncio.sleep(0.1)
+            manager.download_progress.pop("org/model")
+            await task
+
+        assert progress["downloaded_bytes"] == 300
+        assert scan_threads and threading.main_thread() not in scan_threads
+
+    @pytest.mark.asyncio
+    async def test_no_scan_when_hook_reports_bytes(self, manager, tmp_path):
+        manager._PROGRESS_FALLBACK_INTERVAL = 0.01
+        progress = {"downloaded_bytes": 0}
+        manager.download_progress["org/model"] = progress
+        tracker = ProgressTracker(progress, "model", "org/model")
+        tracker.add(10)
+
+        with patch.object(ArtifactManager, "_get_dir_size") as scan:
+            task = asyncio.create_task(manager._monitor_download_progress("org/model", str(tmp_path), tracker))
+            await asyncio.sleep(0.05)
+            manager.download_progress.pop("org/model")
+            await task
+
+        scan.assert_not_called()
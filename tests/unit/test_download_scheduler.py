@@ -0,0 +1,135 @@
+"""
+Unit tests for DownloadScheduler: priority admission, escalation,
+queue publication, priority gating and the bandwidth token bucket.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from data_plane.inference.sidecar.download_scheduler import DownloadPriority, DownloadScheduler, estimate_eta
+
+
+async def _hold(scheduler, identifier, priority, started, release):
+    async with scheduler.slot(identifier, priority):
+        started.append(identifier)
+        await release.wait()
+
+
+class TestAdmission:
+
+    @pytest.mark.asyncio
+    async def test_queue_drains_in_priority_order(self):
+        scheduler = DownloadScheduler(max_concurrent=1)
+        started, release = [], asyncio.Event()
+
+        first = asyncio.create_task(_hold(scheduler, "big-model", DownloadPriority.BACKGROUND, started, asyncio.Event()))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(_hold(scheduler, "model-2", DownloadPriority.BACKGROUND, started, release)),
+            asyncio.create_task(_hold(scheduler, "prefetch", DownloadPriority.PREFETCH, started, release)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queued == ["prefetch", "model-2"]
+
+        first.cancel()
+        release.set()
+        await asyncio.gather(*tasks)
+        assert started == ["big-model", "prefetch", "model-2"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_does_not_wait_behind_background(self):
+        scheduler = DownloadScheduler(max_concurrent=1)
+        started, release = [], asyncio.Event()
+
+        bg = asyncio.create_task(_hold(scheduler, "big-model", DownloadPriority.BACKGROUND, started, release))
+        await asyncio.sleep(0)
+        blocking = asyncio.create_task(_hold(scheduler, "adapter", DownloadPriority.BLOCKING, started, release))
+        await asyncio.sleep(0)
+
+        assert started == ["big-model", "adapter"]
+        release.set()
+        await asyncio.gather(bg, blocking)
+
+    @pytest.mark.asyncio
+    async def test_raise_priority_reorders_queue(self):
+        progress = {}
+        scheduler = DownloadScheduler(max_concurrent=1, progress=progress)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(scheduler, name, DownloadPriority.BACKGROUND, started, release))
+                 for name in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        assert progress["c"]["queue_position"] == 2
+        assert progress["c"]["status"] == "queued"
+
+        assert scheduler.raise_priority("c", DownloadPriority.PREFETCH) is True
+        assert scheduler.queued == ["c", "b"]
+        assert progress["c"]["queue_position"] == 1
+        assert progress["c"]["priority"] == "prefetch"
+        # Lowering is a no-op
+        assert scheduler.raise_priority("c", DownloadPriority.BACKGROUND) is False
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert started == ["a", "c", "b"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        scheduler = DownloadScheduler(max_concurrent=1)
+        started, release = [], asyncio.Event()
+        holder = asyncio.create_task(_hold(scheduler, "a", DownloadPriority.BACKGROUND, started, release))
+        waiter = asyncio.create_task(_hold(scheduler, "b", DownloadPriority.BACKGROUND, started, release))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.queued == []
+
+        release.set()
+        await holder
+        assert scheduler.active == {}
+
+
+class TestThrottle:
+
+    def test_lower_priority_paused_while_blocking_active(self):
+        scheduler = DownloadScheduler(max_concurrent=2)
+        scheduler._active = {"model": DownloadPriority.BACKGROUND, "adapter": DownloadPriority.BLOCKING}
+        passed = threading.Event()
+
+        t = threading.Thread(target=lambda: (scheduler.wait_turn("model"), passed.set()))
+        t.start()
+        assert not passed.wait(0.1)
+        # The blocking adapter itself is never gated, and the bandwidth hook never gates
+        scheduler.wait_turn("adapter")
+        scheduler.throttle("model", 1)
+
+        with scheduler._cond:
+            scheduler._active.pop("adapter")
+            scheduler._cond.notify_all()
+        assert passed.wait(1.0)
+        t.join()
+
+    def test_bandwidth_bucket_sleeps_off_deficit(self):
+        scheduler = DownloadScheduler(bandwidth_bytes_per_s=10_000)
+        start = time.monotonic()
+        scheduler.throttle("x", 10_000)  # burst allowance
+        scheduler.throttle("x", 2_000)  # 0.2 s of debt
+        assert time.monotonic() - start >= 0.15
+
+
+def test_estimate_eta():
+    now = time.time()
+    assert estimate_eta({"downloaded_bytes": 0, "total_bytes": 100, "started_at": now}) is None
+    assert estimate_eta({"downloaded_bytes": 50, "total_bytes": None, "started_at": now - 10}) is None
+    assert estimate_eta({"downloaded_bytes": 50, "total_bytes": 100, "started_at": now - 10}) == pytest.approx(10, rel=0.05)
+
+
+def test_parse_priority():
+    assert DownloadPriority.parse("Blocking") == DownloadPriority.BLOCKING
+    with pytest.raises(ValueError, match="expected one of"):
+        DownloadPriority.parse("urgent")
@@ -0,0 +1,298 @@
+"""
+Unit tests for the parallel artifact downloader.
+
+A local ThreadingHTTPServer with Range support stands in for the hub.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data_plane.inference.sidecar.download_scheduler import DownloadPriority, DownloadScheduler
+from data_plane.inference.sidecar.downloader import ChecksumMismatch, ParallelDownloader, RemoteFile
+
+
+# ---------------------------------------------------------------------------
+# Local hub stand-in
+# ---------------------------------------------------------------------------
+
+class _HubHandler(BaseHTTPRequestHandler):
+    files: dict = {}
+    requests: list = []
+    fail_ranges: set = set()
+
+    def do_GET(self):
+        name = self.path.lstrip("/")
+        data = self.files.get(name)
+        if data is None:
+            self.send_error(404)
+            return
+        range_header = self.headers.get("Range")
+        self.requests.append((name, range_header))
+        if range_header in self.fail_ranges:
+            self.send_error(404)
+            return
+        if range_header:
+            start, end = (int(x) for x in range_header.removeprefix("bytes=").split("-"))
+            body = data[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hub():
+    _HubHandler.files = {}
+    _HubHandler.requests = []
+    _HubHandler.fail_ranges = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield _HubHandler, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _remote(base_url: str, name: str, data: bytes, **hashes) -> RemoteFile:
+    return RemoteFile(path=name, size=len(data), url=f"{base_url}/{name}", **hashes)
+
+
+@pytest.fixture
+def downloader():
+    d = ParallelDownloader(workers=4, chunk_bytes=1000, max_retries=0)
+    yield d
+    d.close()
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestParallelDownload:
+
+    def test_chunks_assembled_and_sha256_verified(self, hub, downloader, tmp_path):
+        handler, url = hub
+        weights = os.urandom(4500)
+        handler.files["model.safetensors"] = weights
+        remote = _remote(url, "model.safetensors", weights, sha256=hashlib.sha256(weights).hexdigest())
+
+        progress = []
+        fetched = downloader.download([remote], str(tmp_path), on_progress=progress.append)
+
+        assert (tmp_path / "model.safetensors").read_bytes() == weights
+        assert fetched == sum(progress) == 4500
+        assert len(handler.requests) == 5  # 4 full chunks + 1 tail
+        assert not (tmp_path / "model.safetensors.part").exists()
+        assert not (tmp_path / "model.safetensors.part.state").exists()
+
+    def test_git_blob_sha1_verified_for_small_files(self, hub, downloader, tmp_path):
+        handler, url = hub
+        data = b'{"hidden_size": 8}'
+        handler.files["config.json"] = data
+        blob_id = hashlib.sha1(f"blob {len(data)}\0".encode() + data).hexdigest()
+
+        downloader.download([_remote(url, "config.json", data, git_sha1=blob_id)], str(tmp_path))
+
+        assert (tmp_path / "config.json").read_bytes() == data
+        # Single-chunk files are fetched without a Range header
+        assert handler.requests == [("config.json", None)]
+
+    def test_checksum_mismatch_discards_partial(self, hub, downloader, tmp_path):
+        handler, url = hub
+        handler.files["model.bin"] = b"x" * 2500
+        remote = _remote(url, "model.bin", b"x" * 2500, sha256="0" * 64)
+
+        with pytest.raises(ChecksumMismatch):
+            downloader.download([remote], str(tmp_path))
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_checksums_skipped_when_disabled(self, hub, tmp_path):
+        handler, url = hub
+        handler.files["model.bin"] = b"x" * 10
+        d = ParallelDownloader(workers=2, chunk_bytes=1000, verify_checksums=False)
+        try:
+            d.download([_remote(url, "model.bin", b"x" * 10, sha256="0" * 64)], str(tmp_path))
+        finally:
+            d.close()
+        assert (tmp_path / "model.bin").exists()
+
+    def test_resume_fetches_only_missing_chunks(self, hub, downloader, tmp_path):
+        handler, url = hub
+        data = os.urandom(3000)
+        handler.files["model.bin"] = data
+        remote = _remote(url, "model.bin", data, sha256=hashlib.sha256(data).hexdigest())
+
+        # First attempt: the last chunk fails, the others land in the .part file
+        handler.fail_ranges = {"bytes=2000-2999"}
+        with pytest.raises(Exception):
+            downloader.download([remote], str(tmp_path))
+        state = json.loads((tmp_path / "model.bin.part.state").read_text())
+        assert state["completed"] == [0, 1]
+
+        handler.fail_ranges = set()
+        handler.requests.clear()
+        fetched = downloader.download([remote], str(tmp_path))
+
+        assert fetched == 1000
+        assert handler.requests == [("model.bin", "bytes=2000-2999")]
+        assert (tmp_path / "model.bin").read_bytes() == data
+
+    def test_failed_chunk_stops_the_download(self, hub, tmp_path):
+        handler, url = hub
+        data = os.urandom(5000)
+        handler.files["model.bin"] = data
+        handler.fail_ranges = {"bytes=1000-1999"}
+        d = ParallelDownloader(workers=1, chunk_bytes=1000, max_retries=0)
+        try:
+            with pytest.raises(Exception):
+                d.download([_remote(url, "model.bin", data)], str(tmp_path))
+        finally:
+            d.close()
+
+        # Nothing past the failed chunk was requested; what landed is still recorded
+        assert [r for _, r in handler.requests] == ["bytes=0-999", "bytes=1000-1999"]
+        assert json.loads((tmp_path / "model.bin.part.state").read_text())["completed"] == [0]
+
+    def test_resume_state_written_in_batches(self, hub, downloader, tmp_path, monkeypatch):
+        handler, url = hub
+        data = os.urandom(5000)
+        handler.files["model.bin"] = data
+        writes = []
+        real_replace = os.replace
+        monkeypatch.setattr(
+            "data_plane.inference.sidecar.downloader.os.replace",
+            lambda src, dst: (writes.append(dst), real_replace(src, dst)),
+        )
+
+        downloader.download([_remote(url, "model.bin", data)], str(tmp_path))
+
+        assert writes.count(str(tmp_path / "model.bin.part.state")) == 1
+        assert (tmp_path / "model.bin").read_bytes() == data
+
+    def test_existing_file_skipped(self, hub, downloader, tmp_path):
+        handler, url = hub
+        handler.files["config.json"] = b"{}"
+        (tmp_path / "config.json").write_bytes(b"{}")
+
+        assert downloader.download([_remote(url, "config.json", b"{}")], str(tmp_path)) == 0
+        assert handler.requests == []
+
+    def test_nested_paths_created(self, hub, downloader, tmp_path):
+        handler, url = hub
+        handler.files["tokenizer/vocab.txt"] = b"a\nb\n"
+        downloader.download([_remote(url, "tokenizer/vocab.txt", b"a\nb\n")], str(tmp_path))
+        assert (tmp_path / "tokenizer" / "vocab.txt").read_bytes() == b"a\nb\n"
+
+    def test_chunks_spread_across_mirrors_and_failover(self, hub, tmp_path):
+        handler, url = hub
+        data = os.urandom(4000)
+        handler.files["peer-a/model.bin"] = data
+        remote = RemoteFile(
+            path="model.bin", size=len(data), url=f"{url}/gone/model.bin",
+            sha256=hashlib.sha256(data).hexdigest(), mirrors=[f"{url}/peer-a/model.bin"],
+        )
+        d = ParallelDownloader(workers=4, chunk_bytes=1000, max_retries=1)
+        try:
+            d.download([remote], str(tmp_path))
+        finally:
+            d.close()
+
+        assert (tmp_path / "model.bin").read_bytes() == data
+
+
+class TestPriorityGating:
+
+    def test_blocking_download_runs_while_background_is_paused(self, hub, tmp_path):
+        handler, url = hub
+        model, adapter = os.urandom(40_000), os.urandom(3_000)
+        handler.files["model.bin"] = model
+        handler.files["adapter.bin"] = adapter
+        scheduler = DownloadScheduler(max_concurrent=2)
+        scheduler._active = {"model": DownloadPriority.BACKGROUND}
+        d = ParallelDownloader(workers=2, chunk_bytes=1000, max_retries=0)
+        model_progress = threading.Semaphore(0)
+        model_done, adapter_done = threading.Event(), threading.Event()
+
+        def _slow(nbytes):
+            time.sleep(0.01)
+
+        def _fetch(name, data, identifier, done, **hooks):
+            d.download([_remote(url, name, data)], str(tmp_path), gate=scheduler.gate_for(identifier), **hooks)
+            done.set()
+
+        threading.Thread(
+            target=_fetch, args=("model.bin", model, "model", model_done),
+            kwargs={"on_progress": lambda n: model_progress.release(), "throttle": _slow}, daemon=True,
+        ).start()
+        try:
+            assert model_progress.acquire(timeout=5)
+            # A blocking download arrives while the model has chunks in flight
+            with scheduler._cond:
+                scheduler._active["adapter"] = DownloadPriority.BLOCKING
+            threading.Thread(target=_fetch, args=("adapter.bin", adapter, "adapter", adapter_done), daemon=True).start()
+
+            assert adapter_done.wait(5)
+            assert not model_done.is_set()
+            with scheduler._cond:
+                scheduler._active.pop("adapter")
+                scheduler._cond.notify_all()
+            assert model_done.wait(10)
+        finally:
+            d.close()
+        assert (tmp_path / "adapter.bin").read_bytes() == adapter
+        assert (tmp_path / "model.bin").read_bytes() == model
+
+
+class TestArtifactManagerParallelEngine:
+
+    @pytest.mark.asyncio
+    async def test_fetch_uses_manifest_and_reports_progress(self, hub, tmp_path, monkeypatch):
+        from unittest.mock import patch
+
+        from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+        from data_plane.inference.sidecar.config import SidecarConfig
+
+        monkeypatch.delenv("HF_TOKEN", raising=False)
+        handler, url = hub
+        handler.files["config.json"] = b"{}"
+        handler.files["model.bin"] = b"w" * 5000
+        manifest = [_remote(url, "model.bin", b"w" * 5000), _remote(url, "config.json", b"{}")]
+
+        mgr = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path / "models"),
+            registry_path=str(tmp_path / "registry.json"),
+            download_engine="parallel",
+            download_chunk_bytes=1000,
+        ))
+        seen = {}
+        original = mgr._downloader.download
+
+        def _download(*args):
+            result = original(*args)
+            seen.update(mgr.download_progress["org/model"])
+            return result
+
+        try:
+            with patch("data_plane.inference.sidecar.artifact_manager.hub_manifest", return_value=manifest), \
+                    patch.object(mgr._downloader, "download", side_effect=_download):
+                path = await mgr._fetch_from_external_storage("model", "org/model", "main")
+        finally:
+            mgr.close()
+
+        assert os.path.exists(os.path.join(path, "config.json"))
+        assert seen["total_bytes"] == seen["downloaded_bytes"] == 5002
+        assert "org/model" not in mgr.download_progress
@@ -1,5 +1,6 @@
 """gRPC integration tests — in-process server + client for KV cache service."""
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import grpc
@@ -11,6 +12,7 @@ from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
 from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
 from data_plane.inference.engine.sidecar_cache_client import SidecarCacheClient
 from data_plane.inference.engine.mock_engine import MockLLMEngine
+from shared.proto import kv_cache_pb2
 from shared.types import TransferResult
 
 
@@ -88,6 +90,76 @@ class TestGRPCStoreLoadRoundtrip:
         data = await client.load_block(9999)
         assert data is None
 
+    @pytest.mark.asyncio
+    async def test_query_prefix_follows_chain(self, grpc_env):
+        client, *_ = grpc_env
+        ids = await client.allocate_blocks(["p0", "p1", "p2"])
+        parents = ["", "p0", "p1"]
+        for bid, h, parent in zip(ids, ["p0", "p1", "p2"], parents):
+            assert await client.store_block(bid, h, b"\x01" * 128, parent_hash=parent)
+
+        assert await client.query_prefix(["p0", "p1", "p2", "p3"]) == ["L1", "L1", "L1"]
+        # p2's parent is p1, so it does not continue a chain that skips p1
+        assert await client.query_prefix(["p0", "p2"]) == ["L1"]
+        assert await client.query_prefix(["missing", "p0"]) == []
+
+    @pytest.mark.asyncio
+    async def test_lookup_blocks_by_hash(self, grpc_env):
+        client, *_ = grpc_env
+        [bid] = await client.allocate_blocks(["look-1"])
+        data = b"\x02" * 128
+        await client.store_block(bid, "look-1", data)
+
+        found = await client.lookup_blocks(["look-1", "absent"], include_data=True)
+        assert found == [(bid, "L1", data), (-1, "", None)]
+        assert await client.lookup_blocks(["look-1"]) == [(bid, "L1", None)]
+
+    @pytest.mark.asyncio
+    async def test_lookup_error_reported_as_internal(self, grpc_env, monkeypatch):
+        client, manager, _ = grpc_env
+        monkeypatch.setattr(manager, "lookup_blocks", AsyncMock(side_effect=RuntimeError("boom")))
+
+        with pytest.raises(grpc.aio.AioRpcError) as exc:
+            await client._stub.LookupBlocks(kv_cache_pb2.LookupBlocksRequest(block_hashes=["x"]))
+        assert exc.value.code() == grpc.StatusCode.INTERNAL
+        assert exc.value.details() == "boom"
+        # The client falls back to "nothing resident"
+        assert await client.lookup_blocks(["x"]) == []
+
+    @pytest.mark.asyncio
+    async def test_list_resident_blocks_pages(self, grpc_env, monkeypatch):
+        from data_plane.inference.engine.kv_offload import sidecar_handler
+
+        client, *_ = grpc_env
+        hashes = [f"list-{i}" for i in range(5)]
+        ids = await client.allocate_blocks(hashes)
+        for bid, h in zip(ids[:4], hashes):
+            await client.store_block(bid, h, b"\x03" * 128)
+
+        monkeypatch.setattr(sidecar_handler, "_LIST_PAGE_BLOCKS", 3)
+        resident = await asyncio.to_thread(sidecar_handler.list_resident_blocks, "localhost:50099")
+        # Only blocks with stored bytes are listed, in block_id order
+        assert resident == sorted(zip(hashes[:4], ids[:4]), key=lambda item: item[1])
+
+    @pytest.mark.asyncio
+    async def test_list_resident_blocks_of_one_model(self, grpc_env):
+        from data_plane.inference.engine.kv_offload import sidecar_handler
+
+        client, *_ = grpc_env
+        for model_id in ("m1", "m2"):
+            [bid] = await client.allocate_blocks([f"own-{model_id}"], model_id)
+            await client.store_block(bid, f"own-{model_id}", b"\x04" * 128, model_id=model_id)
+
+        resident = await asyncio.to_thread(sidecar_handler.list_resident_blocks, "localhost:50099", "m1")
+        assert [block_hash for block_hash, _ in resident] == ["own-m1"]
+
+    @pytest.mark.asyncio
+    async def test_resolve_namespace(self, grpc_env):
+        from data_plane.inference.engine.kv_offload.sidecar_handler import resolve_namespace
+
+        # No namespaces configured: every model shares the whole L1
+        assert await asyncio.to_thread(resolve_namespace, "localhost:50099", "any-model") == (0, 16)
+
 
 class TestMockEngineOffloadGRPC:
     @pytest.mark.asyncio
@@ -103,13 +175,13 @@ class TestMockEngineOffloadGRPC:
         assert ok is True
 
         # Verify in registry
-        entry = registry.lookup("engine-hash")
+        entry = registry.lookup("engine-hash", "test-model")
         assert entry is not None
         assert entry.model_id == "test-model"
 
         # Fetch back — we need the block_id that was allocated
-        block_id = manager.l1._hash_to_id.get("engine-hash")
-        assert block_id is not None
+        [(block_id, location, _)] = await manager.lookup_blocks(["engine-hash"], model_id="test-model")
+        assert location == "L1"
 
         loaded = await engine.fetch_block("engine-hash", block_id)
         assert loaded == data
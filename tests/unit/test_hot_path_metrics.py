@@ -0,0 +1,59 @@
+"""Unit tests for the hot-path Prometheus counters and histograms."""
+
+import threading
+
+import pytest
+from prometheus_client import CollectorRegistry, generate_latest
+
+from shared.monitoring.hot_path import HotCounter, HotHistogram
+
+
+@pytest.fixture
+def registry():
+    return CollectorRegistry()
+
+
+class TestHotCounter:
+    def test_exposition_matches_prometheus_counter(self, registry):
+        counter = HotCounter("ops_total", "Operations", ["op"], registry=registry)
+        counter.labels(op="store").inc()
+        counter.labels("store").inc(2)
+
+        assert registry.get_sample_value("ops_total", {"op": "store"}) == 3
+        assert "# TYPE ops_total counter" in generate_latest(registry).decode()
+
+    def test_counts_from_many_threads(self, registry):
+        child = HotCounter("hits_total", "Hits", registry=registry).labels()
+
+        def _work():
+            for _ in range(10_000):
+                child.inc()
+
+        threads = [threading.Thread(target=_work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert registry.get_sample_value("hits_total") == 40_000
+
+    def test_wrong_labels_rejected(self, registry):
+        counter = HotCounter("x_total", "X", ["a", "b"], registry=registry)
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+
+class TestHotHistogram:
+    def test_buckets_are_cumulative(self, registry):
+        hist = HotHistogram("lat_seconds", "Latency", ["op"], buckets=[0.1, 1.0], registry=registry)
+        child = hist.labels(op="load")
+        for value in (0.05, 0.1, 0.5, 2.0):
+            child.observe(value)
+
+        def sample(le):
+            return registry.get_sample_value("lat_seconds_bucket", {"op": "load", "le": le})
+
+        assert sample("0.1") == 2  # le is inclusive
+        assert sample("1.0") == 3
+        assert sample("+Inf") == 4
+        assert registry.get_sample_value("lat_seconds_count", {"op": "load"}) == 4
+        assert registry.get_sample_value("lat_seconds_sum", {"op": "load"}) == pytest.approx(2.65)
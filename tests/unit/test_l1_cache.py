@@ -8,7 +8,22 @@ import pytest
 
 from data_plane.inference.sidecar.l1_cache.allocator import BlockSlotAllocator
 from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
-from data_plane.inference.sidecar.l1_cache.eviction_policy import LRUPolicy
+from data_plane.inference.sidecar.l1_cache.compression import (
+    CODEC_NONE,
+    CODEC_ZERO,
+    CODEC_ZLIB,
+    BlockCompressor,
+)
+from data_plane.inference.sidecar.l1_cache.eviction_policy import (
+    ARCPolicy,
+    EVICTION_POLICIES,
+    LRUPolicy,
+    S3FIFOPolicy,
+    TinyLFUAdmission,
+    TwoQueuePolicy,
+    make_eviction_policy,
+)
+from data_plane.inference.sidecar.l1_cache.namespaces import split_namespaces
 from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
 from shared.types import KVBlockEntry
 
@@ -57,6 +72,27 @@ class TestBlockSlotAllocator:
         id3 = alloc.allocate()
         assert id3 == id1  # reuses freed ID
 
+    def test_allocate_specific_keeps_free_list_consistent(self):
+        alloc = BlockSlotAllocator(num_blocks=5)
+        assert alloc.allocate_specific(1) is True
+        assert alloc.allocate_specific(1) is True  # idempotent
+        assert alloc.allocate_specific(5) is False
+        assert alloc.is_allocated(1) and not alloc.is_allocated(5)
+        assert alloc.num_free == 4
+
+        # The remaining IDs are handed out exactly once
+        rest = alloc.allocate_n(4)
+        assert sorted(rest) == [0, 2, 3, 4]
+        assert alloc.allocate() is None
+
+    def test_bulk_free_and_specific(self):
+        alloc = BlockSlotAllocator(num_blocks=4)
+        assert alloc.allocate_specific_n([3, 0]) is True
+        assert alloc.allocate_specific_n([1, 9]) is False
+        assert not alloc.is_allocated(1)
+        assert alloc.free_n([3, 0, 0]) == 2  # second free of 0 is a double-free
+        assert alloc.num_free == 4
+
 
 # --- LRU Policy tests ---
 
@@ -87,6 +123,106 @@ class TestLRUPolicy:
         assert lru.select_victim() is None
 
 
+# --- Scan-resistant policy tests ---
+
+
+def _simulate(policy, trace, capacity):
+    """Drive a policy the way L1ByteStore does; returns the resident set."""
+    resident = set()
+    for key in trace:
+        if key in resident:
+            policy.record_access(key)
+            continue
+        if len(resident) >= capacity:
+            victim = policy.select_victim()
+            if not policy.admit(key, victim):
+                continue
+            policy.on_evict(victim)
+            resident.discard(victim)
+        resident.add(key)
+        policy.track_new(key, 1)
+    return resident
+
+
+class TestScanResistantPolicies:
+    @pytest.mark.parametrize("name", ["2q", "arc", "s3fifo"])
+    def test_hot_keys_survive_one_off_scan(self, name):
+        hot = [f"hot-{i}" for i in range(4)]
+        # Hot keys recur between one-off fillers (enough to push them out of
+        # 2Q's A1in into its ghost list), then a long one-off scan goes by
+        warmup = []
+        for r in range(3):
+            warmup += hot + [f"fill-{r}-{i}" for i in range(4)]
+        scan = [f"scan-{i}" for i in range(50)]
+        resident = _simulate(make_eviction_policy(name, 10), warmup + scan, capacity=10)
+        assert set(hot) <= resident
+
+    def test_lru_is_flushed_by_scan(self):
+        hot = [f"hot-{i}" for i in range(4)]
+        scan = [f"scan-{i}" for i in range(50)]
+        resident = _simulate(make_eviction_policy("lru", 10), hot * 3 + scan, capacity=10)
+        assert not set(hot) & resident
+
+    def test_2q_promotes_key_returning_from_ghost(self):
+        policy = TwoQueuePolicy(capacity=4)
+        policy.track_new("a", 1)
+        policy.on_evict("a")
+        policy.track_new("a", 1)
+        assert "a" in policy._am
+
+    def test_arc_ghost_hit_grows_recency_target(self):
+        policy = ARCPolicy(capacity=4)
+        policy.track_new("a", 1)
+        policy.on_evict("a")
+        assert policy._p == 0
+        policy.track_new("a", 1)
+        assert policy._p > 0
+        assert "a" in policy._t2
+
+    def test_s3fifo_reaccessed_small_key_moves_to_main(self):
+        policy = S3FIFOPolicy(capacity=10)
+        policy.track_new("a", 1)
+        policy.track_new("b", 1)
+        policy.record_access("a")
+        assert policy.select_victim() == "b"
+        assert "a" in policy._main
+
+    def test_remove_does_not_leave_ghost(self):
+        for name in EVICTION_POLICIES:
+            policy = make_eviction_policy(name, 4)
+            policy.track_new("a", 1)
+            policy.remove("a")
+            assert policy.select_victim() is None
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            make_eviction_policy("mru", 4)
+
+
+class TestTinyLFUAdmission:
+    def test_rejects_colder_candidate(self):
+        policy = TinyLFUAdmission(LRUPolicy(), capacity=8)
+        policy.track_new("hot", 1)
+        for _ in range(5):
+            policy.record_access("hot")
+        assert policy.admit("cold", "hot") is False
+
+    def test_admits_candidate_requested_more_often(self):
+        policy = TinyLFUAdmission(LRUPolicy(), capacity=8)
+        policy.track_new("victim", 1)
+        for _ in range(3):
+            policy.admit("popular", "victim")
+        assert policy.admit("popular", "victim") is True
+
+    def test_counters_age(self):
+        policy = TinyLFUAdmission(LRUPolicy(), capacity=1, sample_factor=10)
+        for _ in range(9):
+            policy.increment("k")
+        assert policy.estimate("k") == 9
+        policy.increment("other")
+        assert policy.estimate("k") == 4
+
+
 # --- L1ByteStore tests ---
 
 
@@ -148,6 +284,246 @@ class TestL1ByteStore:
     def test_load_miss(self, store):
         assert store.load(999) is None
 
+    def test_load_is_zero_copy_view_of_slot(self, store):
+        ids = store.allocate_blocks(["hash-v"])
+        store.store(ids[0], b"abc", "hash-v")
+
+        view = store.load(ids[0])
+        assert isinstance(view, memoryview)
+        assert view.nbytes == 3
+        # Overwriting the slot is visible through the earlier view
+        store.store(ids[0], b"xyz", "hash-v")
+        assert bytes(view) == b"xyz"
+
+    def test_oversized_block_rejected(self, store):
+        ids = store.allocate_blocks(["big"])
+        assert store.store(ids[0], b"\x01" * 65, "big") is False
+        assert store.load(ids[0]) is None
+
+    def test_freed_slot_is_empty(self, store):
+        ids = store.allocate_blocks(["hash-f"])
+        store.store(ids[0], b"\x07" * 10, "hash-f")
+        store.free(ids[0])
+        assert store.load(ids[0]) is None
+        assert store._num_stored == 0
+
+    def test_empty_block_roundtrip(self, store):
+        ids = store.allocate_blocks(["empty"])
+        assert store.store(ids[0], b"", "empty") is True
+        assert store.load(ids[0]) == b""
+
+    def test_admission_filter_refuses_allocation(self):
+        store = L1ByteStore(num_blocks=1, block_size_bytes=64, tinylfu_admission=True)
+        store.store(0, b"x", "hot")
+        for _ in range(5):
+            store.load(0)
+        assert store.allocate_blocks(["one-off"]) is None
+        assert store.load(0) == b"x"
+
+    def test_reused_slot_drops_previous_hash(self, store):
+        store.store(0, b"a", "old")
+        store.store(0, b"b", "new")
+        assert store.slot_of("old") is None
+        assert store.eviction_policy.select_victim() == "new"
+
+    def test_link_shares_resident_bytes(self, store):
+        store.store(0, b"shared", "dup")
+        assert store.link(2, "dup") is True
+        assert store.load(2) == b"shared"
+        assert store._num_stored == 1
+        assert store.link(3, "not-stored") is False
+
+        # Freeing the link keeps the block; freeing the owner drops its links
+        assert store.free(2) is True
+        assert store.load(0) == b"shared"
+        store.link(2, "dup")
+        store.free(0)
+        assert store.load(2) is None
+        assert store.get_num_free_blocks() == 4
+
+    def test_store_into_link_detaches_it(self, store):
+        store.store(0, b"a", "owner")
+        store.link(1, "owner")
+        store.store(1, b"b", "other")
+        assert store.load(0) == b"a"
+        assert store.load(1) == b"b"
+        # Reusing the owner's slot for another block drops the remaining link
+        store.link(2, "owner")
+        store.store(0, b"c", "replacement")
+        assert store.load(2) is None
+
+    def test_shared_arena_commit(self, tmp_path):
+        import mmap
+
+        path = str(tmp_path / "arena")
+        store = L1ByteStore(num_blocks=4, block_size_bytes=64, shm_path=path)
+        assert os.path.getsize(path) == 4 * 64
+
+        # Another process maps the file and writes slot 2 directly
+        with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as peer:
+            peer[2 * 64:2 * 64 + 5] = b"hello"
+        assert store.commit(2, 5, "peer-hash") is True
+        assert store.load(2) == b"hello"
+        assert store.commit(3, 65, "too-big") is False
+
+        store.close()
+        assert not os.path.exists(path)
+
+
+class TestCompressedL1ByteStore:
+    @pytest.fixture
+    def store(self):
+        # 8 block IDs over 2 blocks' worth of 4 KB pages
+        return L1ByteStore(
+            num_blocks=8, block_size_bytes=32768, compression="zlib", arena_bytes=2 * 32768
+        )
+
+    def test_compressible_blocks_exceed_raw_capacity(self, store):
+        data = b"kv-prefix-" * 3276 + b"kv-pre"
+        for i in range(8):
+            assert store.store(i, data, f"h{i}") is True
+        assert store._num_stored == 8
+        for i in range(8):
+            assert store.load(i) == data
+        assert store.compression_ratio > 4
+
+    def test_zero_block_takes_no_pages(self, store):
+        assert store.store(0, bytes(32768), "zeros") is True
+        assert store._used_bytes() == 0
+        assert store.load(0) == bytes(32768)
+
+    def test_incompressible_block_is_raw_zero_copy_view(self, store):
+        data = os.urandom(32768)
+        store.store(0, data, "rand")
+        assert store._codecs[0] == CODEC_NONE
+        view = store.load(0)
+        assert view == data
+        assert view.obj is store._arena
+
+    def test_page_pressure_evicts_lru(self, store):
+        blocks = {f"r{i}": os.urandom(32768) for i in range(3)}
+        for i, (h, data) in enumerate(blocks.items()):
+            assert store.store(i, data, h) is True
+        assert store.load(0) is None
+        assert store.load(2) == blocks["r2"]
+        assert store._used_bytes() == 2 * 32768
+
+    def test_free_returns_pages(self, store):
+        store.store(0, os.urandom(32768), "r")
+        store.free(0)
+        assert store._used_bytes() == 0
+        assert len(store._free_pages) == 16
+
+    def test_disabled_with_shared_arena(self, tmp_path):
+        store = L1ByteStore(
+            num_blocks=2, block_size_bytes=64, shm_path=str(tmp_path / "arena"), compression="zlib"
+        )
+        assert store._compressor is None
+        store.close()
+
+
+class TestL1Namespaces:
+    def test_split_by_weight_default_first(self):
+        assert split_namespaces(10, {}) == [("default", 0, 10)]
+        # Rounding leftovers go to the default namespace
+        assert split_namespaces(10, {"llama": 2, "qwen": 1}) == [
+            ("default", 0, 3), ("llama", 3, 5), ("qwen", 8, 2),
+        ]
+        assert split_namespaces(8, {"llama": 1, "default": 0}) == [("default", 0, 0), ("llama", 0, 8)]
+
+    def test_allocation_only_evicts_own_namespace(self):
+        store = L1ByteStore(num_blocks=4, block_size_bytes=64, namespace_weights={"m": 1})
+        ids = store.allocate_blocks(["m0", "m1"], namespace="m")
+        assert all(bid >= 2 for bid in ids)
+        for bid, h in zip(ids, ["m0", "m1"]):
+            store.store(bid, b"m", h)
+        store.store(0, b"d", "d0")
+        store.store(1, b"d", "d1")
+
+        # The busy model evicts its own oldest block, never the default namespace's
+        [new_id] = store.allocate_blocks(["m2"], namespace="m")
+        assert store.slot_of("m0", "m") is None
+        assert store.load(0) == b"d" and store.load(1) == b"d"
+        assert store.namespace_of(new_id) == "m"
+
+    def test_hashes_and_links_stay_in_namespace(self):
+        store = L1ByteStore(num_blocks=4, block_size_bytes=64, namespace_weights={"m": 1})
+        store.store(0, b"default copy", "same-hash")
+        assert store.resident_id("same-hash") == 0
+        assert store.resident_id("same-hash", "m") is None
+        # Another model's equal hash is not the same block
+        assert store.link(3, "same-hash") is False
+        store.store(3, b"model copy", "same-hash")
+        assert store.resident_id("same-hash", "m") == 3
+        assert store.load(0) == b"default copy"
+
+    def test_page_pressure_evicts_from_namespace_over_its_share(self):
+        store = L1ByteStore(
+            num_blocks=8, block_size_bytes=32768, compression="zlib",
+            arena_bytes=2 * 32768, namespace_weights={"m": 1},
+        )
+        block = os.urandom(16384)  # kept raw: 4 of the 16 pages
+        store.store(4, block, "m-oldest")
+        for i in range(3):
+            store.store(i, block, f"d{i}")
+        # Plain LRU would evict m-oldest; the default namespace holds 3x its share
+        store.store(5, block, "m-new")
+        assert store.load(4) == block
+        assert store.load(0) is None
+
+    def test_per_namespace_load_metrics(self):
+        from prometheus_client import REGISTRY
+
+        store = L1ByteStore(num_blocks=4, block_size_bytes=64, namespace_weights={"metrics-ns": 1})
+        store.store(2, b"x", "h")
+
+        def loads(result):
+            return REGISTRY.get_sample_value(
+                "l1_cache_namespace_loads_total", {"namespace": "metrics-ns", "result": result}
+            ) or 0
+
+        hits, misses = loads("hit"), loads("miss")
+        store.load(2)
+        store.load(3)
+        assert (loads("hit") - hits, loads("miss") - misses) == (1, 1)
+        assert REGISTRY.get_sample_value(
+            "l1_cache_namespace_blocks_stored", {"namespace": "metrics-ns"}
+        ) == 1
+
+
+class TestBlockCompressor:
+    def test_incompressible_block_kept_raw(self):
+        compressor = BlockCompressor("zlib")
+        for _ in range(3):
+            codec, payload = compressor.compress(os.urandom(32768))
+            assert codec == CODEC_NONE
+            assert payload.nbytes == 32768
+        codec, payload = compressor.compress(b"a" * 32768)
+        assert codec == CODEC_ZLIB
+        assert compressor.decompress(codec, payload, 32768) == b"a" * 32768
+
+    def test_codec_over_cpu_budget_is_dropped(self):
+        compressor = BlockCompressor("zlib", cpu_budget_us=0, probe_interval=4)
+        codec, _ = compressor.compress(b"a" * 32768)
+        assert codec == CODEC_NONE
+        assert compressor.current_codec == "none"
+        # A later probe under a looser budget picks the codec up again
+        compressor.cpu_budget_us = 1e9
+        codecs = [compressor.compress(b"a" * 32768)[0] for _ in range(4)]
+        assert codecs[-1] == CODEC_ZLIB
+
+    def test_zero_block(self):
+        codec, payload = BlockCompressor("auto").compress(bytes(1024))
+        assert codec == CODEC_ZERO
+        assert payload.nbytes == 0
+
+    def test_missing_codec_falls_back_to_zlib(self, monkeypatch):
+        from data_plane.inference.sidecar.l1_cache import compression
+
+        monkeypatch.setattr(compression, "_zstd", None)
+        codec, _ = compression.BlockCompressor("zstd").compress(b"b" * 4096)
+        assert codec == CODEC_ZLIB
+
 
 # --- KV Block Registry tests ---
 
@@ -160,12 +536,26 @@ class TestKVBlockRegistry:
             model_id="test-model", prefix_hash="abc123",
         )
         reg.register(entry)
-        assert reg.lookup("blk-1") is not None
-        assert reg.lookup("blk-1").model_id == "test-model"
-
-        reg.unregister("blk-1")
+        assert reg.lookup("blk-1", "test-model") is not None
+        assert reg.lookup("blk-1", "test-model").model_id == "test-model"
         assert reg.lookup("blk-1") is None
 
+        reg.unregister("blk-1", "test-model")
+        assert reg.lookup("blk-1", "test-model") is None
+
+    def test_same_hash_of_two_models_is_two_blocks(self):
+        reg = KVBlockRegistry()
+        reg.register(KVBlockEntry(key="h", location="L1", size_bytes=10, model_id="a"))
+        reg.register(KVBlockEntry(key="h", location="L2", size_bytes=20, model_id="b"))
+
+        assert reg.location("h", "a") == "L1"
+        assert reg.location("h", "b") == "L2"
+        reg.update_location("h", "DISK", "a")
+        reg.unregister("h", "b")
+        assert reg.location("h", "a") == "DISK"
+        assert reg.location("h", "b") is None
+        assert reg.stats()["total_blocks"] == 1
+
     def test_query_by_prefix(self):
         reg = KVBlockRegistry()
         reg.register(KVBlockEntry(key="a", location="L1", size_bytes=100, prefix_hash="pf1", model_id="m1"))
@@ -187,7 +577,7 @@ class TestKVBlockRegistry:
 
             # New instance should restore
             reg2 = KVBlockRegistry(persist_path=path)
-            restored = reg2.lookup("persist-test")
+            restored = reg2.lookup("persist-test", "m")
             assert restored is not None
             assert restored.size_bytes == 512
 
@@ -202,3 +592,35 @@ class TestKVBlockRegistry:
         assert stats["l2_blocks"] == 1
         assert stats["l1_used_bytes"] == 100
         assert stats["l2_used_bytes"] == 200
+
+    def test_query_filters_by_model_and_location(self):
+        reg = KVBlockRegistry()
+        reg.register(KVBlockEntry(key="a", location="L1", size_bytes=1, prefix_hash="pf", model_id="m1"))
+        reg.register(KVBlockEntry(key="b", location="L2", size_bytes=1, prefix_hash="pf", model_id="m1"))
+        reg.register(KVBlockEntry(key="c", location="L1", size_bytes=1, prefix_hash="pf", model_id="m2"))
+
+        assert {e.key for e in reg.query(model_id="m1")} == {"a", "b"}
+        assert {e.key for e in reg.query(prefix_hash="pf", location="L1")} == {"a", "c"}
+        assert [e.key for e in reg.query(model_id="m1", location="L2")] == ["b"]
+        assert reg.query(model_id="missing") == []
+        assert len(reg.query()) == 3
+
+    def test_stats_follow_moves_and_replacements(self):
+        reg = KVBlockRegistry()
+        reg.register(KVBlockEntry(key="a", location="L1", size_bytes=100, model_id="m1"))
+        reg.register(KVBlockEntry(key="b", location="L1", size_bytes=50, model_id="m1"))
+        reg.update_location("a", "L2", "m1", size_bytes=80)
+        reg.register(KVBlockEntry(key="b", location="DISK", size_bytes=60, model_id="m1"))
+        reg.unregister("missing")
+
+        stats = reg.stats()
+        assert (stats["l1_blocks"], stats["disk_blocks"], stats["l2_blocks"]) == (0, 1, 1)
+        assert (stats["l1_used_bytes"], stats["disk_used_bytes"], stats["l2_used_bytes"]) == (0, 60, 80)
+        assert [e.key for e in reg.query(model_id="m1", location="L2")] == ["a"]
+
+        reg.unregister("a", "m1")
+        reg.forget_location("DISK")
+        stats = reg.stats()
+        assert stats["total_blocks"] == 0
+        assert stats["l2_used_bytes"] == 0
+        assert reg.query(model_id="m2") == []
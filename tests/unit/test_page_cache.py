@@ -0,0 +1,109 @@
+"""
+Unit tests for page-cache warming of model weights, its per-file status in
+the artifact registry, and the engine startup timing breakdown.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from data_plane.inference.engine.startup_timing import StartupTimer
+from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.page_cache import warm_model_dir, weight_files
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    root = tmp_path / "org" / "model" / "main"
+    root.mkdir(parents=True)
+    (root / "model-00001-of-00002.safetensors").write_bytes(b"a" * 3000)
+    (root / "model-00002-of-00002.safetensors").write_bytes(b"b" * 1000)
+    (root / "config.json").write_text("{}")
+    return root
+
+
+class TestWarmModelDir:
+
+    def test_only_weight_shards_selected_largest_first(self, model_dir):
+        assert weight_files(str(model_dir)) == [
+            "model-00001-of-00002.safetensors",
+            "model-00002-of-00002.safetensors",
+        ]
+
+    def test_every_shard_read(self, model_dir):
+        seen = []
+        results = warm_model_dir(str(model_dir), workers=2, on_file=lambda rel, rec: seen.append(rel))
+
+        assert {r["status"] for r in results.values()} == {"warm"}
+        assert results["model-00001-of-00002.safetensors"]["bytes"] == 3000
+        assert sorted(seen) == sorted(results)
+
+    def test_shards_beyond_memory_budget_skipped(self, model_dir):
+        with patch("data_plane.inference.sidecar.page_cache.available_memory_bytes", return_value=2000):
+            results = warm_model_dir(str(model_dir), max_memory_fraction=1.0)
+
+        assert results["model-00001-of-00002.safetensors"]["status"] == "skipped"
+        assert results["model-00002-of-00002.safetensors"]["status"] == "warm"
+
+
+class TestArtifactManagerWarm:
+
+    @pytest.fixture
+    def manager(self, tmp_path, model_dir):
+        am = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path),
+            registry_path=str(tmp_path / "registry.json"),
+            download_engine="snapshot",
+        ))
+        am.model_registry["org/model"] = {
+            "model_id": "org/model", "version": "main", "local_path": str(model_dir), "status": "loaded",
+        }
+        yield am
+        am.close()
+
+    @pytest.mark.asyncio
+    async def test_per_file_status_in_registry_entry(self, manager):
+        await manager.warm_model("org/model")
+
+        page_cache = manager.model_registry["org/model"]["page_cache"]
+        assert page_cache["status"] == "warm"
+        assert page_cache["bytes"] == 4000
+        assert set(page_cache["files"]) == {
+            "model-00001-of-00002.safetensors", "model-00002-of-00002.safetensors",
+        }
+
+    @pytest.mark.asyncio
+    async def test_load_model_schedules_warm(self, manager, model_dir):
+        with patch.object(manager, "_fetch_from_external_storage", return_value=str(model_dir)):
+            await manager.load_model("org/other", "main")
+            await manager._warm_tasks["org/other"]
+
+        assert manager.model_registry["org/other"]["page_cache"]["status"] == "warm"
+
+    @pytest.mark.asyncio
+    async def test_page_cache_state_not_persisted(self, manager, tmp_path):
+        await manager.warm_model("org/model")
+        manager._record_model("org/model")
+        manager._store.flush()
+
+        restored = ArtifactManager(manager.config)
+        assert "page_cache" not in restored.model_registry["org/model"]
+        restored.close()
+
+
+class TestStartupTimer:
+
+    def test_phases_recorded_in_summary(self):
+        timer = StartupTimer()
+        with timer.phase("sidecar_wait"):
+            pass
+        with timer.phase("engine_init"):
+            pass
+        timer.finish()
+
+        summary = timer.summary()
+        assert summary["complete"] is True
+        assert set(summary["phases"]) == {"sidecar_wait", "engine_init"}
+        assert summary["phases"]["engine_init"]["seconds"] >= 0
+        assert summary["phases"]["engine_init"].get("read_bytes", 0) >= 0
@@ -0,0 +1,183 @@
+"""
+Unit tests for peer-to-peer artifact distribution: peer file planning, and a
+sidecar fetching an artifact from a second, locally served sidecar.
+"""
+
+import hashlib
+import os
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+import uvicorn
+
+from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.downloader import RemoteFile
+from data_plane.inference.sidecar.peers import PeerDirectory, plan_peer_files
+
+
+class TestPlanPeerFiles:
+
+    def test_chunks_mirrored_across_agreeing_peers(self):
+        listing = [{"path": "w.bin", "size": 10, "sha256": "ab"}]
+        holders = [("http://p1", listing), ("http://p2", listing), ("http://p3", [{"path": "w.bin", "size": 9}])]
+
+        files = plan_peer_files("org/m", "main", holders, [RemoteFile("w.bin", 10, "hub", sha256="ab")])
+
+        assert len(files) == 1
+        assert files[0].url.startswith("http://p1/artifacts/file?")
+        assert [m.split("/artifacts")[0] for m in files[0].mirrors] == ["http://p2"]
+        assert files[0].sha256 == "ab"
+
+    def test_none_when_no_peer_has_every_file(self):
+        holders = [("http://p1", [{"path": "a", "size": 1}])]
+        hub = [RemoteFile("a", 1, "hub"), RemoteFile("b", 1, "hub")]
+        assert plan_peer_files("org/m", "main", holders, hub) is None
+
+    @pytest.mark.asyncio
+    async def test_discover_excludes_self(self):
+        peers = PeerDirectory(["http://127.0.0.1:8001", "http://10.0.0.9:8001/"], port=8001)
+        assert await peers.discover() == ["http://10.0.0.9:8001"]
+
+
+@pytest.fixture
+def peer_token(tmp_path):
+    path = tmp_path / "peer-token"
+    path.write_text("s3cret\n")
+    return str(path)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def holder_sidecar(tmp_path, peer_token):
+    """A second sidecar holding org/model@main, served over real HTTP."""
+    from data_plane.inference.sidecar import api
+
+    root = tmp_path / "holder"
+    version_dir = root / "org--model" / "main"
+    version_dir.mkdir(parents=True)
+    shard = os.urandom(50_000)
+    (version_dir / "model.bin").write_bytes(shard)
+    (version_dir / "config.json").write_bytes(b"{}")
+    manager = ArtifactManager(SidecarConfig(
+        shared_volume=str(root), registry_path=str(root / "registry.json"), download_engine="snapshot",
+        peer_token_file=peer_token,
+    ))
+    manager.model_registry["org/model"] = {
+        "model_id": "org/model", "version": "main", "local_path": str(version_dir), "status": "loaded",
+    }
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, lifespan="off", log_level="error"))
+    with patch.object(api, "_manager", manager):
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{port}", shard
+        server.should_exit = True
+        thread.join(timeout=5)
+    manager.close()
+
+
+class TestFetchFromPeer:
+
+    @pytest.mark.asyncio
+    async def test_artifact_fetched_from_peer_and_verified_against_hub(
+        self, holder_sidecar, peer_token, tmp_path, monkeypatch
+    ):
+        monkeypatch.delenv("HF_TOKEN", raising=False)
+        peer_url, shard = holder_sidecar
+        hub = [
+            RemoteFile("model.bin", len(shard), "http://hub.invalid/model.bin", sha256=hashlib.sha256(shard).hexdigest()),
+            RemoteFile("config.json", 2, "http://hub.invalid/config.json"),
+        ]
+        mgr = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path / "fetcher"),
+            registry_path=str(tmp_path / "fetcher" / "registry.json"),
+            download_engine="snapshot",
+            download_chunk_bytes=16_384,
+            disk_min_free_bytes=0,
+            peer_urls=[peer_url],
+            peer_token_file=peer_token,
+        ))
+        try:
+            with patch("data_plane.inference.sidecar.artifact_manager.hub_manifest", return_value=hub), \
+                    patch("data_plane.inference.sidecar.artifact_manager.snapshot_download") as hub_download:
+                path = await mgr._fetch_from_external_storage("model", "org/model", "main")
+        finally:
+            mgr.close()
+
+        hub_download.assert_not_called()
+        with open(os.path.join(path, "model.bin"), "rb") as f:
+            assert f.read() == shard
+        assert os.path.exists(os.path.join(path, "config.json"))
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_hub_when_no_peer_holds_it(self, holder_sidecar, peer_token, tmp_path):
+        peer_url, _ = holder_sidecar
+        mgr = ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path / "fetcher"),
+            registry_path=str(tmp_path / "fetcher" / "registry.json"),
+            download_engine="snapshot",
+            disk_min_free_bytes=0,
+            peer_urls=[peer_url],
+            peer_token_file=peer_token,
+        ))
+        try:
+            with patch("data_plane.inference.sidecar.artifact_manager.snapshot_download") as hub_download:
+                await mgr._fetch_from_external_storage("model", "org/other", "main")
+        finally:
+            mgr.close()
+
+        hub_download.assert_called_once()
+
+
+class TestPeerAccess:
+
+    def _manager(self, tmp_path, **kwargs):
+        return ArtifactManager(SidecarConfig(
+            shared_volume=str(tmp_path), registry_path=str(tmp_path / "registry.json"),
+            download_engine="snapshot", **kwargs,
+        ))
+
+    @pytest.mark.asyncio
+    async def test_artifacts_refused_without_peer_token(self, holder_sidecar):
+        peer_url, _ = holder_sidecar
+        params = {"identifier": "org/model", "version": "main"}
+        async with httpx.AsyncClient() as client:
+            anonymous = await client.get(f"{peer_url}/artifacts/manifest", params=params)
+            wrong = await client.get(
+                f"{peer_url}/artifacts/file", params={**params, "path": "model.bin"},
+                headers={"Authorization": "Bearer guess"},
+            )
+            peer = await client.get(
+                f"{peer_url}/artifacts/manifest", params=params, headers={"Authorization": "Bearer s3cret"},
+            )
+        assert (anonymous.status_code, wrong.status_code, peer.status_code) == (403, 403, 200)
+
+    @pytest.mark.asyncio
+    async def test_without_token_only_peer_addresses_allowed(self, tmp_path):
+        manager = self._manager(tmp_path, peer_urls=["http://127.0.0.1:9001"])
+        try:
+            assert await manager.peer_authorized("127.0.0.1", None) is True
+            assert await manager.peer_authorized("10.1.2.3", None) is False
+        finally:
+            manager.close()
+
+    @pytest.mark.asyncio
+    async def test_nobody_allowed_without_peers_or_token(self, tmp_path):
+        manager = self._manager(tmp_path)
+        try:
+            assert await manager.peer_authorized("127.0.0.1", None) is False
+        finally:
+            manager.close()
@@ -0,0 +1,92 @@
+"""Unit tests for the per-model KV block prefix index."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from data_plane.inference.sidecar.cache_manager import MultiTieredCacheManager
+from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
+from data_plane.inference.sidecar.l1_cache.api import L1ByteStore
+from data_plane.inference.sidecar.prefix_index import PrefixIndex
+from shared.types import KVBlockEntry, TransferResult
+
+
+def _chain(index, hashes, model_id="m", location="L1"):
+    parent = ""
+    for h in hashes:
+        index.insert(model_id, h, parent, location)
+        parent = h
+
+
+class TestPrefixIndex:
+    def test_longest_prefix_follows_chain(self):
+        index = PrefixIndex()
+        _chain(index, ["a", "b", "c"])
+        match = index.longest_prefix("m", ["a", "b", "c", "d"])
+        assert match.num_blocks == 3
+        assert match.block_hashes == ["a", "b", "c"]
+        assert match.locations == ["L1", "L1", "L1"]
+
+    def test_gap_stops_match(self):
+        index = PrefixIndex()
+        _chain(index, ["a", "b", "c"])
+        index.remove("m", "b")
+        assert index.longest_prefix("m", ["a", "b", "c"]).num_blocks == 1
+        # c is still linked to b, so it cannot follow a directly either
+        assert index.longest_prefix("m", ["a", "c"]).num_blocks == 1
+        assert len(index) == 2
+
+    def test_models_are_separate(self):
+        index = PrefixIndex()
+        _chain(index, ["a", "b"], model_id="m1")
+        assert index.longest_prefix("m2", ["a", "b"]).num_blocks == 0
+
+    def test_unlinked_block_matches_until_linked(self):
+        index = PrefixIndex()
+        index.insert("m", "a")
+        index.insert("m", "b")  # parent unknown when stored
+        assert index.longest_prefix("m", ["a", "b"]).num_blocks == 2
+        index.insert("m", "b", parent_hash="x")
+        assert index.longest_prefix("m", ["a", "b"]).num_blocks == 1
+
+    def test_location_tracked(self):
+        index = PrefixIndex()
+        _chain(index, ["a", "b"])
+        index.update_location("m", "b", "L2")
+        assert index.longest_prefix("m", ["a", "b"]).locations == ["L1", "L2"]
+
+    def test_placeholders_pruned(self):
+        index = PrefixIndex()
+        index.insert("m", "b", parent_hash="a")  # a becomes a placeholder
+        assert index.longest_prefix("m", ["a", "b"]).num_blocks == 0
+        index.remove("m", "b")
+        assert len(index) == 0
+        assert index._models == {}
+
+
+class TestRegistryPrefix:
+    def test_restored_registry_keeps_links(self, tmp_path):
+        path = str(tmp_path / "kv_blocks.json")
+        reg = KVBlockRegistry(persist_path=path)
+        reg.register(KVBlockEntry(key="a", location="L1", size_bytes=1, model_id="m"))
+        reg.register(KVBlockEntry(key="b", location="L2", size_bytes=1, model_id="m", parent_hash="a"))
+        reg.close()
+
+        restored = KVBlockRegistry(persist_path=path)
+        match = restored.longest_prefix(["a", "b"], model_id="m")
+        assert match.locations == ["L1", "L2"]
+        restored.close()
+
+    @pytest.mark.asyncio
+    async def test_l1_eviction_drops_block_from_prefix(self):
+        l2 = AsyncMock()
+        l2.put = AsyncMock(return_value=TransferResult(True, "L2 OK"))
+        registry = KVBlockRegistry()
+        manager = MultiTieredCacheManager(
+            l1=L1ByteStore(num_blocks=1, block_size_bytes=64), l2=l2, registry=registry, demotion_queue_blocks=0
+        )
+
+        await manager.store_block(0, "a", b"x" * 64)
+        assert manager.longest_prefix(["a"]).num_blocks == 1
+        assert manager.allocate_blocks(["b"]) is not None  # evicts a
+        assert manager.longest_prefix(["a"]).num_blocks == 0
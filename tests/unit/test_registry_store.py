@@ -0,0 +1,236 @@
+"""
+Unit tests for RegistryStore (snapshot + write-ahead log) and its use by
+ArtifactManager and KVBlockRegistry.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from data_plane.inference.sidecar.artifact_manager import ArtifactManager
+from data_plane.inference.sidecar.config import SidecarConfig
+from data_plane.inference.sidecar.kv_block_registry import KVBlockRegistry
+from data_plane.inference.sidecar.registry_store import RegistryStore
+from shared.types import KVBlockEntry
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "registry.json")
+
+
+class TestRegistryStore:
+
+    def test_log_replayed_on_recovery(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models", "adapters"))
+        store.load()
+        store.put("models", "m", {"status": "loaded"})
+        store.put("adapters", "a", {"status": "loaded"})
+        store.delete("adapters", "a")
+        store.close()
+
+        assert not os.path.exists(store_path)  # nothing compacted yet
+        recovered = RegistryStore(store_path, namespaces=("models", "adapters")).load()
+        assert recovered == {"models": {"m": {"status": "loaded"}}, "adapters": {}}
+
+    def test_torn_tail_record_ignored(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models",))
+        store.load()
+        store.put("models", "m", {"v": 1})
+        store.close()
+        with open(store_path + ".wal", "a") as f:
+            f.write('{"op":"put","ns":"models","key":"x","val')
+
+        assert RegistryStore(store_path, namespaces=("models",)).load() == {"models": {"m": {"v": 1}}}
+
+    def test_records_after_torn_tail_survive_restarts(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models",))
+        store.load()
+        store.put("models", "a", {"v": 1})
+        store.close()
+        with open(store_path + ".wal", "a") as f:
+            f.write('{"op":"put","ns":"models","key":"x","val')
+
+        store = RegistryStore(store_path, namespaces=("models",))
+        store.load()
+        store.put("models", "b", {"v": 2})
+        store.close()
+        store = RegistryStore(store_path, namespaces=("models",))
+        assert set(store.load()["models"]) == {"a", "b"}
+        store.close()
+        assert set(RegistryStore(store_path, namespaces=("models",)).load()["models"]) == {"a", "b"}
+
+    def test_checkpoint_writes_snapshot_and_truncates_log(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models",))
+        store.load()
+        store.put("models", "m", {"v": 1})
+        store.checkpoint()
+
+        with open(store_path) as f:
+            assert json.load(f) == {"models": {"m": {"v": 1}}}
+        assert os.path.getsize(store_path + ".wal") == 0
+        store.close()
+
+    def test_log_compacted_past_threshold(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models",), compact_threshold_bytes=200)
+        store.load()
+        for i in range(20):
+            store.put("models", f"m{i}", {"v": i})
+        store.flush()
+
+        assert os.path.exists(store_path)
+        assert os.path.getsize(store_path + ".wal") < 200
+        store.close()
+        assert len(RegistryStore(store_path, namespaces=("models",)).load()["models"]) == 20
+
+    def test_second_handle_sees_unflushed_writes(self, store_path):
+        first = RegistryStore(store_path, namespaces=("models",))
+        first.load()
+        first.put("models", "m", {"v": 1})
+
+        second = RegistryStore(store_path, namespaces=("models",))
+        assert second.load()["models"] == {"m": {"v": 1}}
+        first.close()
+        second.close()
+
+    def test_writes_to_one_key_coalesced(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models",), flush_delay_s=60.0)
+        store.load()
+        for i in range(50):
+            store.put("models", "m", {"v": i})
+        store.put("models", "gone", {"v": 0})
+        store.delete("models", "gone")
+        store.flush()
+
+        with open(store_path + ".wal") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 2
+        assert {"op": "put", "ns": "models", "key": "m", "value": {"v": 49}} in records
+        store.close()
+
+    def test_flush_delay_bounds_log_latency(self, store_path):
+        store = RegistryStore(store_path, namespaces=("models",), flush_delay_s=0.05)
+        store.load()
+        store.put("models", "m", {"v": 1})
+
+        deadline = time.monotonic() + 5.0
+        wal = store_path + ".wal"
+        while not (os.path.exists(wal) and os.path.getsize(wal)) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Written by the writer's own deadline: nothing flushed or closed the store
+        assert os.path.getsize(wal) > 0
+        store.close()
+        assert RegistryStore(store_path, namespaces=("models",)).load() == {"models": {"m": {"v": 1}}}
+
+
+class TestArtifactManagerLog:
+
+    def _config(self, tmp_path):
+        return SidecarConfig(
+            registry_path=str(tmp_path / "registry.json"),
+            shared_volume=str(tmp_path),
+            model_store_path=str(tmp_path),
+            download_engine="snapshot",
+        )
+
+    def test_transitions_recovered_without_snapshot(self, tmp_path):
+        am1 = ArtifactManager(config=self._config(tmp_path))
+        am1.model_registry["m"] = {"model_id": "m", "status": "loaded"}
+        am1._record_model("m")
+        am1.adapter_registry["a"] = {"adapter_id": "a", "status": "loaded"}
+        am1._record_adapter("a")
+        del am1.adapter_registry["a"]
+        am1._record_adapter("a")
+        am1._store.close()  # stop without the shutdown snapshot
+
+        am2 = ArtifactManager(config=self._config(tmp_path))
+        assert am2.model_registry == {"m": {"model_id": "m", "status": "loaded"}}
+        assert am2.adapter_registry == {}
+        am2.close()
+
+    def test_uses_recovered_without_snapshot(self, tmp_path):
+        am1 = ArtifactManager(config=self._config(tmp_path))
+        am1.model_registry["m"] = {"model_id": "m", "status": "loaded"}
+        am1._record_model("m")
+        am1.touch("model", "m")
+        am1.touch("model", "m")
+        last_used = am1.model_registry["m"]["last_used"]
+        am1._store.close()
+
+        am2 = ArtifactManager(config=self._config(tmp_path))
+        assert am2.model_registry["m"]["use_count"] == 2
+        assert am2.model_registry["m"]["last_used"] == last_used
+        am2.close()
+
+    def test_close_writes_snapshot(self, tmp_path):
+        am = ArtifactManager(config=self._config(tmp_path))
+        am.model_registry["m"] = {"model_id": "m", "status": "loaded", "page_cache": {"resident": True}}
+        am._record_model("m")
+        am.close()
+
+        with open(tmp_path / "registry.json") as f:
+            assert json.load(f)["models"] == {"m": {"model_id": "m", "status": "loaded"}}
+        assert os.path.getsize(tmp_path / "registry.json.wal") == 0
+
+    def test_legacy_snapshot_loads(self, tmp_path):
+        with open(tmp_path / "registry.json", "w") as f:
+            json.dump({"models": {"m": {"status": "loaded"}}, "adapters": {}}, f, indent=2)
+
+        am = ArtifactManager(config=self._config(tmp_path))
+        assert am.model_registry == {"m": {"status": "loaded"}}
+        am.close()
+
+
+class TestKVBlockRegistryLog:
+
+    def test_legacy_list_format_migrated(self, tmp_path):
+        path = tmp_path / "kv_blocks.json"
+        with open(path, "w") as f:
+            json.dump([KVBlockEntry(key="k", location="L1", size_bytes=64).to_dict()], f)
+
+        reg = KVBlockRegistry(persist_path=str(path))
+        assert reg.lookup("k").size_bytes == 64
+        reg.close()
+
+    def test_location_update_and_unregister_persisted(self, tmp_path):
+        path = str(tmp_path / "kv_blocks.json")
+        reg = KVBlockRegistry(persist_path=path)
+        reg.register(KVBlockEntry(key="a", location="L1", size_bytes=1))
+        reg.register(KVBlockEntry(key="b", location="L1", size_bytes=2))
+        reg.update_location("a", "L2")
+        reg.unregister("b")
+        reg.close()
+
+        restored = KVBlockRegistry(persist_path=path)
+        assert restored.lookup("a").location == "L2"
+        assert restored.lookup("b") is None
+        restored.close()
+
+    def test_entries_logged_as_of_write(self, tmp_path):
+        path = str(tmp_path / "kv_blocks.json")
+        reg = KVBlockRegistry(persist_path=path, flush_delay_s=60.0)
+        reg.register(KVBlockEntry(key="a", location="L1", size_bytes=1))
+        reg.update_location("a", "DISK")
+        reg.update_location("a", "L2")
+        reg.flush()
+
+        with open(path + ".wal") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["value"]["location"] for r in records] == ["L2"]
+        reg.close()
+
+    def test_forget_location_drops_restored_tier(self, tmp_path):
+        path = str(tmp_path / "kv_blocks.json")
+        reg = KVBlockRegistry(persist_path=path)
+        reg.register(KVBlockEntry(key="a", location="L1", size_bytes=1))
+        reg.register(KVBlockEntry(key="b", location="L2", size_bytes=2))
+        reg.close()
+
+        restored = KVBlockRegistry(persist_path=path)
+        assert restored.forget_location("L1") == 1
+        assert restored.entry("a") is None
+        assert restored.stats()["eviction_count"] == 0
+        restored.close()
+        assert KVBlockRegistry(persist_path=path).entry("b").location == "L2"
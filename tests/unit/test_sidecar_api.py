@@ -99,6 +99,16 @@ class TestSidecarModels:
         response = test_client.post("/unload/nonexistent")
         assert response.status_code == 404
 
+    def test_warm_model_returns_202(self, test_client, mock_manager):
+        response = test_client.post("/warm/test-model")
+        assert response.status_code == 202
+        mock_manager.schedule_warm.assert_called_once_with("test-model")
+
+    def test_warm_model_still_downloading_returns_409(self, test_client, mock_manager):
+        mock_manager.model_registry["test-model"]["status"] = "downloading"
+        response = test_client.post("/warm/test-model")
+        assert response.status_code == 409
+
 
 class TestSidecarRegistry:
     """Tests for registry query endpoints."""
@@ -150,6 +160,22 @@ class TestSidecarAdapters:
         data = response.json()
         assert data["status"] == "downloading"
 
+    def test_load_adapter_in_flight_priority_raised(self, test_client, mock_manager):
+        from data_plane.inference.sidecar.download_scheduler import DownloadPriority
+
+        mock_manager.adapter_registry["test-adapter"] = {
+            "adapter_id": "test-adapter",
+            "version": "v1",
+            "status": "downloading",
+        }
+        response = test_client.post("/adapter/load/test-adapter?version=v1&priority=blocking")
+        assert response.status_code == 202
+        mock_manager.raise_download_priority.assert_called_once_with("test-adapter", DownloadPriority.BLOCKING)
+
+    def test_load_adapter_invalid_priority_returns_422(self, test_client):
+        response = test_client.post("/adapter/load/test-adapter?priority=urgent")
+        assert response.status_code == 422
+
 
 class TestSidecarMetrics:
     """Tests for the /metrics endpoint."""
@@ -195,6 +221,7 @@ def make_manager(tmp_path):
             shared_volume=str(tmp_path / "models"),
             registry_path=str(tmp_path / "registry.json"),
             hf_token_file=hf_token_file,
+            download_engine="snapshot",
         )
         return ArtifactManager(config=config)
 